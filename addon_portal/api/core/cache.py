@@ -0,0 +1,438 @@
+"""
+Response cache for read-heavy endpoints (branding, policy, plans, usage).
+
+Every desktop add-on calls /licenses/policy and /licenses/branding on launch; the
+underlying rows change rarely, so responses are cached and served with an ETag:
+
+- In-process TTL cache (LRU-bounded), always on
+- Optional Redis second level (RESPONSE_CACHE_REDIS_URL) shared by all workers;
+  entries then stay in the local level for at most RESPONSE_CACHE_LOCAL_TTL_SECONDS
+- Tag-based invalidation: entries are tagged (e.g. "tenant:3", "plans") and
+  write paths call invalidate_tags(...) after committing. Invalidations bump a
+  generation counter (per process, and in Redis for all workers); a load that
+  overlapped an invalidation is not stored, so a slow loader in one worker
+  cannot put a stale body back after another worker invalidated it
+- Concurrent misses for the same key share one loader call
+
+Usage:
+    return await cached_response(
+        request, f"branding:{slug}", load_branding, tags=lambda body: [tenant_tag(body["tenant_id"])]
+    )
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+
+from .logging import get_logger
+from .settings import settings
+
+LOGGER = get_logger(__name__)
+
+
+def tenant_tag(tenant_id: int) -> str:
+    return f"tenant:{tenant_id}"
+
+
+PLANS_TAG = "plans"
+
+
+@dataclass
+class CachedValue:
+    """A cached JSON body and its ETag."""
+    body: Any
+    etag: str
+
+
+def compute_etag(body: Any) -> str:
+    """Weak ETag over the canonical JSON encoding of a response body."""
+    encoded = json.dumps(body, sort_keys=True, separators=(",", ":"), default=str)
+    return f'W/"{hashlib.sha1(encoded.encode()).hexdigest()}"'
+
+
+class _LocalStore:
+    """LRU-bounded TTL store with a tag index (single event loop, no locking needed)."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, CachedValue, Tuple[str, ...]]]" = OrderedDict()
+        self._tags: Dict[str, Set[str]] = {}
+
+    def get(self, key: str) -> Optional[CachedValue]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value, _ = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: CachedValue, ttl: float, tags: Iterable[str]) -> None:
+        self._remove(key)
+        tags = tuple(tags)
+        self._entries[key] = (time.monotonic() + ttl, value, tags)
+        for tag in tags:
+            self._tags.setdefault(tag, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+
+    def invalidate(self, tag: str) -> int:
+        keys = self._tags.pop(tag, set())
+        for key in keys:
+            self._remove(key)
+        return len(keys)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._tags.clear()
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[2]:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Atomically store an entry unless an invalidation happened since the load began.
+# KEYS: generation, entry, tag sets...  ARGV: expected generation, payload, ttl, cache key
+# Tag sets are shared by entries with different TTLs, so their expiry only ever grows.
+_REDIS_SET_SCRIPT = """
+if tonumber(redis.call('GET', KEYS[1]) or '0') ~= tonumber(ARGV[1]) then
+    return 0
+end
+redis.call('SET', KEYS[2], ARGV[2], 'EX', ARGV[3])
+for i = 3, #KEYS do
+    redis.call('SADD', KEYS[i], ARGV[4])
+    if redis.call('TTL', KEYS[i]) < tonumber(ARGV[3]) then
+        redis.call('EXPIRE', KEYS[i], ARGV[3])
+    end
+end
+return 1
+"""
+
+
+class _RedisStore:
+    """Redis level: JSON entries with TTL, tags as Redis sets of keys, a shared invalidation generation."""
+
+    def __init__(self, url: str, namespace: str):
+        self.url = url
+        self.namespace = namespace
+        self._client = None
+
+    def _redis(self):
+        if self._client is None:
+            try:
+                import redis.asyncio as aioredis
+            except ImportError:
+                raise RuntimeError("redis package not installed. Install with: pip install redis")
+            self._client = aioredis.from_url(self.url, decode_responses=True)
+        return self._client
+
+    def _key(self, key: str) -> str:
+        return f"{self.namespace}:entry:{key}"
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.namespace}:tag:{tag}"
+
+    def _generation_key(self) -> str:
+        return f"{self.namespace}:generation"
+
+    async def generation(self) -> int:
+        """Current invalidation generation shared by all workers."""
+        raw = await self._redis().get(self._generation_key())
+        return int(raw or 0)
+
+    async def get(self, key: str) -> Optional[CachedValue]:
+        raw = await self._redis().get(self._key(key))
+        if raw is None:
+            return None
+        data = json.loads(raw)
+        return CachedValue(body=data["body"], etag=data["etag"])
+
+    async def set(self, key: str, value: CachedValue, ttl: float, tags: Iterable[str], generation: int) -> bool:
+        """
+        Store an entry if no invalidation happened since `generation` was read.
+
+        Returns:
+            True if stored
+        """
+        keys = [self._generation_key(), self._key(key)] + [self._tag_key(tag) for tag in tags]
+        payload = json.dumps({"body": value.body, "etag": value.etag}, default=str)
+        stored = await self._redis().eval(
+            _REDIS_SET_SCRIPT, len(keys), *keys, generation, payload, max(1, int(ttl)), key
+        )
+        return bool(stored)
+
+    async def invalidate(self, tag: str) -> int:
+        client = self._redis()
+        # Bump first: loads still running in any worker will not store their result
+        await client.incr(self._generation_key())
+        keys = await client.smembers(self._tag_key(tag))
+        if keys:
+            await client.delete(*[self._key(key) for key in keys])
+        await client.delete(self._tag_key(tag))
+        return len(keys)
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
+
+class ResponseCache:
+    """
+    Two-level TTL cache for JSON response bodies.
+
+    Args:
+        enabled: When False every lookup calls the loader (invalidation is a no-op)
+        default_ttl: Seconds an entry lives unless a ttl is passed to get_or_load
+        max_entries: Bound of the in-process level (least recently used entries are dropped)
+        redis_url: Optional Redis URL for the shared level
+        local_ttl: With Redis, max seconds an entry stays in the in-process level
+            (bounds staleness in other workers after an invalidation)
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        default_ttl: float = 300,
+        max_entries: int = 10000,
+        redis_url: Optional[str] = None,
+        local_ttl: float = 5,
+        namespace: str = "q2o:response_cache",
+    ):
+        self.enabled = enabled
+        self.default_ttl = default_ttl
+        self.local_ttl = local_ttl
+        self._local = _LocalStore(max_entries)
+        self._redis = _RedisStore(redis_url, namespace) if redis_url else None
+        self._inflight: Dict[str, "asyncio.Future[CachedValue]"] = {}
+        # Bumped by every invalidation; a load that overlapped one is not stored
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    async def get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: Optional[float] = None,
+        tags: Any = (),
+    ) -> CachedValue:
+        """
+        Return the cached value for key, calling loader on a miss.
+
+        Exceptions raised by the loader (e.g. HTTPException 404) propagate and
+        are not cached.
+
+        Args:
+            key: Cache key (include tenant/device identifiers)
+            loader: Coroutine function returning a JSON-serializable body
+            ttl: Entry lifetime in seconds (defaults to RESPONSE_CACHE_TTL_SECONDS)
+            tags: Invalidation tags, or a callable body -> tags for tags only known after loading
+
+        Returns:
+            CachedValue with the body and its ETag
+        """
+        if not self.enabled:
+            body = await loader()
+            return CachedValue(body=body, etag=compute_etag(body))
+
+        value = self._local.get(key)
+        if value is None and self._redis is not None:
+            value = await self._redis_get(key)
+            if value is not None:
+                self._local.set(key, value, self.local_ttl, self._resolve_tags(tags, value.body))
+        if value is not None:
+            self.hits += 1
+            return value
+
+        self.misses += 1
+        pending = self._inflight.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future: "asyncio.Future[CachedValue]" = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        generation = self._generation
+        try:
+            redis_generation = await self._redis_generation()
+            body = await loader()
+            value = CachedValue(body=body, etag=compute_etag(body))
+            if generation == self._generation:
+                await self._store(key, value, ttl or self.default_ttl, self._resolve_tags(tags, body), redis_generation)
+            future.set_result(value)
+            return value
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Waiters get the exception; mark it retrieved so an unshared failure is not logged
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    async def invalidate_tags(self, *tags: str) -> int:
+        """
+        Drop every entry carrying any of the tags (both levels).
+
+        Call after the write has been committed.
+
+        Returns:
+            Number of entries dropped from the in-process level
+        """
+        self._generation += 1
+        removed = 0
+        for tag in tags:
+            removed += self._local.invalidate(tag)
+            if self._redis is not None:
+                try:
+                    await self._redis.invalidate(tag)
+                except Exception as e:
+                    LOGGER.warning("response_cache_invalidate_failed", extra={"tag": tag, "error": str(e)})
+        if removed:
+            LOGGER.debug("response_cache_invalidated", extra={"tags": list(tags), "entries": removed})
+        return removed
+
+    def clear(self) -> None:
+        """Drop the in-process level (tests, admin tooling)."""
+        self._local.clear()
+
+    async def close(self) -> None:
+        if self._redis is not None:
+            await self._redis.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._local),
+            "hits": self.hits,
+            "misses": self.misses,
+            "redis": self._redis is not None,
+        }
+
+    @staticmethod
+    def _resolve_tags(tags: Any, body: Any) -> List[str]:
+        if callable(tags):
+            tags = tags(body)
+        return [tag for tag in tags if tag]
+
+    async def _redis_get(self, key: str) -> Optional[CachedValue]:
+        try:
+            return await self._redis.get(key)
+        except Exception as e:
+            LOGGER.warning("response_cache_redis_get_failed", extra={"key": key, "error": str(e)})
+            return None
+
+    async def _redis_generation(self) -> Optional[int]:
+        """Shared invalidation generation before a load (None: Redis unavailable, skip storing there)."""
+        if self._redis is None:
+            return None
+        try:
+            return await self._redis.generation()
+        except Exception as e:
+            LOGGER.warning("response_cache_redis_get_failed", extra={"key": "generation", "error": str(e)})
+            return None
+
+    async def _store(self, key: str, value: CachedValue, ttl: float, tags: List[str],
+                     redis_generation: Optional[int] = None) -> None:
+        local_ttl = min(ttl, self.local_ttl) if self._redis is not None else ttl
+        if self._redis is not None and redis_generation is not None:
+            try:
+                if not await self._redis.set(key, value, ttl, tags, redis_generation):
+                    # Invalidated by another worker while loading: the body may be stale
+                    return
+            except Exception as e:
+                LOGGER.warning("response_cache_redis_set_failed", extra={"key": key, "error": str(e)})
+        self._local.set(key, value, local_ttl, tags)
+
+
+_cache_instance: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> ResponseCache:
+    """Get the process-wide response cache (configured from settings)."""
+    global _cache_instance
+    if _cache_instance is None:
+        _cache_instance = ResponseCache(
+            enabled=settings.RESPONSE_CACHE_ENABLED,
+            default_ttl=settings.RESPONSE_CACHE_TTL_SECONDS,
+            max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES,
+            redis_url=settings.RESPONSE_CACHE_REDIS_URL,
+            local_ttl=settings.RESPONSE_CACHE_LOCAL_TTL_SECONDS,
+        )
+    return _cache_instance
+
+
+async def invalidate_tags(*tags: str) -> None:
+    """Invalidate cached responses; never raises (cache problems must not fail writes)."""
+    try:
+        await get_response_cache().invalidate_tags(*tags)
+    except Exception as e:
+        LOGGER.warning("response_cache_invalidate_failed", extra={"tags": list(tags), "error": str(e)})
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # Weak comparison: W/"x" matches "x"
+    candidates = {candidate.strip().removeprefix("W/") for candidate in header.split(",")}
+    return etag.removeprefix("W/") in candidates
+
+
+async def cached_response(
+    request: Request,
+    key: str,
+    loader: Callable[[], Awaitable[Any]],
+    ttl: Optional[float] = None,
+    tags: Any = (),
+) -> Response:
+    """
+    Serve a JSON body through the response cache with ETag / 304 support.
+
+    Clients sending If-None-Match with the current ETag get an empty 304.
+    Responses are marked "private, no-cache" so clients always revalidate
+    (a revalidation is a cache lookup here, not a database query).
+
+    Args:
+        request: Incoming request (for If-None-Match)
+        key: Cache key
+        loader: Coroutine function producing the JSON-serializable body
+        ttl: Entry lifetime in seconds
+        tags: Invalidation tags (or callable body -> tags)
+
+    Returns:
+        JSONResponse, or a 304 Response when the client copy is current
+    """
+    value = await get_response_cache().get_or_load(key, loader, ttl=ttl, tags=tags)
+    return etag_response(request, value)
+
+
+def etag_response(request: Request, value: CachedValue) -> Response:
+    """Build the JSON (or 304 Not Modified) response for a cached value."""
+    headers = {"ETag": value.etag, "Cache-Control": "private, no-cache"}
+    if _etag_matches(request, value.etag):
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(content=value.body, headers=headers)
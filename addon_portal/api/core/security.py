@@ -1,4 +1,6 @@
-import time, jwt
+import time, jwt, hashlib, threading
+from collections import OrderedDict
+from typing import Optional, Tuple
 from .settings import settings
 
 ALGO = "RS256"
@@ -19,5 +21,75 @@ def issue_access_token(tenant_id: int, device_id: int, plan: str, quota: int, su
     }
     return jwt.encode(payload, settings.JWT_PRIVATE_KEY, algorithm=ALGO)
 
+
+class VerifiedTokenCache:
+    """
+    Claims of already-verified access tokens, keyed by SHA-256 of the token.
+
+    Desktop add-ons reuse the same access token for every call until it expires,
+    so the RS256 signature only needs checking once per token. Entries are kept
+    until the token's exp (checked on every hit) and bounded LRU-style.
+    Only successfully verified tokens are cached.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def get(self, token_key: str) -> Optional[Tuple[float, dict]]:
+        with self._lock:
+            entry = self._entries.get(token_key)
+            if entry is not None:
+                self._entries.move_to_end(token_key)
+            return entry
+
+    def put(self, token_key: str, exp: float, claims: dict) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[token_key] = (exp, claims)
+            self._entries.move_to_end(token_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def discard(self, token_key: str) -> None:
+        with self._lock:
+            self._entries.pop(token_key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+verified_tokens = VerifiedTokenCache(settings.JWT_VERIFY_CACHE_MAX_ENTRIES)
+
+
 def verify_access(token: str) -> dict:
-    return jwt.decode(token, settings.JWT_PUBLIC_KEY, audience=settings.JWT_AUDIENCE, algorithms=[ALGO])
+    """
+    Verify an access token and return its claims.
+
+    A token verified before is served from verified_tokens until its exp; expired
+    cached tokens raise jwt.ExpiredSignatureError exactly like a fresh decode.
+    """
+    token_key = VerifiedTokenCache.key(token)
+    entry = verified_tokens.get(token_key)
+    if entry is not None:
+        exp, claims = entry
+        if exp > time.time():
+            return dict(claims)
+        verified_tokens.discard(token_key)
+        raise jwt.ExpiredSignatureError("Signature has expired")
+
+    claims = jwt.decode(token, settings.JWT_PUBLIC_KEY, audience=settings.JWT_AUDIENCE, algorithms=[ALGO])
+    # Tokens without exp never expire on their own; don't pin them in the cache
+    if "exp" in claims:
+        verified_tokens.put(token_key, float(claims["exp"]), dict(claims))
+    return claims
@@ -31,6 +31,30 @@ class Settings(BaseSettings):
     JWT_PUBLIC_KEY: str = "CHANGE_ME_RSA_PUB_PEM"
     JWT_ACCESS_TTL_SECONDS: int = 900  # 15m
     JWT_REFRESH_TTL_SECONDS: int = 60 * 60 * 24 * 14  # 14d
+    JWT_VERIFY_CACHE_MAX_ENTRIES: int = 50000  # Verified access tokens kept until exp (skips RS256 per request)
+    # Seconds between reloads of the revoked-device set from the database (revocations made
+    # in this worker apply immediately; this bounds propagation from other workers)
+    LICENSE_REVOCATION_REFRESH_SECONDS: int = 30
+    # Device heartbeats: last_seen is buffered in memory and written in bulk UPDATEs
+    HEARTBEAT_FLUSH_INTERVAL_SECONDS: int = 15
+    HEARTBEAT_FLUSH_BATCH_SIZE: int = 1000  # Devices per UPDATE statement
+    # Tenant portal sessions: validated sessions are cached per worker for a few seconds
+    # (logout/refresh apply immediately in the same worker) and last_activity is only
+    # written when it moved by at least the granularity
+    SESSION_CACHE_TTL_SECONDS: int = 15
+    SESSION_CACHE_MAX_ENTRIES: int = 10000
+    SESSION_ACTIVITY_GRANULARITY_SECONDS: int = 60
+    # Project downloads: ZIPs are streamed in chunks of this size; set a cache directory
+    # to keep the built archive per output folder state (enables resumable Range requests)
+    PROJECT_ARCHIVE_CHUNK_BYTES: int = 1024 * 1024
+    PROJECT_ARCHIVE_CACHE_DIR: str = ""
+    # Project executions run on warm agent workers (agent_worker.py) that imported the
+    # agent system once; a worker is recycled after AGENT_WORKER_MAX_JOBS jobs or above
+    # AGENT_WORKER_MAX_RSS_MB. 0 workers = always start a fresh main.py subprocess
+    AGENT_WORKER_POOL_SIZE: int = 2
+    AGENT_WORKER_MAX_JOBS: int = 20
+    AGENT_WORKER_MAX_RSS_MB: int = 2048
+    AGENT_WORKER_START_TIMEOUT_SECONDS: int = 120
 
     # Stripe
     STRIPE_SECRET_KEY: str = "sk_test_xxx"
@@ -72,6 +96,32 @@ class Settings(BaseSettings):
     # Default: UTC (no offset)
     TIME_ZONE: str = "UTC"  # Server timezone for date calculations
 
+    # GraphQL Subscriptions
+    # Backend used to fan subscription events out across uvicorn workers:
+    # "memory" (single worker), "redis" (uses GRAPHQL_PUBSUB_REDIS_URL) or "postgres" (LISTEN/NOTIFY on DB_DSN)
+    GRAPHQL_PUBSUB_BACKEND: str = "memory"
+    GRAPHQL_PUBSUB_REDIS_URL: str = "redis://localhost:6379/0"
+    GRAPHQL_PUBSUB_CHANNEL: str = "q2o_graphql_events"
+    GRAPHQL_SUBSCRIBER_QUEUE_SIZE: int = 100  # Pending events per subscriber before it is evicted
+    # systemMetricsStream: seconds between full database recomputes per shared producer
+    # (task changes made through this API process are applied incrementally in between)
+    GRAPHQL_METRICS_FULL_REFRESH_SECONDS: int = 30
+    # systemMetricsStream: seconds between polls for task rows written by other processes
+    # (main.py/agent subprocesses); a changed scope is recomputed on its next snapshot. 0 disables
+    GRAPHQL_METRICS_CHANGE_POLL_SECONDS: float = 5
+
+    # Task statistics rollup (agent_task_stats): seconds between full rebuilds that repair drift
+    TASK_STATS_RECONCILE_INTERVAL_SECONDS: int = 600
+    # Seconds a process buffers global counter deltas before applying them in one UPDATE
+    TASK_STATS_GLOBAL_FLUSH_SECONDS: float = 2
+
+    # Response cache for read-heavy endpoints (license policy, branding, plans, usage)
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_TTL_SECONDS: int = 300  # Upper bound on staleness if an invalidation is missed
+    RESPONSE_CACHE_MAX_ENTRIES: int = 10000  # In-process entries per worker (LRU)
+    RESPONSE_CACHE_REDIS_URL: Optional[str] = None  # e.g. redis://localhost:6379/1 to share across workers
+    RESPONSE_CACHE_LOCAL_TTL_SECONDS: int = 5  # With Redis: max seconds a worker serves its local copy
+
     # LLM System Prompt (managed via LLM Management service, synced to .env)
     LLM_SYSTEM_PROMPT: Optional[str] = None
 
@@ -6,205 +6,397 @@ Implements batch loading and caching to solve the N+1 query problem.
 Example: If you query 100 tasks and each task loads its project,
 without DataLoader = 101 queries (1 for tasks + 100 for projects)
 with DataLoader = 2 queries (1 for tasks + 1 batched for all projects)
+
+Loaders are created per request (see create_dataloaders), so results are cached
+for the duration of one GraphQL operation only.
 """
-import asyncio
-from typing import List, Optional, Dict
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
 from aiodataloader import DataLoader
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
+from sqlalchemy import select, func, and_, case
 from ..core.logging import get_logger
+from ..models.agent_tasks import AgentTask
+from ..models.llm_config import LLMProjectConfig
+from .types import Agent, AgentType, LLMUsage, Project, ProjectStatus, Task, TaskStatus
 
 logger = get_logger(__name__)
 
+ACTIVE_TASK_STATUSES = ('started', 'running')
+
+# Database task status -> GraphQL TaskStatus
+TASK_STATUS_MAP = {
+    'pending': TaskStatus.PENDING,
+    'started': TaskStatus.IN_PROGRESS,
+    'running': TaskStatus.IN_PROGRESS,
+    'completed': TaskStatus.COMPLETED,
+    'failed': TaskStatus.FAILED,
+    'cancelled': TaskStatus.CANCELLED,
+}
+
+# Database project execution_status -> GraphQL ProjectStatus
+PROJECT_STATUS_MAP = {
+    'pending': ProjectStatus.PLANNING,
+    'running': ProjectStatus.IN_PROGRESS,
+    'completed': ProjectStatus.COMPLETED,
+    'failed': ProjectStatus.FAILED,
+    'paused': ProjectStatus.ON_HOLD,
+}
+
+
+# ============================================================================
+# CONVERSION HELPERS (shared by loaders and resolvers)
+# ============================================================================
+
+def _aware(value: Optional[datetime]) -> Optional[datetime]:
+    """Ensure timezone-aware datetimes (SQLite returns naive values)."""
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def to_agent_type(agent_type: Optional[str]) -> AgentType:
+    """Map a database agent_type string to AgentType (unknown types map to CODER)."""
+    try:
+        agent_type_str = agent_type.upper()
+        return AgentType[agent_type_str] if agent_type_str in AgentType.__members__ else AgentType.CODER
+    except (KeyError, AttributeError):
+        return AgentType.CODER
+
+
+def to_graphql_task(db_task: AgentTask) -> Task:
+    """Convert an AgentTask row to a GraphQL Task."""
+    return Task(
+        id=db_task.task_id,
+        project_id=db_task.project_id,
+        agent_type=to_agent_type(db_task.agent_type),
+        title=db_task.task_name,
+        description=db_task.task_description or "",
+        status=TASK_STATUS_MAP.get(db_task.status, TaskStatus.PENDING),
+        priority=db_task.priority,
+        created_at=_aware(db_task.created_at),
+        started_at=_aware(db_task.started_at),
+        completed_at=_aware(db_task.completed_at),
+        error_message=db_task.error_message
+    )
+
+
+def build_agent(stats: Any, current_task_id: Optional[str], agent_id: Optional[str] = None) -> Agent:
+    """
+    Build an Agent from a per-agent-type statistics row.
+
+    Args:
+        stats: Row with agent_type, total_tasks, completed, failed, last_activity
+        current_task_id: Most recent running task for this agent type (if any)
+        agent_id: Override the default "agent-{type}" id
+    """
+    total_tasks = stats.total_tasks or 0
+    completed = stats.completed or 0
+    failed = stats.failed or 0
+
+    # Health score = success rate over all tasks of this agent type
+    health_score = (completed / total_tasks) * 100.0 if total_tasks > 0 else 0.0
+
+    return Agent(
+        id=agent_id or f"agent-{stats.agent_type}",
+        type=to_agent_type(stats.agent_type),
+        name=f"{stats.agent_type.title()} Agent",
+        status="active" if current_task_id else "idle",
+        health_score=health_score,
+        tasks_completed=completed,
+        tasks_failed=failed,
+        current_task_id=current_task_id,
+        last_activity=_aware(stats.last_activity) or datetime.now(timezone.utc)
+    )
+
+
+def agent_stats_query(agent_types: Optional[Iterable[str]] = None):
+    """Grouped per-agent-type statistics (one row per agent type)."""
+    stmt = select(
+        AgentTask.agent_type,
+        func.count(AgentTask.id).label('total_tasks'),
+        func.sum(case((AgentTask.status == 'completed', 1), else_=0)).label('completed'),
+        func.sum(case((AgentTask.status == 'failed', 1), else_=0)).label('failed'),
+        # AgentTask has no updated_at: the latest timestamp a task reached is its last activity
+        func.max(func.coalesce(AgentTask.completed_at, AgentTask.started_at, AgentTask.created_at)).label('last_activity')
+    ).group_by(AgentTask.agent_type)
+    if agent_types is not None:
+        stmt = stmt.where(AgentTask.agent_type.in_(list(agent_types)))
+    return stmt
+
+
+def build_project(
+    db_project: LLMProjectConfig,
+    task_stats: Dict[str, Any],
+    agents: Optional[List[Agent]] = None,
+    estimated_time_remaining: Optional[int] = None
+) -> Project:
+    """
+    Build a Project from its config row and current-run task statistics.
+
+    Args:
+        db_project: LLMProjectConfig row
+        task_stats: Output of get_projects_progress (via TaskStatsByProjectLoader)
+        agents: Optional agent list (only the single-project query computes these)
+        estimated_time_remaining: Optional ETA in seconds
+    """
+    total_tasks = task_stats["total_tasks"]
+    completion_percentage = task_stats["completion_percentage"]
+
+    # If no tasks exist yet, use status-based fallback
+    if total_tasks == 0:
+        if db_project.execution_status == 'completed':
+            completion_percentage = 100.0
+        elif db_project.execution_status == 'running':
+            completion_percentage = 5.0  # Just started, minimal progress
+        else:
+            completion_percentage = 0.0
+    else:
+        # Round completion percentage to whole number for clean display
+        completion_percentage = round(completion_percentage)
+
+    created_at = _aware(db_project.created_at) or datetime.now(timezone.utc)
+    return Project(
+        id=db_project.project_id,
+        name=db_project.client_name or "Unnamed Project",
+        objective=db_project.custom_instructions or db_project.description or "",
+        status=PROJECT_STATUS_MAP.get(db_project.execution_status, ProjectStatus.PLANNING),
+        created_at=created_at,
+        updated_at=_aware(db_project.updated_at) or created_at,
+        completion_percentage=completion_percentage,
+        total_tasks=total_tasks,
+        completed_tasks=task_stats["completed_tasks"],
+        failed_tasks=task_stats["failed_tasks"],
+        agents=agents or [],
+        estimated_time_remaining_seconds=estimated_time_remaining
+    )
+
+
+# ============================================================================
+# LOADERS
+# ============================================================================
+
+class TaskStatsByProjectLoader(DataLoader):
+    """
+    Batch load current-run task statistics by project ID.
+
+    One query reads every requested project's agent_task_stats rollup row
+    (see task_stats_service), instead of loading each project's task rows.
+    """
+
+    def __init__(self, db: AsyncSession):
+        super().__init__()
+        self.db = db
+
+    async def batch_load_fn(self, project_ids: List[str]) -> List[Dict[str, Any]]:
+        from ..services.task_stats_service import get_projects_progress
+
+        logger.debug(f"DataLoader: Batching task statistics for {len(project_ids)} projects into 1 query")
+
+        progress = await get_projects_progress(self.db, project_ids)
+        return [progress[project_id] for project_id in project_ids]
+
 
 class ProjectLoader(DataLoader):
     """
     Batch load projects by ID
-    
+
     Instead of N queries for N tasks, this batches all project IDs
-    and loads them in a single query.
+    and loads them in a single query (plus one batched statistics query).
     """
-    
-    def __init__(self, db: AsyncSession):
+
+    def __init__(self, db: AsyncSession, stats_loader: TaskStatsByProjectLoader):
         super().__init__()
         self.db = db
-    
-    async def batch_load_fn(self, project_ids: List[str]) -> List[Optional[Dict]]:
+        self.stats_loader = stats_loader
+
+    async def batch_load_fn(self, project_ids: List[str]) -> List[Optional[Project]]:
         """
         Load multiple projects in a single query
-        
+
         Args:
             project_ids: List of project IDs to load
-        
+
         Returns:
             List of projects in the same order as input IDs
         """
         logger.debug(f"DataLoader: Batching {len(project_ids)} project queries into 1")
-        
-        # In production, query from database:
-        # result = await self.db.execute(
-        #     select(Project).where(Project.id.in_(project_ids))
-        # )
-        # projects = result.scalars().all()
-        
-        # For now, return mock data
-        from .types import Project, ProjectStatus
-        from datetime import datetime, timedelta
-        
-        projects_dict = {
-            pid: Project(
-                id=pid,
-                name=f"Project {pid}",
-                objective=f"Objective for {pid}",
-                status=ProjectStatus.IN_PROGRESS,
-                created_at=datetime.utcnow() - timedelta(days=1),
-                updated_at=datetime.utcnow(),
-                completion_percentage=75.0,
-                total_tasks=20,
-                completed_tasks=15,
-                failed_tasks=0
-            )
-            for pid in project_ids
+
+        result = await self.db.execute(
+            select(LLMProjectConfig).where(LLMProjectConfig.project_id.in_(project_ids))
+        )
+        configs = {config.project_id: config for config in result.scalars().all()}
+        stats = await self.stats_loader.load_many(list(configs.keys()))
+        projects = {
+            project_id: build_project(config, project_stats)
+            for (project_id, config), project_stats in zip(configs.items(), stats)
         }
-        
+
         # Return in same order as input (DataLoader requirement)
-        return [projects_dict.get(pid) for pid in project_ids]
+        return [projects.get(pid) for pid in project_ids]
+
+
+class CurrentTaskByAgentTypeLoader(DataLoader):
+    """Batch load the most recently started running task ID per agent type."""
+
+    def __init__(self, db: AsyncSession):
+        super().__init__()
+        self.db = db
+
+    async def batch_load_fn(self, agent_types: List[str]) -> List[Optional[str]]:
+        logger.debug(f"DataLoader: Batching current task lookups for {len(agent_types)} agent types into 1")
+
+        result = await self.db.execute(
+            select(AgentTask.agent_type, AgentTask.task_id)
+            .where(
+                and_(
+                    AgentTask.agent_type.in_(agent_types),
+                    AgentTask.status.in_(ACTIVE_TASK_STATUSES)
+                )
+            )
+            .order_by(AgentTask.started_at.desc())
+        )
+        current: Dict[str, str] = {}
+        for row in result.all():
+            # Rows are newest first; keep the first one per agent type
+            current.setdefault(row.agent_type, row.task_id)
+        return [current.get(agent_type) for agent_type in agent_types]
 
 
 class AgentLoader(DataLoader):
     """
-    Batch load agents by type
+    Batch load agents by type (AgentType or database agent_type string)
     """
-    
-    def __init__(self, db: AsyncSession):
+
+    def __init__(self, db: AsyncSession, current_task_loader: CurrentTaskByAgentTypeLoader):
         super().__init__()
         self.db = db
-    
-    async def batch_load_fn(self, agent_types: List[str]) -> List[Optional[Dict]]:
+        self.current_task_loader = current_task_loader
+
+    async def batch_load_fn(self, agent_types: List[Union[AgentType, str]]) -> List[Optional[Agent]]:
         """
-        Load multiple agents in a single query
+        Load multiple agents in a single statistics query
         """
         logger.debug(f"DataLoader: Batching {len(agent_types)} agent queries into 1")
-        
-        # In production, query from agent_activity table
-        from .types import Agent, AgentType
-        from datetime import datetime
-        
-        agents_dict = {
-            agent_type: Agent(
-                id=f"agent-{agent_type}",
-                type=AgentType[agent_type],
-                name=f"{agent_type} Agent",
-                status="active",
-                health_score=0.95,
-                tasks_completed=100,
-                tasks_failed=5,
-                current_task_id=None,
-                last_activity=datetime.utcnow()
-            )
-            for agent_type in agent_types
-        }
-        
-        return [agents_dict.get(at) for at in agent_types]
+
+        keys = [a.name.lower() if isinstance(a, AgentType) else str(a) for a in agent_types]
+        result = await self.db.execute(agent_stats_query(set(keys)))
+        stats_by_type = {row.agent_type: row for row in result.all()}
+        found = list(stats_by_type.keys())
+        current_tasks = dict(zip(found, await self.current_task_loader.load_many(found)))
+
+        return [
+            build_agent(stats_by_type[key], current_tasks.get(key)) if key in stats_by_type else None
+            for key in keys
+        ]
 
 
 class TasksByProjectLoader(DataLoader):
     """
-    Batch load tasks by project ID
-    
-    Used when querying: project.tasks
+    Batch load tasks by (project_id, status, limit)
+
+    Used when querying: project.tasks(status:, limit:)
+    Keys sharing the same status/limit are loaded with one windowed query,
+    so the limit applies per project.
     """
-    
+
     def __init__(self, db: AsyncSession):
         super().__init__()
         self.db = db
-    
-    async def batch_load_fn(self, project_ids: List[str]) -> List[List[Dict]]:
+
+    async def batch_load_fn(self, keys: List[Tuple[str, Optional[TaskStatus], int]]) -> List[List[Task]]:
         """
-        Load tasks for multiple projects in a single query
-        
+        Load tasks for multiple projects
+
         Returns:
-            List of task lists (one list per project)
+            List of task lists (one list per key)
         """
-        logger.debug(f"DataLoader: Batching tasks for {len(project_ids)} projects into 1 query")
-        
-        # Query REAL tasks from database
-        from ..models.agent_tasks import AgentTask
-        from .types import Task, TaskStatus, AgentType
-        from collections import defaultdict
-        from datetime import timezone
-        
+        logger.debug(f"DataLoader: Batching tasks for {len(keys)} projects")
+
+        groups: Dict[Tuple[Optional[TaskStatus], int], List[str]] = defaultdict(list)
+        for project_id, status, limit in keys:
+            groups[(status, limit)].append(project_id)
+
+        loaded: Dict[Tuple[str, Optional[TaskStatus], int], List[Task]] = {}
+        for (status, limit), project_ids in groups.items():
+            tasks_by_project = await self._load_group(project_ids, status, limit)
+            for project_id in project_ids:
+                loaded[(project_id, status, limit)] = tasks_by_project.get(project_id, [])
+
+        # Return in same order as input (empty list if no tasks)
+        return [loaded.get(key, []) for key in keys]
+
+    async def _load_group(self, project_ids: List[str], status: Optional[TaskStatus], limit: int) -> Dict[str, List[Task]]:
+        conditions = [AgentTask.project_id.in_(project_ids)]
+        order_by = AgentTask.created_at.desc()
+        if status == TaskStatus.COMPLETED:
+            # For completed tasks: only tasks with completed_at set, oldest first (timeline order)
+            conditions += [AgentTask.status == 'completed', AgentTask.completed_at.isnot(None)]
+            order_by = AgentTask.completed_at.asc()
+        elif status == TaskStatus.IN_PROGRESS:
+            conditions.append(AgentTask.status.in_(ACTIVE_TASK_STATUSES))
+        elif status is not None:
+            conditions.append(AgentTask.status == status.value)
+
+        row_number = func.row_number().over(partition_by=AgentTask.project_id, order_by=order_by).label('row_number')
+        ranked = select(AgentTask.id, row_number).where(and_(*conditions)).subquery()
         result = await self.db.execute(
-            select(AgentTask).where(AgentTask.project_id.in_(project_ids))
-            .order_by(AgentTask.created_at.desc())
+            select(AgentTask)
+            .join(ranked, ranked.c.id == AgentTask.id)
+            .where(ranked.c.row_number <= limit)
+            .order_by(AgentTask.project_id, ranked.c.row_number)
         )
-        db_tasks = result.scalars().all()
-        
-        # Group by project_id and convert to GraphQL Task objects
-        tasks_by_project = defaultdict(list)
-        for db_task in db_tasks:
-            # Map agent_type to AgentType enum
-            try:
-                agent_type_str = db_task.agent_type.upper()
-                agent_type = AgentType[agent_type_str] if agent_type_str in [e.name for e in AgentType] else AgentType.CODER
-            except (KeyError, AttributeError):
-                agent_type = AgentType.CODER
-            
-            # Map status
-            status_map = {
-                'pending': TaskStatus.PENDING,
-                'started': TaskStatus.IN_PROGRESS,
-                'running': TaskStatus.IN_PROGRESS,
-                'completed': TaskStatus.COMPLETED,
-                'failed': TaskStatus.FAILED,
-                'cancelled': TaskStatus.CANCELLED,
-            }
-            task_status = status_map.get(db_task.status, TaskStatus.PENDING)
-            
-            # Ensure timezone-aware datetimes
-            created_at = db_task.created_at
-            if created_at and created_at.tzinfo is None:
-                created_at = created_at.replace(tzinfo=timezone.utc)
-            
-            started_at = db_task.started_at
-            if started_at and started_at.tzinfo is None:
-                started_at = started_at.replace(tzinfo=timezone.utc)
-            
-            completed_at = db_task.completed_at
-            if completed_at and completed_at.tzinfo is None:
-                completed_at = completed_at.replace(tzinfo=timezone.utc)
-            
-            task = Task(
-                id=db_task.task_id,
-                project_id=db_task.project_id,
-                agent_type=agent_type,
-                title=db_task.task_name,
-                description=db_task.task_description or "",
-                status=task_status,
-                priority=db_task.priority,
-                created_at=created_at,
-                started_at=started_at,
-                completed_at=completed_at,
-                error_message=db_task.error_message
+
+        tasks_by_project: Dict[str, List[Task]] = defaultdict(list)
+        for db_task in result.scalars().all():
+            tasks_by_project[db_task.project_id].append(to_graphql_task(db_task))
+        return tasks_by_project
+
+
+class LLMUsageByProjectLoader(DataLoader):
+    """Batch load total LLM usage (calls, tokens, cost) per project."""
+
+    def __init__(self, db: AsyncSession):
+        super().__init__()
+        self.db = db
+
+    async def batch_load_fn(self, project_ids: List[str]) -> List[LLMUsage]:
+        logger.debug(f"DataLoader: Batching LLM usage for {len(project_ids)} projects into 1 query")
+
+        result = await self.db.execute(
+            select(
+                AgentTask.project_id,
+                func.coalesce(func.sum(AgentTask.llm_calls_count), 0).label('calls'),
+                func.coalesce(func.sum(AgentTask.llm_tokens_used), 0).label('tokens'),
+                func.coalesce(func.sum(AgentTask.llm_cost_usd), 0.0).label('cost')
             )
-            
-            tasks_by_project[db_task.project_id].append(task)
-        
-        # Return in same order as input (empty list if no tasks)
-        return [tasks_by_project.get(pid, []) for pid in project_ids]
+            .where(AgentTask.project_id.in_(project_ids))
+            .group_by(AgentTask.project_id)
+        )
+        usage = {
+            row.project_id: LLMUsage(calls=int(row.calls), tokens=int(row.tokens), cost_usd=float(row.cost))
+            for row in result.all()
+        }
+        return [usage.get(pid) or LLMUsage(calls=0, tokens=0, cost_usd=0.0) for pid in project_ids]
 
 
 def create_dataloaders(db: AsyncSession) -> Dict[str, DataLoader]:
     """
     Create all DataLoaders for a GraphQL request context
-    
+
     These are created per-request to ensure proper caching scope.
-    
+
     Uses async Session for optimal performance in SaaS platform.
     """
+    task_stats_loader = TaskStatsByProjectLoader(db)
+    current_task_loader = CurrentTaskByAgentTypeLoader(db)
     return {
-        "project_loader": ProjectLoader(db),
-        "agent_loader": AgentLoader(db),
+        "project_loader": ProjectLoader(db, task_stats_loader),
+        "agent_loader": AgentLoader(db, current_task_loader),
         "tasks_by_project_loader": TasksByProjectLoader(db),
+        "task_stats_loader": task_stats_loader,
+        "current_task_loader": current_task_loader,
+        "llm_usage_loader": LLMUsageByProjectLoader(db),
     }
-
@@ -0,0 +1,371 @@
+"""
+Shared System Metrics Producer - One snapshot loop per (scope, interval).
+
+Previously every open system_metrics_stream subscription ran its own set of
+aggregate AgentTask queries every interval, so N dashboards meant N x identical
+database load. Now subscriptions with the same tenant/project scope and interval
+share one MetricsProducer:
+
+- A full recompute (single grouped query) runs at most every
+  GRAPHQL_METRICS_FULL_REFRESH_SECONDS.
+- Between recomputes, task creations/status changes made through
+  agent_task_service in this process are applied to the in-memory counters.
+- Task rows are mostly written by main.py/agent subprocesses, which this
+  process never hears about. Every GRAPHQL_METRICS_CHANGE_POLL_SECONDS the
+  registry asks the database which tenant/project scopes have task rows
+  created, started, completed or failed since its last poll, and marks the
+  matching producers for a recompute on their next snapshot.
+- Every interval the producer publishes one snapshot through the subscription
+  hub to all subscribers of its scope, and stops when the last one leaves.
+"""
+import time
+import asyncio
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import select, func, and_, or_, case
+
+from .pubsub import get_subscription_hub
+from .types import SystemMetrics
+from ..core.db import AsyncSessionLocal
+from ..core.logging import get_logger
+from ..core.settings import settings
+from ..models.agent_tasks import AgentTask
+
+logger = get_logger(__name__)
+
+METRICS_TOPIC = "system_metrics"
+ACTIVE_STATUSES = ("started", "running")
+
+ScopeKey = Tuple[Optional[int], Optional[str], int]
+
+# Timestamps written on every task creation/status transition (agent_task_service)
+CHANGE_COLUMNS = (AgentTask.created_at, AgentTask.started_at, AgentTask.completed_at, AgentTask.failed_at)
+
+
+def _empty_metrics() -> SystemMetrics:
+    """Metrics reported when the database cannot be read."""
+    return SystemMetrics(
+        timestamp=datetime.now(timezone.utc),
+        active_agents=0,
+        active_tasks=0,
+        tasks_completed_today=0,
+        tasks_failed_today=0,
+        average_task_duration_seconds=0.0,
+        system_health_score=0.0,
+        cpu_usage_percent=0.0,
+        memory_usage_percent=0.0
+    )
+
+
+def _as_utc(value: datetime) -> datetime:
+    """SQLite returns naive datetimes; treat them as UTC."""
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+def _sample_resources() -> Tuple[float, float]:
+    """CPU and memory usage (blocking ~0.1s, run in a thread)."""
+    try:
+        import psutil
+        return psutil.cpu_percent(interval=0.1), psutil.virtual_memory().percent
+    except Exception:
+        return 0.0, 0.0
+
+
+class MetricsProducer:
+    """Computes metrics for one scope and broadcasts them to its subscribers."""
+
+    def __init__(self, tenant_id: Optional[int], project_id: Optional[str], interval_seconds: int,
+                 full_refresh_seconds: int):
+        self.tenant_id = tenant_id
+        self.project_id = project_id
+        self.interval_seconds = interval_seconds
+        self.full_refresh_seconds = full_refresh_seconds
+        self.key: ScopeKey = (tenant_id, project_id, interval_seconds)
+        self.scope = f"{tenant_id}:{project_id}:{interval_seconds}"
+        self.subscribers = 0
+        self.latest: Optional[SystemMetrics] = None
+        self.stats = {"full_recomputes": 0, "incremental_updates": 0, "external_changes": 0, "snapshots": 0}
+
+        # (status, agent_type) -> task count, plus running sums for the average duration
+        self._counts: Counter = Counter()
+        self._duration_sum = 0.0
+        self._duration_count = 0
+        self._loaded = False
+        self._stale = False
+        self._last_full = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    def matches(self, tenant_id: Optional[int], project_id: Optional[str]) -> bool:
+        """Whether a task in tenant/project falls inside this producer's scope."""
+        if self.tenant_id and tenant_id != self.tenant_id:
+            return False
+        if self.project_id and project_id != self.project_id:
+            return False
+        return True
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        hub = get_subscription_hub()
+        while True:
+            try:
+                snapshot = await self.snapshot()
+            except Exception as e:
+                logger.error(f"Error computing system metrics for scope {self.scope}: {e}", exc_info=True)
+                snapshot = self.latest or _empty_metrics()
+            self.latest = snapshot
+            self.stats["snapshots"] += 1
+            await hub.publish(METRICS_TOPIC, snapshot, relay=False, scope=self.scope)
+            await asyncio.sleep(self.interval_seconds)
+
+    async def snapshot(self) -> SystemMetrics:
+        """Build a snapshot, recomputing from the database only when due."""
+        if (not self._loaded or self._stale
+                or time.monotonic() - self._last_full >= self.full_refresh_seconds):
+            await self.recompute()
+        cpu_usage_percent, memory_usage_percent = await asyncio.to_thread(_sample_resources)
+        return self._build(cpu_usage_percent, memory_usage_percent)
+
+    async def recompute(self):
+        """Reload all counters with one grouped aggregate query."""
+        query_filters = []
+        if self.tenant_id:
+            query_filters.append(AgentTask.tenant_id == self.tenant_id)
+        if self.project_id:
+            query_filters.append(AgentTask.project_id == self.project_id)
+
+        has_duration = and_(AgentTask.status == 'completed', AgentTask.actual_duration_seconds.isnot(None))
+        query = select(
+            AgentTask.status,
+            AgentTask.agent_type,
+            func.count(AgentTask.id).label('tasks'),
+            func.sum(case((has_duration, AgentTask.actual_duration_seconds), else_=0)).label('duration_sum'),
+            func.sum(case((has_duration, 1), else_=0)).label('duration_count'),
+        ).group_by(AgentTask.status, AgentTask.agent_type)
+        if query_filters:
+            query = query.where(and_(*query_filters))
+
+        # Short-lived session per recompute so the subscription never pins a connection
+        db = AsyncSessionLocal()
+        try:
+            rows = (await db.execute(query)).all()
+        except Exception:
+            try:
+                await db.rollback()
+            except Exception as rollback_error:
+                logger.warning(f"Error rolling back metrics transaction: {rollback_error}")
+            raise
+        finally:
+            try:
+                await db.close()
+            except Exception as close_error:
+                logger.warning(f"Error closing metrics database session: {close_error}")
+
+        counts: Counter = Counter()
+        duration_sum = 0.0
+        duration_count = 0
+        for row in rows:
+            counts[(row.status, row.agent_type)] += row.tasks or 0
+            duration_sum += float(row.duration_sum or 0)
+            duration_count += int(row.duration_count or 0)
+
+        self._counts = counts
+        self._duration_sum = duration_sum
+        self._duration_count = duration_count
+        self._loaded = True
+        self._stale = False
+        self._last_full = time.monotonic()
+        self.stats["full_recomputes"] += 1
+
+    def invalidate(self):
+        """Another process changed tasks in this scope: recompute on the next snapshot."""
+        self._stale = True
+        self.stats["external_changes"] += 1
+
+    def apply_status_change(self, task: AgentTask, old_status: Optional[str]):
+        """Apply a task creation/status change to the in-memory counters."""
+        if not self._loaded or old_status == task.status:
+            return
+        if old_status is not None:
+            key = (old_status, task.agent_type)
+            if self._counts[key] > 0:
+                self._counts[key] -= 1
+        self._counts[(task.status, task.agent_type)] += 1
+        if task.status == 'completed' and task.actual_duration_seconds is not None:
+            self._duration_sum += task.actual_duration_seconds
+            self._duration_count += 1
+        self.stats["incremental_updates"] += 1
+
+    def _build(self, cpu_usage_percent: float, memory_usage_percent: float) -> SystemMetrics:
+        active_agent_types = {agent for (status, agent), n in self._counts.items() if status in ACTIVE_STATUSES and n > 0}
+        active_tasks = sum(n for (status, _), n in self._counts.items() if status in ACTIVE_STATUSES)
+        completed = sum(n for (status, _), n in self._counts.items() if status == 'completed')
+        failed = sum(n for (status, _), n in self._counts.items() if status == 'failed')
+
+        # Success Rate = Completed / (Completed + Failed) * 100%; no finished tasks = healthy
+        finished_tasks = completed + failed
+        if finished_tasks > 0:
+            system_health_score = max(0.0, min(100.0, (completed / finished_tasks) * 100.0))
+        else:
+            system_health_score = 100.0
+
+        avg_duration = self._duration_sum / self._duration_count if self._duration_count else 0.0
+
+        return SystemMetrics(
+            timestamp=datetime.now(timezone.utc),
+            active_agents=len(active_agent_types),
+            active_tasks=active_tasks,
+            tasks_completed_today=completed,
+            tasks_failed_today=failed,
+            average_task_duration_seconds=float(avg_duration),
+            system_health_score=system_health_score,
+            cpu_usage_percent=cpu_usage_percent,
+            memory_usage_percent=memory_usage_percent
+        )
+
+
+class MetricsProducerRegistry:
+    """Creates, shares and retires MetricsProducers by scope."""
+
+    def __init__(self, full_refresh_seconds: int = 30, change_poll_seconds: float = 0):
+        """
+        Args:
+            full_refresh_seconds: Seconds between unconditional recomputes per producer
+            change_poll_seconds: Seconds between database polls for task changes made by
+                other processes (0 disables polling)
+        """
+        self.full_refresh_seconds = full_refresh_seconds
+        self.change_poll_seconds = change_poll_seconds
+        self._producers: Dict[ScopeKey, MetricsProducer] = {}
+        self._listening = False
+        self._poll_task: Optional[asyncio.Task] = None
+
+    def acquire(self, tenant_id: Optional[int], project_id: Optional[str], interval_seconds: int) -> MetricsProducer:
+        """Get (and start, if new) the producer for a scope; pair with release()."""
+        interval_seconds = max(1, int(interval_seconds))
+        key = (tenant_id, project_id, interval_seconds)
+        producer = self._producers.get(key)
+        if producer is None:
+            producer = MetricsProducer(tenant_id, project_id, interval_seconds, self.full_refresh_seconds)
+            self._producers[key] = producer
+            logger.info(f"Started shared metrics producer for scope {producer.scope}")
+        producer.subscribers += 1
+        producer.start()
+        self._ensure_listener()
+        self._ensure_change_poll()
+        return producer
+
+    async def release(self, producer: MetricsProducer):
+        """Drop a subscriber; stops the producer when it has none left."""
+        producer.subscribers -= 1
+        if producer.subscribers > 0:
+            return
+        if self._producers.get(producer.key) is producer:
+            del self._producers[producer.key]
+        await producer.stop()
+        logger.info(f"Stopped shared metrics producer for scope {producer.scope}")
+        if not self._producers:
+            await self._stop_change_poll()
+
+    async def close(self):
+        for producer in list(self._producers.values()):
+            await producer.stop()
+        self._producers.clear()
+        await self._stop_change_poll()
+
+    def _ensure_change_poll(self):
+        if self.change_poll_seconds <= 0 or (self._poll_task is not None and not self._poll_task.done()):
+            return
+        self._poll_task = asyncio.create_task(self._poll_changes())
+
+    async def _stop_change_poll(self):
+        if self._poll_task is not None:
+            self._poll_task.cancel()
+            try:
+                await self._poll_task
+            except asyncio.CancelledError:
+                pass
+            self._poll_task = None
+
+    async def _poll_changes(self):
+        # Producers recompute when they start, so only later changes matter
+        since = datetime.now(timezone.utc)
+        while True:
+            await asyncio.sleep(self.change_poll_seconds)
+            try:
+                since = await self.poll_changes(since)
+            except Exception as e:
+                logger.warning(f"Metrics change poll failed: {e}")
+
+    async def poll_changes(self, since: datetime) -> datetime:
+        """
+        Invalidate producers whose scope has task rows changed after `since`.
+
+        Returns:
+            The newest change timestamp seen (the next poll's `since`)
+        """
+        query = select(
+            AgentTask.tenant_id,
+            AgentTask.project_id,
+            *(func.max(column) for column in CHANGE_COLUMNS),
+        ).where(or_(*(column > since for column in CHANGE_COLUMNS))).group_by(
+            AgentTask.tenant_id, AgentTask.project_id
+        )
+
+        db = AsyncSessionLocal()
+        try:
+            rows = (await db.execute(query)).all()
+        finally:
+            await db.close()
+
+        invalidated = set()
+        for row in rows:
+            tenant_id, project_id, *timestamps = row
+            for producer in self._producers.values():
+                if producer.key not in invalidated and producer.matches(tenant_id, project_id):
+                    producer.invalidate()
+                    invalidated.add(producer.key)
+            for value in timestamps:
+                if value is not None:
+                    since = max(since, _as_utc(value))
+        return since
+
+    def _ensure_listener(self):
+        if self._listening:
+            return
+        from ..services.agent_task_service import add_task_status_listener
+        add_task_status_listener(self.on_task_status)
+        self._listening = True
+
+    def on_task_status(self, task: AgentTask, old_status: Optional[str]):
+        """agent_task_service listener: feed the change to every matching producer."""
+        for producer in self._producers.values():
+            if producer.matches(task.tenant_id, task.project_id):
+                producer.apply_status_change(task, old_status)
+
+
+_registry_instance: Optional[MetricsProducerRegistry] = None
+
+
+def get_metrics_registry() -> MetricsProducerRegistry:
+    """Get or create the process-wide MetricsProducerRegistry."""
+    global _registry_instance
+    if _registry_instance is None:
+        _registry_instance = MetricsProducerRegistry(
+            full_refresh_seconds=settings.GRAPHQL_METRICS_FULL_REFRESH_SECONDS,
+            change_poll_seconds=settings.GRAPHQL_METRICS_CHANGE_POLL_SECONDS
+        )
+    return _registry_instance
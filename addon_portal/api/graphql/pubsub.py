@@ -0,0 +1,423 @@
+"""
+GraphQL Subscription Hub - Topic-based fan-out for real-time subscriptions.
+
+Every subscriber gets its own bounded asyncio.Queue, so each published event
+reaches every open dashboard (instead of whichever subscription happened to
+call get() first on a shared queue). Filters such as project_id / agent_type
+are evaluated when the event is published, so subscribers only wake up for
+events they will actually yield.
+
+Subscribers that fall too far behind (queue full) are evicted: their stream
+ends and the client reconnects, instead of one slow browser holding memory
+or back-pressuring publishers.
+
+Backends (GRAPHQL_PUBSUB_BACKEND):
+- memory:   single process (default)
+- redis:    Redis PUBLISH/SUBSCRIBE, for multi-worker uvicorn
+- postgres: PostgreSQL LISTEN/NOTIFY on the main database, for multi-worker uvicorn
+
+Usage:
+    hub = get_subscription_hub()
+    await hub.publish("task_updated", task, project_id=task.project_id)
+
+    async with hub.subscribe("task_updated", project_id="project-1") as subscriber:
+        async for event in subscriber:
+            yield event.payload
+"""
+import json
+import uuid
+import asyncio
+import dataclasses
+from datetime import datetime
+from enum import Enum
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, Optional, Set, Union
+
+from ..core.logging import get_logger
+from ..core.settings import settings
+
+logger = get_logger(__name__)
+
+# PostgreSQL rejects NOTIFY payloads of 8000 bytes or more
+POSTGRES_NOTIFY_MAX_BYTES = 7900
+
+
+@dataclasses.dataclass
+class HubEvent:
+    """An event delivered to subscribers."""
+    topic: str
+    payload: Any
+    attributes: Dict[str, str]
+
+
+# Queue sentinel that ends an evicted subscriber's stream
+_EVICTED = object()
+
+
+class Subscriber:
+    """A single subscription: topics, attribute filters and a bounded queue."""
+
+    def __init__(self, hub: "SubscriptionHub", topics: Set[str], filters: Dict[str, str], max_queue: int):
+        self.hub = hub
+        self.topics = topics
+        self.filters = filters
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self.evicted = False
+
+    def matches(self, attributes: Dict[str, str]) -> bool:
+        """Check server-side filters (a missing attribute never matches a filter)."""
+        return all(attributes.get(key) == value for key, value in self.filters.items())
+
+    def offer(self, event: HubEvent) -> bool:
+        """Enqueue without blocking; returns False if the subscriber is full."""
+        try:
+            self.queue.put_nowait(event)
+            return True
+        except asyncio.QueueFull:
+            return False
+
+    def evict(self):
+        """Drop pending events and wake the consumer so its stream ends."""
+        self.evicted = True
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(_EVICTED)
+
+    def __aiter__(self) -> AsyncIterator[HubEvent]:
+        return self
+
+    async def __anext__(self) -> HubEvent:
+        item = await self.queue.get()
+        if item is _EVICTED:
+            raise StopAsyncIteration
+        return item
+
+    async def __aenter__(self) -> "Subscriber":
+        await self.hub.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.hub.unsubscribe(self)
+
+
+# ============================================================================
+# PAYLOAD CODEC (cross-worker backends only)
+# ============================================================================
+
+def encode_payload(value: Any) -> Any:
+    """Convert Strawberry types/enums/datetimes into tagged JSON-safe values."""
+    if isinstance(value, Enum):
+        return {"__enum__": type(value).__name__, "value": value.value}
+    if isinstance(value, datetime):
+        return {"__datetime__": value.isoformat()}
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        fields = {
+            field.name: encode_payload(getattr(value, field.name))
+            for field in dataclasses.fields(value)
+            if field.init
+        }
+        return {"__type__": type(value).__name__, "fields": fields}
+    if isinstance(value, (list, tuple)):
+        return [encode_payload(item) for item in value]
+    if isinstance(value, dict):
+        return {key: encode_payload(item) for key, item in value.items()}
+    return value
+
+
+def decode_payload(value: Any, registry: Dict[str, type]) -> Any:
+    """Inverse of encode_payload using the hub's registered types."""
+    if isinstance(value, list):
+        return [decode_payload(item, registry) for item in value]
+    if not isinstance(value, dict):
+        return value
+    if "__datetime__" in value:
+        return datetime.fromisoformat(value["__datetime__"])
+    if "__enum__" in value:
+        enum_cls = registry.get(value["__enum__"])
+        return enum_cls(value["value"]) if enum_cls else value["value"]
+    if "__type__" in value:
+        fields = {key: decode_payload(item, registry) for key, item in value["fields"].items()}
+        cls = registry.get(value["__type__"])
+        return cls(**fields) if cls else fields
+    return {key: decode_payload(item, registry) for key, item in value.items()}
+
+
+# ============================================================================
+# CROSS-WORKER BACKENDS
+# ============================================================================
+
+MessageHandler = Callable[[str], Awaitable[None]]
+
+
+class RedisPubSubBackend:
+    """Relays hub events between workers through Redis PUBLISH/SUBSCRIBE."""
+
+    def __init__(self, url: str, channel: str):
+        self.url = url
+        self.channel = channel
+        self._client = None
+        self._pubsub = None
+        self._listener: Optional[asyncio.Task] = None
+
+    async def start(self, on_message: MessageHandler):
+        try:
+            import redis.asyncio as aioredis
+        except ImportError:
+            raise RuntimeError("redis package not installed. Install with: pip install redis")
+
+        self._client = aioredis.from_url(self.url, decode_responses=True)
+        self._pubsub = self._client.pubsub()
+        await self._pubsub.subscribe(self.channel)
+        self._listener = asyncio.create_task(self._listen(on_message))
+        logger.info(f"[OK] GraphQL subscription hub relaying via Redis channel '{self.channel}'")
+
+    async def _listen(self, on_message: MessageHandler):
+        async for message in self._pubsub.listen():
+            if message.get("type") == "message":
+                await on_message(message["data"])
+
+    async def publish(self, message: str):
+        await self._client.publish(self.channel, message)
+
+    async def close(self):
+        if self._listener:
+            self._listener.cancel()
+        if self._pubsub:
+            await self._pubsub.close()
+        if self._client:
+            await self._client.close()
+
+
+class PostgresNotifyBackend:
+    """Relays hub events between workers through PostgreSQL LISTEN/NOTIFY."""
+
+    def __init__(self, dsn: str, channel: str):
+        # SQLAlchemy dialect prefix is not understood by psycopg directly
+        self.dsn = dsn.replace("postgresql+psycopg://", "postgresql://")
+        self.channel = channel
+        self._listen_conn = None
+        self._notify_conn = None
+        self._notify_lock = asyncio.Lock()
+        self._listener: Optional[asyncio.Task] = None
+
+    async def start(self, on_message: MessageHandler):
+        import psycopg
+        from psycopg import sql
+
+        self._listen_conn = await psycopg.AsyncConnection.connect(self.dsn, autocommit=True)
+        self._notify_conn = await psycopg.AsyncConnection.connect(self.dsn, autocommit=True)
+        await self._listen_conn.execute(sql.SQL("LISTEN {}").format(sql.Identifier(self.channel)))
+        self._listener = asyncio.create_task(self._listen(on_message))
+        logger.info(f"[OK] GraphQL subscription hub relaying via PostgreSQL channel '{self.channel}'")
+
+    async def _listen(self, on_message: MessageHandler):
+        async for notify in self._listen_conn.notifies():
+            await on_message(notify.payload)
+
+    async def publish(self, message: str):
+        if len(message.encode("utf-8")) > POSTGRES_NOTIFY_MAX_BYTES:
+            logger.warning(f"Subscription event too large for NOTIFY ({len(message)} chars), not relayed to other workers")
+            return
+        async with self._notify_lock:
+            await self._notify_conn.execute("SELECT pg_notify(%s, %s)", (self.channel, message))
+
+    async def close(self):
+        if self._listener:
+            self._listener.cancel()
+        for conn in (self._listen_conn, self._notify_conn):
+            if conn:
+                await conn.close()
+
+
+# ============================================================================
+# HUB
+# ============================================================================
+
+class SubscriptionHub:
+    """
+    Process-wide pub/sub hub for GraphQL subscriptions.
+
+    Events are always delivered to local subscribers directly; when a
+    cross-worker backend is configured they are also relayed to the other
+    workers (each worker ignores its own relayed messages).
+    """
+
+    def __init__(self, backend: Optional[Union[RedisPubSubBackend, PostgresNotifyBackend]] = None,
+                 max_queue: int = 100):
+        """
+        Initialize hub.
+
+        Args:
+            backend: Optional cross-worker relay (None = this process only)
+            max_queue: Pending events per subscriber before it is evicted
+        """
+        self.backend = backend
+        self.max_queue = max_queue
+        self.origin = uuid.uuid4().hex
+        self._subscribers: Dict[str, Set[Subscriber]] = {}
+        self._types: Dict[str, type] = {}
+        self._start_lock: Optional[asyncio.Lock] = None
+        self._started = False
+        self.stats = {"published": 0, "delivered": 0, "filtered": 0, "evicted": 0, "relayed": 0}
+
+    def register_types(self, *types: type):
+        """Register Strawberry types/enums that can be rebuilt from relayed events."""
+        for cls in types:
+            self._types[cls.__name__] = cls
+
+    @property
+    def subscriber_count(self) -> int:
+        return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+    async def start(self):
+        """Start the cross-worker backend (no-op for the memory backend)."""
+        if self._started or self.backend is None:
+            return
+        if self._start_lock is None:
+            self._start_lock = asyncio.Lock()
+        async with self._start_lock:
+            if self._started:
+                return
+            try:
+                await self.backend.start(self._on_backend_message)
+            except Exception as e:
+                # Keep serving local subscribers; other workers just won't see our events
+                logger.error(f"GraphQL subscription backend unavailable, using in-process delivery only: {e}")
+                self.backend = None
+            self._started = True
+
+    async def close(self):
+        """Stop the backend and end all subscriber streams."""
+        if self.backend is not None and self._started:
+            await self.backend.close()
+        for subscribers in self._subscribers.values():
+            for subscriber in list(subscribers):
+                subscriber.evict()
+        self._subscribers.clear()
+        self._started = False
+
+    def subscribe(self, topics: Union[str, Iterable[str]], max_queue: Optional[int] = None,
+                  **filters: Optional[Any]) -> Subscriber:
+        """
+        Register a subscriber.
+
+        Args:
+            topics: Topic name or names to receive
+            max_queue: Override the per-subscriber queue bound
+            **filters: Attribute filters (None values are ignored), e.g. project_id="project-1"
+
+        Returns:
+            Subscriber - use as `async with hub.subscribe(...) as s: async for event in s`
+        """
+        topic_set = {topics} if isinstance(topics, str) else set(topics)
+        active_filters = {key: _attribute(value) for key, value in filters.items() if value is not None}
+        subscriber = Subscriber(self, topic_set, active_filters, max_queue or self.max_queue)
+        for topic in topic_set:
+            self._subscribers.setdefault(topic, set()).add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        """Remove a subscriber from all of its topics."""
+        for topic in subscriber.topics:
+            subscribers = self._subscribers.get(topic)
+            if subscribers is not None:
+                subscribers.discard(subscriber)
+                if not subscribers:
+                    del self._subscribers[topic]
+
+    async def publish(self, topic: str, payload: Any, relay: bool = True, **attributes: Optional[Any]):
+        """
+        Publish an event to every matching subscriber (and other workers).
+
+        Args:
+            topic: Topic name, e.g. "task_updated"
+            payload: Event object yielded by subscriptions
+            relay: Also send to other workers (False for per-worker data such as metrics snapshots)
+            **attributes: Filterable attributes, e.g. project_id=..., agent_type=...
+        """
+        attrs = {key: _attribute(value) for key, value in attributes.items() if value is not None}
+        self.stats["published"] += 1
+        self._deliver(HubEvent(topic=topic, payload=payload, attributes=attrs))
+
+        if not relay:
+            return
+        if self.backend is not None:
+            await self.start()
+        if self.backend is not None:
+            message = json.dumps({
+                "origin": self.origin,
+                "topic": topic,
+                "attributes": attrs,
+                "payload": encode_payload(payload),
+            })
+            try:
+                await self.backend.publish(message)
+            except Exception as e:
+                logger.warning(f"Failed to relay subscription event '{topic}' to other workers: {e}")
+
+    def _deliver(self, event: HubEvent):
+        """Fan an event out to local subscribers, evicting any that are full."""
+        for subscriber in list(self._subscribers.get(event.topic, ())):
+            if not subscriber.matches(event.attributes):
+                self.stats["filtered"] += 1
+                continue
+            if subscriber.offer(event):
+                self.stats["delivered"] += 1
+                continue
+            logger.warning(
+                f"Evicting slow GraphQL subscriber on '{event.topic}' "
+                f"({subscriber.queue.qsize()} events pending)"
+            )
+            self.unsubscribe(subscriber)
+            subscriber.evict()
+            self.stats["evicted"] += 1
+
+    async def _on_backend_message(self, raw: str):
+        """Deliver an event relayed from another worker."""
+        try:
+            message = json.loads(raw)
+        except (TypeError, ValueError):
+            logger.warning("Ignoring malformed subscription relay message")
+            return
+        if message.get("origin") == self.origin:
+            return
+        self.stats["relayed"] += 1
+        self._deliver(HubEvent(
+            topic=message.get("topic", ""),
+            payload=decode_payload(message.get("payload"), self._types),
+            attributes=message.get("attributes", {}),
+        ))
+
+
+def _attribute(value: Any) -> str:
+    """Normalize filter/attribute values (enums compare by value)."""
+    if isinstance(value, Enum):
+        return str(value.value)
+    return str(value)
+
+
+_hub_instance: Optional[SubscriptionHub] = None
+
+
+def create_backend() -> Optional[Union[RedisPubSubBackend, PostgresNotifyBackend]]:
+    """Build the configured cross-worker backend (None for in-process only)."""
+    backend = settings.GRAPHQL_PUBSUB_BACKEND.lower()
+    channel = settings.GRAPHQL_PUBSUB_CHANNEL
+    if backend == "redis":
+        return RedisPubSubBackend(settings.GRAPHQL_PUBSUB_REDIS_URL, channel)
+    if backend == "postgres":
+        if not settings.DB_DSN.startswith("postgresql"):
+            logger.warning("GRAPHQL_PUBSUB_BACKEND=postgres requires a PostgreSQL DB_DSN, using in-process delivery")
+            return None
+        return PostgresNotifyBackend(settings.DB_DSN, channel)
+    return None
+
+
+def get_subscription_hub() -> SubscriptionHub:
+    """Get or create the process-wide SubscriptionHub."""
+    global _hub_instance
+    if _hub_instance is None:
+        _hub_instance = SubscriptionHub(
+            backend=create_backend(),
+            max_queue=settings.GRAPHQL_SUBSCRIBER_QUEUE_SIZE,
+        )
+    return _hub_instance
@@ -9,19 +9,22 @@ from datetime import datetime, timedelta, timezone
 from sqlalchemy import select, func, and_
 from sqlalchemy.ext.asyncio import AsyncSession
 import strawberry
-import asyncio
 
 from .types import (
     Agent, Task, Project, AgentActivity, SystemMetrics, DashboardStats,
     TaskStatus, AgentType, ProjectStatus,
     CreateProjectInput, UpdateTaskInput, TaskFilterInput, ProjectFilterInput
 )
+from .pubsub import get_subscription_hub
 from ..core.logging import get_logger
 
 logger = get_logger(__name__)
 
-# Event queue for real-time subscriptions
-subscription_queue: asyncio.Queue = asyncio.Queue()
+# Fan-out hub for real-time subscriptions (every subscriber gets every matching event)
+subscription_hub = get_subscription_hub()
+subscription_hub.register_types(
+    Agent, Task, Project, AgentActivity, TaskStatus, AgentType, ProjectStatus
+)
 
 
 # ============================================================================
@@ -59,83 +62,27 @@ class Query:
             logger.warning("No database session available for agents query")
             return []
         
-        # Query REAL agents from database (aggregate from tasks and agent configs)
-        from ..models.agent_tasks import AgentTask
-        from ..models.llm_config import LLMAgentConfig
-        from sqlalchemy import func, and_, case
-        
-        # Get distinct agent types from tasks
-        stmt = select(
-            AgentTask.agent_type,
-            func.count(AgentTask.id).label('total_tasks'),
-            func.sum(case((AgentTask.status == 'completed', 1), else_=0)).label('completed'),
-            func.sum(case((AgentTask.status == 'failed', 1), else_=0)).label('failed'),
-            func.max(AgentTask.updated_at).label('last_activity')
-        ).group_by(AgentTask.agent_type)
-        
-        # Filter by agent_type if provided
-        if agent_type:
-            agent_type_str = agent_type.name.lower()
-            stmt = stmt.where(AgentTask.agent_type == agent_type_str)
+        # Query REAL agents from database (aggregate from tasks)
+        from .dataloaders import agent_stats_query, build_agent
         
-        result = await db.execute(stmt)
+        # One grouped query for per-agent-type statistics
+        agent_type_str = agent_type.name.lower() if agent_type else None
+        result = await db.execute(agent_stats_query([agent_type_str] if agent_type_str else None))
         agent_stats = result.all()
         
-        # Build Agent objects from statistics
+        # One batched query for the current (most recent running) task of every agent type
+        current_tasks = await info.context["current_task_loader"].load_many(
+            [stats.agent_type for stats in agent_stats]
+        )
+        
         agents = []
-        for stats in agent_stats:
-            try:
-                agent_type_str = stats.agent_type.upper()
-                agent_type_enum = AgentType[agent_type_str] if agent_type_str in [e.name for e in AgentType] else AgentType.CODER
-            except (KeyError, AttributeError):
-                agent_type_enum = AgentType.CODER
-            
-            total_tasks = stats.total_tasks or 0
-            completed = stats.completed or 0
-            failed = stats.failed or 0
-            
-            # Calculate health score (success rate)
-            if total_tasks > 0:
-                health_score = (completed / total_tasks) * 100.0
-            else:
-                health_score = 0.0
+        for stats, current_task in zip(agent_stats, current_tasks):
+            agent = build_agent(stats, current_task)
             
             # Apply min_health filter
-            if min_health > 0 and health_score < min_health:
+            if min_health > 0 and agent.health_score < min_health:
                 continue
-            
-            # Get current task (most recent running task)
-            current_task_result = await db.execute(
-                select(AgentTask.task_id)
-                .where(
-                    and_(
-                        AgentTask.agent_type == stats.agent_type,
-                        AgentTask.status.in_(['started', 'running'])
-                    )
-                )
-                .order_by(AgentTask.started_at.desc())
-                .limit(1)
-            )
-            current_task = current_task_result.scalar_one_or_none()
-            
-            # Determine status
-            status = "active" if current_task else "idle"
-            
-            last_activity = stats.last_activity or datetime.now(timezone.utc)
-            if last_activity.tzinfo is None:
-                last_activity = last_activity.replace(tzinfo=timezone.utc)
-            
-            agents.append(Agent(
-                id=f"agent-{stats.agent_type}",
-                type=agent_type_enum,
-                name=f"{stats.agent_type.title()} Agent",
-                status=status,
-                health_score=health_score,
-                tasks_completed=completed,
-                tasks_failed=failed,
-                current_task_id=current_task,
-                last_activity=last_activity
-            ))
+            agents.append(agent)
         
         return agents
     
@@ -209,52 +156,8 @@ class Query:
         db_tasks = result.scalars().all()
         
         # Convert to GraphQL Task objects
-        tasks = []
-        for db_task in db_tasks:
-            # Map agent_type to AgentType enum
-            try:
-                agent_type_str = db_task.agent_type.upper()
-                agent_type = AgentType[agent_type_str] if agent_type_str in [e.name for e in AgentType] else AgentType.CODER
-            except (KeyError, AttributeError):
-                agent_type = AgentType.CODER
-            
-            # Map status
-            status_map = {
-                'pending': TaskStatus.PENDING,
-                'started': TaskStatus.IN_PROGRESS,
-                'running': TaskStatus.IN_PROGRESS,
-                'completed': TaskStatus.COMPLETED,
-                'failed': TaskStatus.FAILED,
-                'cancelled': TaskStatus.CANCELLED,
-            }
-            task_status = status_map.get(db_task.status, TaskStatus.PENDING)
-            
-            # Ensure timezone-aware datetimes
-            created_at = db_task.created_at
-            if created_at and created_at.tzinfo is None:
-                created_at = created_at.replace(tzinfo=timezone.utc)
-            
-            started_at = db_task.started_at
-            if started_at and started_at.tzinfo is None:
-                started_at = started_at.replace(tzinfo=timezone.utc)
-            
-            completed_at = db_task.completed_at
-            if completed_at and completed_at.tzinfo is None:
-                completed_at = completed_at.replace(tzinfo=timezone.utc)
-            
-            tasks.append(Task(
-                id=db_task.task_id,
-                project_id=db_task.project_id,
-                agent_type=agent_type,
-                title=db_task.task_name,
-                description=db_task.task_description or "",
-                status=task_status,
-                priority=db_task.priority,
-                created_at=created_at,
-                started_at=started_at,
-                completed_at=completed_at,
-                error_message=db_task.error_message
-            ))
+        from .dataloaders import to_graphql_task
+        tasks = [to_graphql_task(db_task) for db_task in db_tasks]
         
         return tasks
     
@@ -286,33 +189,44 @@ class Query:
         """
         db: AsyncSession = getattr(info.context, 'db', None) if info.context else None
         
-        # In production, query from projects table
-        projects = [
-            Project(
-                id=f"project-{i}",
-                name=f"QuickBooks Migration {i}",
-                objective=f"Migrate QuickBooks data to Odoo for client {i}",
-                status=ProjectStatus.IN_PROGRESS if i <= 2 else ProjectStatus.COMPLETED,
-                created_at=datetime.utcnow() - timedelta(days=i*2),
-                updated_at=datetime.utcnow() - timedelta(hours=i),
-                completion_percentage=75.0 if i <= 2 else 100.0,
-                total_tasks=20,
-                completed_tasks=15 if i <= 2 else 20,
-                failed_tasks=0
-            )
-            for i in range(1, 11)
-        ]
+        if not db:
+            logger.warning("No database session available for projects query")
+            return []
         
-        # Apply filters
+        from ..models.llm_config import LLMProjectConfig
+        from .dataloaders import PROJECT_STATUS_MAP, build_project
+        
+        stmt = select(LLMProjectConfig)
+        
+        # Tenant-scoped when the request is authenticated as a tenant
+        tenant_id = getattr(info.context, 'tenant_id', None)
+        if tenant_id:
+            stmt = stmt.where(LLMProjectConfig.tenant_id == tenant_id)
+        
+        # Apply filters in SQL
         if filter:
             if filter.status:
-                projects = [p for p in projects if p.status == filter.status]
+                execution_statuses = [db_status for db_status, status in PROJECT_STATUS_MAP.items() if status == filter.status]
+                stmt = stmt.where(LLMProjectConfig.execution_status.in_(execution_statuses))
             if filter.name_contains:
-                projects = [p for p in projects if filter.name_contains.lower() in p.name.lower()]
+                stmt = stmt.where(LLMProjectConfig.client_name.ilike(f"%{filter.name_contains}%"))
             if filter.created_after:
-                projects = [p for p in projects if p.created_at >= filter.created_after]
+                stmt = stmt.where(LLMProjectConfig.created_at >= filter.created_after)
+        
+        stmt = stmt.order_by(LLMProjectConfig.created_at.desc()).limit(limit).offset(offset)
+        result = await db.execute(stmt)
+        db_projects = result.scalars().all()
+        
+        # Task statistics for every listed project in one batched query
+        task_stats = await info.context["task_stats_loader"].load_many([p.project_id for p in db_projects])
+        projects = [build_project(db_project, stats) for db_project, stats in zip(db_projects, task_stats)]
         
-        return projects[offset:offset + limit]
+        # Nested task.project lookups in the same request reuse these
+        project_loader = info.context["project_loader"]
+        for project in projects:
+            project_loader.prime(project.id, project)
+        
+        return projects
     
     @strawberry.field
     async def project(self, info, id: str) -> Optional[Project]:
@@ -355,33 +269,30 @@ class Query:
         
         logger.info(f"Found project: {db_project.project_id}, execution_status: {db_project.execution_status}")
         
-        # Map execution_status to ProjectStatus
-        status_map = {
-            'pending': ProjectStatus.PLANNING,
-            'running': ProjectStatus.IN_PROGRESS,
-            'completed': ProjectStatus.COMPLETED,
-            'failed': ProjectStatus.FAILED,
-            'paused': ProjectStatus.ON_HOLD,
-        }
-        project_status = status_map.get(db_project.execution_status, ProjectStatus.PLANNING)
-        
-        # Calculate REAL completion percentage from actual tasks
-        from ..services.agent_task_service import calculate_project_progress, get_project_tasks
-        from ..models.agent_tasks import AgentTask
+        from ..services.agent_task_service import summarize_project_tasks, get_project_tasks
+        from .dataloaders import build_project
         
-        # CRITICAL FIX: Pass execution_started_at to only count tasks from current run
+        # CRITICAL FIX: Only count tasks from the current run (created after execution_started_at)
         # This prevents showing stale data from previous runs when project is restarted
+        # All per-project statistics below are derived from this single task query
         execution_started_at = db_project.execution_started_at
-        
-        # Get real task statistics (filtered by execution_started_at if available)
-        task_stats = await calculate_project_progress(db, id, execution_started_at=execution_started_at)
+        agent_tasks = []
+        if execution_started_at is not None:
+            agent_tasks = await get_project_tasks(db, id, execution_started_at=execution_started_at)
+        task_stats = summarize_project_tasks(agent_tasks)
         total_tasks = task_stats["total_tasks"]
         completed_tasks = task_stats["completed_tasks"]
         failed_tasks = task_stats["failed_tasks"]
-        completion_percentage = task_stats["completion_percentage"]
         
         # CRITICAL: Check if all tasks are done and update project status automatically
-        if db_project.execution_status == 'running' and total_tasks > 0:
+        # (check_and_update_project_completion only acts when nothing is pending/running/cancelled,
+        # so skip its extra queries while work is still in flight)
+        all_tasks_done = (
+            task_stats["pending_tasks"] == 0
+            and task_stats["in_progress_tasks"] == 0
+            and task_stats["cancelled_tasks"] == 0
+        )
+        if db_project.execution_status == 'running' and total_tasks > 0 and all_tasks_done:
             from ..services.project_execution_service import check_and_update_project_completion
             try:
                 # This will automatically mark project as completed/failed if all tasks are done
@@ -393,60 +304,37 @@ class Query:
         
         logger.info(
             f"Project {id} task stats: total={total_tasks}, completed={completed_tasks}, "
-            f"failed={failed_tasks}, completion={completion_percentage}%"
+            f"failed={failed_tasks}, completion={task_stats['completion_percentage']}%"
         )
         
-        # If no tasks exist yet, use status-based fallback
-        if total_tasks == 0:
-            if db_project.execution_status == 'completed':
-                completion_percentage = 100.0
-            elif db_project.execution_status == 'running':
-                completion_percentage = 5.0  # Just started, minimal progress
-            elif db_project.execution_status == 'failed':
-                completion_percentage = 0.0
-            else:
-                completion_percentage = 0.0
-        else:
-            # Round completion percentage to whole number for clean display
-            completion_percentage = round(completion_percentage)
-        
         # Get agents from BOTH agent_configs AND actual task activity
         # This ensures we show all agents that are working, not just configured ones
         agents = []
         
-        # Get task counts per agent type from actual tasks
+        # Get task counts per agent type from actual tasks (tasks are newest first)
         agent_task_counts = {}
-        agent_types_seen = set()
-        
-        if total_tasks > 0:
-            agent_tasks = await get_project_tasks(db, id, execution_started_at=execution_started_at)
-            for task in agent_tasks:
-                agent_type = task.agent_type
-                agent_types_seen.add(agent_type)  # Track which agent types have tasks
-                
-                if agent_type not in agent_task_counts:
-                    agent_task_counts[agent_type] = {"completed": 0, "failed": 0, "running": None, "last_activity": None}
-                
-                if task.status == 'completed':
-                    agent_task_counts[agent_type]["completed"] += 1
-                elif task.status == 'failed':
-                    agent_task_counts[agent_type]["failed"] += 1
-                elif task.status in ('started', 'running') and not agent_task_counts[agent_type]["running"]:
-                    agent_task_counts[agent_type]["running"] = task.task_id
-                
-                # Track last activity (most recent task update)
-                # AgentTask doesn't have updated_at, use completed_at, started_at, or created_at
-                last_activity = None
-                if task.completed_at:
-                    last_activity = task.completed_at
-                elif task.started_at:
-                    last_activity = task.started_at
-                elif task.created_at:
-                    last_activity = task.created_at
-                
-                if last_activity:
-                    if not agent_task_counts[agent_type]["last_activity"] or last_activity > agent_task_counts[agent_type]["last_activity"]:
-                        agent_task_counts[agent_type]["last_activity"] = last_activity
+        durations = []
+        for task in agent_tasks:
+            agent_type = task.agent_type
+            
+            if agent_type not in agent_task_counts:
+                agent_task_counts[agent_type] = {"completed": 0, "failed": 0, "running": None, "last_activity": None}
+            
+            if task.status == 'completed':
+                agent_task_counts[agent_type]["completed"] += 1
+                if task.actual_duration_seconds is not None:
+                    durations.append(task.actual_duration_seconds)
+            elif task.status == 'failed':
+                agent_task_counts[agent_type]["failed"] += 1
+            elif task.status in ('started', 'running') and not agent_task_counts[agent_type]["running"]:
+                agent_task_counts[agent_type]["running"] = task.task_id
+            
+            # Track last activity (most recent task update)
+            # AgentTask doesn't have updated_at, use completed_at, started_at, or created_at
+            last_activity = task.completed_at or task.started_at or task.created_at
+            if last_activity:
+                if not agent_task_counts[agent_type]["last_activity"] or last_activity > agent_task_counts[agent_type]["last_activity"]:
+                    agent_task_counts[agent_type]["last_activity"] = last_activity
         
         # Create agents from agent_configs (if they exist)
         agent_configs_by_type = {}
@@ -456,85 +344,70 @@ class Query:
         
         # Create agents from BOTH agent_configs AND actual task activity
         # This ensures we show all agents that are working, even if not in agent_configs
-        all_agent_types = set(agent_types_seen)
-        if agent_configs_by_type:
-            all_agent_types.update(agent_configs_by_type.keys())
+        all_agent_types = set(agent_task_counts.keys())
+        all_agent_types.update(agent_configs_by_type.keys())
         
+        from .dataloaders import to_agent_type
         for agent_type_str in all_agent_types:
-                try:
-                    # Map agent_type string to AgentType enum
-                    agent_type_upper = agent_type_str.upper()
-                    agent_type = AgentType[agent_type_upper] if agent_type_upper in [e.name for e in AgentType] else AgentType.CODER
-                except (KeyError, AttributeError):
-                    agent_type = AgentType.CODER
-                
-                # Get real task statistics for this agent
-                agent_stats = agent_task_counts.get(agent_type_str, {"completed": 0, "failed": 0, "running": None, "last_activity": None})
-                tasks_completed = agent_stats["completed"]
-                tasks_failed = agent_stats["failed"]
-                current_task_id = agent_stats["running"]
-                last_activity = agent_stats["last_activity"]
-                
-                # Get agent config if it exists
-                agent_config = agent_configs_by_type.get(agent_type_str)
-                
-                # Agent is "active" if:
-                # 1. Project is running AND
-                # 2. (Agent is enabled in config OR no config exists) AND
-                # 3. Has active/running tasks
-                agent_status = "active" if (
-                    db_project.execution_status == 'running' 
-                    and (agent_config is None or agent_config.enabled)
-                    and current_task_id is not None
-                ) else "idle"
-                
-                # Health score based on success rate
-                total_agent_tasks = tasks_completed + tasks_failed
-                if total_agent_tasks > 0:
-                    health_score = (tasks_completed / total_agent_tasks) * 100.0
-                elif agent_status == "active":
-                    health_score = 100.0  # Active but no completed tasks yet
-                else:
-                    health_score = 0.0
-                
-                # Use last_activity from tasks, or fallback to agent_config, or current time
+            agent_type = to_agent_type(agent_type_str)
+            
+            # Get real task statistics for this agent
+            agent_stats = agent_task_counts.get(agent_type_str, {"completed": 0, "failed": 0, "running": None, "last_activity": None})
+            tasks_completed = agent_stats["completed"]
+            tasks_failed = agent_stats["failed"]
+            current_task_id = agent_stats["running"]
+            last_activity = agent_stats["last_activity"]
+            
+            # Get agent config if it exists
+            agent_config = agent_configs_by_type.get(agent_type_str)
+            
+            # Agent is "active" if:
+            # 1. Project is running AND
+            # 2. (Agent is enabled in config OR no config exists) AND
+            # 3. Has active/running tasks
+            agent_status = "active" if (
+                db_project.execution_status == 'running' 
+                and (agent_config is None or agent_config.enabled)
+                and current_task_id is not None
+            ) else "idle"
+            
+            # Health score based on success rate
+            total_agent_tasks = tasks_completed + tasks_failed
+            if total_agent_tasks > 0:
+                health_score = (tasks_completed / total_agent_tasks) * 100.0
+            elif agent_status == "active":
+                health_score = 100.0  # Active but no completed tasks yet
+            else:
+                health_score = 0.0
+            
+            # Use last_activity from tasks, or fallback to agent_config, or current time
+            if not last_activity:
+                if agent_config:
+                    last_activity = agent_config.updated_at or agent_config.created_at
                 if not last_activity:
-                    if agent_config:
-                        last_activity = agent_config.updated_at or agent_config.created_at
-                    if not last_activity:
-                        last_activity = datetime.now(timezone.utc)
-                
-                # Ensure timezone-aware
-                if last_activity.tzinfo is None:
-                    last_activity = last_activity.replace(tzinfo=timezone.utc)
-                
-                agents.append(Agent(
-                    id=f"{db_project.project_id}-{agent_type_str}",
-                    type=agent_type,
-                    name=f"{agent_type_str.title()} Agent",
-                    status=agent_status,
-                    health_score=health_score,
-                    tasks_completed=tasks_completed,
-                    tasks_failed=tasks_failed,
-                    current_task_id=current_task_id,
-                    last_activity=last_activity
-                ))
-        
-        # Calculate estimated time remaining based on REAL task data
+                    last_activity = datetime.now(timezone.utc)
+            
+            # Ensure timezone-aware
+            if last_activity.tzinfo is None:
+                last_activity = last_activity.replace(tzinfo=timezone.utc)
+            
+            agents.append(Agent(
+                id=f"{db_project.project_id}-{agent_type_str}",
+                type=agent_type,
+                name=f"{agent_type_str.title()} Agent",
+                status=agent_status,
+                health_score=health_score,
+                tasks_completed=tasks_completed,
+                tasks_failed=tasks_failed,
+                current_task_id=current_task_id,
+                last_activity=last_activity
+            ))
+        
+        # Calculate estimated time remaining based on REAL task data (current run)
         estimated_time_remaining = None
+        completion_percentage = task_stats["completion_percentage"]
         if db_project.execution_status == 'running' and total_tasks > 0:
-            # Get average task duration from completed tasks
-            result = await db.execute(
-                select(func.avg(AgentTask.actual_duration_seconds))
-                .where(
-                    and_(
-                        AgentTask.project_id == id,
-                        AgentTask.status == 'completed',
-                        AgentTask.actual_duration_seconds.isnot(None)
-                    )
-                )
-            )
-            avg_duration = result.scalar()
+            avg_duration = sum(durations) / len(durations) if durations else None
             
             if avg_duration:
                 # Estimate: remaining tasks * average duration
@@ -556,20 +429,10 @@ class Query:
         
         # Create Project object with REAL data
         # Note: tasks field is loaded via resolver method, not passed directly
-        project = Project(
-            id=db_project.project_id,
-            name=db_project.client_name or "Unnamed Project",
-            objective=db_project.custom_instructions or db_project.description or "",
-            status=project_status,
-            created_at=db_project.created_at or datetime.now(timezone.utc),
-            updated_at=db_project.updated_at or db_project.created_at or datetime.now(timezone.utc),
-            completion_percentage=completion_percentage,
-            total_tasks=total_tasks,
-            completed_tasks=completed_tasks,
-            failed_tasks=failed_tasks,
-            agents=agents,
-            estimated_time_remaining_seconds=estimated_time_remaining
-        )
+        project = build_project(db_project, task_stats, agents=agents, estimated_time_remaining=estimated_time_remaining)
+        
+        # Nested task.project lookups in the same request reuse this project
+        info.context["project_loader"].prime(id, project)
         
         return project
     
@@ -624,15 +487,11 @@ class Query:
         )
         active_projects = result.scalar() or 0
         
-        # Count tasks
-        result = await db.execute(select(func.count(AgentTask.id)))
-        total_tasks = result.scalar() or 0
-        
-        result = await db.execute(
-            select(func.count(AgentTask.id))
-            .where(AgentTask.status.in_(['started', 'running']))
-        )
-        active_tasks = result.scalar() or 0
+        # Task counters come from the materialized rollup (one row instead of full-table aggregates)
+        from ..services.task_stats_service import get_global_stats
+        task_stats = await get_global_stats(db)
+        total_tasks = task_stats["total_tasks"]
+        active_tasks = task_stats["in_progress_tasks"]
         
         # Tasks completed today
         today_start = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
@@ -649,16 +508,8 @@ class Query:
         
         # Calculate average success rate (based on finished tasks only)
         # Success Rate = Completed / (Completed + Failed) * 100%
-        from sqlalchemy import case
-        result = await db.execute(
-            select(
-                func.sum(case((AgentTask.status == 'completed', 1), else_=0)).label('completed'),
-                func.sum(case((AgentTask.status == 'failed', 1), else_=0)).label('failed')
-            )
-        )
-        stats = result.first()
-        completed = stats.completed or 0
-        failed = stats.failed or 0
+        completed = task_stats["completed_tasks"]
+        failed = task_stats["failed_tasks"]
         finished_tasks = completed + failed
         average_success_rate = round((completed / finished_tasks * 100.0) if finished_tasks > 0 else 0.0)
         
@@ -772,12 +623,10 @@ class Query:
         )
         active_agents = result.scalar() or 0
         
-        # Count active tasks
-        result = await db.execute(
-            select(func.count(AgentTask.id))
-            .where(AgentTask.status.in_(['started', 'running']))
-        )
-        active_tasks = result.scalar() or 0
+        # Task counters come from the materialized rollup (one row instead of full-table aggregates)
+        from ..services.task_stats_service import get_global_stats
+        task_stats = await get_global_stats(db)
+        active_tasks = task_stats["in_progress_tasks"]
         
         # Tasks completed today
         today_start = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
@@ -805,30 +654,13 @@ class Query:
         tasks_failed_today = result.scalar() or 0
         
         # Average task duration (from completed tasks)
-        result = await db.execute(
-            select(func.avg(AgentTask.actual_duration_seconds))
-            .where(
-                and_(
-                    AgentTask.status == 'completed',
-                    AgentTask.actual_duration_seconds.isnot(None)
-                )
-            )
-        )
-        avg_duration = result.scalar() or 0.0
+        avg_duration = task_stats["average_duration_seconds"] or 0.0
         
         # System health score (based on success rate of finished tasks)
         # Success Rate = Completed / (Completed + Failed) * 100%
         # Only counts tasks that have finished, not pending/in_progress
-        from sqlalchemy import case
-        result = await db.execute(
-            select(
-                func.sum(case((AgentTask.status == 'completed', 1), else_=0)).label('completed'),
-                func.sum(case((AgentTask.status == 'failed', 1), else_=0)).label('failed')
-            )
-        )
-        stats = result.first()
-        completed = stats.completed or 0
-        failed = stats.failed or 0
+        completed = task_stats["completed_tasks"]
+        failed = task_stats["failed_tasks"]
         finished_tasks = completed + failed
         
         if finished_tasks > 0:
@@ -913,10 +745,7 @@ class Mutation:
         logger.info(f"Created project: {new_project.name} (ID: {new_project.id})")
         
         # Broadcast event to subscribers
-        await subscription_queue.put({
-            "type": "project_created",
-            "project": new_project
-        })
+        await subscription_hub.publish("project_created", new_project, project_id=new_project.id)
         
         return new_project
     
@@ -963,10 +792,12 @@ class Mutation:
         logger.info(f"Updated task: {updated_task.id} -> {updated_task.status}")
         
         # Broadcast event to subscribers
-        await subscription_queue.put({
-            "type": "task_updated",
-            "task": updated_task
-        })
+        await subscription_hub.publish(
+            "task_updated",
+            updated_task,
+            project_id=updated_task.project_id,
+            agent_type=updated_task.agent_type
+        )
         
         return updated_task
 
@@ -1000,19 +831,10 @@ class Subscription:
         """
         logger.info(f"New subscription: agent_activity (filter: {agent_type})")
         
-        while True:
-            # Wait for events from the queue
-            event = await subscription_queue.get()
-            
-            if event["type"] == "agent_activity":
-                activity = event["activity"]
-                
-                # Filter by agent_type if specified
-                if agent_type is None or activity.agent_type == agent_type:
-                    yield activity
-            
-            # Small delay to prevent overwhelming clients
-            await asyncio.sleep(0.1)
+        # Filtering by agent_type happens in the hub, before events are queued
+        async with subscription_hub.subscribe("agent_activity", agent_type=agent_type) as subscriber:
+            async for event in subscriber:
+                yield event.payload
     
     @strawberry.subscription
     async def task_updates(
@@ -1034,15 +856,9 @@ class Subscription:
         """
         logger.info(f"New subscription: task_updates (project: {project_id})")
         
-        while True:
-            event = await subscription_queue.get()
-            
-            if event["type"] == "task_updated":
-                task = event["task"]
-                
-                # Filter by project_id if specified
-                if project_id is None or task.project_id == project_id:
-                    yield task
+        async with subscription_hub.subscribe("task_updated", project_id=project_id) as subscriber:
+            async for event in subscriber:
+                yield event.payload
     
     @strawberry.subscription
     async def system_metrics_stream(
@@ -1068,161 +884,22 @@ class Subscription:
         """
         logger.info(f"New subscription: system_metrics_stream (interval: {interval_seconds}s, project_id: {project_id})")
         
-        # Get tenant_id from context (we'll create a new session for each iteration)
         tenant_id = getattr(info.context, 'tenant_id', None) if info.context else None
         
-        # CRITICAL FIX: Create a new database session for each iteration to prevent connection leaks
-        # The context's db session should not be kept open for the entire subscription duration
-        from ..core.db import AsyncSessionLocal
+        # All subscriptions with the same scope and interval share one producer, so the
+        # aggregate queries run once per scope instead of once per open dashboard
+        from .metrics_producer import METRICS_TOPIC, get_metrics_registry
         
-        while True:
-            # Create a new session for each iteration
-            db = AsyncSessionLocal()
-            try:
-                # Get REAL metrics filtered by tenant and optionally project
-                from ..models.agent_tasks import AgentTask
-                from datetime import datetime, timezone, timedelta
-                from sqlalchemy import case
-                try:
-                    import psutil
-                except ImportError:
-                    psutil = None
-                
-                # Build query filters
-                query_filters = []
-                if tenant_id:
-                    query_filters.append(AgentTask.tenant_id == tenant_id)
-                if project_id:
-                    query_filters.append(AgentTask.project_id == project_id)
-                
-                # Count active agents (agents with running tasks)
-                active_agents_query = select(func.count(func.distinct(AgentTask.agent_type)))
-                if query_filters:
-                    active_agents_query = active_agents_query.where(and_(*query_filters, AgentTask.status.in_(['started', 'running'])))
-                else:
-                    active_agents_query = active_agents_query.where(AgentTask.status.in_(['started', 'running']))
-                result = await db.execute(active_agents_query)
-                active_agents = result.scalar() or 0
-                
-                # Count active tasks
-                active_tasks_query = select(func.count(AgentTask.id))
-                if query_filters:
-                    active_tasks_query = active_tasks_query.where(and_(*query_filters, AgentTask.status.in_(['started', 'running'])))
-                else:
-                    active_tasks_query = active_tasks_query.where(AgentTask.status.in_(['started', 'running']))
-                result = await db.execute(active_tasks_query)
-                active_tasks = result.scalar() or 0
-                
-                # Tasks completed today (all tasks for project, not just today)
-                # For project-specific metrics, we want all completed tasks, not just today
-                completed_query = select(func.count(AgentTask.id)).where(
-                    AgentTask.status == 'completed'
-                )
-                if query_filters:
-                    # Apply tenant/project filters
-                    base_filters = [f for f in query_filters]
-                    completed_query = completed_query.where(and_(*base_filters))
-                result = await db.execute(completed_query)
-                tasks_completed_today = result.scalar() or 0
-                
-                # Tasks failed (all failed tasks for project)
-                failed_query = select(func.count(AgentTask.id)).where(
-                    AgentTask.status == 'failed'
-                )
-                if query_filters:
-                    base_filters = [f for f in query_filters]
-                    failed_query = failed_query.where(and_(*base_filters))
-                result = await db.execute(failed_query)
-                tasks_failed_today = result.scalar() or 0
-                
-                # Average task duration
-                duration_query = select(func.avg(AgentTask.actual_duration_seconds)).where(
-                    and_(
-                        AgentTask.status == 'completed',
-                        AgentTask.actual_duration_seconds.isnot(None)
-                    )
-                )
-                if query_filters:
-                    base_filters = [f for f in query_filters]
-                    duration_query = duration_query.where(and_(*base_filters))
-                result = await db.execute(duration_query)
-                avg_duration = result.scalar() or 0.0
-                
-                # System health score (success rate of finished tasks)
-                # Success Rate = Completed / (Completed + Failed) * 100%
-                # Only counts tasks that have finished, not pending/in_progress
-                stats_query = select(
-                    func.sum(case((AgentTask.status == 'completed', 1), else_=0)).label('completed'),
-                    func.sum(case((AgentTask.status == 'failed', 1), else_=0)).label('failed')
-                )
-                if query_filters:
-                    stats_query = stats_query.where(and_(*query_filters))
-                result = await db.execute(stats_query)
-                stats = result.first()
-                completed = stats.completed or 0
-                failed = stats.failed or 0
-                finished_tasks = completed + failed
-                
-                if finished_tasks > 0:
-                    # Success rate: percentage of finished tasks that succeeded
-                    system_health_score = (completed / finished_tasks) * 100.0
-                    system_health_score = max(0.0, min(100.0, system_health_score))  # Cap at 100%
-                else:
-                    system_health_score = 100.0  # No finished tasks = healthy (nothing to judge)
-                
-                # System resource usage (from psutil)
-                try:
-                    if psutil:
-                        cpu_usage_percent = psutil.cpu_percent(interval=0.1)
-                        memory = psutil.virtual_memory()
-                        memory_usage_percent = memory.percent
-                    else:
-                        cpu_usage_percent = 0.0
-                        memory_usage_percent = 0.0
-                except Exception:
-                    cpu_usage_percent = 0.0
-                    memory_usage_percent = 0.0
-                
-                metrics = SystemMetrics(
-                    timestamp=datetime.now(timezone.utc),
-                    active_agents=active_agents,
-                    active_tasks=active_tasks,
-                    tasks_completed_today=tasks_completed_today,
-                    tasks_failed_today=tasks_failed_today,
-                    average_task_duration_seconds=float(avg_duration),
-                    system_health_score=system_health_score,
-                    cpu_usage_percent=cpu_usage_percent,
-                    memory_usage_percent=memory_usage_percent
-                )
-                
-                yield metrics
-            except Exception as e:
-                logger.error(f"Error in system_metrics_stream: {e}", exc_info=True)
-                # CRITICAL: Rollback transaction on error to prevent PendingRollbackError
-                try:
-                    await db.rollback()
-                except Exception as rollback_error:
-                    logger.warning(f"Error rolling back transaction in system_metrics_stream: {rollback_error}")
-                # Yield default metrics on error
-                yield SystemMetrics(
-                    timestamp=datetime.now(timezone.utc),
-                    active_agents=0,
-                    active_tasks=0,
-                    tasks_completed_today=0,
-                    tasks_failed_today=0,
-                    average_task_duration_seconds=0.0,
-                    system_health_score=0.0,
-                    cpu_usage_percent=0.0,
-                    memory_usage_percent=0.0
-                )
-            finally:
-                # CRITICAL: Always close the session after each iteration to prevent connection leaks
-                try:
-                    await db.close()
-                except Exception as close_error:
-                    logger.warning(f"Error closing database session in system_metrics_stream: {close_error}")
-            
-            await asyncio.sleep(interval_seconds)
+        registry = get_metrics_registry()
+        producer = registry.acquire(tenant_id, project_id, interval_seconds)
+        try:
+            async with subscription_hub.subscribe(METRICS_TOPIC, scope=producer.scope) as subscriber:
+                if producer.latest is not None:
+                    yield producer.latest
+                async for event in subscriber:
+                    yield event.payload
+        finally:
+            await registry.release(producer)
     
     @strawberry.subscription
     async def project_updates(
@@ -1248,12 +925,7 @@ class Subscription:
         """
         logger.info(f"New subscription: project_updates (project: {project_id})")
         
-        while True:
-            event = await subscription_queue.get()
-            
-            if event["type"] == "project_updated" and event.get("project", {}).get("id") == project_id:
-                yield event["project"]
-            
-            # Small delay to prevent overwhelming clients
-            await asyncio.sleep(0.1)
+        async with subscription_hub.subscribe("project_updated", project_id=project_id) as subscriber:
+            async for event in subscriber:
+                yield event.payload
 
@@ -83,6 +83,27 @@ async def periodic_cleanup_task():
             # Continue running even if cleanup fails
 
 
+# Background task that rebuilds the agent_task_stats rollup to repair drift
+async def periodic_task_stats_reconcile():
+    """Rebuild task statistics rollups every TASK_STATS_RECONCILE_INTERVAL_SECONDS."""
+    from .services.task_stats_service import reconcile_task_stats
+    from .core.db import AsyncSessionLocal
+    
+    while True:
+        try:
+            await asyncio.sleep(settings.TASK_STATS_RECONCILE_INTERVAL_SECONDS)
+            async with AsyncSessionLocal() as db:
+                summary = await reconcile_task_stats(db)
+            if summary["drifted"]:
+                logger.info(f"Task stats reconciled: {summary}")
+            else:
+                logger.debug(f"Task stats reconciled: {summary}")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Error in task stats reconciliation: {e}", exc_info=True)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan context manager for startup and shutdown events."""
@@ -92,16 +113,39 @@ async def lifespan(app: FastAPI):
     # Start periodic cleanup task (runs every hour, NOT on startup)
     cleanup_task = asyncio.create_task(periodic_cleanup_task())
     logger.info("[OK] Periodic cleanup task scheduled (runs every hour)")
+    reconcile_task = asyncio.create_task(periodic_task_stats_reconcile())
+    from .services.heartbeat_service import get_heartbeat_aggregator
+    heartbeat_aggregator = get_heartbeat_aggregator()
+    heartbeat_task = asyncio.create_task(heartbeat_aggregator.run())
+    logger.info(f"[OK] Device heartbeat flush scheduled (every {settings.HEARTBEAT_FLUSH_INTERVAL_SECONDS}s)")
+    logger.info(f"[OK] Task stats reconciliation scheduled (every {settings.TASK_STATS_RECONCILE_INTERVAL_SECONDS}s)")
+    from .services.agent_worker_pool import get_agent_worker_pool
+    agent_worker_pool = get_agent_worker_pool()
+    await agent_worker_pool.start()
+    if settings.AGENT_WORKER_POOL_SIZE > 0:
+        logger.info(f"[OK] Agent worker pool starting ({settings.AGENT_WORKER_POOL_SIZE} warm workers)")
     
     yield
     
     # Shutdown
     logger.info("Application shutdown: Cancelling background tasks...")
-    cleanup_task.cancel()
-    try:
-        await cleanup_task
-    except asyncio.CancelledError:
-        pass
+    for task in (cleanup_task, reconcile_task, heartbeat_task):
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+    # Write heartbeats received since the last flush
+    await heartbeat_aggregator.close()
+    # Idle workers exit now; busy ones finish their project first
+    await agent_worker_pool.close()
+    from .core.cache import get_response_cache
+    await get_response_cache().close()
+    if GRAPHQL_AVAILABLE:
+        from .graphql.metrics_producer import get_metrics_registry
+        from .graphql.pubsub import get_subscription_hub
+        await get_metrics_registry().close()
+        await get_subscription_hub().close()
     logger.info("[OK] Background tasks cancelled")
 
 
@@ -71,6 +71,53 @@ class AgentTask(Base):
     # Indexes for performance (composite indexes for common queries)
     __table_args__ = (
         Index('idx_agent_tasks_project_status', 'project_id', 'status'),
+        Index('idx_agent_tasks_logical_task', 'project_id', 'task_name', 'agent_type'),
         CheckConstraint("status IN ('pending', 'started', 'running', 'completed', 'failed', 'cancelled')", name='agent_tasks_status_check'),
     )
 
+
+# Scope key of the platform-wide row in agent_task_stats
+GLOBAL_STATS_SCOPE = "__global__"
+
+
+class AgentTaskStats(Base):
+    """
+    Materialized rollup of agent_tasks, one row per project plus one global row.
+    
+    Maintained in the same transaction as task writes by agent_task_service
+    (see task_stats_service), so progress and dashboard reads are single-row
+    lookups instead of COUNT/SUM(CASE ...) aggregates. A periodic reconciliation
+    job rebuilds rows from agent_tasks to repair any drift.
+    
+    Project rows cover the current run only (tasks created after run_started_at)
+    and count LOGICAL tasks (task_name + agent_type, so main/backup agent duplicates
+    count once), matching calculate_project_progress. Raw counters count rows.
+    The global row (project_id = GLOBAL_STATS_SCOPE) only uses the raw counters.
+    """
+    __tablename__ = "agent_task_stats"
+    
+    project_id = Column(String(100), primary_key=True)  # Project ID or GLOBAL_STATS_SCOPE
+    tenant_id = Column(Integer, ForeignKey("tenants.id", ondelete="CASCADE"), nullable=True, index=True)
+    run_started_at = Column(DateTime(timezone=True), nullable=True)  # execution_started_at the row was built for
+    
+    # Logical task counters (project rows)
+    total_tasks = Column(Integer, nullable=False, default=0)
+    completed_tasks = Column(Integer, nullable=False, default=0)
+    failed_tasks = Column(Integer, nullable=False, default=0)
+    in_progress_tasks = Column(Integer, nullable=False, default=0)
+    pending_tasks = Column(Integer, nullable=False, default=0)
+    cancelled_tasks = Column(Integer, nullable=False, default=0)
+    
+    # Raw row counters (project and global rows)
+    raw_total = Column(Integer, nullable=False, default=0)
+    raw_pending = Column(Integer, nullable=False, default=0)
+    raw_in_progress = Column(Integer, nullable=False, default=0)  # started + running
+    raw_completed = Column(Integer, nullable=False, default=0)
+    raw_failed = Column(Integer, nullable=False, default=0)
+    raw_cancelled = Column(Integer, nullable=False, default=0)
+    duration_sum_seconds = Column(Float, nullable=False, default=0.0)  # Completed tasks with a duration
+    duration_count = Column(Integer, nullable=False, default=0)
+    
+    reconciled_at = Column(DateTime(timezone=True), nullable=True)  # Last full rebuild
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
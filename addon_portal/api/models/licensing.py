@@ -62,7 +62,10 @@ class Device(Base):
     last_seen = Column(DateTime, default=datetime.utcnow, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     is_revoked = Column(Boolean, default=False, nullable=False)
-    __table_args__ = (UniqueConstraint("tenant_id", "hw_fingerprint", name="uq_device_per_tenant_fpr"),)
+    __table_args__ = (
+        UniqueConstraint("tenant_id", "hw_fingerprint", name="uq_device_per_tenant_fpr"),
+        Index("ix_devices_created_at", "created_at"),
+    )
 
 class UsageEvent(Base):
     __tablename__ = "usage_events"
@@ -95,7 +98,10 @@ class ActivationCode(Base):
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     revoked_at = Column(DateTime, nullable=True)
     tenant = relationship("Tenant", backref="activation_codes")
-    __table_args__ = (Index("ix_activation_codes_tenant", "tenant_id"),)
+    __table_args__ = (
+        Index("ix_activation_codes_tenant", "tenant_id"),
+        Index("ix_activation_codes_created_at", "created_at"),
+    )
 
 class TenantSession(Base):
     """Session management for tenant dashboard OTP authentication."""
@@ -3,7 +3,7 @@ Admin API Router - JSON endpoints for React Admin Portal
 Provides CRUD operations for Tenants, Activation Codes, and Devices
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, or_
@@ -27,6 +27,8 @@ from ..schemas.plan import PlanResponse, PlanCollectionResponse
 from ..services.tenant_service import create_tenant, delete_tenant, get_tenant_by_slug, list_tenants, update_tenant
 from ..core.logging import get_logger
 from ..core.exceptions import TenantNotFoundError
+from ..core.cache import cached_response, PLANS_TAG
+from ..services.license_state_service import mark_device_revoked
 
 router = APIRouter(prefix="/admin/api", tags=["admin_api"])
 LOGGER = get_logger(__name__)
@@ -288,66 +290,35 @@ async def get_activation_trend(
     db: AsyncSession = Depends(get_db),
     days: int = Query(30, ge=7, le=365, description="Number of days for trend")
 ):
-    """Get activation trend data for dashboard chart (codes generated vs projects/devices activated)."""
+    """Get activation trend data for dashboard chart (codes generated vs projects/devices activated).
     
-    from datetime import timedelta, timezone as tz
-    from sqlalchemy import func, and_
+    Rows are bucketed per server-timezone day in SQL (see utils/time_buckets.py),
+    so the cost does not grow with days x rows.
+    """
+    
+    from datetime import timedelta
     from ..models.llm_config import LLMProjectConfig
-    from ..utils.timezone_utils import now_in_server_tz, utc_to_server_tz, get_server_timezone
+    from ..utils.timezone_utils import now_in_server_tz
+    from ..utils.time_buckets import count_by_local_day, daily_series
     
     # Use configured server timezone for date calculations
     now = now_in_server_tz()
-    start_date = now - timedelta(days=days)
-    
-    # Fetch all codes, projects, and devices (we'll filter by date in Python for reliability)
-    result = await db.execute(select(ActivationCode))
-    all_codes = result.scalars().all()
-    result = await db.execute(
-        select(LLMProjectConfig).where(LLMProjectConfig.activation_code_id.isnot(None))
+    start_day = (now - timedelta(days=days)).date()
+    end_day = now.date()
+    
+    # Codes generated per day (count ALL codes, regardless of source - Admin Portal or Tenant Dashboard)
+    codes = await count_by_local_day(db, ActivationCode.created_at, start_day, end_day)
+    # Projects activated per day (using activation codes)
+    projects = await count_by_local_day(
+        db, LLMProjectConfig.created_at, start_day, end_day,
+        LLMProjectConfig.activation_code_id.isnot(None),
+    )
+    # Devices activated per day
+    devices = await count_by_local_day(
+        db, Device.created_at, start_day, end_day, Device.is_revoked == False
     )
-    all_projects = result.scalars().all()
-    result = await db.execute(select(Device).where(Device.is_revoked == False))
-    all_devices = result.scalars().all()
-    
-    # Helper function to convert timezone-naive datetime (assumed UTC) to server timezone date
-    def _get_date_in_server_tz(dt):
-        """Convert timezone-naive datetime (assumed UTC) to server timezone and return date."""
-        if dt is None:
-            return None
-        # If naive, assume UTC (as stored in database)
-        if dt.tzinfo is None:
-            dt_utc = dt.replace(tzinfo=tz.utc)
-        else:
-            dt_utc = dt
-        # Convert to server timezone and extract date
-        return utc_to_server_tz(dt_utc).date()
-    
-    trend_data = []
-    current_date = start_date
-    
-    while current_date <= now:
-        date_str = current_date.strftime('%b %d')
-        date_only = current_date.date()
-        
-        # Codes generated on this date (count ALL codes, regardless of source - Admin Portal or Tenant Dashboard)
-        codes_count = sum(1 for c in all_codes if _get_date_in_server_tz(c.created_at) == date_only)
-        
-        # Projects activated on this date (using activation codes)
-        projects_count = sum(1 for p in all_projects if _get_date_in_server_tz(p.created_at) == date_only)
-        
-        # Devices activated on this date
-        devices_count = sum(1 for d in all_devices if _get_date_in_server_tz(d.created_at) == date_only)
-        
-        trend_data.append({
-            "date": date_str,
-            "codes": codes_count,
-            "projects": projects_count,
-            "devices": devices_count,
-        })
-        
-        current_date += timedelta(days=1)
     
-    return {"trend": trend_data}
+    return {"trend": daily_series(start_day, end_day, codes=codes, projects=projects, devices=devices)}
 
 
 @router.get("/project-device-distribution")
@@ -402,11 +373,10 @@ async def get_analytics(
     from sqlalchemy import func, and_, desc, text
     from ..models.licensing import Plan, Subscription, SubscriptionState
     from ..models.llm_config import LLMProjectConfig
-    from ..utils.timezone_utils import now_in_server_tz, get_postgresql_timezone_string
+    from ..utils.timezone_utils import now_in_server_tz
     
     # Calculate date range using configured server timezone
     now = now_in_server_tz()
-    tz_str = get_postgresql_timezone_string()
     
     # Calculate start_date based on date_range
     # For "today", start at midnight of today
@@ -427,55 +397,11 @@ async def get_analytics(
     start_date_only = start_date_normalized.date()
     now_date_only = now.date()
     
-    # Activation trends (daily codes generated and devices activated)
-    # Fetch all codes and devices, filter by date in Python for reliability
-    from datetime import timezone as tz
-    from ..utils.timezone_utils import utc_to_server_tz
-    result = await db.execute(select(ActivationCode))
-    all_codes_for_trend = result.scalars().all()
-    result = await db.execute(select(Device))
-    all_devices_for_trend = result.scalars().all()
-    
-    # Helper function to convert timezone-naive datetime (assumed UTC) to server timezone date
-    def _get_date_in_server_tz_analytics(dt):
-        """Convert timezone-naive datetime (assumed UTC) to server timezone and return date."""
-        if dt is None:
-            return None
-        # If naive, assume UTC (as stored in database)
-        if dt.tzinfo is None:
-            dt_utc = dt.replace(tzinfo=tz.utc)
-        else:
-            dt_utc = dt
-        # Convert to server timezone and extract date
-        return utc_to_server_tz(dt_utc).date()
-    
-    # Filter codes and devices to only those within the date range
-    filtered_codes = [
-        c for c in all_codes_for_trend 
-        if _get_date_in_server_tz_analytics(c.created_at) is not None 
-        and start_date_only <= _get_date_in_server_tz_analytics(c.created_at) <= now_date_only
-    ]
-    filtered_devices = [
-        d for d in all_devices_for_trend 
-        if _get_date_in_server_tz_analytics(d.created_at) is not None 
-        and start_date_only <= _get_date_in_server_tz_analytics(d.created_at) <= now_date_only
-    ]
-    
-    # Build daily trend data
-    activation_trend = []
-    current_date = start_date_normalized
-    while current_date <= now:
-        date_str = current_date.strftime('%b %d')
-        date_only = current_date.date()
-        # Count codes and devices for this specific date
-        codes_count = sum(1 for c in filtered_codes if _get_date_in_server_tz_analytics(c.created_at) == date_only)
-        devices_count = sum(1 for d in filtered_devices if _get_date_in_server_tz_analytics(d.created_at) == date_only)
-        activation_trend.append({
-            "date": date_str,
-            "codes": codes_count,
-            "devices": devices_count
-        })
-        current_date += timedelta(days=1)
+    # Activation trends (daily codes generated and devices activated), bucketed in SQL
+    from ..utils.time_buckets import count_by_local_day, daily_series
+    codes_per_day = await count_by_local_day(db, ActivationCode.created_at, start_date_only, now_date_only)
+    devices_per_day = await count_by_local_day(db, Device.created_at, start_date_only, now_date_only)
+    activation_trend = daily_series(start_date_only, now_date_only, codes=codes_per_day, devices=devices_per_day)
     
     # Tenant usage (current usage vs quota) - with project filtering
     tenant_usage = []
@@ -701,13 +627,14 @@ async def get_tenants(
 
 
 @router.get("/plans", response_model=PlanCollectionResponse)
-async def get_plans(db: AsyncSession = Depends(get_db)) -> PlanCollectionResponse:
+async def get_plans(request: Request, db: AsyncSession = Depends(get_db)):
     """Get all available subscription plans from the database.
     
     This endpoint provides the single source of truth for subscription plans.
     Frontend should use this to populate plan dropdowns dynamically.
+    Served from the response cache (tag PLANS_TAG) with ETag support.
     """
-    try:
+    async def load_plans():
         result = await db.execute(select(Plan).order_by(Plan.monthly_run_quota.asc()))
         plans = result.scalars().all()
         return PlanCollectionResponse(
@@ -720,7 +647,10 @@ async def get_plans(db: AsyncSession = Depends(get_db)) -> PlanCollectionRespons
                 )
                 for plan in plans
             ]
-        )
+        ).model_dump()
+    
+    try:
+        return await cached_response(request, "plans:admin", load_plans, tags=[PLANS_TAG])
     except Exception as e:
         LOGGER.error("failed_to_fetch_plans", extra={"error": str(e)})
         raise HTTPException(
@@ -1110,6 +1040,7 @@ async def revoke_device(device_id: int, db: AsyncSession = Depends(get_db)):
     # Mark as revoked
     device.is_revoked = True
     await db.commit()
+    mark_device_revoked(device.id)
     
     return {
         "success": True,
@@ -8,6 +8,7 @@ from typing import Optional
 from ..deps import get_db
 from ..models.licensing import Tenant, ActivationCode, Device
 from ..core.settings import settings
+from ..services.license_state_service import mark_device_revoked
 from ..deps_admin import require_admin
 from .authz import _hash_code
 from datetime import datetime, timedelta
@@ -92,5 +93,6 @@ async def revoke_device_action(request: Request, user = Depends(require_admin),
     if not dev: raise HTTPException(404, "device not found")
     dev.is_revoked = True
     await db.commit()
+    mark_device_revoked(dev.id)
     url = request.url_for("devices_page") + f"?tenant={tenant_slug}"
     return RedirectResponse(url, status_code=HTTP_303_SEE_OTHER)
@@ -9,6 +9,7 @@ from ..core.db import AsyncSessionLocal
 from ..models.licensing import Subscription, SubscriptionState, Plan, Tenant, ActivationCode
 from ..routers.tenant_api import get_tenant_from_session
 from ..core.logging import get_logger
+from ..core.cache import invalidate_tags, tenant_tag
 from datetime import datetime, timezone
 
 # Initialize Stripe
@@ -35,6 +36,7 @@ async def stripe_webhook(request: Request):
         try:
             event_type = event["type"]
             obj = event["data"]["object"]
+            changed_tenant_id = None  # Tenant whose subscription/plan changed (cached policy/usage)
             
             LOGGER.info("stripe_webhook_received", extra={"event_type": event_type})
             
@@ -67,6 +69,7 @@ async def stripe_webhook(request: Request):
                 sub.state = SubscriptionState[state]
                 sub.current_period_start = datetime.fromtimestamp(obj["current_period_start"], tz=timezone.utc)
                 sub.current_period_end = datetime.fromtimestamp(obj["current_period_end"], tz=timezone.utc)
+                changed_tenant_id = sub.tenant_id
                 await db.commit()
                 
             # Handle checkout session completion (for one-time purchases like activation codes)
@@ -109,6 +112,7 @@ async def stripe_webhook(request: Request):
                         plan = result.scalar_one_or_none()
                         if plan:
                             sub.plan_id = plan.id
+                            changed_tenant_id = sub.tenant_id
                             await db.commit()
                             LOGGER.info("subscription_upgraded_via_stripe", extra={"tenant_id": tenant_id, "plan_id": plan_id})
             
@@ -123,6 +127,7 @@ async def stripe_webhook(request: Request):
                     if sub:
                         # Update subscription status to active
                         sub.state = SubscriptionState.active
+                        changed_tenant_id = sub.tenant_id
                         await db.commit()
                         LOGGER.info("invoice_payment_succeeded", extra={"subscription_id": subscription_id})
             
@@ -137,9 +142,12 @@ async def stripe_webhook(request: Request):
                     if sub:
                         # Update subscription status to past_due
                         sub.state = SubscriptionState.past_due
+                        changed_tenant_id = sub.tenant_id
                         await db.commit()
                         LOGGER.warning("invoice_payment_failed", extra={"subscription_id": subscription_id})
             
+            if changed_tenant_id is not None:
+                await invalidate_tags(tenant_tag(changed_tenant_id))
             return {"ok": True}
         except Exception as e:
             await db.rollback()
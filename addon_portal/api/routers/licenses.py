@@ -1,47 +1,45 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from ..deps import get_db, current_identity
-from ..models.licensing import Tenant, Subscription, Device, SubscriptionState
+from ..core.cache import cached_response, etag_response, tenant_tag
+from ..models.licensing import Tenant
+from ..services.license_state_service import parse_token_subject, check_device_active, get_tenant_entitlements
+from ..services.heartbeat_service import get_heartbeat_aggregator
 from ..schemas.licensing import Policy, Branding, HeartbeatRequest
-from datetime import datetime
 
 router = APIRouter(prefix="/licenses", tags=["licenses"])
 
 @router.get("/policy", response_model=Policy)
-async def get_policy(identity = Depends(current_identity), db: AsyncSession = Depends(get_db)):
-    sub = identity.get("sub","")
-    try:
-        _, tenant_id_str, _, device_id_str = sub.split(":")
-        tenant_id = int(tenant_id_str); device_id = int(device_id_str)
-    except Exception:
-        raise HTTPException(401, "bad token subject")
-    result = await db.execute(
-        select(Device).where(Device.id == device_id, Device.tenant_id == tenant_id, Device.is_revoked == False)
-    )
-    device = result.scalar_one_or_none()
-    if not device: raise HTTPException(401, "device revoked")
-    result = await db.execute(select(Subscription).where(Subscription.tenant_id == tenant_id))
-    subs = result.scalar_one_or_none()
-    return Policy(plan_name=subs.plan.name, monthly_run_quota=subs.plan.monthly_run_quota, subscription_state=subs.state.value)
+async def get_policy(request: Request, identity = Depends(current_identity), db: AsyncSession = Depends(get_db)):
+    # Hot path: cached token verification, in-memory revocation check and per-tenant
+    # cached entitlements - no database round trip unless a cache is cold
+    tenant_id, device_id = parse_token_subject(identity)
+    await check_device_active(db, device_id, tenant_id)
+    entitlements = await get_tenant_entitlements(db, tenant_id)
+    return etag_response(request, entitlements)
 
 @router.post("/heartbeat")
 async def heartbeat(body: HeartbeatRequest, identity = Depends(current_identity), db: AsyncSession = Depends(get_db)):
-    sub = identity.get("sub","")
-    _, tenant_id_str, _, device_id_str = sub.split(":")
-    tenant_id = int(tenant_id_str); device_id = int(device_id_str)
-    result = await db.execute(select(Device).where(Device.id == device_id, Device.tenant_id == tenant_id))
-    device = result.scalar_one_or_none()
-    if not device: raise HTTPException(401, "device not found")
-    if device.is_revoked: raise HTTPException(401, "device revoked")
-    device.last_seen = datetime.utcnow()
-    db.add(device)
-    await db.commit()
+    tenant_id, device_id = parse_token_subject(identity)
+    await check_device_active(db, device_id, tenant_id)
+    # last_seen is written in periodic bulk updates, not per heartbeat
+    get_heartbeat_aggregator().record(tenant_id, device_id)
     return {"ok": True}
 
 @router.get("/branding/{tenant_slug}", response_model=Branding)
-async def get_branding(tenant_slug: str, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(Tenant).where(Tenant.slug == tenant_slug))
-    tenant = result.scalar_one_or_none()
-    if not tenant: raise HTTPException(404, "tenant not found")
-    return Branding(logo_url=tenant.logo_url, primary_color=tenant.primary_color, domain=tenant.domain)
+async def get_branding(tenant_slug: str, request: Request, db: AsyncSession = Depends(get_db)):
+    loaded = {}
+
+    async def load_branding():
+        result = await db.execute(select(Tenant).where(Tenant.slug == tenant_slug))
+        tenant = result.scalar_one_or_none()
+        if not tenant: raise HTTPException(404, "tenant not found")
+        loaded["tenant_id"] = tenant.id
+        return Branding(logo_url=tenant.logo_url, primary_color=tenant.primary_color, domain=tenant.domain).model_dump()
+
+    # Cached per tenant slug; invalidated by tenant updates
+    return await cached_response(
+        request, f"branding:{tenant_slug}", load_branding,
+        tags=lambda body: [tenant_tag(loaded["tenant_id"])] if "tenant_id" in loaded else [],
+    )
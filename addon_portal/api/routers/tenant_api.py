@@ -2,13 +2,11 @@
 
 from __future__ import annotations
 
-import io
-import zipfile
-import fnmatch
+import asyncio
 from datetime import datetime, timezone
 from typing import Optional, List
 from pathlib import Path
-from fastapi import APIRouter, Depends, HTTPException, Header, status, Response
+from fastapi import APIRouter, Depends, HTTPException, Header, Request, status, Response
 from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, extract
@@ -18,6 +16,16 @@ from ..core.exceptions import ConfigurationError, InvalidOperationError, TenantN
 from ..models.licensing import Tenant, Subscription, SubscriptionState, ActivationCode
 from ..models.llm_config import LLMProjectConfig
 from ..services.project_execution_service import execute_project, restart_project
+from ..services.project_archive_service import (
+    build_cached_archive,
+    cached_archive_path,
+    collect_entries,
+    fingerprint_entries,
+    iter_file_range,
+    parse_range,
+    stream_zip,
+    stream_zip_to_cache,
+)
 from ..core.logging import get_logger
 from ..deps import get_db
 from ..schemas.llm import (
@@ -78,15 +86,16 @@ async def get_tenant_from_session(
 ) -> dict:
     """Dependency to extract tenant info from session token.
     
-    Updates last_activity to keep session alive during active use.
+    Keeps the session alive during active use (last_activity is written at most
+    once per SESSION_ACTIVITY_GRANULARITY_SECONDS).
     
     Raises:
         HTTPException: If session is invalid or expired.
     """
     try:
         tenant_info = await validate_session(x_session_token, db)
-        # Commit the last_activity update immediately to ensure it's persisted
-        # This prevents race conditions where navigation triggers multiple requests
+        # Commit any last_activity update immediately to ensure it's persisted
+        # (a no-op when the session was served from the cache without a write)
         await db.commit()
         return tenant_info
     except InvalidOperationError as e:
@@ -408,23 +417,27 @@ async def get_tenant_billing(
 
 @router.get("/billing/plans")
 async def get_available_plans(
+    request: Request,
     db: AsyncSession = Depends(get_db),
 ):
-    """Get all available subscription plans for upgrade/downgrade."""
+    """Get all available subscription plans for upgrade/downgrade (cached, ETag-aware)."""
     from ..models.licensing import Plan
-    
-    result = await db.execute(select(Plan).order_by(Plan.monthly_run_quota))
-    plans = result.scalars().all()
-    
-    return [
-        PlanResponse(
-            id=plan.id,
-            name=plan.name,
-            stripe_price_id=plan.stripe_price_id,
-            monthly_run_quota=plan.monthly_run_quota,
-        )
-        for plan in plans
-    ]
+    from ..core.cache import cached_response, PLANS_TAG
+    
+    async def load_plans():
+        result = await db.execute(select(Plan).order_by(Plan.monthly_run_quota))
+        plans = result.scalars().all()
+        return [
+            PlanResponse(
+                id=plan.id,
+                name=plan.name,
+                stripe_price_id=plan.stripe_price_id,
+                monthly_run_quota=plan.monthly_run_quota,
+            ).model_dump()
+            for plan in plans
+        ]
+    
+    return await cached_response(request, "plans:tenant", load_plans, tags=[PLANS_TAG])
 
 
 @router.post("/billing/upgrade")
@@ -900,6 +913,7 @@ async def create_tenant_project(
 @router.get("/projects/{project_id}/download")
 async def download_project(
     project_id: str,
+    request: Request,
     tenant_info: dict = Depends(get_tenant_from_session),
     db: AsyncSession = Depends(get_db),
 ):
@@ -912,7 +926,9 @@ async def download_project(
     
     Returns:
     - ZIP file containing all project files from output folder
-    - Created in memory to avoid file system locks
+    - Streamed while it is compressed (never held in memory); when
+      PROJECT_ARCHIVE_CACHE_DIR is set, the archive is cached per output folder
+      state and supports Range requests for resumable downloads
     """
     # Get project
     result = await db.execute(
@@ -973,122 +989,15 @@ async def download_project(
         )
     
     try:
-        # Create zip file in memory to avoid file system locks
-        zip_buffer = io.BytesIO()
-        
-        with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-            # QA_Engineer: Exclude sensitive files from downloads (secrets, logs, etc.)
-            # Files/folders to exclude from project downloads
-            excluded_patterns = [
-                # Execution logs (contain system information, errors, secrets)
-                'execution_stdout.log',
-                'execution_stderr.log',
-                '*.log',
-                # Environment files (contain secrets, API keys, database credentials)
-                '.env',
-                '.env.local',
-                '.env.*',
-                '*.env',
-                # Cache directories (contain temporary data)
-                '.cache',
-                '.llm_cache',
-                '.research_cache',
-                '.coverage_reports',
-                # Git directories (not needed in downloads)
-                '.git',
-                '.github',
-                # Database files (may contain sensitive data)
-                '*.db',
-                '*.sqlite',
-                '*.sqlite3',
-                # Temporary files
-                '*.tmp',
-                '*.bak',
-                '__pycache__',
-                '*.pyc',
-            ]
-            
-            def should_exclude_file(file_path: Path) -> bool:
-                """Check if file should be excluded from download."""
-                file_name = file_path.name
-                relative_path = file_path.relative_to(output_folder)
-                relative_str = str(relative_path).replace('\\', '/')
-                
-                # Check against exclusion patterns
-                for pattern in excluded_patterns:
-                    # Exact filename match
-                    if pattern == file_name:
-                        return True
-                    # Wildcard pattern match
-                    if '*' in pattern:
-                        if fnmatch.fnmatch(file_name, pattern) or fnmatch.fnmatch(relative_str, pattern):
-                            return True
-                    # Directory pattern (check if file is in excluded directory)
-                    if pattern.startswith('.') and pattern in relative_str:
-                        return True
-                
-                # Exclude files in directories starting with '.'
-                parts = relative_path.parts
-                if any(part.startswith('.') for part in parts):
-                    return True
-                
-                return False
-            
-            # Walk through the output folder and add all files (excluding sensitive ones)
-            files_added = 0
-            files_excluded = 0
-            
-            for file_path in output_folder.rglob('*'):
-                if file_path.is_file():
-                    # QA_Engineer: Skip sensitive files
-                    if should_exclude_file(file_path):
-                        files_excluded += 1
-                        LOGGER.debug(
-                            "download_excluded_file",
-                            extra={
-                                "project_id": project_id,
-                                "file_path": str(file_path),
-                                "reason": "Sensitive file excluded from download",
-                            }
-                        )
-                        continue
-                    
-                    # Get relative path from output folder root
-                    arcname = file_path.relative_to(output_folder)
-                    
-                    # Read file content and add to zip
-                    try:
-                        zip_file.write(file_path, arcname)
-                        files_added += 1
-                    except (PermissionError, OSError) as e:
-                        # Skip files that can't be read (locked files, etc.)
-                        files_excluded += 1
-                        LOGGER.warning(
-                            "download_skip_file",
-                            extra={
-                                "project_id": project_id,
-                                "file_path": str(file_path),
-                                "error": str(e),
-                            }
-                        )
-                        continue
-            
-            LOGGER.info(
-                "download_zip_created",
-                extra={
-                    "project_id": project_id,
-                    "files_added": files_added,
-                    "files_excluded": files_excluded,
-                }
-            )
-        
-        # Get zip file size and reset buffer position
-        zip_size = zip_buffer.tell()
-        zip_buffer.seek(0)
+        # Scan the output folder in a worker thread (large asset trees)
+        entries, files_excluded = await asyncio.to_thread(collect_entries, output_folder)
+        fingerprint = fingerprint_entries(entries)
+        archive_path = cached_archive_path(project.project_id, fingerprint)
         
         # Generate filename
         safe_project_name = "".join(c for c in (project.client_name or project.project_id) if c.isalnum() or c in (' ', '-', '_')).strip()
         filename = f"{safe_project_name}-{project.project_id}.zip"
+        headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
         
         LOGGER.info(
             "project_download_initiated",
@@ -1097,18 +1006,60 @@ async def download_project(
                 "tenant_id": tenant_info["tenant_id"],
                 "output_folder": str(output_folder),
                 "zip_filename": filename,
-                "zip_size_bytes": zip_size,
+                "files_added": len(entries),
+                "files_excluded": files_excluded,
+                "archive_cached": bool(archive_path and archive_path.exists()),
             }
         )
         
-        # Return streaming response with zip file
+        if archive_path is None:
+            # No archive cache: stream the ZIP as it is compressed (size unknown up front)
+            headers["Accept-Ranges"] = "none"
+            return StreamingResponse(stream_zip(entries, project.project_id), media_type="application/zip", headers=headers)
+        
+        etag = f'"{fingerprint}"'
+        range_header = request.headers.get("range")
+        if_range = request.headers.get("if-range")
+        if range_header and if_range and if_range != etag:
+            # The client's partial download is of a different archive version
+            range_header = None
+        
+        if not archive_path.exists():
+            if not range_header:
+                # Stream to the client and fill the cache at the same time
+                headers.update({"Accept-Ranges": "bytes", "ETag": etag})
+                return StreamingResponse(
+                    stream_zip_to_cache(entries, project.project_id, archive_path),
+                    media_type="application/zip",
+                    headers=headers,
+                )
+            # A resumed download needs the complete archive to slice
+            await asyncio.to_thread(build_cached_archive, entries, project.project_id, archive_path)
+        
+        total_size = archive_path.stat().st_size
+        headers.update({"Accept-Ranges": "bytes", "ETag": etag})
+        try:
+            byte_range = parse_range(range_header, total_size)
+        except ValueError:
+            return Response(
+                status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+                headers={"Content-Range": f"bytes */{total_size}"},
+            )
+        if byte_range is None:
+            headers["Content-Length"] = str(total_size)
+            return StreamingResponse(
+                iter_file_range(archive_path, 0, total_size - 1),
+                media_type="application/zip",
+                headers=headers,
+            )
+        start, end = byte_range
+        headers["Content-Length"] = str(end - start + 1)
+        headers["Content-Range"] = f"bytes {start}-{end}/{total_size}"
         return StreamingResponse(
-            zip_buffer,
+            iter_file_range(archive_path, start, end),
+            status_code=status.HTTP_206_PARTIAL_CONTENT,
             media_type="application/zip",
-            headers={
-                "Content-Disposition": f'attachment; filename="{filename}"',
-                "Content-Length": str(zip_size),
-            }
+            headers=headers,
         )
         
     except Exception as e:
@@ -1,32 +1,51 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from sqlalchemy.orm import selectinload
 from ..deps import get_db
+from ..core.cache import cached_response, tenant_tag
 from ..models.licensing import Tenant, MonthlyUsageRollup, Subscription
 from ..utils.timezone_utils import now_in_server_tz
 
 router = APIRouter(prefix="/usage", tags=["usage"])
 
+# Usage counters are written outside this API (rollup jobs), so entries expire quickly
+USAGE_CACHE_TTL_SECONDS = 60
+
+
 @router.get("/{tenant_slug}")
-async def get_usage(tenant_slug: str, db: AsyncSession = Depends(get_db)):
+async def get_usage(tenant_slug: str, request: Request, db: AsyncSession = Depends(get_db)):
     """Get tenant usage statistics for current month in server timezone."""
-    result = await db.execute(select(Tenant).where(Tenant.slug == tenant_slug))
-    tenant = result.scalar_one_or_none()
-    if not tenant:
-        raise HTTPException(404, "tenant not found")
-    # Use configured server timezone for date calculations
-    today = now_in_server_tz()
-    result = await db.execute(
-        select(MonthlyUsageRollup).where(
-            MonthlyUsageRollup.tenant_id == tenant.id,
-            MonthlyUsageRollup.year == today.year,
-            MonthlyUsageRollup.month == today.month
+    loaded = {}
+
+    async def load_usage():
+        result = await db.execute(select(Tenant).where(Tenant.slug == tenant_slug))
+        tenant = result.scalar_one_or_none()
+        if not tenant:
+            raise HTTPException(404, "tenant not found")
+        loaded["tenant_id"] = tenant.id
+        # Use configured server timezone for date calculations
+        today = now_in_server_tz()
+        result = await db.execute(
+            select(MonthlyUsageRollup).where(
+                MonthlyUsageRollup.tenant_id == tenant.id,
+                MonthlyUsageRollup.year == today.year,
+                MonthlyUsageRollup.month == today.month
+            )
         )
+        roll = result.scalar_one_or_none()
+        runs = roll.runs if roll else 0
+        result = await db.execute(
+            select(Subscription).options(selectinload(Subscription.plan)).where(Subscription.tenant_id == tenant.id)
+        )
+        sub = result.scalar_one_or_none()
+        quota = sub.plan.monthly_run_quota if sub and sub.plan else 0
+        plan = sub.plan.name if sub and sub.plan else None
+        return {"tenant": tenant.slug, "year": today.year, "month": today.month, "runs": runs, "quota": quota, "plan": plan}
+
+    today = now_in_server_tz()
+    return await cached_response(
+        request, f"usage:{tenant_slug}:{today.year}-{today.month:02d}", load_usage,
+        ttl=USAGE_CACHE_TTL_SECONDS,
+        tags=lambda body: [tenant_tag(loaded["tenant_id"])] if "tenant_id" in loaded else [],
     )
-    roll = result.scalar_one_or_none()
-    runs = roll.runs if roll else 0
-    result = await db.execute(select(Subscription).where(Subscription.tenant_id == tenant.id))
-    sub = result.scalar_one_or_none()
-    quota = sub.plan.monthly_run_quota if sub and sub.plan else 0
-    plan = sub.plan.name if sub and sub.plan else None
-    return {"tenant": tenant.slug, "year": today.year, "month": today.month, "runs": runs, "quota": quota, "plan": plan}
@@ -9,7 +9,7 @@ This service provides functions that agents can call to:
 """
 
 from datetime import datetime, timezone
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable, Iterable, List
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, and_
 from sqlalchemy.orm import selectinload
@@ -19,6 +19,38 @@ from ..core.logging import get_logger
 
 LOGGER = get_logger(__name__)
 
+# Callbacks notified after a task is created or changes status: listener(task, old_status)
+# old_status is None for newly created tasks. Used to keep live dashboard metrics current
+# between full recomputes; listeners must be fast and must not touch the session.
+TaskStatusListener = Callable[[AgentTask, Optional[str]], None]
+_status_listeners: List[TaskStatusListener] = []
+
+
+def add_task_status_listener(listener: TaskStatusListener) -> None:
+    """Register a callback for task creation/status changes in this process."""
+    if listener not in _status_listeners:
+        _status_listeners.append(listener)
+
+
+def remove_task_status_listener(listener: TaskStatusListener) -> None:
+    """Unregister a task status callback."""
+    if listener in _status_listeners:
+        _status_listeners.remove(listener)
+
+
+def _notify_status_listeners(task: AgentTask, old_status: Optional[str]) -> None:
+    for listener in list(_status_listeners):
+        try:
+            listener(task, old_status)
+        except Exception as e:
+            LOGGER.warning(f"Task status listener failed: {e}")
+
+
+async def apply_task_change(db: AsyncSession, task: AgentTask, old_status: Optional[str]) -> None:
+    """Keep the agent_task_stats rollup in step with a task write (same transaction)."""
+    from .task_stats_service import apply_task_change as apply_to_rollup
+    await apply_to_rollup(db, task, old_status)
+
 
 async def create_task(
     db: AsyncSession,
@@ -86,6 +118,8 @@ async def create_task(
     )
     
     db.add(task)
+    await db.flush()
+    await apply_task_change(db, task, None)
     await db.commit()
     await db.refresh(task)
     
@@ -98,6 +132,7 @@ async def create_task(
             "task_name": task_name,
         }
     )
+    _notify_status_listeners(task, None)
     
     return task
 
@@ -155,7 +190,11 @@ async def update_task_status(
         task.completed_at = now
         # Calculate actual duration
         if task.started_at:
-            duration = (now - task.started_at).total_seconds()
+            # Ensure timezone-aware datetime (SQLite returns naive values)
+            started_at = task.started_at
+            if started_at.tzinfo is None:
+                started_at = started_at.replace(tzinfo=timezone.utc)
+            duration = (now - started_at).total_seconds()
             task.actual_duration_seconds = int(duration)
         task.progress_percentage = 100.0
     elif status == 'failed' and not task.failed_at:
@@ -179,6 +218,7 @@ async def update_task_status(
         else:
             task.execution_metadata = execution_metadata
     
+    await apply_task_change(db, task, old_status)
     await db.commit()
     await db.refresh(task)
     
@@ -191,6 +231,7 @@ async def update_task_status(
             "progress_percentage": task.progress_percentage,
         }
     )
+    _notify_status_listeners(task, old_status)
     
     return task
 
@@ -345,8 +386,6 @@ async def calculate_project_progress(
         - pending_tasks: Number of pending tasks
         - completion_percentage: Real completion percentage (0.0 to 100.0)
     """
-    from sqlalchemy import case
-    
     # QA_Engineer: CRITICAL FIX - If execution_started_at is None, return zero stats
     # This prevents counting old tasks when project hasn't started yet (e.g., during restart)
     # Old tasks should be deleted before restart, but this is a safety check
@@ -362,85 +401,102 @@ async def calculate_project_progress(
             "quality_percentage": 0.0,
         }
     
-    # Build query with optional filter for execution_started_at
-    query = select(
-        func.count(AgentTask.id).label('total'),
-        func.sum(case((AgentTask.status == 'completed', 1), else_=0)).label('completed'),
-        func.sum(case((AgentTask.status == 'failed', 1), else_=0)).label('failed'),
-        func.sum(case((AgentTask.status.in_(['started', 'running']), 1), else_=0)).label('in_progress'),
-        func.sum(case((AgentTask.status == 'pending', 1), else_=0)).label('pending'),
-        func.sum(case((AgentTask.status == 'cancelled', 1), else_=0)).label('cancelled'),  # QA_Engineer: Count cancelled tasks
-    ).where(AgentTask.project_id == project_id)
-    
-    # CRITICAL FIX: Only count tasks from current run (created after execution_started_at)
     # Ensure timezone-aware datetime
     if execution_started_at.tzinfo is None:
         execution_started_at = execution_started_at.replace(tzinfo=timezone.utc)
-    query = query.where(AgentTask.created_at >= execution_started_at)
     
-    result = await db.execute(query)
+    # Single-row read from the materialized rollup (rebuilt from agent_tasks when missing/stale)
+    from .task_stats_service import get_project_progress
+    return await get_project_progress(db, project_id, execution_started_at)
+
+
+LOGICAL_COUNTERS = (
+    "total_tasks",
+    "completed_tasks",
+    "failed_tasks",
+    "in_progress_tasks",
+    "pending_tasks",
+    "cancelled_tasks",
+)
+
+
+def logical_task_flags(statuses: Iterable[str]) -> Dict[str, int]:
+    """
+    Classify ONE logical task (task_name + agent_type) from the statuses of its rows.
+    
+    Main and backup agents create separate entries for the same logical task, so a
+    logical task is completed if ANY entry is completed, failed if any entry failed
+    and none completed, and so on.
+    
+    Args:
+        statuses: Status of every agent_tasks row belonging to the logical task
     
-    stats = result.first()
+    Returns:
+        0/1 value per LOGICAL_COUNTERS key (all zero when there are no rows)
+    """
+    seen = set(statuses)
+    if not seen:
+        return {key: 0 for key in LOGICAL_COUNTERS}
     
+    has_completed = 'completed' in seen
+    has_failed = 'failed' in seen
+    has_in_progress = bool(seen & {'started', 'running'})
+    return {
+        "total_tasks": 1,
+        "completed_tasks": int(has_completed),
+        "failed_tasks": int(has_failed and not has_completed),
+        "in_progress_tasks": int(has_in_progress and not has_completed and not has_failed),
+        "pending_tasks": int('pending' in seen and not has_completed and not has_failed and not has_in_progress),
+        "cancelled_tasks": int('cancelled' in seen and not has_completed),
+    }
+
+
+def summarize_project_tasks(tasks: Iterable[Any]) -> Dict[str, Any]:
+    """
+    Compute project progress statistics from already-loaded task rows.
+    
+    Shared by calculate_project_progress and the GraphQL resolvers/DataLoaders
+    (which load tasks for many projects at once) so the logical-task rules stay
+    in one place.
+    
+    Args:
+        tasks: AgentTask objects or rows exposing task_name, agent_type and status
+    
+    Returns:
+        Same dictionary as calculate_project_progress
+    """
     # QA_Engineer: Count LOGICAL tasks (group by task_name + agent_type) instead of database entries
     # This prevents counting duplicates from main/backup agents as separate tasks
-    # Get all tasks to group by logical task identifier
-    all_tasks_query = select(AgentTask).where(AgentTask.project_id == project_id)
-    if execution_started_at:
-        if execution_started_at.tzinfo is None:
-            execution_started_at = execution_started_at.replace(tzinfo=timezone.utc)
-        all_tasks_query = all_tasks_query.where(AgentTask.created_at >= execution_started_at)
+    logical_tasks: Dict[str, List[str]] = {}
+    for task in tasks:
+        logical_id = f"{task.task_name}::{task.agent_type}"
+        logical_tasks.setdefault(logical_id, []).append(task.status)
     
-    all_tasks_result = await db.execute(all_tasks_query)
-    all_tasks = all_tasks_result.scalars().all()
+    counts = {key: 0 for key in LOGICAL_COUNTERS}
+    for statuses in logical_tasks.values():
+        for key, flag in logical_task_flags(statuses).items():
+            counts[key] += flag
+    return progress_from_counts(counts)
+
+
+def progress_from_counts(counts: Any) -> Dict[str, Any]:
+    """
+    Build the calculate_project_progress dictionary from logical task counters.
     
-    # Group tasks by logical identifier (task_name + agent_type)
-    # Main and backup agents create separate entries for same logical task
-    logical_tasks: Dict[str, Dict[str, Any]] = {}
+    Args:
+        counts: Mapping (or object with attributes) holding the LOGICAL_COUNTERS values,
+            e.g. a summarize result or an AgentTaskStats row
     
-    for task in all_tasks:
-        # Create logical task identifier (task_name + agent_type)
-        logical_id = f"{task.task_name}::{task.agent_type}"
-        
-        if logical_id not in logical_tasks:
-            logical_tasks[logical_id] = {
-                'has_completed': False,
-                'has_failed': False,
-                'has_cancelled': False,
-                'has_in_progress': False,
-                'has_pending': False,
-                'db_entries': []
-            }
-        
-        logical_tasks[logical_id]['db_entries'].append(task.id)
-        
-        # Update logical task status (if ANY entry is completed, logical task is completed)
-        if task.status == 'completed':
-            logical_tasks[logical_id]['has_completed'] = True
-        elif task.status == 'failed':
-            logical_tasks[logical_id]['has_failed'] = True
-        elif task.status == 'cancelled':
-            logical_tasks[logical_id]['has_cancelled'] = True
-        elif task.status in ['started', 'running']:
-            logical_tasks[logical_id]['has_in_progress'] = True
-        elif task.status == 'pending':
-            logical_tasks[logical_id]['has_pending'] = True
-    
-    # Count logical tasks
-    total_logical_tasks = len(logical_tasks)
-    completed_logical_tasks = sum(1 for lt in logical_tasks.values() if lt['has_completed'])
-    failed_logical_tasks = sum(1 for lt in logical_tasks.values() if lt['has_failed'] and not lt['has_completed'])
-    in_progress_logical_tasks = sum(1 for lt in logical_tasks.values() if lt['has_in_progress'] and not lt['has_completed'] and not lt['has_failed'])
-    pending_logical_tasks = sum(1 for lt in logical_tasks.values() if lt['has_pending'] and not lt['has_completed'] and not lt['has_failed'] and not lt['has_in_progress'])
-    cancelled_logical_tasks = sum(1 for lt in logical_tasks.values() if lt['has_cancelled'] and not lt['has_completed'])
-    
-    # Use logical task counts for quality calculation
-    total_tasks = total_logical_tasks
-    completed_tasks = completed_logical_tasks
-    failed_tasks = failed_logical_tasks
-    in_progress_tasks = in_progress_logical_tasks
-    pending_tasks = pending_logical_tasks
-    cancelled_tasks = cancelled_logical_tasks
+    Returns:
+        Same dictionary as calculate_project_progress
+    """
+    if isinstance(counts, dict):
+        values = {key: int(counts.get(key) or 0) for key in LOGICAL_COUNTERS}
+    else:
+        values = {key: int(getattr(counts, key) or 0) for key in LOGICAL_COUNTERS}
+    total_tasks = values["total_tasks"]
+    completed_tasks = values["completed_tasks"]
+    failed_tasks = values["failed_tasks"]
     
     # Calculate completion percentage (percentage of tasks that have finished)
     # Completion Rate = (Completed + Failed) / Total * 100%
@@ -465,10 +521,9 @@ async def calculate_project_progress(
         "total_tasks": total_tasks,
         "completed_tasks": completed_tasks,
         "failed_tasks": failed_tasks,
-        "in_progress_tasks": in_progress_tasks,
-        "pending_tasks": pending_tasks,
-        "cancelled_tasks": cancelled_tasks,  # QA_Engineer: Include cancelled tasks in response
+        "in_progress_tasks": values["in_progress_tasks"],
+        "pending_tasks": values["pending_tasks"],
+        "cancelled_tasks": values["cancelled_tasks"],  # QA_Engineer: Include cancelled tasks in response
         "completion_percentage": completion_percentage,
         "quality_percentage": quality_percentage,  # QA_Engineer: Include quality percentage
     }
-
@@ -0,0 +1,318 @@
+"""
+Agent Worker Pool - Warm, pre-imported runners for project executions
+
+Starting `python main.py` per project re-imports every agent module, the LLM SDKs
+and the task tracking models before any work happens; for short runs (restarts)
+that cold start dominates. The pool keeps AGENT_WORKER_POOL_SIZE agent_worker.py
+processes running that have already done those imports, and hands each project
+to an idle worker over a local TCP socket (127.0.0.1, token-authenticated).
+
+A job looks like a subprocess to the rest of the API: PooledExecution has the same
+pid / returncode / wait() / terminate() interface as SupervisedProcess, writes the
+same execution_stdout.log / execution_stderr.log and the same heartbeat file, so
+_monitor_process_completion supervises both the same way. Terminating a job
+terminates its worker; the pool starts a replacement.
+
+Workers recycle themselves after AGENT_WORKER_MAX_JOBS jobs or once they exceed
+AGENT_WORKER_MAX_RSS_MB. When no worker is idle (or the pool is disabled or
+failing to start workers), execute_project falls back to a fresh subprocess.
+"""
+
+import asyncio
+import hmac
+import json
+import os
+import secrets
+import uuid
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from ..core.logging import get_logger
+from ..core.settings import settings
+from .process_supervisor import SupervisedProcess, spawn_process
+
+LOGGER = get_logger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+WORKER_SCRIPT = PROJECT_ROOT / "agent_worker.py"
+
+# Stop replacing workers after this many consecutive workers died before becoming ready
+MAX_CONSECUTIVE_START_FAILURES = 3
+
+
+class PooledExecution:
+    """A project execution running on a pool worker (SupervisedProcess interface)."""
+
+    def __init__(self, worker: "_Worker", job_id: str):
+        self._worker = worker
+        self._done = asyncio.Event()
+        self.job_id = job_id
+        self.pid = worker.process.pid
+        self.returncode: Optional[int] = None
+
+    def _finish(self, returncode: int) -> None:
+        if self.returncode is None:
+            self.returncode = returncode
+            self._done.set()
+
+    async def wait(self) -> int:
+        """Wait until the worker reports the job finished (or dies)."""
+        await self._done.wait()
+        return self.returncode
+
+    async def terminate(self, grace_seconds: float = 2) -> None:
+        """Stop the job by terminating its worker."""
+        if self.returncode is not None:
+            return
+        self._worker.retiring = True
+        await self._worker.process.terminate(grace_seconds)
+        await self.wait()
+
+
+class _Worker:
+    """Pool-side state of one agent_worker.py process."""
+
+    def __init__(self, worker_id: str, process: SupervisedProcess):
+        self.worker_id = worker_id
+        self.process = process
+        self.ready = asyncio.Event()
+        self.writer: Optional[asyncio.StreamWriter] = None
+        self.job: Optional[PooledExecution] = None
+        self.jobs_done = 0
+        self.retiring = False
+
+    @property
+    def idle(self) -> bool:
+        return (
+            self.writer is not None and self.job is None and not self.retiring
+            and self.process.returncode is None
+        )
+
+
+class AgentWorkerPool:
+    """
+    Pool of warm agent workers.
+
+    Args:
+        size: Number of workers kept running (0 disables the pool)
+        max_jobs: Jobs per worker before it is recycled
+        max_rss_mb: Memory (MiB) after which a worker is recycled (0 = no limit)
+        start_timeout: Seconds a new worker may take to import and connect
+        worker_cmd: Command starting a worker (default: python agent_worker.py)
+        log_path: File receiving worker output outside of jobs
+    """
+
+    def __init__(
+        self,
+        size: int = 2,
+        max_jobs: int = 20,
+        max_rss_mb: int = 2048,
+        start_timeout: float = 120,
+        worker_cmd: Optional[List[str]] = None,
+        log_path: Optional[Path] = None,
+    ):
+        self.size = size
+        self.max_jobs = max_jobs
+        self.max_rss_mb = max_rss_mb
+        self.start_timeout = start_timeout
+        self.worker_cmd = worker_cmd or ["python", str(WORKER_SCRIPT)]
+        self.log_path = log_path or PROJECT_ROOT / "logs" / "agent_workers.log"
+        self._token = secrets.token_hex(16)
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._address = ""
+        self._workers: Dict[str, _Worker] = {}
+        self._watchers: List[asyncio.Task] = []
+        self._start_failures = 0
+        self._closing = False
+        self.stats = {"started": 0, "jobs": 0, "fallbacks": 0, "recycled": 0, "crashed": 0, "start_failures": 0}
+
+    @property
+    def idle_count(self) -> int:
+        return sum(1 for worker in self._workers.values() if worker.idle)
+
+    async def start(self) -> None:
+        """Open the local job channel and start the workers (they warm up in the background)."""
+        if self.size <= 0 or self._server is not None:
+            return
+        self._server = await asyncio.start_server(self._handle_connection, "127.0.0.1", 0)
+        host, port = self._server.sockets[0].getsockname()[:2]
+        self._address = f"{host}:{port}"
+        for _ in range(self.size):
+            await self._spawn_worker()
+
+    async def _spawn_worker(self) -> None:
+        worker_id = uuid.uuid4().hex[:8]
+        env = os.environ.copy()
+        pythonpath = env.get("PYTHONPATH", "")
+        env["PYTHONPATH"] = f"{PROJECT_ROOT}{os.pathsep}{pythonpath}" if pythonpath else str(PROJECT_ROOT)
+        env.update({
+            "Q2O_WORKER_ADDRESS": self._address,
+            "Q2O_WORKER_TOKEN": self._token,
+            "Q2O_WORKER_ID": worker_id,
+            "AGENT_WORKER_MAX_JOBS": str(self.max_jobs),
+            "AGENT_WORKER_MAX_RSS_MB": str(self.max_rss_mb),
+        })
+        try:
+            self.log_path.parent.mkdir(parents=True, exist_ok=True)
+            # The child keeps its own handle to the log file
+            with open(self.log_path, "a", encoding="utf-8") as log_file:
+                process = await spawn_process(
+                    self.worker_cmd, cwd=str(PROJECT_ROOT), env=env, stdout_file=log_file, stderr_file=log_file,
+                )
+        except Exception as e:
+            self._start_failures += 1
+            self.stats["start_failures"] += 1
+            LOGGER.error("agent_worker_spawn_failed", extra={"error": str(e)})
+            return
+        worker = _Worker(worker_id, process)
+        self._workers[worker_id] = worker
+        self.stats["started"] += 1
+        self._watchers = [watcher for watcher in self._watchers if not watcher.done()]
+        self._watchers.append(asyncio.create_task(self._watch_worker(worker)))
+
+    async def _watch_worker(self, worker: _Worker) -> None:
+        """Enforce the start timeout, then handle the worker's exit."""
+        exit_task = asyncio.ensure_future(worker.process.wait())
+        ready_task = asyncio.ensure_future(worker.ready.wait())
+        done, _ = await asyncio.wait({exit_task, ready_task}, timeout=self.start_timeout, return_when=asyncio.FIRST_COMPLETED)
+        ready_task.cancel()
+        if not done:
+            LOGGER.error("agent_worker_start_timeout", extra={"worker_id": worker.worker_id, "timeout_seconds": self.start_timeout})
+            await worker.process.terminate()
+        returncode = await exit_task
+
+        self._workers.pop(worker.worker_id, None)
+        if worker.writer is not None:
+            worker.writer.close()
+        if not worker.ready.is_set():
+            self._start_failures += 1
+            self.stats["start_failures"] += 1
+            LOGGER.error("agent_worker_start_failed", extra={"worker_id": worker.worker_id, "return_code": returncode, "log": str(self.log_path)})
+        elif worker.job is not None:
+            # Died mid-job: the job ends with the worker's exit code
+            self.stats["crashed"] += 1
+            LOGGER.warning("agent_worker_died_during_job", extra={"worker_id": worker.worker_id, "job_id": worker.job.job_id, "return_code": returncode})
+            worker.job._finish(returncode if returncode else 1)
+            worker.job = None
+        elif worker.retiring:
+            self.stats["recycled"] += 1
+            LOGGER.info("agent_worker_recycled", extra={"worker_id": worker.worker_id, "jobs_done": worker.jobs_done})
+
+        if self._closing:
+            return
+        if self._start_failures >= MAX_CONSECUTIVE_START_FAILURES:
+            LOGGER.error("agent_worker_pool_degraded", extra={"start_failures": self._start_failures, "workers": len(self._workers)})
+            return
+        await self._spawn_worker()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Authenticate a worker's hello, then process its job results."""
+        worker: Optional[_Worker] = None
+        try:
+            hello = json.loads(await asyncio.wait_for(reader.readline(), timeout=self.start_timeout))
+            worker = self._workers.get(str(hello.get("worker_id")))
+            if worker is None or worker.writer is not None or not hmac.compare_digest(str(hello.get("token")), self._token):
+                LOGGER.warning("agent_worker_rejected", extra={"peer": str(writer.get_extra_info("peername"))})
+                worker = None
+                return
+            worker.writer = writer
+            worker.ready.set()
+            self._start_failures = 0
+            LOGGER.info(
+                "agent_worker_ready",
+                extra={"worker_id": worker.worker_id, "pid": hello.get("pid"), "warmup_seconds": hello.get("warmup_seconds")},
+            )
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                message = json.loads(line)
+                job = worker.job
+                if message.get("type") == "done" and job is not None and message.get("job_id") == job.job_id:
+                    worker.job = None
+                    worker.jobs_done += 1
+                    if message.get("recycle"):
+                        worker.retiring = True
+                    job._finish(int(message.get("returncode", 1)))
+        except (asyncio.TimeoutError, ConnectionError, ValueError) as e:
+            LOGGER.warning("agent_worker_channel_error", extra={"worker_id": worker.worker_id if worker else None, "error": str(e)})
+        finally:
+            if worker is None:
+                writer.close()
+
+    async def submit(self, args: List[str], stdout_path: Path, stderr_path: Path) -> Optional[PooledExecution]:
+        """
+        Run main.py arguments on an idle worker.
+
+        Args:
+            args: main.py command line arguments
+            stdout_path: Log file for the job's stdout
+            stderr_path: Log file for the job's stderr
+
+        Returns:
+            The running execution, or None if no worker is idle (caller starts a subprocess)
+        """
+        for worker in list(self._workers.values()):
+            if not worker.idle:
+                continue
+            job = PooledExecution(worker, uuid.uuid4().hex)
+            worker.job = job
+            message = {"type": "job", "job_id": job.job_id, "args": args, "stdout": str(stdout_path), "stderr": str(stderr_path)}
+            try:
+                worker.writer.write(json.dumps(message).encode("utf-8") + b"\n")
+                await worker.writer.drain()
+            except (ConnectionError, OSError) as e:
+                LOGGER.warning("agent_worker_submit_failed", extra={"worker_id": worker.worker_id, "error": str(e)})
+                worker.job = None
+                worker.retiring = True
+                continue
+            self.stats["jobs"] += 1
+            return job
+        self.stats["fallbacks"] += 1
+        return None
+
+    async def close(self) -> None:
+        """
+        Stop idle workers and the job channel.
+
+        Workers in the middle of a job finish it first (as detached subprocesses
+        would) and exit when they see the channel closed.
+        """
+        self._closing = True
+        for worker in list(self._workers.values()):
+            if worker.job is not None:
+                continue
+            if worker.writer is not None:
+                try:
+                    worker.writer.write(b'{"type": "shutdown"}\n')
+                    await worker.writer.drain()
+                except (ConnectionError, OSError):
+                    pass
+            else:
+                await worker.process.terminate()
+        for worker in list(self._workers.values()):
+            if worker.writer is not None:
+                worker.writer.close()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        for watcher in self._watchers:
+            watcher.cancel()
+        self._watchers.clear()
+
+
+_pool: Optional[AgentWorkerPool] = None
+
+
+def get_agent_worker_pool() -> AgentWorkerPool:
+    """Get the process-wide agent worker pool."""
+    global _pool
+    if _pool is None:
+        _pool = AgentWorkerPool(
+            size=settings.AGENT_WORKER_POOL_SIZE,
+            max_jobs=settings.AGENT_WORKER_MAX_JOBS,
+            max_rss_mb=settings.AGENT_WORKER_MAX_RSS_MB,
+            start_timeout=settings.AGENT_WORKER_START_TIMEOUT_SECONDS,
+        )
+    return _pool
@@ -0,0 +1,143 @@
+"""
+Heartbeat Service - Coalesced Device.last_seen writes
+
+Every installed add-on sends a heartbeat every few minutes. Writing last_seen per
+heartbeat turns that into one UPDATE + COMMIT per request; instead heartbeats are
+recorded in memory (latest timestamp per device) and flushed periodically:
+
+- PostgreSQL: UPDATE devices SET last_seen = hb.last_seen FROM (VALUES ...) AS hb
+  in chunks of HEARTBEAT_FLUSH_BATCH_SIZE rows
+- Other databases: one executemany UPDATE per chunk
+
+Revocation checks stay immediate (license_state_service); only the last_seen
+bookkeeping is deferred, by at most HEARTBEAT_FLUSH_INTERVAL_SECONDS.
+"""
+
+import asyncio
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import DateTime, Integer, bindparam, column, update, values
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.logging import get_logger
+from ..core.settings import settings
+from ..models.licensing import Device
+
+LOGGER = get_logger(__name__)
+
+
+class HeartbeatAggregator:
+    """
+    Collects device heartbeats in memory and writes them in bulk.
+
+    Args:
+        session_factory: Callable returning a new AsyncSession (AsyncSessionLocal)
+        flush_interval: Seconds between flushes when run() is active
+        batch_size: Devices per UPDATE statement
+    """
+
+    def __init__(self, session_factory, flush_interval: float = 15, batch_size: int = 1000):
+        self.session_factory = session_factory
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        # (tenant_id, device_id) -> latest heartbeat time (naive UTC, as stored)
+        self._pending: Dict[Tuple[int, int], datetime] = {}
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self.stats = {"recorded": 0, "flushed_rows": 0, "statements": 0, "failures": 0}
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    def record(self, tenant_id: int, device_id: int, seen_at: Optional[datetime] = None) -> None:
+        """Record a heartbeat (no I/O); repeated heartbeats of a device collapse into one row."""
+        seen_at = seen_at or datetime.utcnow()
+        key = (tenant_id, device_id)
+        previous = self._pending.get(key)
+        if previous is None or seen_at > previous:
+            self._pending[key] = seen_at
+        self.stats["recorded"] += 1
+
+    async def flush(self) -> int:
+        """
+        Write all pending heartbeats.
+
+        Rows that fail to write are put back (unless a newer heartbeat arrived)
+        and retried on the next flush.
+
+        Returns:
+            Number of devices written
+        """
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        async with self._flush_lock:
+            if not self._pending:
+                return 0
+            batch, self._pending = self._pending, {}
+            rows = [(device_id, tenant_id, seen_at) for (tenant_id, device_id), seen_at in batch.items()]
+            written = 0
+            try:
+                async with self.session_factory() as db:
+                    for start in range(0, len(rows), self.batch_size):
+                        await self._write_chunk(db, rows[start:start + self.batch_size])
+                        written += len(rows[start:start + self.batch_size])
+                    await db.commit()
+            except Exception as e:
+                self.stats["failures"] += 1
+                for key, seen_at in batch.items():
+                    newer = self._pending.get(key)
+                    if newer is None or newer < seen_at:
+                        self._pending[key] = seen_at
+                LOGGER.warning("heartbeat_flush_failed", extra={"devices": len(rows), "error": str(e)})
+                return 0
+            self.stats["flushed_rows"] += written
+            LOGGER.debug("heartbeat_flush", extra={"devices": written})
+            return written
+
+    async def _write_chunk(self, db: AsyncSession, rows: List[Tuple[int, int, datetime]]) -> None:
+        if db.bind.dialect.name == "postgresql":
+            heartbeats = values(
+                column("id", Integer), column("tenant_id", Integer), column("last_seen", DateTime),
+                name="hb",
+            ).data(rows)
+            await db.execute(
+                update(Device)
+                .where(Device.id == heartbeats.c.id, Device.tenant_id == heartbeats.c.tenant_id)
+                .values(last_seen=heartbeats.c.last_seen)
+                .execution_options(synchronize_session=False)
+            )
+        else:
+            await db.execute(
+                update(Device.__table__)
+                .where(Device.__table__.c.id == bindparam("b_id"), Device.__table__.c.tenant_id == bindparam("b_tenant_id"))
+                .values(last_seen=bindparam("b_last_seen")),
+                [{"b_id": device_id, "b_tenant_id": tenant_id, "b_last_seen": seen_at} for device_id, tenant_id, seen_at in rows],
+            )
+        self.stats["statements"] += 1
+
+    async def run(self) -> None:
+        """Flush every flush_interval seconds until cancelled."""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    async def close(self) -> None:
+        """Final flush on shutdown."""
+        await self.flush()
+
+
+_aggregator: Optional[HeartbeatAggregator] = None
+
+
+def get_heartbeat_aggregator() -> HeartbeatAggregator:
+    """Get the process-wide heartbeat aggregator."""
+    global _aggregator
+    if _aggregator is None:
+        from ..core.db import AsyncSessionLocal
+        _aggregator = HeartbeatAggregator(
+            AsyncSessionLocal,
+            flush_interval=settings.HEARTBEAT_FLUSH_INTERVAL_SECONDS,
+            batch_size=settings.HEARTBEAT_FLUSH_BATCH_SIZE,
+        )
+    return _aggregator
@@ -0,0 +1,202 @@
+"""
+License State Service - In-memory license checks for the desktop add-on endpoints
+
+/licenses/policy and /licenses/heartbeat are called by every device every few
+minutes. Access tokens are signed by us and name the tenant and device, so the
+only per-device facts these endpoints need from the database are "does this
+device still exist?" and "has it been revoked?". Both are answered from
+in-memory device state:
+
+- mark_device_revoked(...) is called by every revocation path after commit, so
+  the change applies immediately in this worker
+- The state is reloaded from the database (one query over device ids) every
+  LICENSE_REVOCATION_REFRESH_SECONDS, which propagates revocations and
+  deletions made by other workers
+- A device missing from the state (registered since the last reload, or
+  deleted) is looked up once; unknown devices get 401 "device not found"
+
+Tenant entitlements (plan, quota, subscription state) are shared by all devices
+of a tenant and come from the response cache (tag tenant:<id>), so a policy
+request on the hot path needs no database round trip.
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, FrozenSet, Iterable, Optional
+
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from ..core.cache import get_response_cache, tenant_tag
+from ..core.logging import get_logger
+from ..core.settings import settings
+from ..models.licensing import Device, Subscription
+from ..schemas.licensing import Policy
+
+LOGGER = get_logger(__name__)
+
+
+class DeviceRevocationSet:
+    """
+    Revoked device IDs plus the (device -> tenant) map of active devices,
+    reloaded periodically and updated on revocation.
+
+    Args:
+        refresh_seconds: Max age of the set before the next lookup reloads it
+    """
+
+    def __init__(self, refresh_seconds: float):
+        self.refresh_seconds = refresh_seconds
+        self._revoked: FrozenSet[int] = frozenset()
+        # Active (existing, not revoked) device id -> tenant id
+        self._active: Dict[int, int] = {}
+        # Revocations applied locally since the last reload (kept across a reload that raced them)
+        self._pending: set = set()
+        self._loaded_at: Optional[float] = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded_at is not None
+
+    def is_revoked(self, device_id: int) -> bool:
+        return device_id in self._revoked or device_id in self._pending
+
+    def is_active(self, device_id: int, tenant_id: int) -> bool:
+        """Whether the device is known to exist for this tenant (and is not revoked)."""
+        return self._active.get(device_id) == tenant_id and not self.is_revoked(device_id)
+
+    def mark_active(self, device_id: int, tenant_id: int) -> None:
+        """Remember a device confirmed by a database lookup."""
+        self._active[device_id] = tenant_id
+
+    def mark_revoked(self, device_ids: Iterable[int]) -> None:
+        """Apply revocations committed by this worker immediately."""
+        self._pending.update(device_ids)
+
+    async def refresh(self, db: AsyncSession) -> None:
+        """Reload revoked and active device IDs from the database."""
+        pending_before = set(self._pending)
+        result = await db.execute(select(Device.id, Device.tenant_id, Device.is_revoked))
+        revoked, active = set(), {}
+        for device_id, tenant_id, is_revoked in result.all():
+            if is_revoked:
+                revoked.add(device_id)
+            else:
+                active[device_id] = tenant_id
+        self._revoked = frozenset(revoked)
+        self._active = active
+        # Revocations marked while the query ran may not be visible to it yet
+        self._pending -= pending_before
+        self._loaded_at = time.monotonic()
+        LOGGER.debug("device_revocation_set_refreshed", extra={"revoked": len(self._revoked)})
+
+    async def ensure_fresh(self, db: AsyncSession) -> None:
+        """Reload the set if it is older than refresh_seconds (concurrent callers share one reload)."""
+        if self._loaded_at is not None and time.monotonic() - self._loaded_at < self.refresh_seconds:
+            return
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if self._loaded_at is not None and time.monotonic() - self._loaded_at < self.refresh_seconds:
+                return
+            try:
+                await self.refresh(db)
+            except Exception as e:
+                if self._loaded_at is None:
+                    raise
+                # Keep serving the last known set; retry on the next request
+                LOGGER.warning("device_revocation_refresh_failed", extra={"error": str(e)})
+
+    def __len__(self) -> int:
+        return len(self._revoked | self._pending)
+
+
+_revocations: Optional[DeviceRevocationSet] = None
+
+
+def get_revocation_set() -> DeviceRevocationSet:
+    """Get the process-wide revoked device set."""
+    global _revocations
+    if _revocations is None:
+        _revocations = DeviceRevocationSet(settings.LICENSE_REVOCATION_REFRESH_SECONDS)
+    return _revocations
+
+
+def mark_device_revoked(*device_ids: int) -> None:
+    """Record committed device revocations (call after commit, alongside cache invalidation)."""
+    get_revocation_set().mark_revoked(device_ids)
+
+
+def parse_token_subject(identity: Dict[str, Any]) -> tuple:
+    """
+    Extract (tenant_id, device_id) from an access token's "tenant:<id>:device:<id>" subject.
+
+    Raises:
+        HTTPException: 401 if the subject is malformed
+    """
+    sub = identity.get("sub", "")
+    try:
+        _, tenant_id_str, _, device_id_str = sub.split(":")
+        return int(tenant_id_str), int(device_id_str)
+    except Exception:
+        raise HTTPException(401, "bad token subject")
+
+
+async def check_device_active(db: AsyncSession, device_id: int, tenant_id: int) -> None:
+    """
+    Reject revoked and unknown devices using the in-memory state.
+
+    Devices not in the state (registered since the last reload, or deleted) cost
+    one lookup; found devices are remembered until the next reload.
+
+    Raises:
+        HTTPException: 401 if the device is revoked or does not exist for the tenant
+    """
+    revocations = get_revocation_set()
+    await revocations.ensure_fresh(db)
+    if revocations.is_revoked(device_id):
+        raise HTTPException(401, "device revoked")
+    if revocations.is_active(device_id, tenant_id):
+        return
+
+    result = await db.execute(
+        select(Device.is_revoked).where(Device.id == device_id, Device.tenant_id == tenant_id)
+    )
+    is_revoked = result.scalar_one_or_none()
+    if is_revoked is None:
+        raise HTTPException(401, "device not found")
+    if is_revoked:
+        revocations.mark_revoked([device_id])
+        raise HTTPException(401, "device revoked")
+    revocations.mark_active(device_id, tenant_id)
+
+
+async def get_tenant_entitlements(db: AsyncSession, tenant_id: int):
+    """
+    Get a tenant's policy (plan, quota, subscription state), cached per tenant.
+
+    Returns:
+        CachedValue whose body is a Policy dict (ETag included)
+
+    Raises:
+        HTTPException: 403 if the tenant has no subscription
+    """
+    async def load_entitlements():
+        result = await db.execute(
+            select(Subscription).options(selectinload(Subscription.plan)).where(Subscription.tenant_id == tenant_id)
+        )
+        subs = result.scalar_one_or_none()
+        if not subs:
+            raise HTTPException(403, "subscription not found")
+        return Policy(
+            plan_name=subs.plan.name,
+            monthly_run_quota=subs.plan.monthly_run_quota,
+            subscription_state=subs.state.value,
+        ).model_dump()
+
+    return await get_response_cache().get_or_load(
+        f"policy:{tenant_id}", load_entitlements, tags=[tenant_tag(tenant_id)]
+    )
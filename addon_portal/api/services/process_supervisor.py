@@ -0,0 +1,188 @@
+"""
+Process Supervisor - Event-driven supervision of project execution subprocesses
+
+Replaces per-project polling (waitpid every 5 seconds, a DB session and progress
+query every minute, full log reads) with:
+
+- Exit awaiting: one daemon thread per child blocks in Popen.wait() and resolves a
+  future on the event loop - no polling. asyncio subprocesses are not used: they
+  need a ProactorEventLoop on Windows (psycopg requires SelectorEventLoop), and
+  their transports kill the child when closed, while project runs must survive an
+  API restart (the periodic completion check picks them up again).
+- Incremental log tailing: LogWatcher remembers its byte offset and only reads
+  and pattern-matches bytes appended since the last check.
+- Pushed progress: the child writes its task counts to HEARTBEAT_FILENAME in the
+  output folder on every process heartbeat (agents/task_tracking.py,
+  write_progress_heartbeat); a stall check is one stat plus reading new bytes.
+"""
+
+import asyncio
+import json
+import subprocess
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterable, List, Optional
+
+from ..core.logging import get_logger
+
+LOGGER = get_logger(__name__)
+
+# Written by the child process (keep in sync with agents/task_tracking.py)
+HEARTBEAT_FILENAME = ".execution_heartbeat.json"
+
+# Max bytes read from a log per check (the rest is picked up on the next check)
+MAX_TAIL_BYTES = 4 * 1024 * 1024
+
+
+class LogWatcher:
+    """
+    Offset-based tail of a log file that records the first match of each pattern.
+
+    Args:
+        path: Log file to watch
+        patterns: Substrings to look for
+        context_before: Lines kept before a match
+        context_after: Lines collected after a match
+    """
+
+    def __init__(self, path: Path, patterns: Iterable[str], context_before: int = 2, context_after: int = 5):
+        self.path = path
+        self.patterns = list(patterns)
+        self.context_after = context_after
+        self.offset = 0
+        self.matches: Dict[str, str] = {}  # pattern -> context of its first match
+        self._partial = ""
+        self._recent: Deque[str] = deque(maxlen=context_before)
+        self._collecting: List[List[Any]] = []  # [pattern, lines, remaining]
+
+    @property
+    def size(self) -> int:
+        try:
+            return self.path.stat().st_size
+        except OSError:
+            return 0
+
+    def read_new(self, final: bool = False) -> int:
+        """
+        Scan bytes appended since the last call (blocking; run in a thread).
+
+        Args:
+            final: Also process a trailing line without newline (process exited)
+
+        Returns:
+            Number of new bytes read
+        """
+        size = self.size
+        if size < self.offset:
+            # Truncated/recreated: start over
+            self.offset, self._partial = 0, ""
+        if size == self.offset and not (final and self._partial):
+            if final:
+                self._finish_collecting()
+            return 0
+        with open(self.path, "rb") as log_file:
+            log_file.seek(self.offset)
+            data = log_file.read(min(size - self.offset, MAX_TAIL_BYTES))
+        self.offset += len(data)
+        text = self._partial + data.decode("utf-8", errors="ignore")
+        lines = text.split("\n")
+        self._partial = lines.pop()
+        if final and self._partial:
+            lines.append(self._partial)
+            self._partial = ""
+        for line in lines:
+            self._feed(line)
+        if final:
+            self._finish_collecting()
+        return len(data)
+
+    def _feed(self, line: str) -> None:
+        for entry in self._collecting:
+            entry[1].append(line)
+            entry[2] -= 1
+        self._finish_collecting(only_done=True)
+        for pattern in self.patterns:
+            if pattern not in self.matches and pattern in line and not any(e[0] == pattern for e in self._collecting):
+                self._collecting.append([pattern, list(self._recent) + [line], self.context_after - 1])
+        self._finish_collecting(only_done=True)
+        self._recent.append(line)
+
+    def _finish_collecting(self, only_done: bool = False) -> None:
+        remaining = []
+        for pattern, lines, left in self._collecting:
+            if only_done and left > 0:
+                remaining.append([pattern, lines, left])
+            else:
+                self.matches[pattern] = "\n".join(lines)
+        self._collecting = remaining
+
+
+def read_heartbeat(output_folder: Path) -> Optional[Dict[str, Any]]:
+    """Latest progress snapshot pushed by the child, or None if it has not written one yet."""
+    try:
+        with open(output_folder / HEARTBEAT_FILENAME, "r", encoding="utf-8") as heartbeat_file:
+            return json.load(heartbeat_file)
+    except (OSError, ValueError):
+        return None
+
+
+class SupervisedProcess:
+    """A started project subprocess whose exit can be awaited."""
+
+    def __init__(self, process: subprocess.Popen):
+        self._process = process
+        self._exit: Optional[asyncio.Future] = None
+        self.pid = process.pid
+
+    @property
+    def returncode(self) -> Optional[int]:
+        return self._process.returncode
+
+    async def wait(self) -> int:
+        """Wait for exit without polling (safe to call from several tasks)."""
+        if self._process.returncode is not None:
+            return self._process.returncode
+        if self._exit is None:
+            loop = asyncio.get_running_loop()
+            self._exit = loop.create_future()
+            threading.Thread(
+                target=self._wait_in_thread, args=(loop, self._exit), name=f"wait-{self.pid}", daemon=True,
+            ).start()
+        # Shielded: a cancelled waiter must not cancel the shared future
+        return await asyncio.shield(self._exit)
+
+    def _wait_in_thread(self, loop: asyncio.AbstractEventLoop, exit_future: asyncio.Future) -> None:
+        returncode = self._process.wait()
+
+        def resolve() -> None:
+            if not exit_future.done():
+                exit_future.set_result(returncode)
+
+        try:
+            loop.call_soon_threadsafe(resolve)
+        except RuntimeError:
+            pass  # Loop already closed (API shutting down)
+
+    async def terminate(self, grace_seconds: float = 2) -> None:
+        """SIGTERM (TerminateProcess on Windows), then kill if still running after the grace period."""
+        if self.returncode is not None:
+            return
+        try:
+            self._process.terminate()
+        except ProcessLookupError:
+            return
+        try:
+            await asyncio.wait_for(self.wait(), timeout=grace_seconds)
+        except asyncio.TimeoutError:
+            try:
+                self._process.kill()
+            except ProcessLookupError:
+                pass
+            await self.wait()
+
+
+async def spawn_process(cmd: List[str], cwd: str, env: Dict[str, str], stdout_file, stderr_file) -> SupervisedProcess:
+    """Start a subprocess writing to the given log files."""
+    process = subprocess.Popen(cmd, stdout=stdout_file, stderr=stderr_file, cwd=cwd, env=env)
+    return SupervisedProcess(process)
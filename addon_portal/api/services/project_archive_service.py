@@ -0,0 +1,294 @@
+"""
+Project Archive Service - Streaming ZIP downloads of generated projects
+
+Generated projects can contain large asset trees, so archives are never built in
+memory. The ZIP is written through a non-seekable sink that hands out compressed
+chunks as they are produced; files are read PROJECT_ARCHIVE_CHUNK_BYTES at a time.
+The generators are synchronous and Starlette iterates them in its threadpool, so
+disk reads and compression stay off the event loop.
+
+Optional archive cache (PROJECT_ARCHIVE_CACHE_DIR): a stream is also written to
+<cache_dir>/<project_id>-<fingerprint>.zip, where the fingerprint hashes the
+archived file list (paths, sizes, mtimes). Later downloads of an unchanged output
+folder are served from that file with HTTP Range support (resumable downloads).
+"""
+
+import fnmatch
+import hashlib
+import os
+import re
+import zipfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+from ..core.logging import get_logger
+from ..core.settings import settings
+
+LOGGER = get_logger(__name__)
+
+# QA_Engineer: Exclude sensitive files from downloads (secrets, logs, etc.)
+EXCLUDED_PATTERNS = [
+    # Execution logs (contain system information, errors, secrets)
+    'execution_stdout.log',
+    'execution_stderr.log',
+    '*.log',
+    # Environment files (contain secrets, API keys, database credentials)
+    '.env',
+    '.env.local',
+    '.env.*',
+    '*.env',
+    # Cache directories (contain temporary data)
+    '.cache',
+    '.llm_cache',
+    '.research_cache',
+    '.coverage_reports',
+    # Git directories (not needed in downloads)
+    '.git',
+    '.github',
+    # Database files (may contain sensitive data)
+    '*.db',
+    '*.sqlite',
+    '*.sqlite3',
+    # Temporary files
+    '*.tmp',
+    '*.bak',
+    '__pycache__',
+    '*.pyc',
+]
+
+
+@dataclass(frozen=True)
+class ArchiveEntry:
+    """A file to include in a project archive."""
+    path: Path
+    arcname: str
+    size: int
+    mtime_ns: int
+
+
+def should_exclude_file(file_path: Path, output_folder: Path) -> bool:
+    """Check if file should be excluded from download."""
+    file_name = file_path.name
+    relative_path = file_path.relative_to(output_folder)
+    relative_str = str(relative_path).replace('\\', '/')
+
+    for pattern in EXCLUDED_PATTERNS:
+        # Exact filename match
+        if pattern == file_name:
+            return True
+        # Wildcard pattern match
+        if '*' in pattern:
+            if fnmatch.fnmatch(file_name, pattern) or fnmatch.fnmatch(relative_str, pattern):
+                return True
+        # Directory pattern (check if file is in excluded directory)
+        if pattern.startswith('.') and pattern in relative_str:
+            return True
+
+    # Exclude files in directories starting with '.'
+    return any(part.startswith('.') for part in relative_path.parts)
+
+
+def collect_entries(output_folder: Path) -> Tuple[List[ArchiveEntry], int]:
+    """
+    Scan an output folder for downloadable files (blocking; run in a thread).
+
+    Returns:
+        (entries sorted by arcname, number of excluded files)
+    """
+    entries: List[ArchiveEntry] = []
+    excluded = 0
+    for file_path in output_folder.rglob('*'):
+        try:
+            if not file_path.is_file():
+                continue
+            if should_exclude_file(file_path, output_folder):
+                excluded += 1
+                continue
+            stat = file_path.stat()
+        except OSError:
+            excluded += 1
+            continue
+        arcname = file_path.relative_to(output_folder).as_posix()
+        entries.append(ArchiveEntry(file_path, arcname, stat.st_size, stat.st_mtime_ns))
+    entries.sort(key=lambda entry: entry.arcname)
+    return entries, excluded
+
+
+def fingerprint_entries(entries: List[ArchiveEntry]) -> str:
+    """Hash of the archived file list; changes whenever a file is added, removed or modified."""
+    digest = hashlib.sha1()
+    for entry in entries:
+        digest.update(f"{entry.arcname}\0{entry.size}\0{entry.mtime_ns}\n".encode())
+    return digest.hexdigest()[:16]
+
+
+class _ChunkSink:
+    """Write-only, non-seekable file object collecting zipfile output for streaming."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def write(self, data: bytes) -> int:
+        if data:
+            self._chunks.append(bytes(data))
+            self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    @property
+    def pending(self) -> int:
+        return sum(len(chunk) for chunk in self._chunks)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def stream_zip(entries: List[ArchiveEntry], project_id: str, chunk_size: Optional[int] = None) -> Iterator[bytes]:
+    """
+    Yield a ZIP archive of entries chunk by chunk without buffering it whole.
+
+    Files that cannot be stat'ed, opened or read are skipped (as before) and
+    logged; all of that is checked before the entry's local header is written.
+    A read error further into a file aborts the stream instead, since the bytes
+    already sent cannot be taken back.
+    """
+    chunk_size = chunk_size or settings.PROJECT_ARCHIVE_CHUNK_BYTES
+    sink = _ChunkSink()
+    files_added = 0
+    with zipfile.ZipFile(sink, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+        for entry in entries:
+            source = None
+            try:
+                zinfo = zipfile.ZipInfo.from_file(entry.path, entry.arcname)
+                source = open(entry.path, 'rb')
+                block = source.read(chunk_size)
+            except OSError as e:
+                if source is not None:
+                    source.close()
+                LOGGER.warning(
+                    "download_skip_file",
+                    extra={"project_id": project_id, "file_path": str(entry.path), "error": str(e)},
+                )
+                continue
+            with source:
+                zinfo.compress_type = zipfile.ZIP_DEFLATED
+                with zip_file.open(zinfo, 'w', force_zip64=entry.size >= zipfile.ZIP64_LIMIT) as target:
+                    while block:
+                        target.write(block)
+                        if sink.pending >= chunk_size:
+                            yield sink.drain()
+                        block = source.read(chunk_size)
+            files_added += 1
+            data = sink.drain()
+            if data:
+                yield data
+    # Central directory is written on close
+    data = sink.drain()
+    if data:
+        yield data
+    LOGGER.info("download_zip_streamed", extra={"project_id": project_id, "files_added": files_added})
+
+
+def cached_archive_path(project_id: str, fingerprint: str) -> Optional[Path]:
+    """Path of the pre-built archive for this output folder state (None if caching is disabled)."""
+    if not settings.PROJECT_ARCHIVE_CACHE_DIR:
+        return None
+    safe_id = re.sub(r"[^A-Za-z0-9_.-]", "_", project_id)
+    return Path(settings.PROJECT_ARCHIVE_CACHE_DIR) / f"{safe_id}-{fingerprint}.zip"
+
+
+def _prune_stale_archives(archive_path: Path) -> None:
+    """Remove archives of older states of the same project."""
+    prefix = archive_path.name.rsplit('-', 1)[0] + '-'
+    for stale in archive_path.parent.glob(f"{prefix}*.zip"):
+        if stale != archive_path and stale.name.rsplit('-', 1)[0] + '-' == prefix:
+            try:
+                stale.unlink()
+            except OSError:
+                pass
+
+
+def stream_zip_to_cache(entries: List[ArchiveEntry], project_id: str, archive_path: Path) -> Iterator[bytes]:
+    """
+    Stream the archive while also writing it to the cache.
+
+    The file is written under a temporary name and only renamed into place once
+    complete, so an interrupted download never leaves a truncated cached archive.
+    """
+    archive_path.parent.mkdir(parents=True, exist_ok=True)
+    partial_path = archive_path.with_name(f"{archive_path.name}.{os.getpid()}.{id(entries)}.partial")
+    completed = False
+    try:
+        with open(partial_path, 'wb') as cache_file:
+            for chunk in stream_zip(entries, project_id):
+                cache_file.write(chunk)
+                yield chunk
+        os.replace(partial_path, archive_path)
+        completed = True
+        _prune_stale_archives(archive_path)
+        LOGGER.info("download_archive_cached", extra={"project_id": project_id, "archive": str(archive_path)})
+    finally:
+        if not completed:
+            try:
+                partial_path.unlink()
+            except OSError:
+                pass
+
+
+def build_cached_archive(entries: List[ArchiveEntry], project_id: str, archive_path: Path) -> Path:
+    """Build the cached archive completely (blocking; run in a thread)."""
+    for _ in stream_zip_to_cache(entries, project_id, archive_path):
+        pass
+    return archive_path
+
+
+def parse_range(range_header: Optional[str], total_size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single "bytes=start-end" range.
+
+    Returns:
+        (start, end) inclusive, or None if the header is absent or not a single byte range
+
+    Raises:
+        ValueError: If the range cannot be satisfied
+    """
+    if not range_header:
+        return None
+    match = re.fullmatch(r"\s*bytes\s*=\s*(\d*)\s*-\s*(\d*)\s*", range_header)
+    if not match or (not match.group(1) and not match.group(2)):
+        return None
+    start_str, end_str = match.groups()
+    if not start_str:
+        # Suffix range: last N bytes
+        length = int(end_str)
+        if length == 0:
+            raise ValueError("empty suffix range")
+        return max(total_size - length, 0), total_size - 1
+    start = int(start_str)
+    end = min(int(end_str), total_size - 1) if end_str else total_size - 1
+    if start >= total_size or start > end:
+        raise ValueError("range not satisfiable")
+    return start, end
+
+
+def iter_file_range(path: Path, start: int, end: int, chunk_size: Optional[int] = None) -> Iterator[bytes]:
+    """Yield bytes start..end (inclusive) of a file in chunks."""
+    chunk_size = chunk_size or settings.PROJECT_ARCHIVE_CHUNK_BYTES
+    remaining = end - start + 1
+    with open(path, 'rb') as source:
+        source.seek(start)
+        while remaining > 0:
+            block = source.read(min(chunk_size, remaining))
+            if not block:
+                break
+            remaining -= len(block)
+            yield block
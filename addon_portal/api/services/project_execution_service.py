@@ -1,11 +1,10 @@
 """Service for executing projects via main.py."""
 
-import subprocess
 import os
 import asyncio
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Optional, Union
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
@@ -14,6 +13,8 @@ from ..models.licensing import Tenant, Subscription, SubscriptionState
 from ..core.exceptions import InvalidOperationError
 from ..core.logging import get_logger
 from ..core.db import AsyncSessionLocal
+from .agent_worker_pool import PooledExecution, get_agent_worker_pool
+from .process_supervisor import LogWatcher, SupervisedProcess, read_heartbeat, spawn_process
 
 LOGGER = get_logger(__name__)
 
@@ -22,6 +23,34 @@ TENANT_PROJECTS_ROOT = Path(__file__).resolve().parents[3] / "Tenant_Projects"
 
 # Configuration for stuck project detection
 PROJECT_EXECUTION_TIMEOUT_HOURS = int(os.getenv("PROJECT_EXECUTION_TIMEOUT_HOURS", "24"))
+# Running projects are checked for progress this often (new log bytes, pushed heartbeat)
+PROJECT_STALL_CHECK_SECONDS = int(os.getenv("PROJECT_STALL_CHECK_SECONDS", "60"))
+# A project without progress this long that shows a STUCK_PATTERNS error loop is terminated
+PROJECT_STALL_TIMEOUT_MINUTES = int(os.getenv("PROJECT_STALL_TIMEOUT_MINUTES", "300"))
+
+# Fatal errors in stderr mark a run as failed
+FATAL_ERROR_PATTERNS = [
+    'SyntaxError',
+    'IndentationError',
+    'ImportError',
+    'ModuleNotFoundError',
+    'NameError',
+    'TypeError',
+    'AttributeError',
+    'FileNotFoundError',
+    'PermissionError',
+]
+# Repeated LLM failures / event loop errors indicate a run stuck in an error loop
+STUCK_PATTERNS = [
+    'LLM task breakdown failed',
+    'Event loop is closed',
+    'All providers failed',
+    'Task was destroyed but it is pending',
+]
+# Successful completion indicators in stdout
+COMPLETION_MARKERS = ["All tasks completed!", "completion_percentage': 100.0"]
+# Heartbeat fields whose change counts as progress
+HEARTBEAT_PROGRESS_KEYS = ("total_tasks", "completed", "failed", "in_progress")
 
 
 async def execute_project(
@@ -103,9 +132,7 @@ async def execute_project(
         raise InvalidOperationError(f"main.py not found at {main_py_path}")
     
     # Build command with project attributes
-    cmd = [
-        "python",
-        str(main_py_path),
+    main_args = [
         "--project-id", project.project_id,
         "--project-name", project.client_name,
         "--description", project.description or "",
@@ -113,6 +140,7 @@ async def execute_project(
         "--output-folder", str(output_folder),
         "--tenant-id", str(tenant_id),
     ]
+    cmd = ["python", str(main_py_path)] + main_args
     
     LOGGER.info(
         "project_execution_command",
@@ -142,26 +170,31 @@ async def execute_project(
         stderr_file = open(stderr_log, 'w', encoding='utf-8')
         
         try:
-            # Ensure .env file is found - set working directory to project root
-            project_root = Path(__file__).resolve().parents[3]
-            env = os.environ.copy()
-            # Ensure PYTHONPATH includes project root for imports
-            pythonpath = env.get("PYTHONPATH", "")
-            if pythonpath:
-                env["PYTHONPATH"] = f"{project_root}{os.pathsep}{pythonpath}"
-            else:
-                env["PYTHONPATH"] = str(project_root)
-            
-            process = subprocess.Popen(
-                cmd,
-                stdout=stdout_file,
-                stderr=stderr_file,
-                cwd=str(project_root),  # Run from project root so .env is found
-                env=env,  # Pass environment variables (including DB connection)
-            )
+            # Prefer a warm worker (main.py already imported); start a fresh process if none is idle
+            process = await get_agent_worker_pool().submit(main_args, stdout_log, stderr_log)
+            runner = "worker_pool" if process is not None else "subprocess"
+            if process is None:
+                # Ensure .env file is found - set working directory to project root
+                project_root = Path(__file__).resolve().parents[3]
+                env = os.environ.copy()
+                # Ensure PYTHONPATH includes project root for imports
+                pythonpath = env.get("PYTHONPATH", "")
+                if pythonpath:
+                    env["PYTHONPATH"] = f"{project_root}{os.pathsep}{pythonpath}"
+                else:
+                    env["PYTHONPATH"] = str(project_root)
+                
+                process = await spawn_process(
+                    cmd,
+                    cwd=str(project_root),  # Run from project root so .env is found
+                    env=env,  # Pass environment variables (including DB connection)
+                    stdout_file=stdout_file,
+                    stderr_file=stderr_file,
+                )
             
-            # Don't close files - subprocess needs them open
-            # They'll be closed when subprocess terminates
+            # The child (or worker) holds its own copies of the log file descriptors
+            stdout_file.close()
+            stderr_file.close()
             
             LOGGER.info(
                 "project_execution_started",
@@ -169,6 +202,7 @@ async def execute_project(
                     "project_id": project.project_id,
                     "tenant_id": tenant_id,
                     "process_id": process.pid,
+                    "runner": runner,
                     "output_folder": str(output_folder),
                     "subscription_state": subscription.state.value,
                     "command": " ".join(cmd),
@@ -183,7 +217,7 @@ async def execute_project(
             
             # Start background task to monitor process completion
             asyncio.create_task(_monitor_process_completion(
-                process.pid,
+                process,
                 project.project_id,
                 tenant_id,
                 output_folder
@@ -196,8 +230,10 @@ async def execute_project(
             }
         except Exception as subprocess_error:
             # Close files if subprocess creation failed
-            stdout_file.close()
-            stderr_file.close()
+            if not stdout_file.closed:
+                stdout_file.close()
+            if not stderr_file.closed:
+                stderr_file.close()
             raise subprocess_error
     except Exception as e:
         # Update project status to failed
@@ -218,298 +254,149 @@ async def execute_project(
         raise InvalidOperationError(f"Failed to start project execution: {str(e)}")
 
 
+def _scan_execution_logs(
+    stderr_watch: LogWatcher,
+    stdout_watch: LogWatcher,
+    output_folder: Path,
+    final: bool = False,
+) -> tuple:
+    """Read new log bytes and the latest heartbeat (blocking; run in a thread).
+    
+    Returns:
+        (new log bytes, heartbeat dict or None)
+    """
+    new_bytes = 0
+    while True:
+        read = stderr_watch.read_new(final) + stdout_watch.read_new(final)
+        new_bytes += read
+        # While running, one bounded read per check is enough
+        if not final or read == 0:
+            break
+    return new_bytes, read_heartbeat(output_folder)
+
+
 async def _monitor_process_completion(
-    process_id: int,
+    process: Union[SupervisedProcess, PooledExecution],
     project_id: str,
     tenant_id: int,
     output_folder: Path
 ):
     """
-    Background task to monitor subprocess completion and update project status.
+    Background task to supervise a project subprocess and update project status.
+    
+    Awaits the process exit instead of polling it. Every PROJECT_STALL_CHECK_SECONDS
+    it scans only the newly written log bytes and reads the progress heartbeat the
+    child pushes; a process with no log output and unchanged task counts for
+    PROJECT_STALL_TIMEOUT_MINUTES whose stderr shows a known error loop is terminated.
     
     Args:
-        process_id: Process ID to monitor
+        process: Started subprocess
         project_id: Project ID
         tenant_id: Tenant ID
         output_folder: Output folder path
     """
+    process_id = process.pid
     try:
-        # Wait for process to complete (check every 5 seconds)
-        max_wait_time = 3600 * 24  # 24 hours max
-        check_interval = 5  # Check every 5 seconds
-        waited = 0
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + PROJECT_EXECUTION_TIMEOUT_HOURS * 3600
+        stderr_log = output_folder / "execution_stderr.log"
+        stdout_log = output_folder / "execution_stdout.log"
+        stderr_watch = LogWatcher(stderr_log, FATAL_ERROR_PATTERNS + STUCK_PATTERNS)
+        stdout_watch = LogWatcher(stdout_log, COMPLETION_MARKERS)
         
-        # Track progress to detect stuck processes
-        last_log_size = 0
-        last_task_count = 0
-        no_progress_count = 0
-        stuck_threshold = 300  # 5 minutes (60 checks * 5 seconds) with no progress
+        wait_task = asyncio.ensure_future(process.wait())
+        last_progress = None
+        last_progress_at = loop.time()
+        return_code = None
         
-        while waited < max_wait_time:
-            # Check for stuck process (no progress for extended period)
-            if waited > 60 and waited % 60 == 0:  # Check every minute
-                try:
-                    # Check log file size (indicates if process is writing)
-                    stderr_log = output_folder / "execution_stderr.log"
-                    current_log_size = stderr_log.stat().st_size if stderr_log.exists() else 0
-                    
-                    # Check task count
-                    db_check = AsyncSessionLocal()
-                    try:
-                        from ..services.agent_task_service import calculate_project_progress
-                        result = await db_check.execute(
-                            select(LLMProjectConfig).where(LLMProjectConfig.project_id == project_id)
-                        )
-                        project_check = result.scalar_one_or_none()
-                        if project_check and project_check.execution_started_at:
-                            task_stats = await calculate_project_progress(
-                                db_check,
-                                project_id,
-                                execution_started_at=project_check.execution_started_at
-                            )
-                            current_task_count = task_stats.get('total_tasks', 0)
-                        else:
-                            current_task_count = 0
-                    finally:
-                        await db_check.close()
-                    
-                    # Check if making progress
-                    if current_log_size == last_log_size and current_task_count == last_task_count:
-                        no_progress_count += 1
-                        if no_progress_count >= stuck_threshold:
-                            # Process is stuck - check for error patterns in logs
-                            if stderr_log.exists():
-                                try:
-                                    import aiofiles
-                                    async with aiofiles.open(stderr_log, 'r', encoding='utf-8', errors='ignore') as f:
-                                        log_content = await f.read()
-                                except ImportError:
-                                    with open(stderr_log, 'r', encoding='utf-8', errors='ignore') as f:
-                                        log_content = f.read()
-                                
-                                # Check for stuck patterns (repeated LLM failures, event loop errors)
-                                stuck_patterns = [
-                                    'LLM task breakdown failed',
-                                    'Event loop is closed',
-                                    'All providers failed',
-                                    'Task was destroyed but it is pending'
-                                ]
-                                
-                                if any(pattern in log_content for pattern in stuck_patterns):
-                                    # Process is stuck in error loop - terminate it
-                                    LOGGER.error(
-                                        "project_execution_stuck_detected",
-                                        extra={
-                                            "project_id": project_id,
-                                            "tenant_id": tenant_id,
-                                            "process_id": process_id,
-                                            "no_progress_minutes": no_progress_count,
-                                            "task_count": current_task_count,
-                                            "log_size": current_log_size,
-                                        }
-                                    )
-                                    # Try to terminate the process
-                                    try:
-                                        import platform
-                                        if platform.system() == "Windows":
-                                            try:
-                                                import psutil
-                                                proc = psutil.Process(process_id)
-                                                proc.terminate()
-                                                await asyncio.sleep(2)
-                                                if proc.is_running():
-                                                    proc.kill()
-                                            except (ImportError, psutil.NoSuchProcess):
-                                                pass
-                                        else:
-                                            import signal
-                                            os.kill(process_id, signal.SIGTERM)
-                                            await asyncio.sleep(2)
-                                            try:
-                                                os.kill(process_id, signal.SIGKILL)
-                                            except ProcessLookupError:
-                                                pass
-                                    except Exception as term_error:
-                                        LOGGER.warning(f"Could not terminate stuck process {process_id}: {term_error}")
-                                    
-                                    # Mark as failed and exit monitoring
-                                    return_code = -1
-                                    break
-                    else:
-                        # Progress detected - reset counter
-                        no_progress_count = 0
-                        last_log_size = current_log_size
-                        last_task_count = current_task_count
-                except Exception as progress_check_error:
-                    LOGGER.debug(f"Error checking progress: {progress_check_error}")
+        while return_code is None:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                LOGGER.error(
+                    "project_execution_timeout",
+                    extra={
+                        "project_id": project_id,
+                        "tenant_id": tenant_id,
+                        "process_id": process_id,
+                        "timeout_hours": PROJECT_EXECUTION_TIMEOUT_HOURS,
+                    }
+                )
+                await process.terminate()
+                return_code = -1
+                break
+            
+            done, _ = await asyncio.wait({wait_task}, timeout=min(PROJECT_STALL_CHECK_SECONDS, remaining))
+            if done:
+                return_code = wait_task.result()
+                break
             
-            # Check if process is still running
+            # Stall check: only new log bytes and the pushed heartbeat are read
             try:
-                # Use os.waitpid with WNOHANG to check without blocking
-                # On Windows, use psutil or check process handle
-                import platform
-                if platform.system() == "Windows":
-                    # Windows: Check if process exists
+                new_bytes, heartbeat = await asyncio.to_thread(
+                    _scan_execution_logs, stderr_watch, stdout_watch, output_folder
+                )
+                progress = tuple((heartbeat or {}).get(key) for key in HEARTBEAT_PROGRESS_KEYS)
+                if new_bytes or progress != last_progress:
+                    last_progress = progress
+                    last_progress_at = loop.time()
+                    continue
+                
+                stalled_minutes = (loop.time() - last_progress_at) / 60
+                stuck_pattern = next((p for p in STUCK_PATTERNS if p in stderr_watch.matches), None)
+                if stalled_minutes >= PROJECT_STALL_TIMEOUT_MINUTES and stuck_pattern:
+                    # Process is stuck in error loop - terminate it
+                    LOGGER.error(
+                        "project_execution_stuck_detected",
+                        extra={
+                            "project_id": project_id,
+                            "tenant_id": tenant_id,
+                            "process_id": process_id,
+                            "no_progress_minutes": int(stalled_minutes),
+                            "task_count": (heartbeat or {}).get("total_tasks"),
+                            "log_size": stderr_watch.offset,
+                            "pattern": stuck_pattern,
+                        }
+                    )
                     try:
-                        import psutil
-                        proc = psutil.Process(process_id)
-                        if proc.is_running():
-                            await asyncio.sleep(check_interval)
-                            waited += check_interval
-                            continue
-                        else:
-                            # Process finished
-                            return_code = proc.returncode
-                            break
-                    except ImportError:
-                        # psutil not available, use alternative method
-                        # On Windows, try to use subprocess.Popen.poll() approach
-                        # Since we don't have the process object, we'll use a simpler check
-                        try:
-                            # Try to open process handle to check if it exists
-                            import ctypes
-                            from ctypes import wintypes
-                            kernel32 = ctypes.windll.kernel32
-                            
-                            # Try to open process with PROCESS_QUERY_INFORMATION
-                            PROCESS_QUERY_INFORMATION = 0x0400
-                            handle = kernel32.OpenProcess(PROCESS_QUERY_INFORMATION, False, process_id)
-                            
-                            if handle:
-                                # Process exists - check if it's still running
-                                exit_code = wintypes.DWORD()
-                                if kernel32.GetExitCodeProcess(handle, ctypes.byref(exit_code)):
-                                    if exit_code.value == 259:  # STILL_ACTIVE
-                                        # Process still running
-                                        kernel32.CloseHandle(handle)
-                                        await asyncio.sleep(check_interval)
-                                        waited += check_interval
-                                        continue
-                                    else:
-                                        # Process finished
-                                        return_code = exit_code.value
-                                        kernel32.CloseHandle(handle)
-                                        break
-                                else:
-                                    # Can't get exit code - assume still running
-                                    kernel32.CloseHandle(handle)
-                                    await asyncio.sleep(check_interval)
-                                    waited += check_interval
-                                    continue
-                            else:
-                                # Process doesn't exist (handle open failed)
-                                # This usually means process finished
-                                return_code = 0
-                                break
-                        except Exception as win_error:
-                            # Fallback: Assume process finished if we can't check
-                            LOGGER.warning(f"Could not check Windows process {process_id}: {win_error}")
-                            return_code = 0
-                            break
-                    except (psutil.NoSuchProcess, psutil.AccessDenied):
-                        # Process doesn't exist or we can't access it
-                        return_code = -1
-                        break
-                else:
-                    # Unix: Use waitpid with WNOHANG
-                    pid, status = os.waitpid(process_id, os.WNOHANG)
-                    if pid == 0:
-                        # Process still running
-                        await asyncio.sleep(check_interval)
-                        waited += check_interval
-                        continue
-                    else:
-                        # Process finished
-                        return_code = os.WEXITSTATUS(status) if os.WIFEXITED(status) else -1
-                        break
-            except (ChildProcessError, ProcessLookupError):
-                # Process already finished
-                return_code = 0
-                break
-            except Exception as e:
-                LOGGER.warning(f"Error checking process {process_id}: {e}")
-                await asyncio.sleep(check_interval)
-                waited += check_interval
-                continue
+                        await process.terminate()
+                    except Exception as term_error:
+                        LOGGER.warning(f"Could not terminate stuck process {process_id}: {term_error}")
+                    
+                    # Mark as failed and exit monitoring
+                    return_code = -1
+                    break
+            except Exception as progress_check_error:
+                LOGGER.debug(f"Error checking progress: {progress_check_error}")
+        
+        if not wait_task.done():
+            wait_task.cancel()
         
         # Before updating status, check for errors in logs and verify task creation
-        stderr_log = output_folder / "execution_stderr.log"
-        stdout_log = output_folder / "execution_stdout.log"
+        # (only the log tails not yet scanned are read)
         has_errors = False
         error_message = None
-        has_tasks_completed = False
+        try:
+            await asyncio.to_thread(_scan_execution_logs, stderr_watch, stdout_watch, output_folder, True)
+        except Exception as log_error:
+            LOGGER.warning(
+                "could_not_read_execution_logs",
+                extra={
+                    "project_id": project_id,
+                    "stderr_log": str(stderr_log),
+                    "error": str(log_error),
+                }
+            )
         
         # Check stderr log for fatal errors (syntax errors, import errors, etc.)
-        if stderr_log.exists():
-            try:
-                try:
-                    import aiofiles
-                    async with aiofiles.open(stderr_log, 'r', encoding='utf-8', errors='ignore') as f:
-                        stderr_content = await f.read()
-                except ImportError:
-                    # Fallback to sync file I/O if aiofiles not available
-                    with open(stderr_log, 'r', encoding='utf-8', errors='ignore') as f:
-                        stderr_content = f.read()
-                
-                # Check for common fatal errors
-                fatal_errors = [
-                    'SyntaxError',
-                    'IndentationError',
-                    'ImportError',
-                    'ModuleNotFoundError',
-                    'NameError',
-                    'TypeError',
-                    'AttributeError',
-                    'FileNotFoundError',
-                    'PermissionError',
-                ]
-                for error_type in fatal_errors:
-                    if error_type in stderr_content:
-                        has_errors = True
-                        # Extract error message (first occurrence)
-                        lines = stderr_content.split('\n')
-                        for i, line in enumerate(lines):
-                            if error_type in line:
-                                # Get context (current line + next few lines)
-                                error_context = '\n'.join(lines[max(0, i-2):min(len(lines), i+5)])
-                                error_message = f"{error_type} detected in execution logs:\n{error_context[:500]}"
-                                break
-                        if error_message:
-                            break
-            except Exception as log_error:
-                LOGGER.warning(
-                    "could_not_read_stderr_log",
-                    extra={
-                        "project_id": project_id,
-                        "stderr_log": str(stderr_log),
-                        "error": str(log_error),
-                    }
-                )
+        for error_type in FATAL_ERROR_PATTERNS:
+            if error_type in stderr_watch.matches:
+                has_errors = True
+                error_context = stderr_watch.matches[error_type]
+                error_message = f"{error_type} detected in execution logs:\n{error_context[:500]}"
+                break
         
         # Check stdout log for successful completion message
-        if stdout_log.exists() and not has_errors:
-            try:
-                try:
-                    import aiofiles
-                    async with aiofiles.open(stdout_log, 'r', encoding='utf-8', errors='ignore') as f:
-                        stdout_content = await f.read()
-                except ImportError:
-                    # Fallback to sync file I/O if aiofiles not available
-                    with open(stdout_log, 'r', encoding='utf-8', errors='ignore') as f:
-                        stdout_content = f.read()
-                
-                # Check for successful completion indicators
-                if "All tasks completed!" in stdout_content or "completion_percentage': 100.0" in stdout_content:
-                    has_tasks_completed = True
-            except Exception as log_error:
-                LOGGER.warning(
-                    "could_not_read_stdout_log",
-                    extra={
-                        "project_id": project_id,
-                        "stdout_log": str(stdout_log),
-                        "error": str(log_error),
-                    }
-                )
+        has_tasks_completed = not has_errors and bool(stdout_watch.matches)
         
         # Check if any tasks were created for this run
         db = AsyncSessionLocal()
@@ -1151,6 +1038,8 @@ async def restart_project(
     
     # Delete all tasks associated with this project from previous runs
     # This ensures a clean slate for the restart
+    from .task_stats_service import remove_project_tasks
+    await remove_project_tasks(session, project.project_id)
     delete_stmt = delete(AgentTask).where(AgentTask.project_id == project.project_id)
     await session.execute(delete_stmt)
     
@@ -0,0 +1,664 @@
+"""
+Task Stats Service - Materialized agent_tasks rollup (agent_task_stats)
+
+Progress polling and dashboards used to aggregate agent_tasks on every request.
+This service keeps per-project and global counters in agent_task_stats instead:
+
+- apply_task_change: incremental update, called by agent_task_service in the
+  same transaction as the task write (atomic `x = x + delta` UPDATE of the
+  project row, locked before the sibling lookup so concurrent main/backup
+  writes of one logical task are counted once)
+- global counters are not updated in that transaction: every write would queue
+  on the one global row. Their deltas are buffered per process once the task
+  write commits and applied in one short UPDATE every
+  TASK_STATS_GLOBAL_FLUSH_SECONDS (and before a global read in this process);
+  deltas lost with a crashed process are repaired by reconciliation
+- get_project_progress / get_global_stats: single-row reads (get_projects_progress
+  reads many project rows in one query); a missing or stale row is rebuilt from
+  agent_tasks on first read (inserted only if still missing, never over a row
+  that increments are already maintaining)
+- reconcile_task_stats: periodic full rebuild that repairs drift (agents that
+  write agent_tasks directly, restarts, crashed transactions)
+"""
+
+import asyncio
+import threading
+from datetime import datetime, timezone
+from typing import Optional, Dict, Any, Iterable, List, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import event, select, update, delete, func, and_
+from sqlalchemy.orm import Session
+
+from ..models.agent_tasks import AgentTask, AgentTaskStats, GLOBAL_STATS_SCOPE
+from ..models.llm_config import LLMProjectConfig
+from ..core.logging import get_logger
+from ..core.settings import settings
+from .agent_task_service import (
+    LOGICAL_COUNTERS,
+    logical_task_flags,
+    summarize_project_tasks,
+    progress_from_counts,
+)
+
+LOGGER = get_logger(__name__)
+
+# agent_tasks.status -> raw counter column
+RAW_STATUS_COLUMNS = {
+    'pending': 'raw_pending',
+    'started': 'raw_in_progress',
+    'running': 'raw_in_progress',
+    'completed': 'raw_completed',
+    'failed': 'raw_failed',
+    'cancelled': 'raw_cancelled',
+}
+RAW_COUNTERS = (
+    "raw_total",
+    "raw_pending",
+    "raw_in_progress",
+    "raw_completed",
+    "raw_failed",
+    "raw_cancelled",
+    "duration_sum_seconds",
+    "duration_count",
+)
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Normalize to an aware UTC datetime (SQLite returns naive values)."""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _raw_delta(task: AgentTask, old_status: Optional[str]) -> Dict[str, float]:
+    """Raw counter changes for one task row moving from old_status to task.status."""
+    delta: Dict[str, float] = {}
+    if old_status is None:
+        delta["raw_total"] = 1
+    else:
+        old_column = RAW_STATUS_COLUMNS.get(old_status)
+        if old_column:
+            delta[old_column] = delta.get(old_column, 0) - 1
+    new_column = RAW_STATUS_COLUMNS.get(task.status)
+    if new_column:
+        delta[new_column] = delta.get(new_column, 0) + 1
+    if (
+        task.status == 'completed'
+        and old_status != 'completed'
+        and task.actual_duration_seconds is not None
+    ):
+        delta["duration_sum_seconds"] = float(task.actual_duration_seconds)
+        delta["duration_count"] = 1
+    return {column: value for column, value in delta.items() if value}
+
+
+def _raw_counts(rows: Iterable[Any]) -> Dict[str, float]:
+    """Raw counters from (status, count, duration_sum, duration_count) rows."""
+    counts: Dict[str, float] = {column: 0 for column in RAW_COUNTERS}
+    for status, count, duration_sum, duration_count in rows:
+        counts["raw_total"] += count or 0
+        column = RAW_STATUS_COLUMNS.get(status)
+        if column:
+            counts[column] += count or 0
+        counts["duration_sum_seconds"] += float(duration_sum or 0)
+        counts["duration_count"] += duration_count or 0
+    return counts
+
+
+def _raw_count_query():
+    completed_duration = and_(
+        AgentTask.status == 'completed',
+        AgentTask.actual_duration_seconds.isnot(None),
+    )
+    return select(
+        AgentTask.status,
+        func.count(AgentTask.id),
+        func.sum(AgentTask.actual_duration_seconds).filter(completed_duration),
+        func.count(AgentTask.id).filter(completed_duration),
+    )
+
+
+async def _increment(db: AsyncSession, scope: str, delta: Dict[str, float]) -> int:
+    """Add delta to an existing rollup row. Returns the number of rows updated."""
+    if not delta:
+        return 0
+    values = {column: getattr(AgentTaskStats, column) + value for column, value in delta.items()}
+    values["updated_at"] = datetime.now(timezone.utc)
+    result = await db.execute(
+        update(AgentTaskStats)
+        .where(AgentTaskStats.project_id == scope)
+        .values(values)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount or 0
+
+
+# Global counter deltas of committed task writes, per engine, not applied yet
+_SESSION_GLOBAL_DELTA_KEY = "task_stats_global_delta"
+_global_deltas: Dict[Any, Dict[str, float]] = {}
+_global_flushes: Dict[Any, "asyncio.Task"] = {}
+_global_lock = threading.Lock()
+
+
+def _merge_delta(target: Dict[str, float], delta: Dict[str, float]) -> None:
+    for column, value in delta.items():
+        target[column] = target.get(column, 0) + value
+
+
+def _defer_global_delta(db: AsyncSession, delta: Dict[str, float]) -> None:
+    """Hold delta on the session until its transaction commits (dropped on rollback)."""
+    if not delta:
+        return
+    engine, pending = db.info.setdefault(_SESSION_GLOBAL_DELTA_KEY, (db.bind, {}))
+    _merge_delta(pending, delta)
+    _schedule_global_flush(engine)
+
+
+@event.listens_for(Session, "after_commit")
+def _buffer_committed_global_delta(session: Session) -> None:
+    # Also fired when a savepoint is released; only the outermost commit counts
+    if session.in_nested_transaction():
+        return
+    engine, delta = session.info.pop(_SESSION_GLOBAL_DELTA_KEY, (None, None))
+    if delta:
+        with _global_lock:
+            _merge_delta(_global_deltas.setdefault(engine, {}), delta)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _drop_uncommitted_global_delta(session: Session, transaction) -> None:
+    # after_commit has already taken the delta of a committed transaction
+    if transaction.parent is None:
+        session.info.pop(_SESSION_GLOBAL_DELTA_KEY, None)
+
+
+def _take_global_deltas(engine) -> Dict[str, float]:
+    with _global_lock:
+        return {column: value for column, value in _global_deltas.pop(engine, {}).items() if value}
+
+
+def _schedule_global_flush(engine) -> None:
+    """Start a delayed flush of the engine's buffered global deltas unless one is pending."""
+    pending = _global_flushes.get(engine)
+    if pending is not None and not pending.done():
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    _global_flushes[engine] = loop.create_task(_flush_global_stats_later(engine))
+
+
+async def _flush_global_stats_later(engine) -> None:
+    try:
+        await asyncio.sleep(settings.TASK_STATS_GLOBAL_FLUSH_SECONDS)
+        await flush_global_stats(engine)
+    finally:
+        if _global_flushes.get(engine) is asyncio.current_task():
+            del _global_flushes[engine]
+
+
+async def flush_global_stats(engine) -> None:
+    """
+    Apply this process's buffered global counter deltas in one short transaction.
+
+    Deltas are dropped when the global row does not exist yet (it is built from
+    agent_tasks, which already includes them) and kept for the next flush if the
+    write fails.
+
+    Args:
+        engine: Async engine the task writes went to
+    """
+    delta = _take_global_deltas(engine)
+    if not delta:
+        return
+    try:
+        async with AsyncSession(engine) as writer:
+            await _increment(writer, GLOBAL_STATS_SCOPE, delta)
+            await writer.commit()
+    except Exception as e:
+        with _global_lock:
+            _merge_delta(_global_deltas.setdefault(engine, {}), delta)
+        LOGGER.warning("task_stats_global_flush_failed", extra={"error": str(e)})
+
+
+async def apply_task_change(db: AsyncSession, task: AgentTask, old_status: Optional[str]) -> None:
+    """
+    Apply one task creation/status change to the rollup rows.
+
+    Must run inside the caller's transaction, after the task has been flushed
+    (so it has an id) and before commit. Rows that do not exist yet are left
+    alone; they are built from agent_tasks on first read. Failures are logged and
+    rolled back to a savepoint so they never break the task write itself. The
+    global delta is only buffered once the caller commits (see flush_global_stats).
+
+    Args:
+        db: Database session holding the task write
+        task: Created or updated task (task.status is the new status)
+        old_status: Previous status, or None for a newly created task
+    """
+    if old_status == task.status:
+        return
+
+    try:
+        raw = _raw_delta(task, old_status)
+        _defer_global_delta(db, raw)
+        async with db.begin_nested():
+            # Row lock: a concurrent write of a sibling row waits here until this
+            # transaction commits, so its sibling lookup below sees this task
+            run_started_at = (await db.execute(
+                select(AgentTaskStats.run_started_at)
+                .where(AgentTaskStats.project_id == task.project_id)
+                .with_for_update()
+            )).scalar_one_or_none()
+            if run_started_at is None:
+                return
+
+            # Tasks from a previous run are not part of the project row
+            # (new tasks always belong to the current run; created_at is a server default)
+            if old_status is not None and _as_utc(task.created_at) < _as_utc(run_started_at):
+                return
+
+            # Other rows of the same logical task (main/backup agent duplicates)
+            sibling_statuses = list((await db.execute(
+                select(AgentTask.status).where(
+                    and_(
+                        AgentTask.project_id == task.project_id,
+                        AgentTask.task_name == task.task_name,
+                        AgentTask.agent_type == task.agent_type,
+                        AgentTask.created_at >= _as_utc(run_started_at),
+                        AgentTask.id != task.id,
+                    )
+                )
+            )).scalars().all())
+
+            before = logical_task_flags(sibling_statuses + ([old_status] if old_status else []))
+            after = logical_task_flags(sibling_statuses + [task.status])
+            delta = dict(raw)
+            for key in LOGICAL_COUNTERS:
+                if after[key] != before[key]:
+                    delta[key] = after[key] - before[key]
+            await _increment(db, task.project_id, delta)
+    except Exception as e:
+        LOGGER.warning(
+            "task_stats_incremental_update_failed",
+            extra={"task_id": task.task_id, "project_id": task.project_id, "error": str(e)},
+        )
+
+
+def _dialect_insert(db: AsyncSession):
+    """INSERT construct with ON CONFLICT support for the session's database, if any."""
+    dialect = db.bind.dialect.name
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+        return insert
+    if dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+        return insert
+    return None
+
+
+async def _store(db: AsyncSession, values: Dict[str, Any], overwrite: bool = False) -> None:
+    """
+    Write a rebuilt rollup row in its own session.
+
+    Read paths call this, so the caller's transaction (often read-only) is never
+    committed on its behalf. By default the row is only inserted when missing or
+    replaced when it belongs to another run: a current-run row is already kept
+    up to date by apply_task_change increments, and absolute values computed from
+    an earlier read would overwrite increments committed in between.
+    Reconciliation passes overwrite=True, since repairing the row is its job.
+    """
+    try:
+        async with AsyncSession(db.bind, expire_on_commit=False) as writer:
+            insert = _dialect_insert(writer)
+            if insert is None:
+                await writer.merge(AgentTaskStats(**values))
+            else:
+                statement = insert(AgentTaskStats).values(**values)
+                replacement = {key: statement.excluded[key] for key in values if key != "project_id"}
+                statement = statement.on_conflict_do_update(
+                    index_elements=[AgentTaskStats.project_id],
+                    set_=replacement,
+                    where=None if overwrite else AgentTaskStats.run_started_at.is_distinct_from(
+                        statement.excluded.run_started_at
+                    ),
+                )
+                await writer.execute(statement)
+            await writer.commit()
+    except Exception as e:
+        LOGGER.warning(
+            "task_stats_store_failed",
+            extra={"project_id": values.get("project_id"), "error": str(e)},
+        )
+
+
+def _project_values(
+    project_id: str,
+    run_started_at: datetime,
+    tasks: List[Any],
+    tenant_id: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Full rollup row values for one project from its current-run task rows."""
+    progress = summarize_project_tasks(tasks)
+    counts: Dict[str, Tuple[int, float, int]] = {}
+    for task in tasks:
+        count, duration_sum, duration_count = counts.get(task.status, (0, 0.0, 0))
+        if task.status == 'completed' and task.actual_duration_seconds is not None:
+            duration_sum += task.actual_duration_seconds
+            duration_count += 1
+        counts[task.status] = (count + 1, duration_sum, duration_count)
+    values = _raw_counts((status, *totals) for status, totals in counts.items())
+    values.update({key: progress[key] for key in LOGICAL_COUNTERS})
+    values.update({
+        "project_id": project_id,
+        "tenant_id": tenant_id,
+        "run_started_at": run_started_at,
+        "reconciled_at": datetime.now(timezone.utc),
+        "updated_at": datetime.now(timezone.utc),
+    })
+    return values
+
+
+async def rebuild_project_stats(
+    db: AsyncSession,
+    project_id: str,
+    execution_started_at: datetime,
+    tenant_id: Optional[int] = None,
+    overwrite: bool = False,
+) -> Dict[str, Any]:
+    """
+    Recompute a project's rollup row from agent_tasks and store it.
+
+    Args:
+        db: Database session (used for the read; the write uses its own session)
+        project_id: Project ID
+        execution_started_at: Start of the current run
+        tenant_id: Tenant owning the project (optional)
+        overwrite: Replace an existing current-run row (see _store)
+
+    Returns:
+        Progress dictionary (same shape as calculate_project_progress)
+    """
+    values = await _rebuild_project_values(db, project_id, execution_started_at, tenant_id, overwrite)
+    return progress_from_counts(values)
+
+
+async def _rebuild_project_values(
+    db: AsyncSession,
+    project_id: str,
+    execution_started_at: datetime,
+    tenant_id: Optional[int] = None,
+    overwrite: bool = False,
+) -> Dict[str, Any]:
+    """Recompute and store a project's rollup row; returns the row values."""
+    run_started_at = _as_utc(execution_started_at)
+    result = await db.execute(
+        select(
+            AgentTask.task_name,
+            AgentTask.agent_type,
+            AgentTask.status,
+            AgentTask.actual_duration_seconds,
+        ).where(
+            and_(
+                AgentTask.project_id == project_id,
+                AgentTask.created_at >= run_started_at,
+            )
+        )
+    )
+    values = _project_values(project_id, run_started_at, result.all(), tenant_id)
+    await _store(db, values, overwrite=overwrite)
+    return values
+
+
+async def get_project_progress(
+    db: AsyncSession,
+    project_id: str,
+    execution_started_at: datetime,
+) -> Dict[str, Any]:
+    """
+    Read a project's progress from its rollup row (one primary-key lookup).
+
+    The row is rebuilt from agent_tasks when it is missing or was built for a
+    different run (project restarted since).
+
+    Args:
+        db: Database session
+        project_id: Project ID
+        execution_started_at: Start of the current run
+
+    Returns:
+        Progress dictionary (same shape as calculate_project_progress)
+    """
+    row = (await db.execute(
+        select(AgentTaskStats)
+        .where(AgentTaskStats.project_id == project_id)
+        .execution_options(populate_existing=True)
+    )).scalar_one_or_none()
+    if row is not None and _as_utc(row.run_started_at) == _as_utc(execution_started_at):
+        return progress_from_counts(row)
+    return await rebuild_project_stats(db, project_id, execution_started_at)
+
+
+def _project_summary(values: Any) -> Dict[str, Any]:
+    """Progress dictionary plus the current run's average completed-task duration."""
+    get = values.get if isinstance(values, dict) else lambda key: getattr(values, key)
+    duration_count = int(get("duration_count") or 0)
+    summary = progress_from_counts(values)
+    summary["average_duration_seconds"] = (
+        float(get("duration_sum_seconds") or 0) / duration_count if duration_count else None
+    )
+    return summary
+
+
+async def get_projects_progress(db: AsyncSession, project_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Read current-run progress for many projects from their rollup rows (one query).
+
+    Rows that are missing or stale are rebuilt one by one, as in
+    get_project_progress. Unknown projects and projects that never started
+    get zero stats.
+
+    Args:
+        db: Database session
+        project_ids: Project IDs
+
+    Returns:
+        Project ID -> progress dictionary (same shape as calculate_project_progress)
+        plus average_duration_seconds
+    """
+    result = await db.execute(
+        select(LLMProjectConfig.project_id, LLMProjectConfig.execution_started_at, AgentTaskStats)
+        .outerjoin(AgentTaskStats, AgentTaskStats.project_id == LLMProjectConfig.project_id)
+        .where(LLMProjectConfig.project_id.in_(project_ids))
+        .execution_options(populate_existing=True)
+    )
+    progress = {project_id: _project_summary({}) for project_id in project_ids}
+    for project_id, execution_started_at, row in result.all():
+        if execution_started_at is None:
+            continue
+        if row is None or _as_utc(row.run_started_at) != _as_utc(execution_started_at):
+            row = await _rebuild_project_values(db, project_id, execution_started_at)
+        progress[project_id] = _project_summary(row)
+    return progress
+
+
+def _global_summary(values: Any) -> Dict[str, Any]:
+    get = values.get if isinstance(values, dict) else lambda key: getattr(values, key)
+    duration_count = int(get("duration_count") or 0)
+    return {
+        "total_tasks": int(get("raw_total") or 0),
+        "pending_tasks": int(get("raw_pending") or 0),
+        "in_progress_tasks": int(get("raw_in_progress") or 0),
+        "completed_tasks": int(get("raw_completed") or 0),
+        "failed_tasks": int(get("raw_failed") or 0),
+        "cancelled_tasks": int(get("raw_cancelled") or 0),
+        "average_duration_seconds": (
+            float(get("duration_sum_seconds") or 0) / duration_count if duration_count else None
+        ),
+    }
+
+
+async def rebuild_global_stats(db: AsyncSession, overwrite: bool = False) -> Dict[str, Any]:
+    """
+    Recompute the platform-wide rollup row from agent_tasks and store it.
+
+    Args:
+        db: Database session
+        overwrite: Replace an existing row (see _store)
+
+    Returns:
+        Global summary dictionary (see get_global_stats)
+    """
+    result = await db.execute(_raw_count_query().group_by(AgentTask.status))
+    values: Dict[str, Any] = _raw_counts(result.all())
+    values.update({
+        "project_id": GLOBAL_STATS_SCOPE,
+        "reconciled_at": datetime.now(timezone.utc),
+        "updated_at": datetime.now(timezone.utc),
+    })
+    await _store(db, values, overwrite=overwrite)
+    return _global_summary(values)
+
+
+async def get_global_stats(db: AsyncSession) -> Dict[str, Any]:
+    """
+    Read platform-wide task counters from the global rollup row.
+
+    Returns:
+        Dictionary with total_tasks, pending_tasks, in_progress_tasks, completed_tasks,
+        failed_tasks, cancelled_tasks (agent_tasks rows) and average_duration_seconds
+        (completed tasks, None when there are none)
+    """
+    await flush_global_stats(db.bind)
+    row = (await db.execute(
+        select(AgentTaskStats)
+        .where(AgentTaskStats.project_id == GLOBAL_STATS_SCOPE)
+        .execution_options(populate_existing=True)
+    )).scalar_one_or_none()
+    if row is not None:
+        return _global_summary(row)
+    return await rebuild_global_stats(db)
+
+
+async def remove_project_tasks(db: AsyncSession, project_id: str) -> None:
+    """
+    Take a project's agent_tasks rows out of the rollups before they are deleted.
+
+    Called by the restart path in the same transaction as the DELETE: subtracts the
+    project's rows from the global counters (buffered like apply_task_change) and
+    drops the project row (it is rebuilt for the new run on first read).
+
+    Args:
+        db: Database session holding the delete
+        project_id: Project whose tasks are about to be deleted
+    """
+    try:
+        async with db.begin_nested():
+            result = await db.execute(
+                _raw_count_query().where(AgentTask.project_id == project_id).group_by(AgentTask.status)
+            )
+            counts = _raw_counts(result.all())
+            await db.execute(delete(AgentTaskStats).where(AgentTaskStats.project_id == project_id))
+        _defer_global_delta(db, {column: -value for column, value in counts.items() if value})
+    except Exception as e:
+        LOGGER.warning(
+            "task_stats_project_reset_failed",
+            extra={"project_id": project_id, "error": str(e)},
+        )
+
+
+async def reconcile_task_stats(db: AsyncSession) -> Dict[str, int]:
+    """
+    Rebuild the global row and every running project's row from agent_tasks.
+
+    Rows of projects that are no longer running are only dropped if they belong
+    to an older run; otherwise they stay valid (their tasks no longer change).
+    Drift between the stored and rebuilt counters is logged.
+
+    Args:
+        db: Database session
+
+    Returns:
+        Dictionary with projects (rows rebuilt), drifted (rows that differed) and
+        removed (stale rows deleted)
+    """
+    # Apply buffered deltas first so they are not reported as drift
+    await flush_global_stats(db.bind)
+    stored = {
+        row.project_id: row
+        for row in (await db.execute(
+            select(AgentTaskStats).execution_options(populate_existing=True)
+        )).scalars().all()
+    }
+    drifted = 0
+
+    previous = stored.get(GLOBAL_STATS_SCOPE)
+    rebuilt_global = await rebuild_global_stats(db, overwrite=True)
+    if previous is not None and _global_summary(previous) != rebuilt_global:
+        drifted += 1
+        LOGGER.info(
+            "task_stats_drift",
+            extra={"project_id": GLOBAL_STATS_SCOPE, "stored": _global_summary(previous), "actual": rebuilt_global},
+        )
+
+    # One query for the current-run tasks of all running projects
+    projects = (await db.execute(
+        select(LLMProjectConfig.project_id, LLMProjectConfig.tenant_id, LLMProjectConfig.execution_started_at)
+        .where(LLMProjectConfig.execution_started_at.isnot(None))
+    )).all()
+    started = {project_id: (tenant_id, _as_utc(started_at)) for project_id, tenant_id, started_at in projects}
+    running_ids = set((await db.execute(
+        select(LLMProjectConfig.project_id).where(LLMProjectConfig.execution_status == 'running')
+    )).scalars().all())
+
+    tasks_by_project: Dict[str, List[Any]] = {project_id: [] for project_id in running_ids if project_id in started}
+    if tasks_by_project:
+        result = await db.execute(
+            select(
+                AgentTask.project_id,
+                AgentTask.task_name,
+                AgentTask.agent_type,
+                AgentTask.status,
+                AgentTask.actual_duration_seconds,
+                AgentTask.created_at,
+            )
+            .where(AgentTask.project_id.in_(list(tasks_by_project)))
+        )
+        for row in result.all():
+            if _as_utc(row.created_at) >= started[row.project_id][1]:
+                tasks_by_project[row.project_id].append(row)
+
+    for project_id, tasks in tasks_by_project.items():
+        tenant_id, run_started_at = started[project_id]
+        values = _project_values(project_id, run_started_at, tasks, tenant_id)
+        previous = stored.get(project_id)
+        if previous is not None and _as_utc(previous.run_started_at) == run_started_at:
+            stale = {
+                key: getattr(previous, key)
+                for key in LOGICAL_COUNTERS + RAW_COUNTERS
+                if getattr(previous, key) != values[key]
+            }
+            if stale:
+                drifted += 1
+                LOGGER.info("task_stats_drift", extra={"project_id": project_id, "stored": stale})
+        await _store(db, values, overwrite=True)
+
+    removed = [
+        project_id
+        for project_id, row in stored.items()
+        if project_id != GLOBAL_STATS_SCOPE
+        and project_id not in tasks_by_project
+        and (project_id not in started or _as_utc(row.run_started_at) != started[project_id][1])
+    ]
+    if removed:
+        try:
+            async with AsyncSession(db.bind) as writer:
+                await writer.execute(delete(AgentTaskStats).where(AgentTaskStats.project_id.in_(removed)))
+                await writer.commit()
+        except Exception as e:
+            LOGGER.warning("task_stats_cleanup_failed", extra={"error": str(e)})
+
+    return {"projects": len(tasks_by_project), "drifted": drifted, "removed": len(removed)}
@@ -2,8 +2,13 @@
 
 from __future__ import annotations
 
+import hashlib
 import secrets
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
+from typing import Optional
 
 from sqlalchemy import delete, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -27,6 +32,98 @@ SESSION_IDLE_TIMEOUT_MINUTES = 30
 SESSION_MAX_LIFETIME_HOURS = 24
 
 
+def _as_utc(value: datetime) -> datetime:
+    """Treat naive timestamps (SQLite) as UTC."""
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+
+
+@dataclass
+class CachedSession:
+    """A validated tenant session as seen by this worker."""
+    info: dict
+    expires_at: datetime
+    last_activity: datetime       # Latest request served by this worker
+    persisted_activity: datetime  # Latest last_activity written to the database
+    loaded_at: float              # time.monotonic() of the database load
+
+
+class SessionCache:
+    """Validated tenant sessions, keyed by SHA-256 of the session token.
+
+    Every portal page fires several API calls with the same session token. Cached
+    entries answer validate_session without a query for SESSION_CACHE_TTL_SECONDS;
+    only positive decisions are served from the cache - an entry that looks
+    expired or idle is always re-checked against the database.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, CachedSession]" = OrderedDict()
+
+    @staticmethod
+    def key(session_token: str) -> str:
+        return hashlib.sha256(session_token.encode()).hexdigest()
+
+    def get(self, token_key: str, include_stale: bool = False) -> Optional[CachedSession]:
+        entry = self._entries.get(token_key)
+        if entry is None:
+            return None
+        if not include_stale and time.monotonic() - entry.loaded_at >= self.ttl_seconds:
+            return None
+        self._entries.move_to_end(token_key)
+        return entry
+
+    def put(self, token_key: str, entry: CachedSession) -> None:
+        if self.max_entries <= 0 or self.ttl_seconds <= 0:
+            return
+        self._entries[token_key] = entry
+        self._entries.move_to_end(token_key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def discard(self, token_key: str) -> None:
+        self._entries.pop(token_key, None)
+
+    def discard_tenant(self, tenant_id: int) -> None:
+        for token_key in [k for k, e in self._entries.items() if e.info["tenant_id"] == tenant_id]:
+            del self._entries[token_key]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+session_cache = SessionCache(settings.SESSION_CACHE_TTL_SECONDS, settings.SESSION_CACHE_MAX_ENTRIES)
+
+
+def forget_session(session_token: str) -> None:
+    """Drop a session from this worker's cache (logout, refresh)."""
+    session_cache.discard(SessionCache.key(session_token))
+
+
+def forget_tenant_sessions(tenant_id: int) -> None:
+    """Drop all cached sessions of a tenant (tenant deleted)."""
+    session_cache.discard_tenant(tenant_id)
+
+
+async def _record_activity(session: AsyncSession, cached: CachedSession, now: datetime) -> None:
+    """Note a request; write last_activity only when it moved by the configured granularity."""
+    cached.last_activity = now
+    granularity = timedelta(seconds=settings.SESSION_ACTIVITY_GRANULARITY_SECONDS)
+    if now - cached.persisted_activity < granularity:
+        return
+    await session.execute(
+        update(TenantSession)
+        .where(TenantSession.id == cached.info["session_id"], TenantSession.last_activity < now)
+        .values(last_activity=now)
+        .execution_options(synchronize_session=False)
+    )
+    cached.persisted_activity = now
+
+
 async def generate_otp(tenant_slug: str, session: AsyncSession) -> None:
     """Generate, store, and send an OTP for tenant authentication.
     
@@ -190,6 +287,13 @@ async def verify_otp(tenant_slug: str, otp_code: str, session: AsyncSession) ->
 async def validate_session(session_token: str, session: AsyncSession) -> dict:
     """Validate session token and return tenant information.
     
+    Sessions are served from this worker's SessionCache when possible, and
+    last_activity is written at most once per SESSION_ACTIVITY_GRANULARITY_SECONDS.
+    Because other workers throttle their writes too, the stored last_activity may
+    lag the latest request by up to that granularity; the idle timeout therefore
+    expires a session no earlier than SESSION_IDLE_TIMEOUT_MINUTES after its last
+    request and at most one granularity later.
+    
     Args:
         session_token: Session token to validate.
         session: Database session.
@@ -201,6 +305,14 @@ async def validate_session(session_token: str, session: AsyncSession) -> dict:
         InvalidOperationError: If session is invalid or expired.
     """
     now = datetime.now(timezone.utc)
+    idle_timeout = timedelta(minutes=SESSION_IDLE_TIMEOUT_MINUTES)
+    granularity = timedelta(seconds=settings.SESSION_ACTIVITY_GRANULARITY_SECONDS)
+    token_key = SessionCache.key(session_token)
+    
+    cached = session_cache.get(token_key)
+    if cached is not None and cached.expires_at > now and cached.last_activity + idle_timeout >= now:
+        await _record_activity(session, cached, now)
+        return dict(cached.info)
     
     # Find session (eagerly load tenant to avoid lazy loading issues)
     result = await session.execute(
@@ -214,15 +326,18 @@ async def validate_session(session_token: str, session: AsyncSession) -> dict:
     tenant_session = result.scalar_one_or_none()
     
     if not tenant_session:
+        session_cache.discard(token_key)
         raise InvalidOperationError("Invalid or expired session.")
     
-    # Store old last_activity before updating (for idle timeout check)
-    old_last_activity = tenant_session.last_activity
+    # Check idle timeout using the last activity BEFORE this request; a stale cache
+    # entry of this worker may know of more recent activity than the database
+    old_last_activity = _as_utc(tenant_session.last_activity)
+    stale = session_cache.get(token_key, include_stale=True)
+    if stale is not None and stale.info["session_id"] == tenant_session.id:
+        old_last_activity = max(old_last_activity, stale.last_activity)
     
-    # Check idle timeout (30 minutes) using the OLD last_activity value
-    # This ensures we check if the user was idle BEFORE this request
-    idle_timeout = timedelta(minutes=SESSION_IDLE_TIMEOUT_MINUTES)
-    if old_last_activity + idle_timeout < now:
+    if old_last_activity + idle_timeout + granularity < now:
+        session_cache.discard(token_key)
         LOGGER.info(
             "session_idle_timeout",
             extra={
@@ -233,22 +348,28 @@ async def validate_session(session_token: str, session: AsyncSession) -> dict:
         )
         raise InvalidOperationError("Session expired due to inactivity.")
     
-    # Update last activity AFTER timeout check passes
-    # This extends the session for active users
-    tenant_session.last_activity = now
-    await session.flush()
-    
-    created_at = tenant_session.created_at
-    if created_at.tzinfo is None:
-        created_at = created_at.replace(tzinfo=timezone.utc)
+    created_at = _as_utc(tenant_session.created_at)
+    expires_at = _as_utc(tenant_session.expires_at)
     
-    return {
+    info = {
         "tenant_id": tenant_session.tenant_id,
         "tenant_slug": tenant_session.tenant.slug,
         "session_id": tenant_session.id,
         "expires_at": tenant_session.expires_at.isoformat(),
         "created_at": created_at.isoformat(),
     }
+    cached = CachedSession(
+        info=info,
+        expires_at=expires_at,
+        last_activity=old_last_activity,
+        persisted_activity=_as_utc(tenant_session.last_activity),
+        loaded_at=time.monotonic(),
+    )
+    # Update last activity AFTER timeout check passes (extends the session for active users)
+    await _record_activity(session, cached, now)
+    session_cache.put(token_key, cached)
+    
+    return dict(info)
 
 
 async def refresh_session(session_token: str, session: AsyncSession) -> dict:
@@ -276,6 +397,8 @@ async def refresh_session(session_token: str, session: AsyncSession) -> dict:
     tenant_session.expires_at = new_expires
     tenant_session.last_activity = now
     await session.flush()
+    # The next request reloads the session with its new expiry
+    forget_session(session_token)
     
     LOGGER.info(
         "session_refreshed",
@@ -299,6 +422,7 @@ async def logout(session_token: str, session: AsyncSession) -> None:
         session_token: Session token to invalidate.
         session: Database session.
     """
+    forget_session(session_token)
     result = await session.execute(
         select(TenantSession).where(TenantSession.session_token == session_token)
     )
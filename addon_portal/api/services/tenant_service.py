@@ -407,6 +407,10 @@ async def update_tenant(session: AsyncSession, slug: str, payload: TenantUpdateP
         LOGGER.error("tenant_update_failed", extra={"tenantId": tenant.id, "error": str(exc)})
         raise InvalidOperationError("Tenant update failed due to a database error.") from exc
 
+    # Branding/policy/usage responses for this tenant are cached
+    from ..core.cache import invalidate_tags, tenant_tag
+    await invalidate_tags(tenant_tag(tenant.id))
+
     # Log tenant update event (gracefully handle if table doesn't exist)
     if changes:
         try:
@@ -619,6 +623,10 @@ async def delete_tenant(session: AsyncSession, slug: str) -> None:
         LOGGER.info("revoked_activation_codes", extra={"tenantId": tenant_id})
 
         # Step 2: Revoke all active devices
+        result = await session.execute(
+            select(Device.id).where(Device.tenant_id == tenant_id, Device.is_revoked == False)
+        )
+        revoked_device_ids = list(result.scalars().all())
         await session.execute(
             update(Device)
             .where(Device.tenant_id == tenant_id, Device.is_revoked == False)
@@ -685,6 +693,13 @@ async def delete_tenant(session: AsyncSession, slug: str) -> None:
         await session.commit()
         LOGGER.info("tenant_deleted", extra={"tenantId": tenant_id, "slug": slug})
 
+        from ..core.cache import invalidate_tags, tenant_tag
+        from .license_state_service import mark_device_revoked
+        from .tenant_auth_service import forget_tenant_sessions
+        await invalidate_tags(tenant_tag(tenant_id))
+        mark_device_revoked(*revoked_device_ids)
+        forget_tenant_sessions(tenant_id)
+
     except SQLAlchemyError as exc:
         await session.rollback()
         LOGGER.error("tenant_delete_failed", extra={"tenantId": tenant_id, "error": str(exc)})
@@ -0,0 +1,145 @@
+"""
+SQL-side time bucketing for dashboard/analytics charts.
+
+Counts rows per calendar day in the configured server timezone (TIME_ZONE) inside
+the database, so chart endpoints fetch one row per day instead of every row of
+the table.
+
+- PostgreSQL: date_trunc('day', column AT TIME ZONE <server tz>); named timezones
+  (e.g. "America/New_York") are DST-aware, "UTC-5" style offsets are fixed
+- SQLite (development): date(column, '<offset> minutes') using the server
+  timezone's current UTC offset
+"""
+
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import Date, Interval, cast, func, literal, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .timezone_utils import get_server_timezone, get_timezone_offset_string
+
+
+def _is_timezone_aware(column: Any) -> bool:
+    return bool(getattr(column.type, "timezone", False))
+
+
+def _postgresql_zone() -> Any:
+    """Server timezone as a PostgreSQL AT TIME ZONE argument."""
+    server_tz = get_server_timezone()
+    zone_name = getattr(server_tz, "key", None) or getattr(server_tz, "zone", None)
+    if zone_name:
+        return literal(zone_name)
+    # Fixed offsets are passed as an INTERVAL: a string such as '-05:00' would be read
+    # as a POSIX zone, where the sign is inverted
+    offset = get_timezone_offset_string(server_tz)
+    if offset == "UTC":
+        return literal("UTC")
+    return cast(literal(offset), Interval)
+
+
+def local_day(column: Any, dialect_name: str) -> Any:
+    """
+    SQL expression for the server-timezone calendar day of a UTC timestamp column.
+
+    Args:
+        column: DateTime column; naive columns are assumed to hold UTC
+        dialect_name: Database dialect (db.bind.dialect.name)
+
+    Returns:
+        SQL expression evaluating to the local date
+    """
+    if dialect_name == "sqlite":
+        offset = get_server_timezone().utcoffset(datetime.now(timezone.utc)) or timedelta(0)
+        return func.date(column, f"{int(offset.total_seconds() // 60):+d} minutes")
+
+    utc_value = column if _is_timezone_aware(column) else func.timezone("UTC", column)
+    return cast(func.date_trunc("day", func.timezone(_postgresql_zone(), utc_value)), Date)
+
+
+def local_day_start(day: date, column: Optional[Any] = None) -> datetime:
+    """
+    UTC instant at which a server-timezone calendar day starts.
+
+    Args:
+        day: Calendar day in the server timezone
+        column: Column the bound is compared with; naive columns get a naive UTC value
+
+    Returns:
+        datetime usable as a range bound on the column (so its index can be used)
+    """
+    start = datetime.combine(day, time.min, tzinfo=get_server_timezone()).astimezone(timezone.utc)
+    if column is not None and not _is_timezone_aware(column):
+        return start.replace(tzinfo=None)
+    return start
+
+
+def _as_date(value: Any) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+async def count_by_local_day(
+    db: AsyncSession,
+    column: Any,
+    start_day: date,
+    end_day: date,
+    *criteria: Any,
+) -> Dict[date, int]:
+    """
+    Count rows per server-timezone day with a single GROUP BY query.
+
+    Args:
+        db: Database session
+        column: Timestamp column to bucket (e.g. ActivationCode.created_at)
+        start_day: First day (inclusive, server timezone)
+        end_day: Last day (inclusive, server timezone)
+        *criteria: Extra WHERE clauses (e.g. Device.is_revoked == False)
+
+    Returns:
+        Mapping of day -> row count (days without rows are omitted)
+    """
+    day = local_day(column, db.bind.dialect.name).label("day")
+    stmt = (
+        select(day, func.count().label("count"))
+        .where(
+            column >= local_day_start(start_day, column),
+            column < local_day_start(end_day + timedelta(days=1), column),
+            *criteria,
+        )
+        .group_by("day")
+    )
+    result = await db.execute(stmt)
+    return {_as_date(row.day): row.count for row in result.all()}
+
+
+def daily_series(
+    start_day: date,
+    end_day: date,
+    label_format: str = "%b %d",
+    **series: Dict[date, int],
+) -> List[Dict[str, Any]]:
+    """
+    Shape per-day counts into a zero-filled chart series.
+
+    Args:
+        start_day: First day (inclusive)
+        end_day: Last day (inclusive)
+        label_format: strftime format of each point's "date" label
+        **series: Name -> counts from count_by_local_day
+
+    Returns:
+        One dict per day: {"date": label, <name>: count, ...}
+    """
+    points = []
+    day = start_day
+    while day <= end_day:
+        point: Dict[str, Any] = {"date": day.strftime(label_format)}
+        for name, counts in series.items():
+            point[name] = counts.get(day, 0)
+        points.append(point)
+        day += timedelta(days=1)
+    return points
@@ -0,0 +1,46 @@
+-- Migration 011: Create Agent Task Statistics Rollup Table
+-- Purpose: Materialized per-project (and global) task counters so progress polling and
+--          dashboards read one row instead of aggregating agent_tasks on every request
+--
+-- Rows are maintained by agent_task_service in the same transaction as task writes and
+-- rebuilt periodically by the reconciliation job. Missing or stale rows are rebuilt on
+-- first read, so no backfill is required after running this migration.
+
+CREATE TABLE IF NOT EXISTS agent_task_stats (
+    project_id VARCHAR(100) PRIMARY KEY,  -- llm_project_config.project_id, or '__global__' for the platform row
+    tenant_id INTEGER REFERENCES tenants(id) ON DELETE CASCADE,
+    run_started_at TIMESTAMP WITH TIME ZONE,  -- execution_started_at the project row was built for
+
+    -- Logical task counters (task_name + agent_type), current run only
+    total_tasks INTEGER NOT NULL DEFAULT 0,
+    completed_tasks INTEGER NOT NULL DEFAULT 0,
+    failed_tasks INTEGER NOT NULL DEFAULT 0,
+    in_progress_tasks INTEGER NOT NULL DEFAULT 0,
+    pending_tasks INTEGER NOT NULL DEFAULT 0,
+    cancelled_tasks INTEGER NOT NULL DEFAULT 0,
+
+    -- Raw row counters
+    raw_total INTEGER NOT NULL DEFAULT 0,
+    raw_pending INTEGER NOT NULL DEFAULT 0,
+    raw_in_progress INTEGER NOT NULL DEFAULT 0,
+    raw_completed INTEGER NOT NULL DEFAULT 0,
+    raw_failed INTEGER NOT NULL DEFAULT 0,
+    raw_cancelled INTEGER NOT NULL DEFAULT 0,
+    duration_sum_seconds DOUBLE PRECISION NOT NULL DEFAULT 0,
+    duration_count INTEGER NOT NULL DEFAULT 0,
+
+    reconciled_at TIMESTAMP WITH TIME ZONE,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_agent_task_stats_tenant_id ON agent_task_stats(tenant_id);
+
+-- Sibling lookup used when maintaining logical task counters
+CREATE INDEX IF NOT EXISTS idx_agent_tasks_logical_task ON agent_tasks(project_id, task_name, agent_type);
+
+COMMENT ON TABLE agent_task_stats IS 'Materialized agent_tasks rollup: one row per project (current run) plus a global row';
+COMMENT ON COLUMN agent_task_stats.total_tasks IS 'Logical tasks (task_name + agent_type) in the current run';
+COMMENT ON COLUMN agent_task_stats.raw_total IS 'agent_tasks rows counted by this rollup';
+
+-- Grant permissions (adjust user as needed)
+-- GRANT ALL PRIVILEGES ON TABLE agent_task_stats TO q2o_user;
@@ -0,0 +1,7 @@
+-- Migration: Add created_at indexes for analytics time bucketing
+-- Purpose: Admin analytics/activation-trend endpoints count rows per day with a
+--          created_at range filter; these indexes keep the 1y view from scanning
+--          the whole activation_codes/devices tables
+
+CREATE INDEX IF NOT EXISTS ix_activation_codes_created_at ON activation_codes(created_at);
+CREATE INDEX IF NOT EXISTS ix_devices_created_at ON devices(created_at);
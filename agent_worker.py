@@ -0,0 +1,205 @@
+"""
+Agent Worker - warm, reusable runner for tenant portal project executions.
+
+Started by the API's AgentWorkerPool (addon_portal/api/services/agent_worker_pool.py)
+instead of a fresh `python main.py` per project. The worker imports main.py (all
+agents, LLM SDKs, task tracking models) once, connects back to the pool over a
+local TCP socket and then runs project jobs one at a time:
+
+    pool -> worker  {"type": "job", "job_id": ..., "args": [...], "stdout": path, "stderr": path}
+    worker -> pool  {"type": "done", "job_id": ..., "returncode": int, "recycle": bool}
+    pool -> worker  {"type": "shutdown"}
+
+Each job runs main.main() with the same arguments and exit codes as the
+subprocess. Job isolation:
+- stdout/stderr (file descriptors 1 and 2) are redirected to the job's log files
+- environment, working directory and sys.argv are restored afterwards
+- per-project singletons (load balancer, git manager, template fast path metrics) are reset
+
+The worker exits (and the pool starts a replacement) after AGENT_WORKER_MAX_JOBS
+jobs or when its memory exceeds AGENT_WORKER_MAX_RSS_MB, and when the pool goes
+away. A job that is running when the API shuts down is finished first.
+"""
+
+import json
+import os
+import socket
+import sys
+import time
+import traceback
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parent
+
+# Module-level singletons bound to one project's workspace: (module, attribute)
+PER_JOB_SINGLETONS: List[Tuple[str, str]] = [
+    ("utils.load_balancer", "_load_balancer"),
+    ("utils.git_manager", "_git_manager"),
+    ("utils.template_fast_path", "_template_fast_path"),
+]
+
+
+def current_rss_mb() -> Optional[float]:
+    """Resident memory of this process in MiB (None if it cannot be determined)."""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    except ImportError:
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    # Peak RSS: KiB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def warm_up() -> float:
+    """Import the agent system and shared clients once; returns seconds spent."""
+    started = time.perf_counter()
+    os.chdir(PROJECT_ROOT)
+    if str(PROJECT_ROOT) not in sys.path:
+        sys.path.insert(0, str(PROJECT_ROOT))
+    import main  # noqa: F401 - loads .env and imports every agent module
+    try:
+        from utils.llm_service import get_llm_service
+        get_llm_service()
+    except Exception as e:
+        print(f"[WARNING] LLM service warm-up failed (created on first use instead): {e}", flush=True)
+    try:
+        from utils.template_renderer import get_renderer
+        get_renderer().warm_up()
+    except Exception as e:
+        print(f"[WARNING] Template warm-up failed (compiled on first render instead): {e}", flush=True)
+    return time.perf_counter() - started
+
+
+def reset_per_job_state() -> None:
+    """Drop singletons that remember the previous project's workspace."""
+    for module_name, attribute in PER_JOB_SINGLETONS:
+        module = sys.modules.get(module_name)
+        if module is not None and hasattr(module, attribute):
+            instance = getattr(module, attribute)
+            close = getattr(instance, "close", None)
+            if callable(close):
+                try:
+                    close()
+                except Exception as e:
+                    print(f"[WARNING] Closing {module_name}.{attribute} failed: {e}", flush=True)
+            setattr(module, attribute, None)
+
+
+def run_job(job: Dict[str, Any]) -> int:
+    """
+    Run one project exactly like `python main.py <args>`.
+
+    Args:
+        job: Job message with args and stdout/stderr log paths
+
+    Returns:
+        Process-style exit code of the run
+    """
+    import main as agent_main
+
+    saved_env = dict(os.environ)
+    saved_argv = sys.argv
+    saved_cwd = os.getcwd()
+    sys.stdout.flush()
+    sys.stderr.flush()
+    saved_stdout_fd, saved_stderr_fd = os.dup(1), os.dup(2)
+    stdout_file = open(job["stdout"], "a", encoding="utf-8")
+    stderr_file = open(job["stderr"], "a", encoding="utf-8")
+    os.dup2(stdout_file.fileno(), 1)
+    os.dup2(stderr_file.fileno(), 2)
+    try:
+        sys.argv = [str(PROJECT_ROOT / "main.py")] + list(job["args"])
+        agent_main.main()
+        returncode = 0
+    except SystemExit as e:
+        if e.code is None:
+            returncode = 0
+        elif isinstance(e.code, int):
+            returncode = e.code
+        else:
+            print(e.code, file=sys.stderr)
+            returncode = 1
+    except BaseException:
+        traceback.print_exc()
+        returncode = 1
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os.dup2(saved_stdout_fd, 1)
+        os.dup2(saved_stderr_fd, 2)
+        os.close(saved_stdout_fd)
+        os.close(saved_stderr_fd)
+        stdout_file.close()
+        stderr_file.close()
+        sys.argv = saved_argv
+        os.chdir(saved_cwd)
+        os.environ.clear()
+        os.environ.update(saved_env)
+        reset_per_job_state()
+    return returncode
+
+
+def serve(address: str, token: str, worker_id: str, max_jobs: int, max_rss_mb: int) -> int:
+    """Connect to the pool and run jobs until shutdown, recycling or pool loss."""
+    warmup_seconds = warm_up()
+    host, port = address.rsplit(":", 1)
+    with socket.create_connection((host, int(port))) as connection:
+        channel = connection.makefile("rwb")
+
+        def send(message: Dict[str, Any]) -> None:
+            channel.write(json.dumps(message).encode("utf-8") + b"\n")
+            channel.flush()
+
+        send({
+            "type": "hello",
+            "token": token,
+            "worker_id": worker_id,
+            "pid": os.getpid(),
+            "warmup_seconds": round(warmup_seconds, 2),
+        })
+        print(f"[OK] Agent worker {worker_id} ready (warm-up {warmup_seconds:.1f}s)", flush=True)
+
+        jobs_done = 0
+        for line in channel:
+            message = json.loads(line)
+            if message.get("type") == "shutdown":
+                break
+            if message.get("type") != "job":
+                continue
+            started = time.perf_counter()
+            returncode = run_job(message)
+            jobs_done += 1
+            rss_mb = current_rss_mb()
+            recycle = jobs_done >= max_jobs > 0 or (max_rss_mb > 0 and rss_mb is not None and rss_mb >= max_rss_mb)
+            print(
+                f"[OK] Job {message.get('job_id')} finished with exit code {returncode} "
+                f"in {time.perf_counter() - started:.1f}s (jobs: {jobs_done}, rss: {rss_mb or 0:.0f} MiB)",
+                flush=True,
+            )
+            send({"type": "done", "job_id": message.get("job_id"), "returncode": returncode, "recycle": recycle})
+            if recycle:
+                break
+    return 0
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(serve(
+            address=os.environ["Q2O_WORKER_ADDRESS"],
+            token=os.environ.pop("Q2O_WORKER_TOKEN"),
+            worker_id=os.environ.get("Q2O_WORKER_ID", str(os.getpid())),
+            max_jobs=int(os.environ.get("AGENT_WORKER_MAX_JOBS", "20")),
+            max_rss_mb=int(os.environ.get("AGENT_WORKER_MAX_RSS_MB", "2048")),
+        ))
+    except KeyError as e:
+        print(f"Error: {e.args[0]} is not set - agent workers are started by the API worker pool", file=sys.stderr)
+        sys.exit(1)
+    except (ConnectionError, OSError) as e:
+        print(f"Agent worker lost its pool connection: {e}", file=sys.stderr)
+        sys.exit(1)
@@ -8,9 +8,9 @@ from typing import Dict, List, Optional, Any, TYPE_CHECKING
 from dataclasses import dataclass, field
 from enum import Enum
 from datetime import datetime
+import asyncio
 import logging
 import os
-from utils.event_loop_utils import create_compatible_event_loop
 
 if TYPE_CHECKING:
     from utils.project_layout import ProjectLayout
@@ -444,63 +444,34 @@ class BaseAgent(ABC):
     def _emit_task_started(self, task_id: str, task: Task):
         """Emit dashboard event for task started.
         
-        Uses background thread with its own event loop to avoid blocking
-        and prevent event loop conflicts. Fire-and-forget pattern.
+        Queued on the process-wide EventManager, which batches events onto the
+        dashboard's event loop; never blocks the agent. Fire-and-forget pattern.
         """
         try:
             from api.dashboard.events import get_event_manager
-            import asyncio
-            import threading
             
-            event_manager = get_event_manager()
-            
-            def emit_in_background():
-                """Emit events in background thread with its own event loop."""
-                try:
-                    # Create new event loop for this thread
-                    # Windows compatibility: Use SelectorEventLoop for psycopg async
-                    loop = create_compatible_event_loop()
-                    asyncio.set_event_loop(loop)
-                    
-                    try:
-                        loop.run_until_complete(event_manager.emit_task_update(
-                            task_id=task_id,
-                            status="in_progress",
-                            title=task.title,
-                            agent_id=self.agent_id,
-                            agent_type=self.agent_type.value,
-                            started_at=task.started_at.isoformat() if task.started_at else None,
-                            dependencies=task.dependencies,
-                            progress=0
-                        ))
-                    finally:
-                        loop.close()
-                        # Clean up event loop reference
-                        try:
-                            asyncio.set_event_loop(None)
-                        except Exception:
-                            pass
-                except Exception as e:
-                    self.logger.debug(f"Failed to emit task started event: {e}")
-            
-            # Run in background thread (fire-and-forget)
-            # Daemon thread ensures it doesn't block process shutdown
-            thread = threading.Thread(target=emit_in_background, daemon=True)
-            thread.start()
-        except Exception:
+            get_event_manager().publish_task_update(
+                task_id=task_id,
+                status="in_progress",
+                title=task.title,
+                agent_id=self.agent_id,
+                agent_type=self.agent_type.value,
+                started_at=task.started_at.isoformat() if task.started_at else None,
+                dependencies=task.dependencies,
+                progress=0
+            )
+        except Exception as e:
             # Fail silently if dashboard not available
-            pass
+            self.logger.debug(f"Failed to emit task started event: {e}")
     
     def _emit_task_complete(self, task_id: str, task: Task):
         """Emit dashboard event for task completed.
         
-        Uses background thread with its own event loop to avoid blocking
-        and prevent event loop conflicts. Fire-and-forget pattern.
+        Queued on the process-wide EventManager, which batches events onto the
+        dashboard's event loop; never blocks the agent. Fire-and-forget pattern.
         """
         try:
             from api.dashboard.events import get_event_manager
-            import asyncio
-            import threading
             
             event_manager = get_event_manager()
             
@@ -509,53 +480,27 @@ class BaseAgent(ABC):
             if task.started_at and task.completed_at:
                 duration = (task.completed_at - task.started_at).total_seconds()
             
-            def emit_in_background():
-                """Emit events in background thread with its own event loop."""
-                try:
-                    # Create new event loop for this thread
-                    # Windows compatibility: Use SelectorEventLoop for psycopg async
-                    loop = create_compatible_event_loop()
-                    asyncio.set_event_loop(loop)
-                    
-                    try:
-                        # Emit task update
-                        loop.run_until_complete(event_manager.emit_task_update(
-                            task_id=task_id,
-                            status="completed",
-                            title=task.title,
-                            agent_id=self.agent_id,
-                            agent_type=self.agent_type.value,
-                            started_at=task.started_at.isoformat() if task.started_at else None,
-                            completed_at=task.completed_at.isoformat() if task.completed_at else None,
-                            duration=duration,
-                            progress=100
-                        ))
-                        
-                        # Emit agent activity
-                        loop.run_until_complete(event_manager.emit_agent_activity(
-                            agent_id=self.agent_id,
-                            agent_type=self.agent_type.value,
-                            activity="task_completed",
-                            task_id=task_id,
-                            status="idle" if len(self.active_tasks) == 0 else "active"
-                        ))
-                    finally:
-                        loop.close()
-                        # Clean up event loop reference
-                        try:
-                            asyncio.set_event_loop(None)
-                        except Exception:
-                            pass
-                except Exception as e:
-                    self.logger.debug(f"Failed to emit task complete event: {e}")
-            
-            # Run in background thread (fire-and-forget)
-            # Daemon thread ensures it doesn't block process shutdown
-            thread = threading.Thread(target=emit_in_background, daemon=True)
-            thread.start()
-        except Exception:
+            event_manager.publish_task_update(
+                task_id=task_id,
+                status="completed",
+                title=task.title,
+                agent_id=self.agent_id,
+                agent_type=self.agent_type.value,
+                started_at=task.started_at.isoformat() if task.started_at else None,
+                completed_at=task.completed_at.isoformat() if task.completed_at else None,
+                duration=duration,
+                progress=100
+            )
+            event_manager.publish_agent_activity(
+                agent_id=self.agent_id,
+                agent_type=self.agent_type.value,
+                activity="task_completed",
+                task_id=task_id,
+                status="idle" if len(self.active_tasks) == 0 else "active"
+            )
+        except Exception as e:
             # Fail silently if dashboard not available
-            pass
+            self.logger.debug(f"Failed to emit task complete event: {e}")
     
     def safe_write_file(self, file_path: str, content: str, encoding: str = 'utf-8', create_dirs: bool = True) -> str:
         """
@@ -598,6 +543,38 @@ class BaseAgent(ABC):
             self.logger.error(f"Failed to write file '{file_path}': {e}")
             raise
     
+    async def generate_concurrently(self, items: List[Any], generate, label: str = "file") -> List[Any]:
+        """
+        Run an async generator coroutine for each item with bounded concurrency.
+        
+        Independent files of one task are generated in parallel, at most
+        CODE_GENERATION_CONCURRENCY (default 4) at a time so provider rate limits
+        are respected. Results come back in the order of items; a failed item
+        yields its exception in place instead of cancelling the others.
+        
+        Args:
+            items: Work items (e.g. file_info dicts or feature names)
+            generate: Async callable taking one item
+            label: Item name used in log messages
+            
+        Returns:
+            One result or exception per item, in input order
+        """
+        if not items:
+            return []
+        
+        semaphore = asyncio.Semaphore(max(1, int(os.getenv("CODE_GENERATION_CONCURRENCY", "4"))))
+        
+        async def run(item):
+            async with semaphore:
+                return await generate(item)
+        
+        results = await asyncio.gather(*(run(item) for item in items), return_exceptions=True)
+        failed = sum(1 for result in results if isinstance(result, BaseException))
+        if len(items) > 1:
+            self.logger.info(f"Generated {len(items) - failed}/{len(items)} {label}s concurrently")
+        return results
+    
     def _auto_commit_task(self, task: Task):
         """
         Automatically commit files created by completed task.
@@ -644,63 +621,35 @@ class BaseAgent(ABC):
     def _emit_task_failed(self, task_id: str, task: Task, error: str):
         """Emit dashboard event for task failed.
         
-        Uses background thread with its own event loop to avoid blocking
-        and prevent event loop conflicts. Fire-and-forget pattern.
+        Queued on the process-wide EventManager, which batches events onto the
+        dashboard's event loop; never blocks the agent. Fire-and-forget pattern.
         """
         try:
             from api.dashboard.events import get_event_manager
-            import asyncio
-            import threading
             
             event_manager = get_event_manager()
-            def emit_in_background():
-                """Emit events in background thread with its own event loop."""
-                try:
-                    # Create new event loop for this thread
-                    # Windows compatibility: Use SelectorEventLoop for psycopg async
-                    loop = create_compatible_event_loop()
-                    asyncio.set_event_loop(loop)
-                    
-                    try:
-                        # Emit task update
-                        loop.run_until_complete(event_manager.emit_task_update(
-                            task_id=task_id,
-                            status="failed",
-                            title=task.title,
-                            agent_id=self.agent_id,
-                            agent_type=self.agent_type.value,
-                            started_at=task.started_at.isoformat() if task.started_at else None,
-                            completed_at=task.completed_at.isoformat() if task.completed_at else None,
-                            error=error,
-                            progress=0
-                        ))
-                        
-                        # Emit agent activity
-                        loop.run_until_complete(event_manager.emit_agent_activity(
-                            agent_id=self.agent_id,
-                            agent_type=self.agent_type.value,
-                            activity="task_failed",
-                            task_id=task_id,
-                            error=error,
-                            status="idle" if len(self.active_tasks) == 0 else "active"
-                        ))
-                    finally:
-                        loop.close()
-                        # Clean up event loop reference
-                        try:
-                            asyncio.set_event_loop(None)
-                        except Exception:
-                            pass
-                except Exception as e:
-                    self.logger.debug(f"Failed to emit task failed event: {e}")
-            
-            # Run in background thread (fire-and-forget)
-            # Daemon thread ensures it doesn't block process shutdown
-            thread = threading.Thread(target=emit_in_background, daemon=True)
-            thread.start()
-        except Exception:
+            event_manager.publish_task_update(
+                task_id=task_id,
+                status="failed",
+                title=task.title,
+                agent_id=self.agent_id,
+                agent_type=self.agent_type.value,
+                started_at=task.started_at.isoformat() if task.started_at else None,
+                completed_at=task.completed_at.isoformat() if task.completed_at else None,
+                error=error,
+                progress=0
+            )
+            event_manager.publish_agent_activity(
+                agent_id=self.agent_id,
+                agent_type=self.agent_type.value,
+                activity="task_failed",
+                task_id=task_id,
+                error=error,
+                status="idle" if len(self.active_tasks) == 0 else "active"
+            )
+        except Exception as e:
             # Fail silently if dashboard not available
-            pass
+            self.logger.debug(f"Failed to emit task failed event: {e}")
 
     def assign_task(self, task: Task) -> bool:
         """
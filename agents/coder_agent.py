@@ -12,6 +12,7 @@ from typing import Dict, Any, List, Optional
 import os
 import logging
 import asyncio
+import time
 
 from agents.base_agent import BaseAgent, AgentType, Task, TaskStatus
 from agents.research_aware_mixin import ResearchAwareMixin
@@ -95,74 +96,83 @@ class CoderAgent(BaseAgent, ResearchAwareMixin):
         try:
             self.logger.info(f"Processing coding task: {task.title}")
             
-            # Load research results from dependencies
-            research_results = self.get_research_results(task)
+            # Template fast path: classified by the orchestrator, no research or LLM needed
+            implemented_files = None
+            if task.metadata.get("template_fast_path"):
+                implemented_files = self._implement_template_fast_path(task)
             
-            # Extract useful information from research
-            if research_results:
-                api_info = self.extract_api_info_from_research(research_results)
-                task.metadata['research_context'] = api_info
-                self.logger.info(f"Enriched task with research: {len(api_info.get('key_findings', []))} findings, "
-                               f"{len(api_info.get('code_examples', []))} examples")
+            if implemented_files is not None:
+                complexity = task.metadata.get("complexity", "medium")
+                code_structure = task.metadata["template_fast_path"]["code_structure"]
+            else:
+                # Load research results from dependencies
+                research_results = self.get_research_results(task)
             
-            # Extract task information
-            description = task.description
-            metadata = task.metadata
-            complexity = metadata.get("complexity", "medium")
-            objective = metadata.get("objective", task.title)
-            tech_stack = task.tech_stack or []
+                # Extract useful information from research
+                if research_results:
+                    api_info = self.extract_api_info_from_research(research_results)
+                    task.metadata['research_context'] = api_info
+                    self.logger.info(f"Enriched task with research: {len(api_info.get('key_findings', []))} findings, "
+                                   f"{len(api_info.get('code_examples', []))} examples")
             
-            # QA_Engineer: Use file_type from Orchestrator's LLM if available (preferred over keyword matching)
-            file_type_from_orchestrator = metadata.get("file_type", None)
-            if file_type_from_orchestrator:
-                self.logger.info(f"[ORCHESTRATOR] Using LLM-determined file_type: {file_type_from_orchestrator}")
-
-            # Generate code structure (with tech stack awareness)
-            # Pass file_type from Orchestrator if available
-            code_structure = self._plan_code_structure(
-                description, objective, complexity, tech_stack, 
-                file_type_hint=file_type_from_orchestrator
-            )
+                # Extract task information
+                description = task.description
+                metadata = task.metadata
+                complexity = metadata.get("complexity", "medium")
+                objective = metadata.get("objective", task.title)
+                tech_stack = task.tech_stack or []
             
-            # Implement the code (handles async if LLM enabled)
-            if self.llm_enabled:
-                # Run async implementation with proper event loop handling
-                try:
-                    # Check if we're already in async context
-                    loop = asyncio.get_running_loop()
-                    # Already in async - use run_coroutine_threadsafe or nest_asyncio
-                    # For now, fall back to sync mode to avoid conflicts
-                    self.logger.warning("Already in async context, using template-only mode for this call")
-                    implemented_files = self._implement_code(code_structure, task)
-                except RuntimeError:
-                    # No running loop - safe to create new one
-                    # Windows compatibility: Use SelectorEventLoop for psycopg async
-                    from utils.event_loop_utils import create_compatible_event_loop
-                    loop = create_compatible_event_loop()
-                    asyncio.set_event_loop(loop)
+                # QA_Engineer: Use file_type from Orchestrator's LLM if available (preferred over keyword matching)
+                file_type_from_orchestrator = metadata.get("file_type", None)
+                if file_type_from_orchestrator:
+                    self.logger.info(f"[ORCHESTRATOR] Using LLM-determined file_type: {file_type_from_orchestrator}")
+
+                # Generate code structure (with tech stack awareness)
+                # Pass file_type from Orchestrator if available
+                code_structure = self._plan_code_structure(
+                    description, objective, complexity, tech_stack, 
+                    file_type_hint=file_type_from_orchestrator
+                )
+            
+                # Implement the code (handles async if LLM enabled)
+                if self.llm_enabled:
+                    # Run async implementation with proper event loop handling
                     try:
-                        implemented_files = loop.run_until_complete(
-                            self._implement_code_async(code_structure, task)
-                        )
-                        # CRITICAL: Wait for all pending tasks to complete before closing loop
-                        pending = asyncio.all_tasks(loop)
-                        if pending:
-                            loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
-                    finally:
-                        # Only close loop after all tasks are complete
+                        # Check if we're already in async context
+                        loop = asyncio.get_running_loop()
+                        # Already in async - use run_coroutine_threadsafe or nest_asyncio
+                        # For now, fall back to sync mode to avoid conflicts
+                        self.logger.warning("Already in async context, using template-only mode for this call")
+                        implemented_files = self._implement_code(code_structure, task)
+                    except RuntimeError:
+                        # No running loop - safe to create new one
+                        # Windows compatibility: Use SelectorEventLoop for psycopg async
+                        from utils.event_loop_utils import create_compatible_event_loop
+                        loop = create_compatible_event_loop()
+                        asyncio.set_event_loop(loop)
                         try:
+                            implemented_files = loop.run_until_complete(
+                                self._implement_code_async(code_structure, task)
+                            )
+                            # CRITICAL: Wait for all pending tasks to complete before closing loop
                             pending = asyncio.all_tasks(loop)
-                            for task in pending:
-                                task.cancel()
                             if pending:
                                 loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
-                        except Exception:
-                            pass
                         finally:
-                            loop.close()
-            else:
-                # Traditional synchronous implementation
-                implemented_files = self._implement_code(code_structure, task)
+                            # Only close loop after all tasks are complete
+                            try:
+                                pending = asyncio.all_tasks(loop)
+                                for task in pending:
+                                    task.cancel()
+                                if pending:
+                                    loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+                            except Exception:
+                                pass
+                            finally:
+                                loop.close()
+                else:
+                    # Traditional synchronous implementation
+                    implemented_files = self._implement_code(code_structure, task)
             
             # Update task metadata
             task.metadata["implemented_files"] = implemented_files
@@ -425,6 +435,131 @@ class CoderAgent(BaseAgent, ResearchAwareMixin):
 
         return structure
 
+    @staticmethod
+    def _is_generic_template_output(file_type: str, code_content: str) -> bool:
+        """Whether built-in template output is too generic to use without the LLM."""
+        # Generic templates often have placeholder text or minimal content
+        return (
+            len(code_content.strip()) < 100 or  # Too short
+            "TODO" in code_content.upper() or  # Has TODOs
+            "PLACEHOLDER" in code_content.upper() or  # Has placeholders
+            code_content.count("pass") > 3 or  # Too many pass statements
+            (file_type == "generic" and len(code_content.strip()) < 500)  # Generic type with minimal content
+        )
+
+    def _file_task_description(self, file_type: str, file_info: Dict[str, Any], objective: str) -> str:
+        """Description a planned file is matched against learned templates with."""
+        return f"{file_type}: {file_info.get('description', objective)}"
+
+    def plan_template_fast_path(self, task: Task) -> Optional[Dict[str, Any]]:
+        """
+        Plan a coder task and resolve a template for each of its files (no LLM, no research).
+        
+        Called by the orchestrator before dispatch. A file is covered by a learned
+        template matching its description and tech stack, or by non-generic
+        built-in template output; "generic" files are never covered because their
+        built-in template uses research results.
+        
+        Args:
+            task: Coder task to classify
+            
+        Returns:
+            Plan ({"code_structure", "files": [{"path", "type", "source", "template_id"
+            or "content"}]}) if every file is covered, None otherwise; built-in
+            output is kept as "content" so it is not rendered again
+        """
+        metadata = task.metadata
+        objective = metadata.get("objective", task.title)
+        tech_stack = task.tech_stack or []
+        code_structure = self._plan_code_structure(
+            task.description, objective, metadata.get("complexity", "medium"), tech_stack,
+            file_type_hint=metadata.get("file_type")
+        )
+        if not code_structure["files"]:
+            return None
+        
+        planned_files = []
+        for file_info in code_structure["files"]:
+            file_type = file_info["type"]
+            planned = {"path": file_info["path"], "type": file_type}
+            
+            learned_template = None
+            if self.template_learning:
+                learned_template = self.template_learning.find_similar_template(
+                    self._file_task_description(file_type, file_info, objective), tech_stack
+                )
+            if learned_template:
+                planned.update(source="learned", template_id=learned_template.template_id)
+            elif file_type != "generic":
+                try:
+                    code_content = self._generate_code_content(file_type, file_info, objective, task)
+                except Exception:
+                    return None
+                if self._is_generic_template_output(file_type, code_content):
+                    return None
+                planned.update(source="builtin", content=code_content)
+            else:
+                return None
+            planned_files.append(planned)
+        
+        return {"code_structure": code_structure, "files": planned_files}
+
+    def _implement_template_fast_path(self, task: Task) -> Optional[List[str]]:
+        """
+        Write a fast-path task's files straight from their templates.
+        
+        Args:
+            task: Task carrying the orchestrator's plan in metadata["template_fast_path"]
+            
+        Returns:
+            Files created, or None if a learned template is gone (the caller then
+            runs the regular hybrid path with the task's research dependencies restored)
+        """
+        from utils.template_fast_path import get_template_fast_path
+        
+        router = get_template_fast_path()
+        started = time.perf_counter()
+        plan = task.metadata["template_fast_path"]
+        
+        contents = []
+        for planned in plan["files"]:
+            if planned["source"] == "learned":
+                learned_template = (
+                    self.template_learning.get_template_by_id(planned["template_id"])
+                    if self.template_learning else None
+                )
+                if learned_template is None:
+                    router.record_fallback(
+                        task, f"learned template {planned['template_id']} is gone", self._get_dependency_task
+                    )
+                    return None
+                contents.append(learned_template.template_content)
+            else:
+                # Rendered during classification
+                contents.append(planned["content"])
+        
+        implemented_files = []
+        for planned, code_content in zip(plan["files"], contents):
+            self.safe_write_file(planned["path"], code_content)
+            if planned["source"] == "learned":
+                self.template_learning.increment_usage(planned["template_id"])
+            # Written to disk; no need to keep file contents in task metadata
+            planned.pop("content", None)
+            implemented_files.append(planned["path"])
+        
+        learned = sum(1 for planned in plan["files"] if planned["source"] == "learned")
+        router.record_completion(
+            files=len(implemented_files),
+            learned=learned,
+            builtin=len(implemented_files) - learned,
+            seconds=time.perf_counter() - started
+        )
+        self.logger.info(
+            f"[FAST PATH] Generated {len(implemented_files)} files from templates "
+            f"({learned} learned, {len(implemented_files) - learned} built-in) without research or LLM"
+        )
+        return implemented_files
+
     async def _implement_code_async(self, code_structure: Dict[str, Any], task: Task) -> List[str]:
         """
         Implement code using HYBRID approach with LLM integration.
@@ -448,17 +583,25 @@ class CoderAgent(BaseAgent, ResearchAwareMixin):
         tech_stack = task.tech_stack or []
 
         for file_info in files_to_create:
-            file_path = file_info["path"]
-            file_type = file_info["type"]
-            full_path = os.path.join(self.workspace_path, file_path)
-            
             # Ensure directory exists
-            os.makedirs(os.path.dirname(full_path), exist_ok=True)
-            
-            # HYBRID GENERATION: Try multiple strategies
-            code_content = await self._generate_code_hybrid(
-                file_type, file_info, objective, task, tech_stack
+            os.makedirs(os.path.dirname(os.path.join(self.workspace_path, file_info["path"])), exist_ok=True)
+        
+        # HYBRID GENERATION: Try multiple strategies, for independent files in parallel
+        generated = await self.generate_concurrently(
+            files_to_create,
+            lambda file_info: self._generate_code_hybrid(
+                file_info["type"], file_info, objective, task, tech_stack
             )
+        )
+        
+        # Write in planned order so output does not depend on which generation finished first
+        failed_files = {}
+        for file_info, code_content in zip(files_to_create, generated):
+            file_path = file_info["path"]
+            if isinstance(code_content, BaseException):
+                self.logger.error(f"[ERROR] Failed to generate file {file_path}: {code_content}")
+                failed_files[file_path] = str(code_content)
+                continue
             
             # Write file using safe file writer (HARD GUARANTEE)
             # QA_Engineer: CRITICAL FIX - Verify file exists after write
@@ -477,6 +620,15 @@ class CoderAgent(BaseAgent, ResearchAwareMixin):
             except Exception as e:
                 self.logger.error(f"[ERROR] Failed to write file {file_path}: {e}")
                 raise
+        
+        if failed_files:
+            # Files that did generate are kept on disk; the task still fails so it is retried
+            task.metadata["implemented_files"] = implemented_files
+            task.metadata["failed_files"] = failed_files
+            raise ValueError(
+                f"Generated {len(implemented_files)}/{len(files_to_create)} files; failed: "
+                + "; ".join(f"{path}: {error}" for path, error in failed_files.items())
+            )
 
         return implemented_files
     
@@ -507,7 +659,7 @@ class CoderAgent(BaseAgent, ResearchAwareMixin):
         Returns:
             Generated code content
         """
-        task_desc = f"{file_type}: {file_info.get('description', objective)}"
+        task_desc = self._file_task_description(file_type, file_info, objective)
         
         # STEP 1: Check learned templates (FREE!)
         if self.template_learning:
@@ -526,14 +678,7 @@ class CoderAgent(BaseAgent, ResearchAwareMixin):
             code_content = self._generate_code_content(file_type, file_info, objective, task)
             
             # Check if template output is generic/insufficient
-            # Generic templates often have placeholder text or minimal content
-            is_generic = (
-                len(code_content.strip()) < 100 or  # Too short
-                "TODO" in code_content.upper() or  # Has TODOs
-                "PLACEHOLDER" in code_content.upper() or  # Has placeholders
-                code_content.count("pass") > 3 or  # Too many pass statements
-                (file_type == "generic" and len(code_content.strip()) < 500)  # Generic type with minimal content
-            )
+            is_generic = self._is_generic_template_output(file_type, code_content)
             
             if is_generic and self.llm_service:
                 # Template is generic - use LLM for better code generation
@@ -227,12 +227,30 @@ class MobileAgent(BaseAgent, ResearchAwareMixin):
         # Core app structure
         generated_files.extend(await self._generate_app_structure())
         
-        # Generate screens/components for each feature
-        for feature in features:
-            feature_files = await self._generate_feature_hybrid(
+        # Generate screens/components for each feature (independent, so in parallel)
+        feature_results = await self.generate_concurrently(
+            features,
+            lambda feature: self._generate_feature_hybrid(
                 feature, description, platforms, tech_stack, task
+            ),
+            label="feature"
+        )
+        failed_features = {}
+        for feature, feature_files in zip(features, feature_results):
+            if isinstance(feature_files, BaseException):
+                self.logger.error(f"Failed to generate feature {feature}: {feature_files}")
+                failed_features[feature] = str(feature_files)
+            else:
+                generated_files.extend(feature_files)
+        
+        if failed_features:
+            # Screens that did generate stay on disk; the task fails so it is retried
+            task.metadata["generated_files"] = generated_files
+            task.metadata["failed_features"] = failed_features
+            raise ValueError(
+                f"Generated {len(features) - len(failed_features)}/{len(features)} features; failed: "
+                + "; ".join(f"{feature}: {error}" for feature, error in failed_features.items())
             )
-            generated_files.extend(feature_files)
         
         # Generate navigation
         nav_files = await self._generate_navigation(features, tech_stack)
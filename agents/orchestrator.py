@@ -9,7 +9,7 @@ Enhanced with LLM task breakdown (Phase 2 - November 2025):
 - Falls back to rules-based logic if LLM unavailable
 """
 
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Callable
 from agents.base_agent import BaseAgent, AgentType, Task, TaskStatus
 import uuid
 import logging
@@ -59,6 +59,8 @@ class OrchestratorAgent(BaseAgent):
         )
         self.project_tasks: Dict[str, Task] = {}
         self.agents: Dict[AgentType, List[BaseAgent]] = {}
+        # Optional callable creating (and registering) the agents of a type on its first task
+        self.agent_factory: Optional[Callable[[AgentType], List[BaseAgent]]] = None
         self.task_queue: List[Task] = []
         self.max_task_size: int = 100  # Maximum size/complexity for a single task
         self.project_id = project_id
@@ -133,6 +135,9 @@ class OrchestratorAgent(BaseAgent):
         """
         self.logger.info(f"Breaking down project: {project_description}")
         
+        # Warm search results/pages for research while the (slow) breakdown runs
+        self._start_research_prefetch(objectives)
+        
         tasks = []
         task_counter = 1
 
@@ -156,6 +161,9 @@ class OrchestratorAgent(BaseAgent):
 
         self.logger.info(f"Created {len(tasks)} tasks from project breakdown")
         
+        # Tasks fully covered by templates skip research and LLM entirely
+        self._route_template_fast_path(tasks)
+        
         # QA_Engineer: If blueprint was created during task breakdown, log it
         if self.project_structure_blueprint:
             blueprint_count = len(self.project_structure_blueprint)
@@ -166,6 +174,72 @@ class OrchestratorAgent(BaseAgent):
         
         return tasks
 
+    def _route_template_fast_path(self, tasks: List[Task]):
+        """
+        Pre-dispatch classification of coder tasks onto the template fast path.
+        
+        A coder agent plans each coder task's files and resolves a template per
+        file; tasks where every file is covered lose their research dependencies
+        (see utils/template_fast_path.py). Never fails the breakdown.
+        
+        Args:
+            tasks: Tasks created by the breakdown
+        """
+        try:
+            from utils.template_fast_path import get_template_fast_path
+            
+            router = get_template_fast_path()
+            if not router.enabled or not any(t.agent_type == AgentType.CODER for t in tasks):
+                return
+            
+            coders = self.agents.get(AgentType.CODER) or []
+            if not coders and self.agent_factory is not None:
+                self.agent_factory(AgentType.CODER)
+                coders = self.agents.get(AgentType.CODER) or []
+            planner = next((agent for agent in coders if hasattr(agent, "plan_template_fast_path")), None)
+            if planner is None:
+                return
+            
+            routed = router.route(
+                tasks,
+                self.project_tasks,
+                planner.plan_template_fast_path,
+                lambda task: self._detect_objective_type(str(task.metadata.get("objective", task.title)).lower())
+            )
+            if routed:
+                self.logger.info(f"[FAST PATH] {len(routed)} coder tasks will be generated from templates only")
+        except Exception as e:
+            self.logger.warning(f"[FAST PATH] Template fast path classification skipped: {e}")
+
+    def _start_research_prefetch(self, objectives: List[str]):
+        """
+        Kick off background search and page fetches for the objectives' platforms/tech stack.
+        
+        Runs before task breakdown so research I/O overlaps with the LLM breakdown;
+        ResearcherAgent picks the results up from the prefetch store when its tasks run.
+        Never blocks and never fails the breakdown.
+        
+        Args:
+            objectives: Project objectives
+        """
+        try:
+            from utils.research_prefetcher import is_prefetch_enabled, get_research_prefetcher
+        except ImportError:
+            return
+        if not is_prefetch_enabled():
+            return
+        
+        try:
+            prefetcher = get_research_prefetcher()
+            queries = []
+            for objective in objectives:
+                objective_lower = objective.lower()
+                tech_stack = self._detect_tech_stack(objective_lower)
+                queries.extend(prefetcher.build_queries(objective, tech_stack))
+            prefetcher.prefetch(queries)
+        except Exception as e:
+            self.logger.warning(f"[PREFETCH] Research prefetch could not be started: {e}")
+
     def _analyze_objective(self, objective: str, context: str, start_counter: int) -> List[Task]:
         """
         Analyze an objective and break it into tasks (ENHANCED with LLM).
@@ -992,6 +1066,9 @@ Project Context: {context}
         """
         agent_type = task.agent_type
         
+        if (agent_type not in self.agents or not self.agents[agent_type]) and self.agent_factory is not None:
+            # Agents are created lazily, on the first task of their type
+            self.agent_factory(agent_type)
         if agent_type not in self.agents or not self.agents[agent_type]:
             self.logger.error(f"No agents available for type {agent_type.value}")
             return False
@@ -1204,6 +1281,15 @@ Project Context: {context}
             "completion_percentage": (completed / total_tasks * 100) if total_tasks > 0 else 0
         }
         
+        # Template fast path metrics (only once tasks were classified)
+        try:
+            from utils.template_fast_path import get_template_fast_path
+            fast_path_stats = get_template_fast_path().summary()
+            if fast_path_stats['classified']:
+                status["template_fast_path"] = fast_path_stats
+        except ImportError:
+            pass
+        
         # QA_Engineer: Clear completed/failed tasks from pending_missing_tasks
         self._clear_completed_missing_tasks()
         
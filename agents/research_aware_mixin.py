@@ -27,10 +27,16 @@ class ResearchAwareMixin:
                 past_research = self.query_global_research("Stripe API")
     """
     
+    # Code examples taken from artifact-backed research (matches what the researcher keeps inline)
+    ARTIFACT_CODE_EXAMPLE_LIMIT = 10
+    
     def get_research_results(self, task) -> List[Dict]:
         """
         Get research results from dependency tasks.
         
+        Results that were streamed to a research artifact are returned as lazy
+        ResearchArtifact views (dict-like, pages are only read when accessed).
+        
         Args:
             task: Current task with dependencies
             
@@ -52,7 +58,7 @@ class ResearchAwareMixin:
                     # Get from metadata
                     research_data = dep_task.metadata.get("research_results", {})
                     if research_data:
-                        research_results.append(research_data)
+                        research_results.append(self._research_view(research_data))
                     
                     # Also try to load from file if available
                     research_file = dep_task.metadata.get("research_file")
@@ -60,13 +66,58 @@ class ResearchAwareMixin:
                         try:
                             with open(research_file, 'r', encoding='utf-8') as f:
                                 file_data = json.load(f)
-                                research_results.append(file_data)
+                                research_results.append(self._research_view(file_data))
                         except Exception as e:
                             logger.warning(f"Could not load research file {research_file}: {e}")
         
         logger.info(f"Retrieved {len(research_results)} research results from dependencies")
         return research_results
     
+    def _research_view(self, research_data: Dict):
+        """Wrap results backed by a streaming artifact in a lazy view; pass others through."""
+        artifact_index = research_data.get("artifact_index")
+        if not artifact_index:
+            return research_data
+        
+        from utils.research_artifact import open_research_artifact
+        artifact = open_research_artifact(artifact_index, summary=research_data)
+        return artifact if artifact is not None else research_data
+    
+    @staticmethod
+    def _iter_research_items(research, key: str, artifact_limit: Optional[int] = None):
+        """
+        Iterate a list field of research results.
+        
+        Artifact-backed lists (search_results, code_examples, api_endpoints) are
+        streamed chunk by chunk instead of being loaded as a whole list.
+        """
+        if hasattr(research, 'iter_chunks'):
+            from utils.research_artifact import STREAMED_KEYS
+            return research.iter_chunks(STREAMED_KEYS[key], limit=artifact_limit)
+        return research.get(key, []) or []
+    
+    def get_research_snippets(self, task, keywords: List[str], limit: int = 5) -> List[Dict]:
+        """
+        Find short page excerpts mentioning keywords in dependency research.
+        
+        Streams artifact pages one at a time instead of loading full research.
+        
+        Args:
+            task: Current task with dependencies
+            keywords: Keywords to look for (e.g., ["refresh token", "webhook"])
+            limit: Maximum number of snippets
+            
+        Returns:
+            List of {'url', 'title', 'snippet'}
+        """
+        snippets = []
+        for research in self.get_research_results(task):
+            if hasattr(research, 'find_snippets'):
+                snippets.extend(research.find_snippets(keywords, limit=limit - len(snippets)))
+            if len(snippets) >= limit:
+                break
+        return snippets[:limit]
+    
     def _get_dependency_task(self, dep_id: str):
         """Get dependency task from orchestrator or registry.
         
@@ -122,14 +173,16 @@ class ResearchAwareMixin:
             # Documentation URLs
             api_info["documentation_urls"].extend(research.get("documentation_urls", []))
             
-            # Code examples
-            api_info["code_examples"].extend(research.get("code_examples", []))
+            # Code examples (artifact-backed research: only as many as are kept inline)
+            api_info["code_examples"].extend(
+                self._iter_research_items(research, "code_examples", artifact_limit=self.ARTIFACT_CODE_EXAMPLE_LIMIT)
+            )
             
             # Key findings
             api_info["key_findings"].extend(research.get("key_findings", []))
             
             # Parse search results for additional info
-            for result in research.get("search_results", []):
+            for result in self._iter_research_items(research, "search_results"):
                 snippet = result.get("snippet", "").lower()
                 url = result.get("url", "")
                 
@@ -30,7 +30,11 @@ import json
 import logging
 import time
 import hashlib
+import sqlite3
 import asyncio
+import threading
+import concurrent.futures
+from contextlib import closing
 from datetime import datetime, timedelta
 from pathlib import Path
 import re
@@ -45,9 +49,129 @@ except ImportError as e:
     LLM_INTEGRATION_AVAILABLE = False
 
 
+def clean_research_query(query: str) -> str:
+    """
+    Clean research query by removing instructions and extracting actual topic.
+    
+    Shared with the research prefetcher so both search the same query text.
+    
+    Args:
+        query: Raw query that may contain instructions
+        
+    Returns:
+        Cleaned research topic
+    """
+    if not query:
+        return query
+    
+    # Remove common instruction patterns
+    instruction_patterns = [
+        r'Follow every requirement below strictly\.?\s*',
+        r'Produce outputs that are detailed, actionable.*?\.\s*',
+        r'Do not skip or summarize sections unless instructed\.\s*',
+        r'Include code, diagrams, and deployment plans\.\s*',
+        r'Be architecturally sound, multistep\.\s*',
+    ]
+    
+    cleaned = query
+    for pattern in instruction_patterns:
+        cleaned = re.sub(pattern, '', cleaned, flags=re.IGNORECASE | re.DOTALL)
+    
+    # If query starts with instructions, try to find the actual topic
+    # Look for patterns like "Research: <topic>" or "Topic: <topic>"
+    topic_patterns = [
+        r'(?:research|topic|subject|about):\s*(.+?)(?:\n|$)',
+        r'research\s+(?:on|about|for)\s+(.+?)(?:\n|$)',
+    ]
+    
+    for pattern in topic_patterns:
+        match = re.search(pattern, cleaned, re.IGNORECASE)
+        if match:
+            cleaned = match.group(1).strip()
+            break
+    
+    # Remove leading/trailing whitespace and newlines
+    cleaned = cleaned.strip()
+    
+    # If cleaned query is too short or still looks like instructions, use original
+    if len(cleaned) < 10 or cleaned.lower().startswith(('follow', 'produce', 'do not', 'include')):
+        # Try to extract from context - look for the actual objective
+        # Split by common separators and take the first substantial part
+        parts = re.split(r'[.\n]', query)
+        for part in parts:
+            part = part.strip()
+            if len(part) > 20 and not part.lower().startswith(('follow', 'produce', 'do not', 'include', 'be thorough')):
+                return part
+    
+    return cleaned if cleaned else query
+
+
+def deep_research_queries(base_query: str, tech_stack: Optional[List[str]]) -> List[str]:
+    """
+    Generate additional queries for deep research, in the order they are searched.
+    
+    Shared with the research prefetcher, which warms the same queries.
+    
+    Args:
+        base_query: Base (cleaned) research query
+        tech_stack: The research task's tech stack
+        
+    Returns:
+        List of additional queries
+    """
+    queries = []
+    tech_stack = tech_stack or []
+    query_lower = base_query.lower()
+    
+    # Detect if this is a migration/platform research
+    is_migration = any(kw in query_lower for kw in ['migration', 'platform', 'api', 'integration'])
+    is_platform_specific = any(kw in query_lower for kw in ['sage', 'quickbooks', 'xero', 'netsuite', 'wave'])
+    
+    # Add tech-stack specific queries
+    for tech in tech_stack:
+        queries.append(f"{base_query} {tech} tutorial")
+    
+    # Add migration-specific deep queries
+    if is_migration:
+        queries.extend([
+            f"{base_query} API documentation",
+            f"{base_query} authentication guide",
+            f"{base_query} code examples Python",
+            f"{base_query} best practices",
+            f"{base_query} entity types data model"
+        ])
+    
+    # Add platform-specific deep queries
+    if is_platform_specific:
+        # Extract platform name
+        for platform in ['sage', 'quickbooks', 'xero', 'netsuite', 'wave', 'stripe']:
+            if platform in query_lower:
+                queries.extend([
+                    f"{platform} API reference",
+                    f"{platform} API entities",
+                    f"{platform} OAuth 2.0 setup",
+                    f"{platform} REST API examples",
+                    f"{platform} data export"
+                ])
+                break
+        if tech_stack:
+            queries.append(f"{base_query} {tech_stack[-1]} best practices")
+    
+    # Add specific aspect queries
+    queries.append(f"{base_query} documentation")
+    queries.append(f"{base_query} code examples")
+    queries.append(f"{base_query} latest version")
+    
+    return queries[:5]  # Limit to 5 additional queries
+
+
 class ResearchCache:
     """Cache for research results to avoid redundant searches."""
     
+    # Keys that point into one project's workspace (research/artifacts/<id>).
+    # The cache is shared across projects, so these never go in or come out.
+    WORKSPACE_LOCAL_KEYS = ('artifact_index',)
+    
     def __init__(self, cache_dir: str = ".research_cache", ttl_days: int = 90):
         """
         Initialize research cache.
@@ -102,7 +226,7 @@ class ResearchCache:
             similar_research = db.find_similar_research(query, limit=1)
             if similar_research:
                 logging.info(f"[OK] Found research in PostgreSQL for: {query}")
-                return similar_research[0]
+                return self._without_workspace_paths(similar_research[0])
         except Exception as e:
             logging.debug(f"PostgreSQL check failed, trying file cache: {e}")
         
@@ -126,7 +250,7 @@ class ResearchCache:
         cache_file = os.path.join(self.cache_dir, f"{cache_key}.json")
         if os.path.exists(cache_file):
             with open(cache_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+                return self._without_workspace_paths(json.load(f))
         
         return None
     
@@ -143,7 +267,7 @@ class ResearchCache:
         # Save results
         cache_file = os.path.join(self.cache_dir, f"{cache_key}.json")
         with open(cache_file, 'w', encoding='utf-8') as f:
-            json.dump(results, f, indent=2)
+            json.dump(self._without_workspace_paths(results), f, indent=2)
         
         # Update index
         self.cache_index[cache_key] = {
@@ -152,6 +276,136 @@ class ResearchCache:
             'file': cache_file
         }
         self._save_cache_index()
+    
+    @classmethod
+    def _without_workspace_paths(cls, results: Dict) -> Dict:
+        """Copy of results without workspace-local artifact references."""
+        if not isinstance(results, dict):
+            return results
+        return {key: value for key, value in results.items() if key not in cls.WORKSPACE_LOCAL_KEYS}
+
+
+class SectionSummaryCache:
+    """
+    Cache of per-section page summaries, stored alongside the research cache.
+    
+    Keys are content hashes of the section text, so a documentation page that was
+    summarized for one project is reused by every later project that scrapes it.
+    Entries live in a SQLite database (one row per key), so concurrent agents and
+    processes add rows instead of rewriting each other's file. Expired rows and
+    the oldest rows beyond max_entries are pruned on save().
+    """
+    
+    def __init__(self, cache_dir: str = ".research_cache", ttl_days: int = 90,
+                 max_entries: Optional[int] = None):
+        """
+        Initialize section summary cache.
+        
+        Args:
+            cache_dir: Research cache directory (summaries live in a database inside it)
+            ttl_days: Time-to-live for cached summaries in days
+            max_entries: Maximum summaries kept (default: RESEARCH_SECTION_CACHE_MAX_ENTRIES or 20000)
+        """
+        self.ttl_days = ttl_days
+        self.max_entries = max_entries or int(os.getenv("RESEARCH_SECTION_CACHE_MAX_ENTRIES", "20000"))
+        os.makedirs(cache_dir, exist_ok=True)
+        self.db_path = os.path.join(cache_dir, "section_summaries.db")
+        self._pending: Dict[str, Dict[str, str]] = {}
+        self._lock = threading.Lock()
+        self._init_database()
+    
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=30)
+    
+    def _init_database(self):
+        """Create the summaries table."""
+        try:
+            with closing(self._connect()) as conn, conn:
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS section_summaries (
+                        key TEXT PRIMARY KEY,
+                        summary TEXT NOT NULL,
+                        source_url TEXT,
+                        timestamp TEXT NOT NULL
+                    )
+                """)
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_section_summaries_timestamp ON section_summaries(timestamp)")
+        except sqlite3.Error as e:
+            logging.warning(f"Section summary cache unavailable ({self.db_path}): {e}")
+    
+    def _cutoff(self) -> str:
+        return (datetime.now() - timedelta(days=self.ttl_days)).isoformat()
+    
+    def save(self):
+        """Persist summaries added with set() and prune expired/excess entries."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return
+        try:
+            with closing(self._connect()) as conn, conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO section_summaries (key, summary, source_url, timestamp) VALUES (?, ?, ?, ?)",
+                    [(key, entry['summary'], entry['source_url'], entry['timestamp']) for key, entry in pending.items()]
+                )
+                conn.execute("DELETE FROM section_summaries WHERE timestamp < ?", (self._cutoff(),))
+                conn.execute("""
+                    DELETE FROM section_summaries WHERE key IN (
+                        SELECT key FROM section_summaries ORDER BY timestamp DESC LIMIT -1 OFFSET ?
+                    )
+                """, (self.max_entries,))
+        except sqlite3.Error as e:
+            logging.warning(f"Could not save section summaries: {e}")
+    
+    @staticmethod
+    def key_for(text: str) -> str:
+        """Content hash used as cache key for a section (or a reduce input)."""
+        return hashlib.sha256(text.strip().encode('utf-8')).hexdigest()
+    
+    def get(self, key: str) -> Optional[str]:
+        """Return a cached summary, or None if missing/expired."""
+        with self._lock:
+            entry = self._pending.get(key)
+        if entry:
+            return entry['summary']
+        try:
+            with closing(self._connect()) as conn:
+                row = conn.execute(
+                    "SELECT summary FROM section_summaries WHERE key = ? AND timestamp >= ?",
+                    (key, self._cutoff())
+                ).fetchone()
+        except sqlite3.Error as e:
+            logging.debug(f"Section summary lookup failed: {e}")
+            return None
+        return row[0] if row else None
+    
+    def set(self, key: str, summary: str, source_url: str = ""):
+        """Store a summary (call save() to persist)."""
+        with self._lock:
+            self._pending[key] = {
+                'summary': summary,
+                'source_url': source_url,
+                'timestamp': datetime.now().isoformat()
+            }
+
+
+# Blocking search clients (DuckDuckGo) run on this pool instead of the event
+# loop's default executor: asyncio.run() joins the default executor on exit,
+# which would hold a fan-out past its deadline until the blocked call returns.
+_blocking_search_executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+_blocking_search_lock = threading.Lock()
+
+
+def _get_blocking_search_executor() -> concurrent.futures.ThreadPoolExecutor:
+    """Get the shared thread pool for blocking search provider calls."""
+    global _blocking_search_executor
+    with _blocking_search_lock:
+        if _blocking_search_executor is None:
+            _blocking_search_executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=int(os.getenv("RESEARCH_SEARCH_THREADS", "8")),
+                thread_name_prefix="research-search"
+            )
+        return _blocking_search_executor
 
 
 class WebSearcher:
@@ -168,6 +422,10 @@ class WebSearcher:
         self.search_count_file = ".research_cache/search_count.json"
         self.search_counts = self._load_search_counts()
         
+        # Fan-out mode: query all enabled providers concurrently instead of sequential fallback
+        self.fanout_enabled = os.getenv("RESEARCH_SEARCH_FANOUT", "false").lower() == "true"
+        self.fanout_deadline = float(os.getenv("RESEARCH_SEARCH_DEADLINE", "12"))
+        
         self.logger = logging.getLogger(__name__)
     
     def _load_search_counts(self) -> Dict:
@@ -199,17 +457,27 @@ class WebSearcher:
         """Check if rate limit exceeded."""
         return self.search_counts.get(source, 0) < self.daily_limit
     
-    def search(self, query: str, num_results: int = 10) -> List[Dict]:
+    def search(self, query: str, num_results: int = 10, use_prefetch: bool = True) -> List[Dict]:
         """
         Search web using available providers with fallback.
         
         Args:
             query: Search query
             num_results: Number of results to return
+            use_prefetch: Serve results warmed by the orchestrator's research prefetch
             
         Returns:
             List of search results
         """
+        if use_prefetch:
+            prefetched = self._get_prefetched_results(query, num_results)
+            if prefetched:
+                self.logger.info(f"[PREFETCH] Using {len(prefetched)} prefetched results for: '{query}'")
+                return prefetched
+        
+        if self.fanout_enabled:
+            return self.search_fanout(query, num_results)
+        
         self.logger.info(f"Searching for: '{query}' (requesting {num_results} results)")
         
         # Try Google first (if API key available and within limit)
@@ -269,6 +537,203 @@ class WebSearcher:
         self.logger.error(f"[ERROR] All search providers failed or rate limited for query: '{query}'")
         return []
     
+    def _get_prefetched_results(self, query: str, num_results: int) -> Optional[List[Dict]]:
+        """Look up results warmed by the research prefetcher (waits briefly for in-flight jobs)."""
+        try:
+            from utils.research_prefetcher import is_prefetch_enabled, get_research_prefetcher
+        except ImportError:
+            return None
+        if not is_prefetch_enabled():
+            return None
+        wait = float(os.getenv("RESEARCH_PREFETCH_WAIT", "10"))
+        return get_research_prefetcher().get_search_results(query, num_results, wait=wait)
+    
+    def _enabled_providers(self) -> List[str]:
+        """Return providers that are configured and still within their daily quota."""
+        providers = []
+        if self.google_api_key and self.google_cx:
+            providers.append('google')
+        if self.bing_api_key:
+            providers.append('bing')
+        providers.append('duckduckgo')
+        
+        enabled = []
+        for provider in providers:
+            if self._check_rate_limit(provider):
+                enabled.append(provider)
+            else:
+                self.logger.info(f"{provider} rate limit reached, skipping in fan-out")
+        return enabled
+    
+    def search_fanout(self, query: str, num_results: int = 10, deadline: Optional[float] = None) -> List[Dict]:
+        """
+        Search all enabled providers concurrently (sync wrapper).
+        
+        Args:
+            query: Search query
+            num_results: Number of results to return
+            deadline: Seconds to wait for providers (defaults to RESEARCH_SEARCH_DEADLINE)
+            
+        Returns:
+            Merged, deduplicated list of search results
+        """
+        deadline = deadline if deadline is not None else self.fanout_deadline
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.search_fanout_async(query, num_results, deadline))
+        
+        # Event loop already running: run a new one in a thread, without joining
+        # the thread if it overruns (a `with` block would wait for it)
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        try:
+            future = executor.submit(asyncio.run, self.search_fanout_async(query, num_results, deadline))
+            return future.result(timeout=deadline + 1)
+        except concurrent.futures.TimeoutError:
+            self.logger.warning(f"Fan-out search for '{query}' overran its {deadline}s deadline")
+            return []
+        finally:
+            executor.shutdown(wait=False)
+    
+    async def search_fanout_async(self, query: str, num_results: int = 10,
+                                  deadline: Optional[float] = None) -> List[Dict]:
+        """
+        Query enabled providers concurrently and merge their results with rank fusion.
+        
+        Providers that have not answered when the deadline expires are cancelled;
+        whatever arrived in time is merged. Only providers that returned results
+        count against their daily quota.
+        
+        Args:
+            query: Search query
+            num_results: Number of results to return
+            deadline: Seconds to wait for providers (defaults to RESEARCH_SEARCH_DEADLINE)
+            
+        Returns:
+            Merged, deduplicated list of search results
+        """
+        deadline = deadline if deadline is not None else self.fanout_deadline
+        providers = self._enabled_providers()
+        if not providers:
+            self.logger.error(f"[ERROR] All search providers rate limited for query: '{query}'")
+            return []
+        
+        self.logger.info(f"Fan-out search for: '{query}' across {', '.join(providers)} (deadline {deadline}s)")
+        
+        search_methods = {
+            'google': self._search_google_async,
+            'bing': self._search_bing_async,
+            'duckduckgo': self._search_duckduckgo_async,
+        }
+        pending_tasks = {
+            asyncio.ensure_future(search_methods[provider](query, num_results)): provider
+            for provider in providers
+        }
+        
+        done, pending = await asyncio.wait(pending_tasks.keys(), timeout=deadline)
+        for task in pending:
+            self.logger.warning(f"{pending_tasks[task]} search missed the {deadline}s deadline, cancelling")
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        
+        provider_results: Dict[str, List[Dict]] = {}
+        for task in done:
+            provider = pending_tasks[task]
+            try:
+                results = task.result()
+            except Exception as e:
+                self.logger.warning(f"{provider} search failed: {e}")
+                continue
+            if results:
+                self._increment_count(provider)
+                provider_results[provider] = results
+                self.logger.info(f"[OK] {provider} returned {len(results)} results")
+            else:
+                self.logger.warning(f"{provider} returned 0 results")
+        
+        merged = self._merge_ranked_results(provider_results, num_results)
+        if not merged:
+            self.logger.error(f"[ERROR] All search providers failed for query: '{query}'")
+        return merged
+    
+    @staticmethod
+    def _canonical_url(url: str) -> str:
+        """
+        Normalize a URL so the same page reported by different providers dedupes.
+        
+        Lowercases scheme/host, drops "www.", fragments, trailing slashes and
+        tracking query parameters (utm_*, gclid, fbclid).
+        """
+        from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+        
+        try:
+            parts = urlsplit(url.strip())
+        except ValueError:
+            return url.strip().lower()
+        
+        host = parts.netloc.lower()
+        if host.startswith('www.'):
+            host = host[4:]
+        query_params = [
+            (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+            if not key.lower().startswith('utm_') and key.lower() not in ('gclid', 'fbclid')
+        ]
+        path = parts.path.rstrip('/') or '/'
+        return urlunsplit((parts.scheme.lower() or 'https', host, path, urlencode(query_params), ''))
+    
+    def _merge_ranked_results(self, provider_results: Dict[str, List[Dict]], num_results: int,
+                              rrf_k: int = 60) -> List[Dict]:
+        """
+        Merge per-provider result lists using reciprocal rank fusion.
+        
+        Each result scores sum(1 / (rrf_k + rank)) over the providers that returned it,
+        so pages found by several providers rise to the top. Duplicates (by canonical
+        URL) are collapsed into one entry listing every provider in 'sources'.
+        
+        Args:
+            provider_results: Mapping of provider name -> ranked results
+            num_results: Maximum number of merged results
+            rrf_k: Rank fusion damping constant
+            
+        Returns:
+            Merged results ordered by fused score
+        """
+        merged: Dict[str, Dict] = {}
+        scores: Dict[str, float] = {}
+        best_rank: Dict[str, int] = {}
+        
+        # Iterate providers in a fixed order so ties resolve deterministically
+        for provider in ('google', 'bing', 'duckduckgo'):
+            for rank, result in enumerate(provider_results.get(provider, []), start=1):
+                url = result.get('url', '')
+                if not url:
+                    continue
+                key = self._canonical_url(url)
+                scores[key] = scores.get(key, 0.0) + 1.0 / (rrf_k + rank)
+                best_rank[key] = min(best_rank.get(key, rank), rank)
+                
+                if key not in merged:
+                    merged[key] = {**result, 'sources': [provider]}
+                    continue
+                
+                entry = merged[key]
+                if provider not in entry['sources']:
+                    entry['sources'].append(provider)
+                # Keep the most descriptive snippet/title across providers
+                if len(result.get('snippet', '')) > len(entry.get('snippet', '')):
+                    entry['snippet'] = result.get('snippet', '')
+                if not entry.get('title') and result.get('title'):
+                    entry['title'] = result['title']
+        
+        ordered = sorted(merged, key=lambda key: (-scores[key], best_rank[key]))
+        results = []
+        for key in ordered[:num_results]:
+            entry = merged[key]
+            entry['rank_score'] = round(scores[key], 6)
+            results.append(entry)
+        return results
+    
     async def _search_google_async(self, query: str, num_results: int) -> List[Dict]:
         """Search using Google Custom Search API (async)."""
         try:
@@ -357,6 +822,67 @@ class WebSearcher:
                 future = executor.submit(asyncio.run, self._search_bing_async(query, num_results))
                 return future.result(timeout=15)
     
+    def _duckduckgo_attempt(self, query: str, num_results: int) -> List[Dict]:
+        """Run a single blocking DuckDuckGo query (no retries)."""
+        from duckduckgo_search import DDGS
+        
+        results = []
+        ddgs = DDGS(timeout=20)
+        search_results = ddgs.text(
+            keywords=query,
+            region='wt-wt',
+            safesearch='moderate',
+            max_results=num_results
+        )
+        for item in search_results or []:
+            results.append({
+                'title': item.get('title', ''),
+                'url': item.get('href', item.get('link', '')),
+                'snippet': item.get('body', item.get('snippet', '')),
+                'source': 'duckduckgo'
+            })
+            if len(results) >= num_results:
+                break
+        return results
+    
+    async def _search_duckduckgo_async(self, query: str, num_results: int) -> List[Dict]:
+        """
+        Search using DuckDuckGo without blocking the event loop.
+        
+        The blocking client runs on a dedicated search thread pool (never joined
+        by asyncio.run) and retry backoff uses asyncio.sleep, so fan-out
+        deadlines can abandon it without waiting for the call to return.
+        """
+        try:
+            import duckduckgo_search  # noqa: F401
+        except ImportError:
+            self.logger.warning("duckduckgo-search not installed. Install with: pip install duckduckgo-search")
+            return []
+        
+        max_retries = 3
+        base_delay = 2.0  # seconds
+        
+        for attempt in range(max_retries):
+            if attempt > 0:
+                delay = base_delay * (attempt + 1)
+                self.logger.info(f"DuckDuckGo retry {attempt + 1}/{max_retries} after {delay}s delay...")
+                await asyncio.sleep(delay)
+            try:
+                results = await asyncio.get_running_loop().run_in_executor(
+                    _get_blocking_search_executor(), self._duckduckgo_attempt, query, num_results
+                )
+                if results:
+                    return results
+                self.logger.warning(f"DuckDuckGo returned 0 results on attempt {attempt + 1}")
+            except Exception as e:
+                if 'ratelimit' in str(e).lower():
+                    self.logger.warning(f"DuckDuckGo rate limit hit on attempt {attempt + 1}/{max_retries}")
+                    continue
+                self.logger.error(f"DuckDuckGo search error: {e}")
+                return []
+        
+        return []
+    
     def _search_duckduckgo(self, query: str, num_results: int) -> List[Dict]:
         """Search using DuckDuckGo (free, no API key)."""
         try:
@@ -462,6 +988,11 @@ class ResearcherAgent(BaseAgent):
         # Initialize research cache (shared across projects)
         cache_dir = os.path.expanduser("~/.quickodoo/research_cache")
         self.cache = ResearchCache(cache_dir, ttl_days=90)
+        self.section_cache = SectionSummaryCache(cache_dir, ttl_days=90)
+        
+        # Map-reduce synthesis limits (bound LLM calls for large scrapes)
+        self.max_sections_per_page = int(os.getenv("RESEARCH_MAX_SECTIONS_PER_PAGE", "6"))
+        self.max_new_sections = int(os.getenv("RESEARCH_MAX_NEW_SECTIONS", "20"))
         
         # Initialize web searcher
         self.searcher = WebSearcher()
@@ -473,6 +1004,11 @@ class ResearcherAgent(BaseAgent):
         # Track research requests
         self.research_requests: Dict[str, Dict] = {}
         
+        # Shared across researcher instances: equivalent in-flight queries run once
+        from utils.research_coalescer import get_research_coalescer
+        self.coalescer = get_research_coalescer()
+        self.coalesce_wait_seconds = float(os.getenv("RESEARCH_COALESCE_WAIT", "600"))
+        
         # LLM Integration (Phase 2 - November 2025)
         self.use_llm = os.getenv("Q2O_USE_LLM", "true").lower() == "true"
         
@@ -520,11 +1056,8 @@ class ResearcherAgent(BaseAgent):
                 research_results = cached_results
                 research_results['cached'] = True
             else:
-                # Conduct new research
-                research_results = self._conduct_research(query, task)
-                
-                # Cache results
-                self.cache.set(query, research_results)
+                # Conduct new research (or share an equivalent run already in flight)
+                research_results = self._conduct_research_coalesced(query, task)
                 research_results['cached'] = False
             
             # Save research (PostgreSQL + files for backup)
@@ -614,58 +1147,79 @@ class ResearcherAgent(BaseAgent):
         return self._clean_research_query(fallback)
     
     def _clean_research_query(self, query: str) -> str:
+        """Clean research query by removing instructions (see clean_research_query)."""
+        return clean_research_query(query)
+    
+    def _conduct_research_coalesced(self, query: str, task: Task) -> Dict[str, Any]:
         """
-        Clean research query by removing instructions and extracting actual topic.
+        Conduct research once per group of equivalent in-flight queries.
+        
+        The first caller (leader) runs _conduct_research and caches the result;
+        concurrent callers with an equivalent query wait for it instead of crawling
+        and calling the LLM again. Agents that joined via a broker request are sent
+        the result when the leader finishes.
         
         Args:
-            query: Raw query that may contain instructions
+            query: Cleaned research query
+            task: The research task
             
         Returns:
-            Cleaned research topic
+            Research results dictionary
         """
-        if not query:
-            return query
-        
-        # Remove common instruction patterns
-        instruction_patterns = [
-            r'Follow every requirement below strictly\.?\s*',
-            r'Produce outputs that are detailed, actionable.*?\.\s*',
-            r'Do not skip or summarize sections unless instructed\.\s*',
-            r'Include code, diagrams, and deployment plans\.\s*',
-            r'Be architecturally sound, multistep\.\s*',
-        ]
-        
-        cleaned = query
-        for pattern in instruction_patterns:
-            cleaned = re.sub(pattern, '', cleaned, flags=re.IGNORECASE | re.DOTALL)
-        
-        # If query starts with instructions, try to find the actual topic
-        # Look for patterns like "Research: <topic>" or "Topic: <topic>"
-        topic_patterns = [
-            r'(?:research|topic|subject|about):\s*(.+?)(?:\n|$)',
-            r'research\s+(?:on|about|for)\s+(.+?)(?:\n|$)',
-        ]
-        
-        for pattern in topic_patterns:
-            match = re.search(pattern, cleaned, re.IGNORECASE)
-            if match:
-                cleaned = match.group(1).strip()
-                break
-        
-        # Remove leading/trailing whitespace and newlines
-        cleaned = cleaned.strip()
+        requester = task.metadata.get("requested_by")
+        entry, is_leader = self.coalescer.begin(query, requester)
+        
+        if not is_leader:
+            self.logger.info(f"[COALESCE] Waiting for in-flight research: '{entry.query}'")
+            shared = self.coalescer.wait(entry, timeout=self.coalesce_wait_seconds)
+            if shared is not None:
+                # Private copy per task; the leader's artifact lives in its own workspace
+                results = json.loads(json.dumps(ResearchCache._without_workspace_paths(shared), default=str))
+                results['coalesced_from'] = entry.query
+                return results
+            # Leader failed or timed out - research ourselves
+            self.logger.warning(f"[COALESCE] Shared research unavailable, researching '{query}' directly")
+            return self._conduct_research(query, task)
+        
+        research_results = None
+        error = "research did not complete"
+        try:
+            research_results = self._conduct_research(query, task)
+            self.cache.set(query, research_results)
+        except Exception as e:
+            error = str(e)
+            raise
+        finally:
+            waiters = self.coalescer.finish(entry, research_results)
+            # The task's own requester is answered by handle_research_request
+            waiters = [agent_id for agent_id in waiters if agent_id != requester]
+            if waiters:
+                self._send_coalesced_results(query, waiters, research_results, error)
         
-        # If cleaned query is too short or still looks like instructions, use original
-        if len(cleaned) < 10 or cleaned.lower().startswith(('follow', 'produce', 'do not', 'include')):
-            # Try to extract from context - look for the actual objective
-            # Split by common separators and take the first substantial part
-            parts = re.split(r'[.\n]', query)
-            for part in parts:
-                part = part.strip()
-                if len(part) > 20 and not part.lower().startswith(('follow', 'produce', 'do not', 'include', 'be thorough')):
-                    return part
+        return research_results
+    
+    def _send_coalesced_results(self, query: str, waiters: List[str],
+                                research_results: Optional[Dict[str, Any]], error: str):
+        """
+        Answer agents that attached to a coalesced run over the message broker.
         
-        return cleaned if cleaned else query
+        Waiters are sent the results without workspace-local paths, or a failed
+        reply if the run raised, so they never wait on a result that won't come.
+        """
+        if not hasattr(self, 'share_result'):
+            return
+        if research_results is None:
+            payload = {"query": query, "status": "failed", "error": error}
+        else:
+            payload = ResearchCache._without_workspace_paths(research_results)
+        try:
+            for agent_id in waiters:
+                self.share_result("research_results", payload, target_agent_id=agent_id)
+        except Exception as e:
+            self.logger.warning(f"[COALESCE] Could not send research for '{query}' to requesters: {e}")
+            return
+        outcome = "failure" if research_results is None else "research"
+        self.logger.info(f"[COALESCE] Sent {outcome} for '{query}' to {len(waiters)} additional requesters")
     
     def _conduct_research(self, query: str, task: Task) -> Dict[str, Any]:
         """
@@ -757,6 +1311,7 @@ class ResearcherAgent(BaseAgent):
             self.logger.info(f"Phase 4: Starting recursive research (multi-level link following)...")
             
             # Use recursive researcher for deep content discovery
+            artifact_writer = None
             try:
                 from utils.recursive_researcher import RecursiveResearcher
                 
@@ -766,10 +1321,14 @@ class ResearcherAgent(BaseAgent):
                 # Configure recursion depth
                 recursion_depth = 2 if depth == 'comprehensive' else 1
                 
+                # Stream full pages to an on-disk artifact instead of holding them in memory
+                artifact_writer = self._open_research_artifact()
+                
                 researcher = RecursiveResearcher(
                     max_depth=recursion_depth,
                     max_links_per_page=10,
-                    request_timeout=10
+                    request_timeout=10,
+                    page_sink=artifact_writer.add_page if artifact_writer else None
                 )
                 
                 # Build focus keywords
@@ -794,6 +1353,9 @@ class ResearcherAgent(BaseAgent):
                 research_results['discovered_links'] = recursive_data.get('discovered_links', [])
                 research_results['sources_consulted'].append('recursive_research_fallback')
                 
+                if artifact_writer:
+                    self._finalize_research_artifact(artifact_writer, research_results)
+                
                 self.logger.info(f"Phase 4: Recursive research complete - "
                                f"{recursive_data.get('total_pages_scraped', 0)} pages scraped, "
                                f"{len(research_results['code_examples'])} code examples, "
@@ -812,6 +1374,10 @@ class ResearcherAgent(BaseAgent):
                 research_results['code_examples'] = code_examples
                 research_results['sources_consulted'].append('content_scraping_fallback')
                 self.logger.info(f"Phase 4 (fallback): Extracted {len(code_examples)} code examples from {len(scraped_content)} pages")
+            finally:
+                # No-op after finalize(); releases the chunk file if recursion failed midway
+                if artifact_writer:
+                    artifact_writer.close()
         
         # Phase 5: Synthesize findings
         key_findings = self._synthesize_findings(research_results, query, task)
@@ -823,6 +1389,57 @@ class ResearcherAgent(BaseAgent):
         
         return research_results
     
+    def _open_research_artifact(self):
+        """
+        Create a streaming artifact writer under research/artifacts/ in the workspace.
+        
+        Returns:
+            ResearchArtifactWriter, or None if the workspace is not writable
+            (research then keeps pages in memory as before)
+        """
+        try:
+            import uuid
+            from utils.research_artifact import ResearchArtifactWriter
+            from utils.safe_file_writer import validate_workspace_path, validate_file_path
+            
+            workspace = validate_workspace_path(self.workspace_path, self.project_id)
+            artifact_dir = validate_file_path(
+                os.path.join("research", "artifacts", uuid.uuid4().hex), workspace
+            )
+            return ResearchArtifactWriter(artifact_dir)
+        except Exception as e:
+            self.logger.debug(f"Research artifact streaming unavailable, keeping pages in memory: {e}")
+            return None
+    
+    def _finalize_research_artifact(self, writer, research_results: Dict[str, Any],
+                                    max_inline_code_examples: int = 10):
+        """
+        Move bulky lists into the artifact and keep a compact copy in the results.
+        
+        All code examples and API endpoints go to disk; the in-memory results keep
+        the first few code examples (truncated) plus 'artifact_index' so consumers
+        can open a lazy ResearchArtifact view for the rest.
+        """
+        try:
+            writer.add_many('search_result', research_results.get('search_results', []))
+            writer.add_many('code_example', research_results.get('code_examples', []))
+            writer.add_many('api_endpoint', research_results.get('api_endpoints', []))
+            research_results['artifact_index'] = writer.finalize({
+                'query': research_results.get('query'),
+                'timestamp': research_results.get('timestamp'),
+                'depth': research_results.get('depth'),
+            })
+        except Exception as e:
+            writer.close()
+            self.logger.warning(f"Could not finalize research artifact: {e}")
+            return
+        
+        research_results['code_examples'] = [
+            {**example, 'code': example.get('code', '')[:2000]}
+            for example in research_results.get('code_examples', [])[:max_inline_code_examples]
+        ]
+        self.logger.info(f"[ARTIFACT] Research pages streamed to {research_results['artifact_index']}")
+    
     def _conduct_research_with_llm(self, query: str, task: Task, depth: str) -> Optional[Dict[str, Any]]:
         """
         Conduct research using LLM as PRIMARY method.
@@ -1307,59 +1924,8 @@ Be specific, accurate, and actionable. Focus on what developers NEED to know."""
             return "comprehensive"
     
     def _generate_deep_queries(self, base_query: str, task: Task) -> List[str]:
-        """
-        Generate additional queries for deep research.
-        
-        Args:
-            base_query: Base research query
-            task: The research task
-            
-        Returns:
-            List of additional queries
-        """
-        queries = []
-        tech_stack = task.tech_stack or []
-        query_lower = base_query.lower()
-        
-        # Detect if this is a migration/platform research
-        is_migration = any(kw in query_lower for kw in ['migration', 'platform', 'api', 'integration'])
-        is_platform_specific = any(kw in query_lower for kw in ['sage', 'quickbooks', 'xero', 'netsuite', 'wave'])
-        
-        # Add tech-stack specific queries
-        for tech in tech_stack:
-            queries.append(f"{base_query} {tech} tutorial")
-        
-        # Add migration-specific deep queries
-        if is_migration:
-            queries.extend([
-                f"{base_query} API documentation",
-                f"{base_query} authentication guide",
-                f"{base_query} code examples Python",
-                f"{base_query} best practices",
-                f"{base_query} entity types data model"
-            ])
-        
-        # Add platform-specific deep queries
-        if is_platform_specific:
-            # Extract platform name
-            for platform in ['sage', 'quickbooks', 'xero', 'netsuite', 'wave', 'stripe']:
-                if platform in query_lower:
-                    queries.extend([
-                        f"{platform} API reference",
-                        f"{platform} API entities",
-                        f"{platform} OAuth 2.0 setup",
-                        f"{platform} REST API examples",
-                        f"{platform} data export"
-                    ])
-                    break
-            queries.append(f"{base_query} {tech} best practices")
-        
-        # Add specific aspect queries
-        queries.append(f"{base_query} documentation")
-        queries.append(f"{base_query} code examples")
-        queries.append(f"{base_query} latest version")
-        
-        return queries[:5]  # Limit to 5 additional queries
+        """Generate additional queries for deep research (see deep_research_queries)."""
+        return deep_research_queries(base_query, task.tech_stack)
     
     def _find_official_documentation(self, search_results: List[Dict], query: str) -> List[str]:
         """
@@ -1422,11 +1988,29 @@ Be specific, accurate, and actionable. Focus on what developers NEED to know."""
             self.logger.warning("httpx or beautifulsoup4 not installed. Skipping content scraping.")
             return []
         
+        # Pages warmed by the orchestrator's research prefetch
+        prefetcher = None
+        try:
+            from utils.research_prefetcher import is_prefetch_enabled, get_research_prefetcher
+            if is_prefetch_enabled():
+                prefetcher = get_research_prefetcher()
+        except ImportError:
+            pass
+        
         # Use async HTTP for concurrent scraping
         async def scrape_url(result: Dict) -> Optional[Dict]:
             """Scrape a single URL asynchronously."""
             try:
                 url = result.get('url', '')
+                page = prefetcher.get_page(url) if prefetcher else None
+                if page:
+                    text = page.get('text', '')
+                    return {
+                        'url': url,
+                        'title': result.get('title', ''),
+                        'content': text[:5000],
+                        'word_count': len(text.split())
+                    }
                 async with httpx.AsyncClient(timeout=10.0) as client:
                     response = await client.get(url, headers={
                         'User-Agent': 'QuickOdoo-ResearchAgent/1.0'
@@ -1580,6 +2164,12 @@ Be specific, accurate, and actionable. Focus on what developers NEED to know."""
         if not self.llm_service:
             return []
         
+        # Scraped pages available: summarize only new sections and combine cached summaries
+        if research_results.get('scraped_content'):
+            insights = await self._synthesize_findings_map_reduce(research_results, query, task)
+            if insights:
+                return insights
+        
         # Prepare research data for LLM
         search_snippets = []
         for idx, result in enumerate(research_results.get('search_results', [])[:10], 1):
@@ -1670,6 +2260,210 @@ Please synthesize these findings into 5-10 actionable insights."""
             insights = [line.strip() for line in lines if line.strip() and len(line.strip()) > 20]
             return insights[:10] if insights else []
     
+    def _split_into_sections(self, text: str, max_chars: int = 3000) -> List[str]:
+        """
+        Split page text into sections on line boundaries.
+        
+        Sections break at heading-like lines when possible and never exceed max_chars,
+        so the same documentation section hashes identically across scrapes.
+        
+        Args:
+            text: Page text
+            max_chars: Maximum characters per section
+            
+        Returns:
+            List of section texts
+        """
+        sections = []
+        current: List[str] = []
+        current_len = 0
+        
+        for line in text.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            is_heading = len(line) < 80 and not line.endswith(('.', ',', ';', ':')) and line[:1].isupper()
+            if current and (current_len + len(line) > max_chars or (is_heading and current_len > max_chars // 2)):
+                sections.append('\n'.join(current))
+                current, current_len = [], 0
+            current.append(line[:max_chars])
+            current_len += len(line) + 1
+        
+        if current:
+            sections.append('\n'.join(current))
+        
+        # Skip navigation crumbs and other fragments too small to summarize
+        return [section for section in sections if len(section) >= 200]
+    
+    def _iter_scraped_pages(self, scraped_content: Any, artifact_index: Optional[str] = None):
+        """
+        Yield scraped pages as {'url', 'title', 'text'}.
+        
+        Accepts the recursive dict or the simple list format. Page stubs streamed to a
+        research artifact are loaded from disk one at a time.
+        """
+        artifact = None
+        if artifact_index:
+            from utils.research_artifact import open_research_artifact
+            artifact = open_research_artifact(artifact_index)
+        
+        pages = scraped_content.values() if isinstance(scraped_content, dict) else scraped_content
+        for page in pages or []:
+            if not isinstance(page, dict):
+                continue
+            if page.get('artifact') and artifact:
+                page = artifact.get_page(page.get('url', '')) or page
+            text = page.get('text') or page.get('content') or ''
+            if text:
+                yield {'url': page.get('url', ''), 'title': page.get('title') or '', 'text': text}
+    
+    async def _summarize_section(self, section: str, source_url: str, task: Optional[Task],
+                                 semaphore: asyncio.Semaphore) -> Optional[str]:
+        """Map step: summarize one page section (query-independent so it can be reused)."""
+        system_prompt = """You summarize technical documentation for developers.
+
+Summarize the section in 2-4 short bullet points. Keep concrete facts: endpoints,
+authentication steps, data models/fields, limits, versions, and gotchas.
+Do not add information that is not in the text. Return plain text bullets only."""
+        
+        async with semaphore:
+            response = await self.llm_service.complete(
+                system_prompt,
+                f"Source: {source_url}\n\n{section}",
+                temperature=0.2,
+                max_tokens=300
+            )
+        
+        if not response.success or not response.content:
+            self.logger.debug(f"Section summary failed for {source_url}: {response.error}")
+            return None
+        if task:
+            self.track_llm_usage(task, response)
+        return response.content.strip()
+    
+    async def _synthesize_findings_map_reduce(self, research_results: Dict, query: str,
+                                              task: Optional[Task] = None) -> List[str]:
+        """
+        Map-reduce synthesis over scraped pages with section-level caching.
+        
+        Map: split each page into sections and summarize only sections whose content
+        hash is not in the section cache. Reduce: combine all section summaries (plus
+        top search snippets) into 5-10 insights. The reduce result is cached too, keyed
+        by its inputs, so an unchanged set of sources needs no LLM call at all.
+        
+        Args:
+            research_results: Research results including 'scraped_content'
+            query: Original research query
+            task: Optional task for LLM usage tracking
+            
+        Returns:
+            List of insights (empty if nothing could be summarized)
+        """
+        pages = self._iter_scraped_pages(
+            research_results.get('scraped_content'), research_results.get('artifact_index')
+        )
+        
+        # Collect sections, reusing cached summaries
+        ordered_keys: List[str] = []
+        summaries: Dict[str, str] = {}
+        pending: Dict[str, tuple] = {}
+        for page in pages:
+            for section in self._split_into_sections(page['text'])[:self.max_sections_per_page]:
+                key = self.section_cache.key_for(section)
+                if key in summaries or key in pending:
+                    continue
+                ordered_keys.append(key)
+                cached = self.section_cache.get(key)
+                if cached:
+                    summaries[key] = cached
+                elif len(pending) < self.max_new_sections:
+                    pending[key] = (section, page['url'])
+        
+        if not ordered_keys:
+            return []
+        
+        self.logger.info(
+            f"[LLM] Map-reduce synthesis: {len(summaries)} cached section summaries, "
+            f"{len(pending)} new sections to summarize"
+        )
+        
+        # Map: summarize new sections concurrently
+        if pending:
+            semaphore = asyncio.Semaphore(int(os.getenv("RESEARCH_SUMMARY_CONCURRENCY", "4")))
+            keys = list(pending.keys())
+            new_summaries = await asyncio.gather(
+                *(self._summarize_section(pending[key][0], pending[key][1], task, semaphore) for key in keys),
+                return_exceptions=True
+            )
+            for key, summary in zip(keys, new_summaries):
+                if isinstance(summary, str) and summary:
+                    summaries[key] = summary
+                    self.section_cache.set(key, summary, pending[key][1])
+            self.section_cache.save()
+        
+        section_summaries = [summaries[key] for key in ordered_keys if key in summaries]
+        if not section_summaries:
+            return []
+        
+        search_snippets = [
+            f"- {result.get('title', 'Untitled')}: {result.get('snippet', '')}"
+            for result in research_results.get('search_results', [])[:5]
+        ]
+        
+        # Reduce: skip the LLM entirely when the same inputs were already combined
+        reduce_input = f"{query}\n" + '\n'.join(search_snippets) + '\n' + '\n'.join(section_summaries)
+        reduce_key = self.section_cache.key_for(f"reduce:{reduce_input}")
+        cached_insights = self.section_cache.get(reduce_key)
+        if cached_insights:
+            self.logger.info("[LLM] Map-reduce synthesis served from cache")
+            return json.loads(cached_insights)
+        
+        system_prompt = """You are a senior software architect analyzing research findings.
+
+You receive summaries of documentation sections relevant to a research query.
+Combine them into 5-10 concise, specific, actionable insights for developers
+(capabilities, best practices, pitfalls, integration requirements, security).
+
+Return JSON: {"insights": ["Insight 1", "Insight 2", ...]}"""
+        
+        user_prompt = f"""Research Query: {query}
+
+Top Search Results:
+{chr(10).join(search_snippets)}
+
+Documentation Section Summaries:
+{chr(10).join(f"[{idx}] {summary}" for idx, summary in enumerate(section_summaries, 1))}
+
+Please synthesize these findings into 5-10 actionable insights."""
+        
+        response = await self.llm_service.complete(
+            system_prompt,
+            user_prompt,
+            temperature=0.3,
+            max_tokens=1024
+        )
+        if not response.success:
+            self.logger.warning(f"LLM map-reduce synthesis failed: {response.error}")
+            return []
+        if task:
+            self.track_llm_usage(task, response)
+        
+        try:
+            from utils.json_parser import parse_json_robust
+            parsed = parse_json_robust(response.content)
+            insights = parsed.get('insights', []) if isinstance(parsed, dict) else []
+        except Exception as e:
+            self.logger.debug(f"Could not parse map-reduce synthesis JSON: {e}")
+            insights = []
+        if not insights:
+            lines = [line.strip(' -*') for line in response.content.split('\n')]
+            insights = [line for line in lines if len(line) > 20][:10]
+        
+        if insights:
+            self.section_cache.set(reduce_key, json.dumps(insights))
+            self.section_cache.save()
+        return insights
+    
     def _synthesize_findings_basic(self, research_results: Dict, query: str) -> List[str]:
         """
         Basic synthesis (fallback when LLM unavailable).
@@ -1978,6 +2772,7 @@ Please synthesize these findings into 5-10 actionable insights."""
             Research results or None if queued
         """
         self.logger.info(f"Research request from {requesting_agent_id}: {query}")
+        query = self._clean_research_query(query)
         
         # Check cache first (fast path)
         cached = self.cache.get(query)
@@ -1988,6 +2783,11 @@ Please synthesize these findings into 5-10 actionable insights."""
                 self.share_result("research_results", cached, target_agent_id=requesting_agent_id)
             return cached
         
+        # Equivalent research already running: the result is sent when it finishes
+        if self.coalescer.attach(query, requesting_agent_id):
+            self.logger.info(f"Research for {requesting_agent_id} coalesced with in-flight run: {query}")
+            return None
+        
         # If not cached and urgency is high, conduct research immediately
         if urgency == "high" and len(self.active_tasks) < 3:
             # Create adhoc research task
@@ -2024,7 +2824,9 @@ Please synthesize these findings into 5-10 actionable insights."""
             message: Message from message broker
         """
         try:
-            payload = message.get("payload", message)
+            # Broker wraps published messages as {"channel", "timestamp", "data": <AgentMessage dict>}
+            msg_data = message.get("data", message)
+            payload = msg_data.get("payload", msg_data)
             
             # Extract request details
             query = payload.get("query")
@@ -6,7 +6,9 @@ Agents use this to automatically track tasks in the agent_tasks table.
 """
 
 import os
+import json
 import asyncio
+from pathlib import Path
 from typing import Optional, Dict, Any
 from datetime import datetime, timezone
 import logging
@@ -272,6 +274,38 @@ async def update_task_status_in_db(
         return False
 
 
+# Progress file read by the API's process supervisor
+# (keep in sync with addon_portal/api/services/process_supervisor.py)
+HEARTBEAT_FILENAME = ".execution_heartbeat.json"
+
+
+def write_progress_heartbeat(output_folder, **progress) -> bool:
+    """
+    Push the current progress snapshot to the supervising API worker.
+    
+    Written atomically to HEARTBEAT_FILENAME in the output folder, so the
+    supervisor only needs to read one small file instead of querying task
+    progress from the database.
+    
+    Args:
+        output_folder: Project output folder (workspace)
+        **progress: Task counts (total_tasks, completed, failed, in_progress, ...)
+    
+    Returns:
+        True if successful, False otherwise
+    """
+    try:
+        folder = Path(output_folder)
+        payload = {"timestamp": datetime.now(timezone.utc).isoformat(), "pid": os.getpid(), **progress}
+        tmp_path = folder / f"{HEARTBEAT_FILENAME}.tmp"
+        tmp_path.write_text(json.dumps(payload, default=str), encoding="utf-8")
+        os.replace(tmp_path, folder / HEARTBEAT_FILENAME)
+        return True
+    except Exception as e:
+        logger.debug(f"Failed to write progress heartbeat: {e}")
+        return False
+
+
 async def update_project_heartbeat(project_id: str, tenant_id: Optional[int] = None) -> bool:
     """
     Update project heartbeat timestamp to indicate process is still alive.
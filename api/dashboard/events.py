@@ -1,26 +1,120 @@
 """
 Event Manager for broadcasting agent activity to dashboard clients.
 Provides real-time event emission and WebSocket connection management.
+
+Events are published synchronously from any thread (agents run in worker
+threads) into a single per-process queue. The queue is flushed on the event
+loop that owns the WebSocket connections every BATCH_INTERVAL_SECONDS:
+
+- Task and agent updates superseded within a batch are coalesced (latest wins)
+- System metrics are maintained incrementally from status counters and sent
+  at most once per batch
+- Each flush sends one JSON frame {"type": "batch", "epoch": e, "seq": n, "events": [...]} per client
+
+seq counts frames within one EventManager and restarts at 0 with the process, so
+every frame also carries the manager's random epoch id.
+
+Every client has its own outbound queue drained by its own writer task, so a slow
+browser never delays other clients or the flush. A client whose queue exceeds
+MAX_PENDING_FRAMES or whose send takes longer than SEND_TIMEOUT_SECONDS is
+disconnected; when it reconnects with ?epoch=<epoch>&since=<last seq> it receives
+a delta snapshot containing only the tasks and agents changed after that frame
+(a full snapshot if the epoch differs, i.e. the server restarted meanwhile).
 """
 
 import asyncio
 import json
 import logging
-from typing import Dict, List, Set, Optional, Any
+import threading
+import uuid
+from collections import Counter
+from typing import Dict, List, Optional, Any
 from datetime import datetime
-from collections import defaultdict
 
 logger = logging.getLogger(__name__)
 
+# How long events are collected before a frame is sent to clients
+BATCH_INTERVAL_SECONDS = 0.05
+# Frames queued for one client before it is considered too slow and disconnected
+MAX_PENDING_FRAMES = 200
+# Longest a single send to one client may take
+SEND_TIMEOUT_SECONDS = 10.0
+# WebSocket close code "Try Again Later" (the client reconnects and resyncs)
+SLOW_CLIENT_CLOSE_CODE = 1013
+
+
+class ClientConnection:
+    """A dashboard WebSocket with its own outbound queue and writer task."""
+
+    def __init__(self, websocket, manager: "EventManager", max_pending: int, send_timeout: float):
+        self.websocket = websocket
+        self.manager = manager
+        self.send_timeout = send_timeout
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_pending)
+        self.closed = False
+        self.writer = asyncio.get_running_loop().create_task(self._write_loop())
+
+    def enqueue(self, message: str) -> bool:
+        """Queue a frame; returns False (and drops the client) if it has fallen too far behind."""
+        if self.closed:
+            return False
+        try:
+            self.queue.put_nowait(message)
+            return True
+        except asyncio.QueueFull:
+            self.disconnect("slow_client_queue_full")
+            return False
+
+    async def _write_loop(self):
+        while True:
+            message = await self.queue.get()
+            try:
+                await asyncio.wait_for(self.websocket.send_text(message), timeout=self.send_timeout)
+            except asyncio.TimeoutError:
+                self.disconnect("slow_client_send_timeout")
+                return
+            except Exception as e:
+                logger.warning(f"Error sending to client: {e}")
+                self.disconnect("send_error", close=False)
+                return
+
+    def disconnect(self, reason: str, close: bool = True):
+        """Stop writing to this client and close its socket so it reconnects."""
+        if self.closed:
+            return
+        self.closed = True
+        logger.warning(f"Dropping dashboard client ({reason}), {self.queue.qsize()} frames pending")
+        self.manager.remove_connection(self.websocket)
+        if self.writer is not asyncio.current_task():
+            self.writer.cancel()
+        if close:
+            asyncio.get_running_loop().create_task(self._close())
+
+    async def _close(self):
+        try:
+            await asyncio.wait_for(
+                self.websocket.close(code=SLOW_CLIENT_CLOSE_CODE), timeout=self.send_timeout
+            )
+        except Exception:
+            pass
+
 
 class EventManager:
     """Manages events and broadcasts them to connected dashboard clients."""
-    
-    def __init__(self):
-        self.connections: Set = set()  # WebSocket connections
+
+    def __init__(
+        self,
+        batch_interval: float = BATCH_INTERVAL_SECONDS,
+        max_pending_frames: int = MAX_PENDING_FRAMES,
+        send_timeout: float = SEND_TIMEOUT_SECONDS,
+    ):
+        self.connections: Dict[Any, ClientConnection] = {}  # WebSocket -> outbound queue/writer
         self.event_history: List[Dict[str, Any]] = []  # Recent events (last 1000)
         self.max_history = 1000
-        
+        self.batch_interval = batch_interval
+        self.max_pending_frames = max_pending_frames
+        self.send_timeout = send_timeout
+
         # Aggregated state
         self.task_state: Dict[str, Dict[str, Any]] = {}
         self.agent_state: Dict[str, Dict[str, Any]] = {}
@@ -35,88 +129,110 @@ class EventManager:
             "idle_agents": 0,
             "average_task_time": 0.0,
         }
-    
-    def add_connection(self, websocket):
-        """Add a WebSocket connection to receive events."""
-        self.connections.add(websocket)
+        # Status counters backing system_metrics (updated per event, never rescanned)
+        self._task_status_counts: Counter = Counter()
+        self._agent_status_counts: Counter = Counter()
+        # Frame sequence number (scoped to epoch) and the frame in which each task/agent last changed
+        self.epoch = uuid.uuid4().hex[:12]
+        self.seq = 0
+        self._task_seq: Dict[str, int] = {}
+        self._agent_seq: Dict[str, int] = {}
+
+        # Pending batch (guarded by _lock; publishers may run in any thread)
+        self._lock = threading.Lock()
+        self._pending_tasks: Dict[str, Dict[str, Any]] = {}
+        self._pending_agents: Dict[str, Dict[str, Any]] = {}
+        self._pending_events: List[Dict[str, Any]] = []
+        self._metrics_dirty = False
+        self._flush_scheduled = False
+        # Event loop serving the WebSocket connections (set by add_connection)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def add_connection(self, websocket, since: Optional[int] = None, epoch: Optional[str] = None) -> ClientConnection:
+        """
+        Add a WebSocket connection to receive events (call from the serving event loop).
+
+        The client's first frame is an initial_state snapshot - a delta of what
+        changed after frame `since` of `epoch` when the client is resuming - queued ahead of
+        any batch, so no update can be missed or applied out of order.
+        """
+        self._loop = asyncio.get_running_loop()
+        client = ClientConnection(websocket, self, self.max_pending_frames, self.send_timeout)
+        self.connections[websocket] = client
+        client.enqueue(json.dumps({"type": "initial_state", **self.get_snapshot(since, epoch)}))
         logger.info(f"Dashboard client connected. Total connections: {len(self.connections)}")
-    
+        return client
+
     def remove_connection(self, websocket):
         """Remove a WebSocket connection."""
-        self.connections.discard(websocket)
+        client = self.connections.pop(websocket, None)
+        if client is None:
+            return
+        if not client.closed:
+            client.closed = True
+            client.writer.cancel()
         logger.info(f"Dashboard client disconnected. Total connections: {len(self.connections)}")
-    
-    async def broadcast(self, event_type: str, data: Dict[str, Any]):
+
+    # Publishing (synchronous, thread-safe, never blocks on clients)
+
+    def publish(self, event_type: str, data: Dict[str, Any]):
         """
-        Broadcast an event to all connected clients.
-        
+        Queue an event for the next batch.
+
         Args:
-            event_type: Type of event (task_update, agent_activity, metric_update, etc.)
+            event_type: Type of event (agent_activity, project_start, static_analysis_update, etc.)
             data: Event data
         """
-        event = {
-            "type": event_type,
-            "data": data,
-            "timestamp": datetime.now().isoformat()
-        }
-        
-        # Store in history
-        self.event_history.append(event)
-        if len(self.event_history) > self.max_history:
-            self.event_history.pop(0)
-        
-        # Broadcast to all connected clients
-        message = json.dumps(event)
-        disconnected = set()
-        
-        for connection in self.connections:
-            try:
-                await connection.send_text(message)
-            except Exception as e:
-                logger.warning(f"Error sending to client: {e}")
-                disconnected.add(connection)
-        
-        # Remove disconnected clients
-        for conn in disconnected:
-            self.remove_connection(conn)
-    
-    # Event emission methods
-    
-    async def emit_task_update(self, task_id: str, status: str, **kwargs):
-        """Emit a task status update."""
+        with self._lock:
+            self._pending_events.append(self._make_event(event_type, data))
+        self._schedule_flush()
+
+    def publish_task_update(self, task_id: str, status: str, **kwargs):
+        """Record a task status change and queue it (superseded updates are coalesced)."""
         task_data = {
             "task_id": task_id,
             "status": status,
             **kwargs
         }
-        
-        # Update internal state
-        self.task_state[task_id] = task_data
-        
-        await self.broadcast("task_update", task_data)
-        await self._update_metrics()
-    
-    async def emit_agent_activity(self, agent_id: str, agent_type: str, activity: str, **kwargs):
-        """Emit agent activity."""
+        with self._lock:
+            previous = self.task_state.get(task_id)
+            if previous is not None:
+                self._task_status_counts[previous.get("status")] -= 1
+            self._task_status_counts[status] += 1
+            self.task_state[task_id] = task_data
+            self._pending_tasks.pop(task_id, None)
+            self._pending_tasks[task_id] = task_data
+            self._metrics_dirty = True
+        self._schedule_flush()
+
+    def publish_agent_activity(self, agent_id: str, agent_type: str, activity: str, **kwargs):
+        """Record agent activity and queue it (superseded updates are coalesced)."""
         activity_data = {
             "agent_id": agent_id,
             "agent_type": agent_type,
             "activity": activity,
             **kwargs
         }
-        
-        # Update internal state
-        self.agent_state[agent_id] = activity_data
-        
-        await self.broadcast("agent_activity", activity_data)
-    
-    async def emit_metric_update(self, metrics: Dict[str, Any]):
-        """Emit system metrics update."""
-        self.system_metrics.update(metrics)
-        await self.broadcast("metric_update", self.system_metrics)
-    
-    async def emit_project_start(self, project_description: str, objectives: List[str], platforms: List[str] = None):
-        """Emit project start event."""
+        with self._lock:
+            previous = self.agent_state.get(agent_id)
+            if previous is not None:
+                self._agent_status_counts[previous.get("status")] -= 1
+            self._agent_status_counts[activity_data.get("status")] += 1
+            self.agent_state[agent_id] = activity_data
+            self._pending_agents.pop(agent_id, None)
+            self._pending_agents[agent_id] = activity_data
+            self._metrics_dirty = True
+        self._schedule_flush()
+
+    def publish_metric_update(self, metrics: Dict[str, Any]):
+        """Merge metrics into system_metrics and queue one metric update for the batch."""
+        with self._lock:
+            self.system_metrics.update(metrics)
+            self._metrics_dirty = True
+        self._schedule_flush()
+
+    def publish_project_start(self, project_description: str, objectives: List[str], platforms: List[str] = None):
+        """Queue project start event."""
         event_data = {
             "project_description": project_description,
             "objectives": objectives,
@@ -124,45 +240,173 @@ class EventManager:
         }
         if platforms:
             event_data["platforms"] = platforms
-        await self.broadcast("project_start", event_data)
-    
-    async def emit_project_complete(self, results: Dict[str, Any]):
-        """Emit project completion event."""
-        await self.broadcast("project_complete", {
+        self.publish("project_start", event_data)
+
+    def publish_project_complete(self, results: Dict[str, Any]):
+        """Queue project completion event."""
+        self.publish("project_complete", {
             **results,
             "completed_at": datetime.now().isoformat()
         })
-    
-    async def _update_metrics(self):
-        """Update aggregated system metrics."""
-        # Calculate metrics from task state
+
+    # Async API (kept for callers running on an event loop)
+
+    async def broadcast(self, event_type: str, data: Dict[str, Any]):
+        """Queue an event for all connected clients (sent with the next batch)."""
+        self.publish(event_type, data)
+
+    async def emit_task_update(self, task_id: str, status: str, **kwargs):
+        """Emit a task status update."""
+        self.publish_task_update(task_id, status, **kwargs)
+
+    async def emit_agent_activity(self, agent_id: str, agent_type: str, activity: str, **kwargs):
+        """Emit agent activity."""
+        self.publish_agent_activity(agent_id, agent_type, activity, **kwargs)
+
+    async def emit_metric_update(self, metrics: Dict[str, Any]):
+        """Emit system metrics update."""
+        self.publish_metric_update(metrics)
+
+    async def emit_project_start(self, project_description: str, objectives: List[str], platforms: List[str] = None):
+        """Emit project start event."""
+        self.publish_project_start(project_description, objectives, platforms)
+
+    async def emit_project_complete(self, results: Dict[str, Any]):
+        """Emit project completion event."""
+        self.publish_project_complete(results)
+
+    # Batching
+
+    @staticmethod
+    def _make_event(event_type: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "type": event_type,
+            "data": data,
+            "timestamp": datetime.now().isoformat()
+        }
+
+    def _refresh_metrics(self):
+        """Derive task/agent metrics from the status counters (caller holds _lock)."""
         total = len(self.task_state)
-        completed = sum(1 for t in self.task_state.values() if t.get("status") == "completed")
-        failed = sum(1 for t in self.task_state.values() if t.get("status") == "failed")
-        in_progress = sum(1 for t in self.task_state.values() if t.get("status") == "in_progress")
-        pending = sum(1 for t in self.task_state.values() if t.get("status") == "pending")
-        
-        metrics = {
+        completed = self._task_status_counts["completed"]
+        self.system_metrics.update({
             "total_tasks": total,
             "completed_tasks": completed,
-            "failed_tasks": failed,
-            "in_progress_tasks": in_progress,
-            "pending_tasks": pending,
+            "failed_tasks": self._task_status_counts["failed"],
+            "in_progress_tasks": self._task_status_counts["in_progress"],
+            "pending_tasks": self._task_status_counts["pending"],
             "completion_percentage": (completed / total * 100) if total > 0 else 0.0,
-            "active_agents": sum(1 for a in self.agent_state.values() if a.get("status") == "active"),
-            "idle_agents": sum(1 for a in self.agent_state.values() if a.get("status") == "idle"),
-        }
-        
-        await self.emit_metric_update(metrics)
-    
+            "active_agents": self._agent_status_counts["active"],
+            "idle_agents": self._agent_status_counts["idle"],
+        })
+
+    def _drain(self) -> List[Dict[str, Any]]:
+        """Take the pending batch as a list of events and record it in history."""
+        with self._lock:
+            self._flush_scheduled = False
+            events = [self._make_event("task_update", data) for data in self._pending_tasks.values()]
+            events += [self._make_event("agent_activity", data) for data in self._pending_agents.values()]
+            events += self._pending_events
+            if self._metrics_dirty:
+                self._refresh_metrics()
+                events.append(self._make_event("metric_update", dict(self.system_metrics)))
+            if events:
+                self.seq += 1
+                for task_id in self._pending_tasks:
+                    self._task_seq[task_id] = self.seq
+                for agent_id in self._pending_agents:
+                    self._agent_seq[agent_id] = self.seq
+            self._pending_tasks = {}
+            self._pending_agents = {}
+            self._pending_events = []
+            self._metrics_dirty = False
+
+            self.event_history.extend(events)
+            if len(self.event_history) > self.max_history:
+                del self.event_history[:len(self.event_history) - self.max_history]
+        return events
+
+    def _schedule_flush(self):
+        """Arrange for the pending batch to be sent after batch_interval."""
+        loop = self._loop
+        if not self.connections or loop is None or loop.is_closed():
+            # Nobody to send to: apply the batch to history right away
+            self._drain()
+            return
+        with self._lock:
+            if self._flush_scheduled:
+                return
+            self._flush_scheduled = True
+        try:
+            loop.call_soon_threadsafe(self._start_flush_timer)
+        except RuntimeError:
+            # Loop shut down between the check and the call
+            self._drain()
+
+    def _start_flush_timer(self):
+        self._loop.call_later(self.batch_interval, lambda: asyncio.ensure_future(self.flush()))
+
+    async def flush(self):
+        """Queue all pending events as one frame on every client (never waits on sends)."""
+        events = self._drain()
+        if not events or not self.connections:
+            return
+
+        message = json.dumps({
+            "type": "batch",
+            "epoch": self.epoch,
+            "seq": self.seq,
+            "events": events,
+            "timestamp": datetime.now().isoformat()
+        })
+        for client in list(self.connections.values()):
+            client.enqueue(message)
+
+    def get_snapshot(self, since: Optional[int] = None, epoch: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Get dashboard state for a (re)connecting client.
+
+        Args:
+            since: Last frame seq the client applied; only tasks and agents changed
+                after it are included. A full snapshot is returned when since is None
+                or unknown.
+            epoch: Epoch of the frame `since` refers to; a full snapshot is returned
+                unless it is this manager's epoch (e.g. the server restarted since).
+
+        Returns:
+            {"epoch": ..., "seq": ..., "data": state}
+        """
+        with self._lock:
+            if since is None or epoch != self.epoch or since > self.seq or since < 0:
+                delta = False
+                tasks, agents = dict(self.task_state), dict(self.agent_state)
+            else:
+                delta = True
+                tasks = {k: v for k, v in self.task_state.items() if self._task_seq.get(k, self.seq + 1) > since}
+                agents = {k: v for k, v in self.agent_state.items() if self._agent_seq.get(k, self.seq + 1) > since}
+            if self._metrics_dirty:
+                self._refresh_metrics()
+            data = {
+                "tasks": tasks,
+                "agents": agents,
+                "metrics": dict(self.system_metrics),
+                "delta": delta,
+            }
+            if not delta:
+                data["recent_events"] = self.event_history[-50:]
+            return {"epoch": self.epoch, "seq": self.seq, "data": data}
+
     def get_current_state(self) -> Dict[str, Any]:
         """Get current dashboard state for initial load."""
-        return {
-            "tasks": self.task_state,
-            "agents": self.agent_state,
-            "metrics": self.system_metrics,
-            "recent_events": self.event_history[-50:]  # Last 50 events
-        }
+        with self._lock:
+            if self._metrics_dirty:
+                self._refresh_metrics()
+            return {
+                "tasks": dict(self.task_state),
+                "agents": dict(self.agent_state),
+                "metrics": dict(self.system_metrics),
+                "recent_events": self.event_history[-50:]  # Last 50 events
+            }
 
 
 # Singleton instance
@@ -175,4 +419,3 @@ def get_event_manager() -> EventManager:
     if _event_manager is None:
         _event_manager = EventManager()
     return _event_manager
-
@@ -5,6 +5,7 @@ Dashboard API Server - FastAPI with WebSocket support for real-time updates.
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import HTMLResponse
+from starlette.websockets import WebSocketState
 from typing import Dict, Any
 import logging
 import json
@@ -39,21 +40,19 @@ async def websocket_endpoint(websocket: WebSocket):
     WebSocket endpoint for real-time dashboard updates.
     
     Clients connect to receive real-time events:
-    - task_update: Task status changes
-    - agent_activity: Agent activity updates
-    - metric_update: System metrics updates
+    - initial_state: State snapshot (only changes since ?epoch=<epoch>&since=<seq> when resuming)
+    - batch: Frames of task_update / agent_activity / metric_update events
     """
     await websocket.accept()
-    event_manager.add_connection(websocket)
+    since = websocket.query_params.get("since")
+    # Queues the initial state snapshot ahead of any event batch
+    event_manager.add_connection(
+        websocket,
+        since=int(since) if since and since.isdigit() else None,
+        epoch=websocket.query_params.get("epoch"),
+    )
     
     try:
-        # Send current state on connection
-        current_state = event_manager.get_current_state()
-        await websocket.send_json({
-            "type": "initial_state",
-            "data": current_state
-        })
-        
         # Keep connection alive and handle client messages
         while True:
             # Client can send subscription requests
@@ -70,6 +69,9 @@ async def websocket_endpoint(websocket: WebSocket):
             except WebSocketDisconnect:
                 break
             except Exception as e:
+                # Socket closed by the server (e.g. slow client dropped by its writer)
+                if WebSocketState.DISCONNECTED in (websocket.application_state, websocket.client_state):
+                    break
                 logger.error(f"Error handling WebSocket message: {e}")
     
     except WebSocketDisconnect:
@@ -156,6 +158,14 @@ def get_dashboard_server() -> FastAPI:
 
 
 if __name__ == "__main__":
+    import os
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8001, log_level="info")
+    # permessage-deflate compresses dashboard frames for clients that support it
+    uvicorn.run(
+        app,
+        host="0.0.0.0",
+        port=8001,
+        log_level="info",
+        ws_per_message_deflate=os.getenv("DASHBOARD_WS_DEFLATE", "true").lower() == "true",
+    )
 
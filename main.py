@@ -71,6 +71,11 @@ import json
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 
+# --profile-startup: time every import from here on (report printed by main())
+if "--profile-startup" in sys.argv:
+    from utils.startup_profiler import enable_startup_profiler
+    enable_startup_profiler()
+
 from agents import (
     OrchestratorAgent,
     CoderAgent,
@@ -104,6 +109,7 @@ except ImportError:
 
 from utils.load_balancer import get_load_balancer
 from utils.project_layout import ProjectLayout, get_default_layout, load_layout_from_config
+from utils.startup_profiler import get_startup_profiler, profile_block
 
 
 def setup_logging(log_level: str = "INFO"):
@@ -151,9 +157,50 @@ def verify_environment():
     return True
 
 
+# Specialized agents: type -> (class, backup agent id, takes project_layout, dispatched by orchestrator)
+AGENT_SPECS = {
+    AgentType.CODER: (CoderAgent, "coder_backup", True, True),
+    AgentType.TESTING: (TestingAgent, "testing_backup", True, True),
+    AgentType.QA: (QAAgent, "qa_backup", False, True),
+    AgentType.INFRASTRUCTURE: (InfrastructureAgent, "infrastructure_backup", True, True),
+    AgentType.INTEGRATION: (IntegrationAgent, "integration_backup", True, True),
+    AgentType.FRONTEND: (FrontendAgent, "frontend_backup", True, True),
+    AgentType.WORKFLOW: (WorkflowAgent, "workflow_backup", True, True),
+    AgentType.SECURITY: (SecurityAgent, "security_backup", False, True),
+    AgentType.RESEARCHER: (ResearcherAgent, "researcher_backup", True, True),
+}
+if HAS_MOBILE_AGENT:
+    # QA_Engineer: Mobile agents registration - CRITICAL FIX for mobile task failures
+    AGENT_SPECS[AgentType.MOBILE] = (MobileAgent, "mobile_backup", True, True)
+if HAS_NODE_AGENT:
+    # Node.js agents are load-balanced but not dispatched by the orchestrator
+    AGENT_SPECS[AgentType.NODEJS] = (NodeAgent, "node_backup", True, False)
+
+# Created with the system: researchers serve ad-hoc research requests other agents
+# publish on the "research" message channel, not only their own tasks
+EAGER_AGENT_TYPES = (AgentType.RESEARCHER,)
+
+
+def _agents_of_type(agent_type: AgentType) -> property:
+    """AgentSystem attribute returning the agents of a type, creating them on first access."""
+    return property(lambda self: self._create_agents(agent_type))
+
+
 class AgentSystem:
     """Main system that coordinates all agents."""
 
+    coder_agents = _agents_of_type(AgentType.CODER)
+    testing_agents = _agents_of_type(AgentType.TESTING)
+    qa_agents = _agents_of_type(AgentType.QA)
+    infrastructure_agents = _agents_of_type(AgentType.INFRASTRUCTURE)
+    integration_agents = _agents_of_type(AgentType.INTEGRATION)
+    frontend_agents = _agents_of_type(AgentType.FRONTEND)
+    workflow_agents = _agents_of_type(AgentType.WORKFLOW)
+    security_agents = _agents_of_type(AgentType.SECURITY)
+    researcher_agents = _agents_of_type(AgentType.RESEARCHER)
+    mobile_agents = _agents_of_type(AgentType.MOBILE)
+    node_agents = _agents_of_type(AgentType.NODEJS)
+
     def __init__(
         self, 
         workspace_path: str = ".", 
@@ -207,117 +254,30 @@ class AgentSystem:
         self.load_balancer = get_load_balancer()
         
         # Initialize orchestrator - CRITICAL: Must pass workspace_path to ensure all files are saved correctly
-        self.orchestrator = OrchestratorAgent(
-            workspace_path=str(self.workspace_path),
-            project_id=self.project_id,
-            tenant_id=self.tenant_id
-        )
-        
-        # Initialize specialized agents with project layout and load balancer
-        # Multiple instances per type for redundancy and uptime
+        with profile_block("OrchestratorAgent()"):
+            self.orchestrator = OrchestratorAgent(
+                workspace_path=str(self.workspace_path),
+                project_id=self.project_id,
+                tenant_id=self.tenant_id
+            )
+        
+        # Specialized agents (primary + backup per type for redundancy and uptime) are
+        # created on the first task of their type: most projects use only a few types.
         # Pass project_id, tenant_id, and orchestrator to agents for task tracking and dependency access
-        agent_kwargs = {
+        self._agent_kwargs = {
             "workspace_path": str(self.workspace_path),
             "project_layout": self.project_layout,
             "project_id": self.project_id,
             "tenant_id": self.tenant_id,
             "orchestrator": self.orchestrator  # Pass orchestrator reference for dependency access
         }
-        
-        self.coder_agents = [
-            CoderAgent(**agent_kwargs),
-            CoderAgent(agent_id="coder_backup", **agent_kwargs)  # CRITICAL: Include workspace_path for backup agents
-        ]
-        self.testing_agents = [
-            TestingAgent(**agent_kwargs),
-            TestingAgent(agent_id="testing_backup", **agent_kwargs)  # CRITICAL: Include workspace_path for backup agents
-        ]
-        self.qa_agents = [
-            QAAgent(**{k: v for k, v in agent_kwargs.items() if k != "project_layout"}),
-            QAAgent(agent_id="qa_backup", **{k: v for k, v in agent_kwargs.items() if k != "project_layout"})  # CRITICAL: Include workspace_path
-        ]
-        self.infrastructure_agents = [
-            InfrastructureAgent(**agent_kwargs),
-            InfrastructureAgent(agent_id="infrastructure_backup", **agent_kwargs)  # CRITICAL: Include workspace_path for backup agents
-        ]
-        self.integration_agents = [
-            IntegrationAgent(**agent_kwargs),
-            IntegrationAgent(agent_id="integration_backup", **agent_kwargs)  # CRITICAL: Include workspace_path for backup agents
-        ]
-        self.frontend_agents = [
-            FrontendAgent(**agent_kwargs),
-            FrontendAgent(agent_id="frontend_backup", **agent_kwargs)  # CRITICAL: Include workspace_path for backup agents
-        ]
-        self.workflow_agents = [
-            WorkflowAgent(**agent_kwargs),
-            WorkflowAgent(agent_id="workflow_backup", **agent_kwargs)  # CRITICAL: Include workspace_path for backup agents
-        ]
-        self.security_agents = [
-            SecurityAgent(**{k: v for k, v in agent_kwargs.items() if k != "project_layout"}),
-            SecurityAgent(agent_id="security_backup", **{k: v for k, v in agent_kwargs.items() if k != "project_layout"})  # CRITICAL: Include workspace_path
-        ]
-        self.researcher_agents = [
-            ResearcherAgent(**agent_kwargs),
-            ResearcherAgent(agent_id="researcher_backup", **agent_kwargs)  # CRITICAL: Include workspace_path for backup agents
-        ]
-        
-        # Mobile agent (12th agent - React Native mobile development)
-        self.mobile_agents = []
-        if HAS_MOBILE_AGENT:
-            self.mobile_agents = [
-                MobileAgent(**agent_kwargs),
-                MobileAgent(agent_id="mobile_backup", **agent_kwargs)  # CRITICAL: Include workspace_path for backup agents
-            ]
-        
-        # Node.js agent (if available)
-        self.node_agents = []
-        if HAS_NODE_AGENT:
-            self.node_agents = [
-                NodeAgent(**agent_kwargs),
-                NodeAgent(agent_id="node_backup", **agent_kwargs)  # CRITICAL: Include workspace_path for backup agents
-            ]
-        
-        # Register all agents with load balancer
-        all_agent_lists = [
-            self.coder_agents, self.testing_agents, self.qa_agents,
-            self.infrastructure_agents, self.integration_agents,
-            self.frontend_agents, self.workflow_agents, self.security_agents,
-            self.researcher_agents
-        ]
-        
-        if HAS_MOBILE_AGENT:
-            all_agent_lists.append(self.mobile_agents)
-        
-        if HAS_NODE_AGENT:
-            all_agent_lists.append(self.node_agents)
-        
-        for agent_list in all_agent_lists:
-            for agent in agent_list:
-                self.load_balancer.register_agent(agent, capacity=5)
-        
-        # Register agents with orchestrator
-        for agent in self.coder_agents:
-            self.orchestrator.register_agent(agent)
-        for agent in self.testing_agents:
-            self.orchestrator.register_agent(agent)
-        for agent in self.qa_agents:
-            self.orchestrator.register_agent(agent)
-        for agent in self.infrastructure_agents:
-            self.orchestrator.register_agent(agent)
-        for agent in self.integration_agents:
-            self.orchestrator.register_agent(agent)
-        for agent in self.frontend_agents:
-            self.orchestrator.register_agent(agent)
-        for agent in self.workflow_agents:
-            self.orchestrator.register_agent(agent)
-        for agent in self.security_agents:
-            self.orchestrator.register_agent(agent)
-        for agent in self.researcher_agents:
-            self.orchestrator.register_agent(agent)
-        # QA_Engineer: Mobile agents registration - CRITICAL FIX for mobile task failures
-        if HAS_MOBILE_AGENT:
-            for agent in self.mobile_agents:
-                self.orchestrator.register_agent(agent)
+        self._agents_by_type: Dict[AgentType, List[Any]] = {}
+        self.orchestrator.agent_factory = self._create_agents
+        if os.getenv("Q2O_EAGER_AGENTS", "false").lower() == "true":
+            self.create_all_agents()
+        else:
+            for agent_type in EAGER_AGENT_TYPES:
+                self._create_agents(agent_type)
         
         self.logger = logging.getLogger(__name__)
         
@@ -335,6 +295,47 @@ class AgentSystem:
         else:
             self.git_manager = None
 
+    def _create_agents(self, agent_type: AgentType) -> List[Any]:
+        """
+        Create and register the agents of a type (once).
+        
+        Args:
+            agent_type: Agent type to create
+            
+        Returns:
+            The agents of that type (empty if the type is not available)
+        """
+        if agent_type in self._agents_by_type:
+            return self._agents_by_type[agent_type]
+        spec = AGENT_SPECS.get(agent_type)
+        if spec is None:
+            self._agents_by_type[agent_type] = []
+            return self._agents_by_type[agent_type]
+        agent_class, backup_id, takes_layout, dispatched = spec
+        kwargs = self._agent_kwargs if takes_layout else {k: v for k, v in self._agent_kwargs.items() if k != "project_layout"}
+        with profile_block(f"{agent_class.__name__}()"):
+            primary = agent_class(**kwargs)
+        with profile_block(f"{agent_class.__name__}(agent_id={backup_id!r})"):
+            backup = agent_class(agent_id=backup_id, **kwargs)  # CRITICAL: Include workspace_path for backup agents
+        agents = [primary, backup]
+        self._agents_by_type[agent_type] = agents
+        
+        # Register with load balancer and orchestrator
+        for agent in agents:
+            self.load_balancer.register_agent(agent, capacity=5)
+            if dispatched:
+                self.orchestrator.register_agent(agent)
+        return agents
+    
+    def create_all_agents(self):
+        """Create every agent type up front (Q2O_EAGER_AGENTS=true, startup profiling)."""
+        for agent_type in AGENT_SPECS:
+            self._create_agents(agent_type)
+    
+    def _created_agents(self) -> List[Any]:
+        """All agents created so far, in AGENT_SPECS order (does not create missing types)."""
+        return [agent for agent_type in AGENT_SPECS for agent in self._agents_by_type.get(agent_type, [])]
+
     def _handle_vcs_integration(self, project_description: str, objectives: List[str], results: Dict[str, Any]):
         """Handle VCS operations after project completion."""
         if not self.vcs_enabled or not self.git_manager:
@@ -360,16 +361,7 @@ class AgentSystem:
                 
                 # Collect all files created from all agents' completed tasks
                 all_files = []
-                all_agents = (
-                    self.coder_agents + self.testing_agents + self.qa_agents +
-                    self.infrastructure_agents + self.integration_agents +
-                    self.frontend_agents + self.workflow_agents + self.security_agents +
-                    self.researcher_agents
-                )
-                if hasattr(self, 'mobile_agents'):
-                    all_agents.extend(self.mobile_agents)
-                if hasattr(self, 'node_agents'):
-                    all_agents.extend(self.node_agents)
+                all_agents = self._created_agents()
                 
                 for agent in all_agents:
                     # Check completed tasks
@@ -421,40 +413,15 @@ class AgentSystem:
         self.logger.info(f"Objectives: {len(objectives)}")
         self.logger.info("=" * 80)
         
-        # Emit dashboard project start event
+        # Emit dashboard project start event (queued; sent with the next dashboard batch)
         try:
             from api.dashboard.events import get_event_manager
-            import asyncio
             
-            event_manager = get_event_manager()
-            # Check if we're in an async context
-            try:
-                loop = asyncio.get_running_loop()
-                # We're in an async context - schedule the task
-                asyncio.create_task(event_manager.emit_project_start(
-                    project_description, 
-                    objectives, 
-                    platforms or []
-                ))
-            except RuntimeError:
-                # No running loop - emit synchronously in background thread
-                import threading
-                def emit_in_background():
-                    from utils.event_loop_utils import create_compatible_event_loop
-                    loop = create_compatible_event_loop()
-                    asyncio.set_event_loop(loop)
-                    try:
-                        loop.run_until_complete(event_manager.emit_project_start(
-                            project_description, 
-                            objectives, 
-                            platforms or []
-                        ))
-                    finally:
-                        loop.close()
-                        asyncio.set_event_loop(None)
-                
-                thread = threading.Thread(target=emit_in_background, daemon=True)
-                thread.start()
+            get_event_manager().publish_project_start(
+                project_description, 
+                objectives, 
+                platforms or []
+            )
         except Exception:
             pass  # Dashboard optional
         
@@ -492,6 +459,22 @@ class AgentSystem:
             # QA_Engineer: Heartbeat mechanism - emit periodic status updates
             current_time = time.time()
             if heartbeat_enabled and (current_time - last_heartbeat_time) >= heartbeat_interval:
+                # Push progress to the supervising API worker (read instead of polling the DB)
+                try:
+                    from agents.task_tracking import write_progress_heartbeat
+                    progress = self.orchestrator.get_project_status()
+                    write_progress_heartbeat(
+                        self.workspace_path,
+                        iteration=iteration,
+                        total_tasks=progress.get("total_tasks", 0),
+                        completed=progress.get("completed", 0),
+                        failed=progress.get("failed", 0),
+                        in_progress=progress.get("in_progress", 0),
+                        pending=progress.get("pending", 0),
+                    )
+                except Exception as e:
+                    if main_process_logging_enabled:
+                        self.logger.debug(f"Progress heartbeat failed (optional): {e}")
                 try:
                     # Emit heartbeat to database/API if available
                     from agents.task_tracking import update_project_heartbeat
@@ -527,18 +510,8 @@ class AgentSystem:
             
             # Process active tasks for each agent
             # QA_Engineer: Include mobile agents in main execution loop (critical bug fix)
-            all_agents = (
-                self.coder_agents + self.testing_agents + self.qa_agents +
-                self.infrastructure_agents + self.integration_agents +
-                self.frontend_agents + self.workflow_agents + self.security_agents +
-                self.researcher_agents
-            )
-            # Add mobile agents if available (consistent with run_project method)
-            if hasattr(self, 'mobile_agents') and self.mobile_agents:
-                all_agents = list(all_agents) + self.mobile_agents
-            # Add node agents if available
-            if hasattr(self, 'node_agents') and self.node_agents:
-                all_agents = list(all_agents) + self.node_agents
+            # Agents are created on their first task, so this covers every agent holding work
+            all_agents = self._created_agents()
             
             for agent in all_agents:
                 for task_id, task in list(agent.active_tasks.items()):
@@ -676,14 +649,13 @@ class AgentSystem:
         # Emit dashboard project complete event
         try:
             from api.dashboard.events import get_event_manager
-            import asyncio
             
             event_manager = get_event_manager()
-            asyncio.run(event_manager.emit_project_complete({
+            event_manager.publish_project_complete({
                 "project_description": project_description,
                 "objectives": objectives,
                 "final_status": final_status
-            }))
+            })
         except Exception:
             pass  # Dashboard optional
         
@@ -704,15 +676,16 @@ class AgentSystem:
             },
             "agent_statuses": {
                 "orchestrator": self.orchestrator.get_status(),
-                "coders": [agent.get_status() for agent in self.coder_agents],
-                "testers": [agent.get_status() for agent in self.testing_agents],
-                "qa": [agent.get_status() for agent in self.qa_agents],
-                "infrastructure": [agent.get_status() for agent in self.infrastructure_agents],
-                "integration": [agent.get_status() for agent in self.integration_agents],
-                "frontend": [agent.get_status() for agent in self.frontend_agents],
-                "workflow": [agent.get_status() for agent in self.workflow_agents],
-                "security": [agent.get_status() for agent in self.security_agents],
-                "researcher": [agent.get_status() for agent in self.researcher_agents]
+                # Only agent types that received tasks were created
+                "coders": [agent.get_status() for agent in self._agents_by_type.get(AgentType.CODER, [])],
+                "testers": [agent.get_status() for agent in self._agents_by_type.get(AgentType.TESTING, [])],
+                "qa": [agent.get_status() for agent in self._agents_by_type.get(AgentType.QA, [])],
+                "infrastructure": [agent.get_status() for agent in self._agents_by_type.get(AgentType.INFRASTRUCTURE, [])],
+                "integration": [agent.get_status() for agent in self._agents_by_type.get(AgentType.INTEGRATION, [])],
+                "frontend": [agent.get_status() for agent in self._agents_by_type.get(AgentType.FRONTEND, [])],
+                "workflow": [agent.get_status() for agent in self._agents_by_type.get(AgentType.WORKFLOW, [])],
+                "security": [agent.get_status() for agent in self._agents_by_type.get(AgentType.SECURITY, [])],
+                "researcher": [agent.get_status() for agent in self._agents_by_type.get(AgentType.RESEARCHER, [])]
             }
         }
         
@@ -736,6 +709,12 @@ class AgentSystem:
         print(f"Pending: {status['pending']}")
         print(f"Completion: {status['completion_percentage']:.1f}%")
         
+        fast_path = status.get("template_fast_path")
+        if fast_path:
+            print(f"Template fast path: {fast_path['routed']}/{fast_path['classified']} coder tasks, "
+                  f"{fast_path['completed']} completed ({fast_path['avg_seconds']:.2f}s avg), "
+                  f"{fast_path['fallbacks']} fallbacks, {fast_path['research_skipped']} research tasks skipped")
+        
         print("\n" + "-" * 80)
         print("TASK DETAILS")
         print("-" * 80)
@@ -776,6 +755,23 @@ class AgentSystem:
                       f"Failed: {statuses['failed_tasks']}")
 
 
+def run_startup_profile(output_folder: Optional[str] = None):
+    """Build the agent system, create every agent type and print the startup profile."""
+    import tempfile
+    
+    profiler = get_startup_profiler()
+    tenant_projects = Path(__file__).parent / "Tenant_Projects"
+    tenant_projects.mkdir(exist_ok=True)
+    # Workspaces must live under Tenant_Projects; use a throwaway one unless given
+    with tempfile.TemporaryDirectory(prefix="startup_profile_", dir=tenant_projects) as workspace:
+        with profiler.measure("AgentSystem() (orchestrator + eager agents)"):
+            system = AgentSystem(workspace_path=output_folder or workspace)
+        with profiler.measure("create_all_agents() (remaining types, normally on first task)"):
+            system.create_all_agents()
+    profiler.remove_import_hook()
+    print(profiler.report())
+
+
 def main():
     """Main entry point."""
     parser = argparse.ArgumentParser(
@@ -791,6 +787,9 @@ Examples:
   
   # Set workspace directory
   python main.py --workspace ./my_project --project "My Project" --objective "Feature 1"
+  
+  # Show import times and agent constructor timings
+  python main.py --profile-startup
         """
     )
     
@@ -872,11 +871,21 @@ Examples:
         help="Tenant ID for task tracking (from tenant portal)"
     )
     
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="Print the import-time tree and agent constructor timings, then exit"
+    )
+    
     args = parser.parse_args()
     
     # Setup logging
     setup_logging(args.log_level)
     
+    if args.profile_startup:
+        run_startup_profile(args.output_folder)
+        return
+    
     # Verify environment configuration
     print("=" * 70)
     print("Environment Configuration Check")
@@ -0,0 +1,96 @@
+"""
+Tests for warm agent workers (agent_worker.py) and the API worker pool
+(addon_portal/api/services/agent_worker_pool.py)
+"""
+
+import asyncio
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).parent.parent
+
+try:
+    from api.services.agent_worker_pool import AgentWorkerPool
+except ImportError as e:
+    pytest.skip(f"Licensing API dependencies not available: {e}", allow_module_level=True)
+
+# Worker running the real job protocol with a stand-in for main.py
+WORKER_SCRIPT = textwrap.dedent(f"""
+    import os, sys, time, types
+    sys.path.insert(0, {str(ROOT)!r})
+    import agent_worker
+
+    def main():
+        print("args", sys.argv[1:])
+        print("leaked", os.environ.get("Q2O_PROJECT_ID"))
+        os.environ["Q2O_PROJECT_ID"] = sys.argv[-1]
+        sys.stderr.write("stderr line\\n")
+        if "--fail" in sys.argv:
+            sys.exit(2)
+        if "--hang" in sys.argv:
+            time.sleep(60)
+
+    fake_main = types.ModuleType("main")
+    fake_main.main = main
+    sys.modules["main"] = fake_main
+    agent_worker.warm_up = lambda: 0.0
+    sys.exit(agent_worker.serve(
+        os.environ["Q2O_WORKER_ADDRESS"], os.environ.pop("Q2O_WORKER_TOKEN"), os.environ["Q2O_WORKER_ID"],
+        int(os.environ["AGENT_WORKER_MAX_JOBS"]), int(os.environ["AGENT_WORKER_MAX_RSS_MB"]),
+    ))
+""")
+
+
+async def _wait_idle(pool, count=1):
+    for _ in range(300):
+        if pool.idle_count >= count:
+            return
+        await asyncio.sleep(0.05)
+    raise AssertionError(f"no idle worker: {pool.stats}")
+
+
+def test_pool_runs_isolated_jobs_and_recycles_workers(tmp_path):
+    """Test jobs reuse a warm worker, get their own logs/env, recycle after max_jobs and can be terminated."""
+
+    async def scenario():
+        pool = AgentWorkerPool(
+            size=1, max_jobs=2, max_rss_mb=0, start_timeout=30,
+            worker_cmd=[sys.executable, "-c", WORKER_SCRIPT], log_path=tmp_path / "workers.log",
+        )
+        await pool.start()
+        try:
+            await _wait_idle(pool)
+            first_out, first_err = tmp_path / "p1_out.log", tmp_path / "p1_err.log"
+            job = await pool.submit(["--project-id", "p1"], first_out, first_err)
+            assert await job.wait() == 0
+            first_pid = job.pid
+
+            second_out = tmp_path / "p2_out.log"
+            job = await pool.submit(["--fail", "--project-id", "p2"], second_out, tmp_path / "p2_err.log")
+            assert await job.wait() == 2
+            assert job.pid == first_pid  # same warm worker
+
+            assert "args ['--project-id', 'p1']" in first_out.read_text()
+            assert first_err.read_text() == "stderr line\n"
+            # Environment changes of a job do not leak into the next one
+            assert "leaked None" in second_out.read_text()
+
+            # max_jobs reached: the worker is replaced
+            await _wait_idle(pool)
+            assert pool.stats["recycled"] == 1 and pool.stats["started"] == 2
+
+            hung = await pool.submit(["--hang", "--project-id", "p3"], tmp_path / "p3_out.log", tmp_path / "p3_err.log")
+            assert hung.pid != first_pid
+            # Busy pool: the caller falls back to a fresh subprocess
+            assert await pool.submit(["--project-id", "p4"], tmp_path / "p4_out.log", tmp_path / "p4_err.log") is None
+            await hung.terminate(grace_seconds=1)
+            assert hung.returncode not in (None, 0)
+            await _wait_idle(pool)
+            assert pool.stats["fallbacks"] == 1
+        finally:
+            await pool.close()
+
+    asyncio.run(scenario())
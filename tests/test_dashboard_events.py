@@ -0,0 +1,125 @@
+"""
+Tests for batched dashboard event emission (api/dashboard/events.py)
+"""
+
+import asyncio
+import json
+import sys
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from api.dashboard.events import EventManager
+
+
+class FakeWebSocket:
+    def __init__(self, delay=0.0):
+        self.frames = []
+        self.delay = delay
+        self.close_code = None
+
+    async def send_text(self, message):
+        await asyncio.sleep(self.delay)
+        self.frames.append(json.loads(message))
+
+    async def close(self, code=1000):
+        self.close_code = code
+
+
+def test_events_from_threads_are_coalesced_into_one_frame():
+    """Test superseded task updates collapse and each client gets one frame per batch."""
+    async def scenario():
+        manager = EventManager(batch_interval=0.02)
+        client = FakeWebSocket()
+        manager.add_connection(client)
+
+        def agent_thread(index):
+            manager.publish_task_update(f"task_{index}", "in_progress", title=f"Task {index}")
+            manager.publish_task_update(f"task_{index}", "completed", title=f"Task {index}")
+            manager.publish_agent_activity("coder_1", "coder", "task_completed", status="idle")
+
+        threads = [threading.Thread(target=agent_thread, args=(i,)) for i in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        await asyncio.sleep(0.1)
+
+        assert [frame["type"] for frame in client.frames] == ["initial_state", "batch"]
+        frame = client.frames[1]
+        task_events = [e for e in frame["events"] if e["type"] == "task_update"]
+        assert len(task_events) == 10
+        assert {e["data"]["status"] for e in task_events} == {"completed"}
+        assert [e["type"] for e in frame["events"]].count("agent_activity") == 1
+        metrics = [e for e in frame["events"] if e["type"] == "metric_update"]
+        assert len(metrics) == 1
+        assert metrics[0]["data"]["completed_tasks"] == 10
+        assert metrics[0]["data"]["in_progress_tasks"] == 0
+        assert metrics[0]["data"]["completion_percentage"] == 100.0
+
+    asyncio.run(scenario())
+
+
+def test_metrics_track_status_transitions_without_clients():
+    """Test counters follow transitions and history is kept when no client is connected."""
+    manager = EventManager()
+    manager.publish_task_update("a", "pending")
+    manager.publish_task_update("b", "pending")
+    manager.publish_task_update("a", "in_progress")
+    manager.publish_task_update("a", "failed")
+    manager.publish_agent_activity("agent_1", "coder", "task_failed", status="active")
+
+    metrics = manager.get_current_state()["metrics"]
+    assert metrics["total_tasks"] == 2
+    assert metrics["pending_tasks"] == 1
+    assert metrics["failed_tasks"] == 1
+    assert metrics["in_progress_tasks"] == 0
+    assert metrics["active_agents"] == 1
+    assert any(event["type"] == "task_update" for event in manager.event_history)
+
+
+def test_slow_client_is_dropped_without_delaying_others_and_resyncs_by_delta():
+    """Test a stalled client is disconnected while a fast one keeps receiving, then resumes via delta."""
+    async def scenario():
+        manager = EventManager(batch_interval=0.01, max_pending_frames=3, send_timeout=5)
+        fast, slow = FakeWebSocket(), FakeWebSocket(delay=60)
+        manager.add_connection(fast)
+        manager.add_connection(slow)
+
+        for i in range(6):
+            manager.publish_task_update(f"task_{i}", "completed")
+            await manager.flush()
+            await asyncio.sleep(0.005)
+        await asyncio.sleep(0.05)
+
+        assert slow not in manager.connections and slow.close_code == 1013
+        assert fast in manager.connections
+        assert [frame["type"] for frame in fast.frames].count("batch") == 6
+        assert {frame["epoch"] for frame in fast.frames} == {manager.epoch}
+
+        # The fast client resumes after frame 4: only tasks changed later are resent
+        resumed = FakeWebSocket()
+        manager.add_connection(resumed, since=4, epoch=manager.epoch)
+        await asyncio.sleep(0.01)
+        snapshot = resumed.frames[0]
+        assert snapshot["type"] == "initial_state" and snapshot["seq"] == 6
+        assert snapshot["data"]["delta"] is True
+        assert sorted(snapshot["data"]["tasks"]) == ["task_4", "task_5"]
+        assert snapshot["data"]["metrics"]["completed_tasks"] == 6
+
+        # Unknown seq, missing epoch or another epoch fall back to a full snapshot
+        assert manager.get_snapshot(since=99, epoch=manager.epoch)["data"]["delta"] is False
+        assert manager.get_snapshot(since=4)["data"]["delta"] is False
+
+        # Restarted server: seq starts over, so a seq from the old process must not yield a delta
+        restarted = EventManager()
+        for i in range(5):
+            restarted.publish_task_update(f"new_{i}", "pending")
+        assert restarted.seq >= 4 and restarted.epoch != manager.epoch
+        snapshot = restarted.get_snapshot(since=4, epoch=manager.epoch)
+        assert snapshot["data"]["delta"] is False and len(snapshot["data"]["tasks"]) == 5
+        for websocket in list(manager.connections):
+            manager.remove_connection(websocket)
+
+    asyncio.run(scenario())
@@ -0,0 +1,156 @@
+"""
+Tests for batch commits through the persistent git pipeline (utils/git_commit_pipeline.py)
+"""
+
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.git_commit_pipeline import GitCommitPipeline, GitPipelineError
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+
+
+def git(repo: Path, *args: str) -> str:
+    return subprocess.run(["git", *args], cwd=repo, check=True, capture_output=True, text=True).stdout
+
+
+@pytest.fixture
+def repo(tmp_path):
+    git(tmp_path, "init", "-q", "-b", "main")
+    git(tmp_path, "config", "user.name", "Pipeline Test")
+    git(tmp_path, "config", "user.email", "pipeline@example.com")
+    (tmp_path / ".gitignore").write_text("*.log\n")
+    (tmp_path / "existing.py").write_text("x = 1\n")
+    git(tmp_path, "add", "-A")
+    git(tmp_path, "commit", "-q", "-m", "initial")
+    return tmp_path
+
+
+def test_batch_becomes_one_commit_with_clean_status(repo):
+    """Test a batch is one commit on the branch, ignored/unchanged files are skipped and the index is synced."""
+    (repo / "src").mkdir()
+    (repo / "src" / "app.py").write_text("print('app')\n")
+    (repo / "src" / "with space.py").write_text("y = 2\n")
+    (repo / "debug.log").write_text("noise\n")
+
+    pipeline = GitCommitPipeline(repo)
+    try:
+        files = ["src/app.py", "src/with space.py", "debug.log", "existing.py"]
+        assert pipeline.commit_files(files, "feat: batch") is True
+        spawned = pipeline.stats['processes_spawned']
+
+        # Nothing changed since: no commit, and no new per-batch processes besides check-ignore
+        assert pipeline.commit_files(files, "feat: again") is False
+        assert pipeline.stats['processes_spawned'] == spawned + 1
+
+        (repo / "src" / "app.py").write_text("print('changed')\n")
+        (repo / "existing.py").unlink()
+        assert pipeline.commit_files(["src/app.py", "existing.py"], "feat: second") is True
+    finally:
+        pipeline.close()
+
+    assert git(repo, "log", "--format=%s").splitlines() == ["feat: second", "feat: batch", "initial"]
+    assert git(repo, "show", "--name-only", "--format=", "HEAD~1").split("\n")[:2] == ["src/app.py", "src/with space.py"]
+    assert git(repo, "show", "HEAD:src/app.py") == "print('changed')\n"
+    assert "existing.py" not in git(repo, "ls-tree", "-r", "--name-only", "HEAD")
+    assert git(repo, "status", "--porcelain") == ""
+
+
+def test_commit_builds_on_commits_made_outside_the_pipeline(repo):
+    """Test the branch tip is re-resolved per batch, so interleaved git commits are kept."""
+    pipeline = GitCommitPipeline(repo)
+    try:
+        (repo / "a.py").write_text("a\n")
+        assert pipeline.commit_files(["a.py"], "pipeline a")
+
+        (repo / "manual.py").write_text("m\n")
+        git(repo, "add", "manual.py")
+        git(repo, "commit", "-q", "-m", "manual")
+
+        (repo / "b.py").write_text("b\n")
+        assert pipeline.commit_files(["b.py"], "pipeline b")
+    finally:
+        pipeline.close()
+
+    assert git(repo, "log", "--format=%s").splitlines() == ["pipeline b", "manual", "pipeline a", "initial"]
+    assert git(repo, "status", "--porcelain") == ""
+
+
+def test_checkpoint_packs_are_consolidated_every_gc_interval(repo):
+    """Test the per-commit pack files are repacked by git gc --auto every gc_interval commits."""
+    git(repo, "config", "gc.autoPackLimit", "3")
+    git(repo, "config", "gc.autoDetach", "false")
+    pack_dir = repo / ".git" / "objects" / "pack"
+    pipeline = GitCommitPipeline(repo, gc_interval=4)
+    try:
+        for i in range(8):
+            (repo / f"file_{i}.py").write_text(f"value = {i}\n")
+            assert pipeline.commit_files([f"file_{i}.py"], f"commit {i}")
+        assert pipeline.stats['gc_runs'] == 2
+        assert len(list(pack_dir.glob("*.pack"))) <= 3
+    finally:
+        pipeline.close()
+
+    assert len(git(repo, "log", "--format=%s").splitlines()) == 9
+    assert git(repo, "status", "--porcelain") == ""
+
+
+def test_index_mode_is_kept_when_the_executable_bit_is_not_trusted(repo):
+    """Test core.fileMode=false keeps a committed executable bit instead of resetting it to 100644."""
+    (repo / "run.sh").write_text("#!/bin/sh\n")
+    git(repo, "add", "run.sh")
+    git(repo, "update-index", "--chmod=+x", "run.sh")
+    git(repo, "commit", "-q", "-m", "script")
+    git(repo, "config", "core.fileMode", "false")
+    (repo / "run.sh").chmod(0o644)
+
+    pipeline = GitCommitPipeline(repo)
+    try:
+        (repo / "run.sh").write_text("#!/bin/sh\necho hi\n")
+        (repo / "new.py").write_text("n = 1\n")
+        assert pipeline.commit_files(["run.sh", "new.py"], "update script")
+    finally:
+        pipeline.close()
+
+    modes = {line.split("\t")[1]: line.split(" ")[0] for line in git(repo, "ls-tree", "HEAD").splitlines()}
+    assert modes["run.sh"] == "100755"
+    assert modes["new.py"] == "100644"
+    assert git(repo, "status", "--porcelain") == ""
+
+
+def test_git_timeouts_and_unreadable_files_surface_as_pipeline_errors(repo, monkeypatch):
+    """Test process timeouts and file read errors raise GitPipelineError so the caller falls back."""
+    pipeline = GitCommitPipeline(repo)
+    try:
+        (repo / "a.py").write_text("a\n")
+        real_run_git = pipeline._run_git
+
+        def slow_check_ignore(args, *rest, **kwargs):
+            if args[0] == "check-ignore":
+                raise subprocess.TimeoutExpired(["git"] + args, 30)
+            return real_run_git(args, *rest, **kwargs)
+
+        monkeypatch.setattr(pipeline, "_run_git", slow_check_ignore)
+        with pytest.raises(GitPipelineError):
+            pipeline.commit_files(["a.py"], "timed out")
+        monkeypatch.setattr(pipeline, "_run_git", real_run_git)
+
+        def unreadable(self):
+            raise PermissionError(13, "Permission denied", str(self))
+
+        monkeypatch.setattr(Path, "read_bytes", unreadable)
+        with pytest.raises(GitPipelineError):
+            pipeline.commit_files(["a.py"], "unreadable")
+        monkeypatch.undo()
+
+        assert pipeline.commit_files(["a.py"], "recovered")
+    finally:
+        pipeline.close()
+
+    assert git(repo, "log", "--format=%s").splitlines() == ["recovered", "initial"]
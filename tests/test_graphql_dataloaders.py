@@ -0,0 +1,168 @@
+"""
+Query-count tests for addon_portal/api/graphql (DataLoaders / N+1 regressions)
+
+Runs real GraphQL operations against an in-memory SQLite database and asserts
+how many SQL statements each one issues, so per-row follow-up queries show up
+as test failures.
+"""
+
+import asyncio
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+try:
+    from sqlalchemy import event
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+    from api.core.db import Base
+    from api.models.agent_tasks import AgentTask, AgentTaskStats
+    from api.models.llm_config import LLMProjectConfig, LLMAgentConfig
+    from api.graphql.schema import schema
+    from api.graphql.dataloaders import create_dataloaders
+    from api.services.task_stats_service import get_projects_progress
+except ImportError as e:
+    pytest.skip(f"GraphQL dependencies not available: {e}", allow_module_level=True)
+
+
+class QueryCounter:
+    """Counts SQL statements executed on an engine."""
+
+    def __init__(self):
+        self.statements = []
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    @property
+    def count(self):
+        return len(self.statements)
+
+
+@contextmanager
+def count_queries(engine):
+    counter = QueryCounter()
+    event.listen(engine.sync_engine, "before_cursor_execute", counter)
+    try:
+        yield counter
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", counter)
+
+
+class _Context:
+    """Minimal stand-in for GraphQLContext (db session + per-request loaders)."""
+
+    def __init__(self, db):
+        self.db = db
+        self.tenant_id = None
+        self.dataloaders = create_dataloaders(db)
+
+    def __getitem__(self, key):
+        return self.dataloaders.get(key)
+
+
+async def _seed(session, project_count=5, agent_types=("coder", "researcher", "frontend", "qa")):
+    started = datetime.now(timezone.utc) - timedelta(hours=1)
+    for p in range(project_count):
+        project_id = f"project-{p}"
+        session.add(LLMProjectConfig(
+            project_id=project_id, client_name=f"Client {p}", description="Migration",
+            execution_status="running", execution_started_at=started,
+            created_at=started - timedelta(minutes=p),
+        ))
+        for i, agent_type in enumerate(agent_types):
+            for status in ("completed", "running", "failed"):
+                session.add(AgentTask(
+                    task_id=f"task-{p}-{agent_type}-{status}", project_id=project_id,
+                    agent_type=agent_type, task_name=f"{agent_type} {status}", status=status,
+                    priority=1, created_at=started + timedelta(minutes=i + 1),
+                    started_at=started + timedelta(minutes=i + 1),
+                    completed_at=started + timedelta(minutes=i + 2) if status == "completed" else None,
+                    actual_duration_seconds=60 if status == "completed" else None,
+                    llm_calls_count=2, llm_tokens_used=100, llm_cost_usd=0.5,
+                ))
+    await session.commit()
+
+
+def _run(query, execute=None):
+    async def scenario():
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all, tables=[
+                LLMProjectConfig.__table__, LLMAgentConfig.__table__, AgentTask.__table__,
+                AgentTaskStats.__table__
+            ])
+        session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        async with session_factory() as session:
+            await _seed(session)
+        async with session_factory() as session:
+            # Build the agent_task_stats rollup rows (maintained by task writes in production)
+            await get_projects_progress(session, [f"project-{p}" for p in range(5)])
+        async with session_factory() as session:
+            with count_queries(engine) as counter:
+                if execute is None:
+                    result = await schema.execute(query, context_value=_Context(session))
+                else:
+                    result = await execute(_Context(session))
+        await engine.dispose()
+        return result, counter
+
+    return asyncio.run(scenario())
+
+
+def test_agents_query_count_is_constant():
+    """Test agents issues one stats query plus one batched current-task query."""
+    result, counter = _run("{ agents { id status currentTaskId tasksCompleted } }")
+    assert result.errors is None
+    assert len(result.data["agents"]) == 4
+    assert all(agent["currentTaskId"] for agent in result.data["agents"])
+    assert counter.count == 2, counter.statements
+
+
+def test_projects_with_nested_fields_are_batched():
+    """Test projects + tasks + task.project + llmUsage do not scale with project count."""
+    result, counter = _run("""
+        {
+          projects(limit: 5) {
+            id
+            totalTasks
+            completedTasks
+            llmUsage { calls costUsd }
+            tasks(limit: 3) { id project { id } }
+          }
+        }
+    """)
+    assert result.errors is None
+    projects = result.data["projects"]
+    assert len(projects) == 5
+    assert projects[0]["totalTasks"] == 12 and projects[0]["completedTasks"] == 4
+    assert projects[0]["llmUsage"] == {"calls": 24, "costUsd": 6.0}
+    assert all(len(p["tasks"]) == 3 for p in projects)
+    # projects, task stats, tasks (windowed), LLM usage
+    assert counter.count == 4, counter.statements
+
+
+def test_project_task_stats_come_from_the_rollup():
+    """Test TaskStatsByProjectLoader reads agent_task_stats rows, not every task row."""
+    async def load(context):
+        return await context["task_stats_loader"].load_many(["project-0", "project-1", "missing"])
+
+    stats, counter = _run(None, execute=load)
+    assert [s["total_tasks"] for s in stats] == [12, 12, 0]
+    assert stats[0]["completed_tasks"] == 4 and stats[0]["average_duration_seconds"] == 60
+    assert stats[2]["average_duration_seconds"] is None
+    assert counter.count == 1, counter.statements
+    assert "agent_task_stats" in counter.statements[0]
+    assert "agent_tasks." not in counter.statements[0]
+
+
+def test_single_project_query_count():
+    """Test project(id) derives stats, agents and ETA from one task query."""
+    result, counter = _run('{ project(id: "project-1") { id totalTasks agents { id status } estimatedTimeRemainingSeconds } }')
+    assert result.errors is None
+    project = result.data["project"]
+    assert project["totalTasks"] == 12
+    assert len(project["agents"]) == 4
+    assert project["estimatedTimeRemainingSeconds"] is not None
+    # project + agent_configs (selectinload) + tasks
+    assert counter.count == 3, counter.statements
@@ -0,0 +1,165 @@
+"""
+Tests for addon_portal/api/graphql/pubsub.py (GraphQL subscription fan-out hub)
+"""
+
+import asyncio
+
+import pytest
+
+try:
+    from api.graphql.pubsub import SubscriptionHub, encode_payload, decode_payload
+except ImportError as e:
+    pytest.skip(f"GraphQL dependencies not available: {e}", allow_module_level=True)
+
+
+async def _drain(subscriber, count):
+    events = []
+    for _ in range(count):
+        events.append(await asyncio.wait_for(subscriber.__anext__(), timeout=1))
+    return events
+
+
+def test_every_subscriber_receives_matching_events():
+    """Test events fan out to all subscribers and filters apply server-side."""
+    async def scenario():
+        hub = SubscriptionHub()
+        async with hub.subscribe("task_updated") as all_tasks, \
+                hub.subscribe("task_updated", project_id="project-1") as project_one, \
+                hub.subscribe("task_updated", project_id="project-2") as project_two:
+            await hub.publish("task_updated", "t1", project_id="project-1")
+            await hub.publish("task_updated", "t2", project_id="project-2")
+
+            assert [e.payload for e in await _drain(all_tasks, 2)] == ["t1", "t2"]
+            assert [e.payload for e in await _drain(project_one, 1)] == ["t1"]
+            assert [e.payload for e in await _drain(project_two, 1)] == ["t2"]
+            assert project_one.queue.empty()
+        assert hub.subscriber_count == 0
+
+    asyncio.run(scenario())
+
+
+def test_slow_subscriber_is_evicted():
+    """Test a subscriber whose queue overflows is dropped and its stream ends."""
+    async def scenario():
+        hub = SubscriptionHub(max_queue=2)
+        async with hub.subscribe("agent_activity") as slow, hub.subscribe("agent_activity", max_queue=10) as fast:
+            for i in range(3):
+                await hub.publish("agent_activity", i, agent_type="coder")
+
+            assert slow.evicted
+            assert [event async for event in slow] == []
+            assert [e.payload for e in await _drain(fast, 3)] == [0, 1, 2]
+            assert hub.stats["evicted"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_payload_codec_round_trips_strawberry_types():
+    """Test relayed events rebuild Strawberry types, enums and datetimes."""
+    from datetime import datetime
+    from api.graphql.types import Task, TaskStatus, AgentType
+
+    task = Task(
+        id="task-1", project_id="project-1", agent_type=AgentType.CODER, title="Build",
+        description=None, status=TaskStatus.COMPLETED, priority=1, created_at=datetime(2025, 1, 1),
+        started_at=datetime(2025, 1, 1), completed_at=datetime(2025, 1, 1, 0, 5), error_message=None
+    )
+    registry = {cls.__name__: cls for cls in (Task, TaskStatus, AgentType)}
+
+    decoded = decode_payload(encode_payload(task), registry)
+    assert isinstance(decoded, Task)
+    assert decoded.status is TaskStatus.COMPLETED
+    assert decoded.duration_seconds() == 300
+
+
+def test_metrics_producer_is_shared_and_applies_status_changes(monkeypatch):
+    """Test dashboards with the same scope share one producer fed by task status events."""
+    from types import SimpleNamespace
+    from api.graphql import metrics_producer
+    from api.graphql.metrics_producer import MetricsProducer, MetricsProducerRegistry, METRICS_TOPIC
+
+    recomputes = []
+
+    async def fake_recompute(self):
+        recomputes.append(self.scope)
+        self._counts.clear()
+        self._counts.update({("running", "coder"): 2, ("completed", "coder"): 3, ("failed", "qa"): 1})
+        self._duration_sum, self._duration_count = 30.0, 3
+        self._loaded = True
+        self._last_full = metrics_producer.time.monotonic()
+
+    monkeypatch.setattr(MetricsProducer, "recompute", fake_recompute)
+    monkeypatch.setattr(metrics_producer, "_sample_resources", lambda: (0.0, 0.0))
+    hub = SubscriptionHub()
+    monkeypatch.setattr(metrics_producer, "get_subscription_hub", lambda: hub)
+
+    async def scenario():
+        registry = MetricsProducerRegistry(full_refresh_seconds=3600)
+        first = registry.acquire(1, "project-1", 60)
+        second = registry.acquire(1, "project-1", 60)
+        assert first is second and first.subscribers == 2
+
+        async with hub.subscribe(METRICS_TOPIC, scope=first.scope) as subscriber:
+            snapshot = (await _drain(subscriber, 1))[0].payload
+        assert (snapshot.active_tasks, snapshot.tasks_completed_today, snapshot.tasks_failed_today) == (2, 3, 1)
+        assert snapshot.system_health_score == 75.0
+
+        task = SimpleNamespace(tenant_id=1, project_id="project-1", agent_type="coder",
+                               status="completed", actual_duration_seconds=50)
+        registry.on_task_status(task, "running")
+        other_project = SimpleNamespace(tenant_id=1, project_id="project-2", agent_type="coder",
+                                        status="failed", actual_duration_seconds=None)
+        registry.on_task_status(other_project, "running")
+
+        updated = await first.snapshot()
+        assert (updated.active_tasks, updated.tasks_completed_today, updated.tasks_failed_today) == (1, 4, 1)
+        assert updated.average_task_duration_seconds == 20.0
+        assert recomputes == [first.scope]
+
+        await registry.release(first)
+        await registry.release(second)
+        assert registry._producers == {}
+
+    asyncio.run(scenario())
+
+
+def test_metrics_change_poll_invalidates_scopes_written_by_other_processes(monkeypatch, tmp_path):
+    """Test task rows written outside the API process mark only the matching producers stale."""
+    from datetime import datetime, timedelta, timezone
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+    from api.core.db import Base
+    from api.graphql import metrics_producer
+    from api.graphql.metrics_producer import MetricsProducer, MetricsProducerRegistry
+    from api.models.agent_tasks import AgentTask
+
+    async def scenario():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'tasks.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all, tables=[AgentTask.__table__])
+        session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        monkeypatch.setattr(metrics_producer, "AsyncSessionLocal", session_factory)
+
+        registry = MetricsProducerRegistry(full_refresh_seconds=3600)
+        watched = MetricsProducer(1, "project-1", 60, 3600)
+        other = MetricsProducer(1, "project-2", 60, 3600)
+        registry._producers = {watched.key: watched, other.key: other}
+
+        since = datetime.now(timezone.utc) - timedelta(seconds=5)
+        async with session_factory() as session:
+            session.add(AgentTask(task_id="t1", project_id="project-1", agent_type="coder", task_name="Build",
+                                  status="completed", tenant_id=1, completed_at=datetime.now(timezone.utc)))
+            await session.commit()
+
+        try:
+            next_since = await registry.poll_changes(since)
+            assert next_since > since
+            assert (watched._stale, other._stale) == (True, False)
+
+            # Nothing new since the returned watermark
+            watched._stale = False
+            assert await registry.poll_changes(next_since) == next_since
+            assert watched._stale is False
+        finally:
+            await engine.dispose()
+
+    asyncio.run(scenario())
@@ -0,0 +1,164 @@
+"""
+Tests for cached token verification, in-memory device revocation and coalesced
+heartbeats (addon_portal/api/core/security.py, addon_portal/api/services/license_state_service.py,
+addon_portal/api/services/heartbeat_service.py)
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+try:
+    import jwt
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+    from fastapi import HTTPException
+    from sqlalchemy import select, update
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+    from api.core import security
+    from api.core.db import Base
+    from api.core.settings import settings
+    from api.models.licensing import Device, Tenant
+    from api.services import license_state_service
+    from api.services.heartbeat_service import HeartbeatAggregator
+    from api.services.license_state_service import DeviceRevocationSet, check_device_active, mark_device_revoked
+except ImportError as e:
+    pytest.skip(f"Licensing API dependencies not available: {e}", allow_module_level=True)
+
+
+@pytest.fixture
+def rsa_keys(monkeypatch):
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_pem = key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    ).decode()
+    public_pem = key.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    ).decode()
+    monkeypatch.setattr(settings, "JWT_PRIVATE_KEY", private_pem)
+    monkeypatch.setattr(settings, "JWT_PUBLIC_KEY", public_pem)
+    security.verified_tokens.clear()
+    yield
+    security.verified_tokens.clear()
+
+
+def test_verified_tokens_skip_signature_check_until_exp(rsa_keys, monkeypatch):
+    """Test a token is decoded once, served from cache, and rejected after exp."""
+    token = security.issue_access_token(1, 7, "pro", 100, "active")
+    decodes = []
+    real_decode = jwt.decode
+    monkeypatch.setattr(security.jwt, "decode", lambda *a, **kw: decodes.append(1) or real_decode(*a, **kw))
+
+    first = security.verify_access(token)
+    second = security.verify_access(token)
+    assert first == second and first["sub"] == "tenant:1:device:7"
+    assert len(decodes) == 1
+
+    # Mutating returned claims must not leak into the cache
+    second["sub"] = "tampered"
+    assert security.verify_access(token)["sub"] == "tenant:1:device:7"
+
+    monkeypatch.setattr(security.time, "time", lambda: first["exp"] + 1)
+    with pytest.raises(jwt.ExpiredSignatureError):
+        security.verify_access(token)
+
+    # Invalid tokens are never cached
+    with pytest.raises(jwt.InvalidTokenError):
+        security.verify_access(token[:-4] + "AAAA")
+    assert len(security.verified_tokens) == 0
+
+
+def test_revocation_set_applies_local_marks_and_reloads(monkeypatch):
+    """Test revocations apply immediately locally and other workers' appear after a reload."""
+    monkeypatch.setattr(license_state_service, "_revocations", DeviceRevocationSet(refresh_seconds=3600))
+
+    async def scenario():
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all, tables=[Tenant.__table__, Device.__table__])
+        session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        async with session_factory() as session:
+            session.add(Tenant(id=1, name="Tenant", slug="tenant"))
+            session.add_all([
+                Device(id=1, tenant_id=1, hw_fingerprint="a"),
+                Device(id=2, tenant_id=1, hw_fingerprint="b", is_revoked=True),
+                Device(id=3, tenant_id=1, hw_fingerprint="c"),
+            ])
+            await session.commit()
+
+            await check_device_active(session, 1, 1)
+            with pytest.raises(HTTPException):
+                await check_device_active(session, 2, 1)
+
+            # Revoked by this worker: effective without a reload
+            await session.execute(update(Device).where(Device.id == 1).values(is_revoked=True))
+            await session.commit()
+            mark_device_revoked(1)
+            with pytest.raises(HTTPException):
+                await check_device_active(session, 1, 1)
+
+            # Revoked by another worker: effective after the next reload
+            await session.execute(update(Device).where(Device.id == 3).values(is_revoked=True))
+            await session.commit()
+            await check_device_active(session, 3, 1)
+            await license_state_service.get_revocation_set().refresh(session)
+            with pytest.raises(HTTPException):
+                await check_device_active(session, 3, 1)
+            assert len(license_state_service.get_revocation_set()) == 3
+
+            # Registered since the reload: one lookup. Deleted or another tenant's: not found
+            session.add(Device(id=4, tenant_id=1, hw_fingerprint="d"))
+            await session.commit()
+            await check_device_active(session, 4, 1)
+            with pytest.raises(HTTPException) as wrong_tenant:
+                await check_device_active(session, 4, 2)
+            assert wrong_tenant.value.detail == "device not found"
+
+            await session.execute(Device.__table__.delete().where(Device.id == 4))
+            await session.commit()
+            await license_state_service.get_revocation_set().refresh(session)
+            with pytest.raises(HTTPException) as deleted:
+                await check_device_active(session, 4, 1)
+            assert deleted.value.detail == "device not found"
+        await engine.dispose()
+
+    asyncio.run(scenario())
+
+
+def test_heartbeats_coalesce_into_bulk_updates():
+    """Test repeated heartbeats collapse per device and are written in batched statements."""
+    async def scenario():
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all, tables=[Tenant.__table__, Device.__table__])
+        session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        async with session_factory() as session:
+            session.add(Tenant(id=1, name="Tenant", slug="tenant"))
+            session.add_all([Device(id=i, tenant_id=1, hw_fingerprint=str(i)) for i in range(1, 6)])
+            await session.commit()
+
+        aggregator = HeartbeatAggregator(session_factory, batch_size=2)
+        base = datetime(2026, 1, 1, 12, 0, 0)
+        for minute in range(3):
+            for device_id in range(1, 6):
+                aggregator.record(1, device_id, base + timedelta(minutes=minute))
+        # An out-of-order older heartbeat never moves last_seen backwards
+        aggregator.record(1, 1, base)
+        assert aggregator.pending_count == 5
+
+        assert await aggregator.flush() == 5
+        assert aggregator.pending_count == 0
+        assert aggregator.stats["statements"] == 3
+        async with session_factory() as session:
+            seen = (await session.execute(select(Device.last_seen))).scalars().all()
+            assert seen == [base + timedelta(minutes=2)] * 5
+
+        # A failed flush keeps the heartbeats for the next attempt
+        failing = HeartbeatAggregator(lambda: (_ for _ in ()).throw(RuntimeError("db down")))
+        failing.record(1, 1)
+        assert await failing.flush() == 0
+        assert failing.pending_count == 1
+        await engine.dispose()
+
+    asyncio.run(scenario())
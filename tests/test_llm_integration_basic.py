@@ -69,6 +69,7 @@ def test_template_learning_initialization():
     print(f"   Database: {test_db}")
     
     # Cleanup
+    engine.close()
     Path(test_db).unlink()
 
 
@@ -113,6 +114,40 @@ async def test_llm_service_mock_call():
     print(f"   Current spend: ${service.cost_monitor.monthly_spent}")
 
 
+def test_provider_calls_do_not_block_the_event_loop():
+    """Test blocking OpenAI/Anthropic SDK calls overlap instead of serializing concurrent generations."""
+    import time
+    from types import SimpleNamespace
+    from utils.llm_service import LLMService
+
+    def blocking_openai(**kwargs):
+        time.sleep(0.2)
+        usage = SimpleNamespace(prompt_tokens=1, completion_tokens=1, total_tokens=2)
+        message = SimpleNamespace(content="ok")
+        return SimpleNamespace(usage=usage, model=kwargs["model"], choices=[SimpleNamespace(message=message)])
+
+    def blocking_anthropic(**kwargs):
+        time.sleep(0.2)
+        return SimpleNamespace(usage=SimpleNamespace(input_tokens=1, output_tokens=1),
+                               content=[SimpleNamespace(text="ok")])
+
+    service = LLMService(monthly_budget=100.0)
+    service._openai_client = SimpleNamespace(
+        chat=SimpleNamespace(completions=SimpleNamespace(create=blocking_openai)))
+    service._anthropic_client = SimpleNamespace(messages=SimpleNamespace(create=blocking_anthropic))
+
+    async def scenario():
+        started = time.perf_counter()
+        calls = [service._openai_complete("s", "u", 0.1, 10, "gpt-test") for _ in range(3)]
+        calls += [service._anthropic_complete("s", "u", 0.1, 10, "claude-test") for _ in range(3)]
+        responses = await asyncio.gather(*calls)
+        return responses, time.perf_counter() - started
+
+    responses, elapsed = asyncio.run(scenario())
+    assert [response.content for response in responses] == ["ok"] * 6
+    assert elapsed < 0.8
+
+
 @pytest.mark.asyncio
 async def test_coder_agent_with_llm():
     """Test CoderAgent initializes with LLM integration."""
@@ -180,6 +215,7 @@ def test_learning_stats_empty_table():
     print("[OK] Bug 3 fix verified: Empty table handled correctly")
     
     # Cleanup
+    engine.close()
     Path(test_db).unlink()
 
 
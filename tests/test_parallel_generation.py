@@ -0,0 +1,41 @@
+"""
+Tests for bounded-concurrency file generation (BaseAgent.generate_concurrently)
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from agents.base_agent import BaseAgent, AgentType, Task
+
+
+class _GeneratingAgent(BaseAgent):
+    def process_task(self, task: Task) -> Task:
+        return task
+
+
+def test_generation_is_bounded_ordered_and_tolerates_failures(monkeypatch):
+    """Test at most CODE_GENERATION_CONCURRENCY run at once, results keep input order and failures stay in place."""
+    monkeypatch.setenv("CODE_GENERATION_CONCURRENCY", "3")
+    agent = _GeneratingAgent("gen_test", AgentType.CODER, enable_messaging=False)
+    running = 0
+    peak = 0
+
+    async def generate(item):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        # Later items finish first, so ordering cannot come from completion order
+        await asyncio.sleep(0.01 * (10 - item))
+        running -= 1
+        if item == 4:
+            raise ValueError("LLM generation failed")
+        return f"file{item}"
+
+    results = asyncio.run(agent.generate_concurrently(list(range(10)), generate))
+
+    assert peak == 3
+    assert isinstance(results[4], ValueError)
+    assert [r for i, r in enumerate(results) if i != 4] == [f"file{i}" for i in range(10) if i != 4]
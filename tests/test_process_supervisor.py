@@ -0,0 +1,66 @@
+"""
+Tests for project subprocess supervision (addon_portal/api/services/process_supervisor.py)
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+
+try:
+    from api.services.process_supervisor import HEARTBEAT_FILENAME, LogWatcher, read_heartbeat, spawn_process
+except ImportError as e:
+    pytest.skip(f"Licensing API dependencies not available: {e}", allow_module_level=True)
+
+
+def test_log_watcher_reads_only_appended_bytes_and_keeps_context(tmp_path):
+    """Test the tail resumes from its offset, handles split lines, and records match context."""
+    log = tmp_path / "execution_stderr.log"
+    log.write_text("line 1\nline 2\nTraceback\n  File x\nImportErr")
+    watcher = LogWatcher(log, ["ImportError", "Event loop is closed"], context_before=2, context_after=3)
+
+    first = watcher.read_new()
+    assert first == log.stat().st_size
+    assert watcher.matches == {}  # "ImportErr" is an incomplete line so far
+
+    with open(log, "a") as f:
+        f.write("or: No module named foo\nafter 1\n")
+    assert watcher.read_new() == len("or: No module named foo\nafter 1\n")
+    assert watcher.read_new() == 0
+
+    watcher.read_new(final=True)
+    assert watcher.matches["ImportError"] == "Traceback\n  File x\nImportError: No module named foo\nafter 1"
+    assert "Event loop is closed" not in watcher.matches
+
+
+def test_spawned_process_exit_is_awaited_and_terminate_kills(tmp_path):
+    """Test exit codes are awaited without polling and a hung child can be terminated."""
+    async def scenario():
+        with open(tmp_path / "out.log", "w") as out, open(tmp_path / "err.log", "w") as err:
+            process = await spawn_process(
+                [sys.executable, "-c", "import sys; print('done'); sys.exit(3)"],
+                cwd=str(tmp_path), env=dict(os.environ), stdout_file=out, stderr_file=err,
+            )
+        assert await process.wait() == 3
+        assert (tmp_path / "out.log").read_text().strip() == "done"
+
+        with open(tmp_path / "out.log", "w") as out, open(tmp_path / "err.log", "w") as err:
+            hung = await spawn_process(
+                [sys.executable, "-c", "import time; time.sleep(60)"],
+                cwd=str(tmp_path), env=dict(os.environ), stdout_file=out, stderr_file=err,
+            )
+        started = time.monotonic()
+        await hung.terminate(grace_seconds=5)
+        assert hung.returncode is not None
+        assert time.monotonic() - started < 5
+
+    asyncio.run(scenario())
+
+
+def test_read_heartbeat_returns_child_progress(tmp_path):
+    """Test the supervisor reads the progress file written by the child."""
+    assert read_heartbeat(tmp_path) is None
+    (tmp_path / HEARTBEAT_FILENAME).write_text('{"total_tasks": 4, "completed": 2}')
+    assert read_heartbeat(tmp_path) == {"total_tasks": 4, "completed": 2}
@@ -61,6 +61,316 @@ def test_web_searcher_initialization():
     # (Google and Bing may not be configured in test environment)
 
 
+def test_web_searcher_fanout_merges_and_dedupes():
+    """Test rank fusion merge collapses the same page from different providers."""
+    searcher = WebSearcher()
+    
+    merged = searcher._merge_ranked_results({
+        "google": [
+            {"title": "Docs", "url": "https://www.example.com/docs/", "snippet": "short"},
+            {"title": "Other", "url": "https://other.com/page", "snippet": "x"},
+        ],
+        "duckduckgo": [
+            {"title": "Docs", "url": "https://example.com/docs?utm_source=ddg", "snippet": "a longer snippet"},
+        ],
+    }, num_results=10)
+    
+    assert len(merged) == 2
+    assert merged[0]["sources"] == ["google", "duckduckgo"]
+    assert merged[0]["snippet"] == "a longer snippet"
+
+
+def test_web_searcher_fanout_respects_deadline():
+    """Test fan-out returns results that arrived before the deadline."""
+    import asyncio
+    
+    searcher = WebSearcher()
+    searcher.google_api_key = "key"
+    searcher.google_cx = "cx"
+    searcher.bing_api_key = None
+    searcher.search_counts = {"google": 0, "bing": 0, "duckduckgo": 0}
+    searcher._save_search_counts = lambda: None
+    
+    async def fast_google(query, num_results):
+        return [{"title": "G", "url": "https://g.example.com", "snippet": "", "source": "google"}]
+    
+    async def slow_ddg(query, num_results):
+        await asyncio.sleep(5)
+        return [{"title": "D", "url": "https://d.example.com", "snippet": "", "source": "duckduckgo"}]
+    
+    searcher._search_google_async = fast_google
+    searcher._search_duckduckgo_async = slow_ddg
+    
+    results = searcher.search_fanout("test query", num_results=5, deadline=0.2)
+    
+    assert [r["url"] for r in results] == ["https://g.example.com"]
+    assert searcher.search_counts["google"] == 1
+    assert searcher.search_counts["duckduckgo"] == 0
+
+
+def test_research_prefetch_serves_search(monkeypatch):
+    """Test prefetched search results are served to WebSearcher.search."""
+    from utils.research_prefetcher import ResearchPrefetcher
+    import utils.research_prefetcher as prefetch_module
+    
+    calls = []
+    
+    def fake_search(self, query, num_results=10, use_prefetch=True):
+        calls.append((query, use_prefetch))
+        return [{"title": "QBO", "url": "https://developer.intuit.com", "snippet": "", "source": "google"}]
+    
+    prefetcher = ResearchPrefetcher(max_workers=1, pages_per_query=0)
+    monkeypatch.setattr(WebSearcher, "search", fake_search)
+    monkeypatch.setattr(prefetch_module, "_prefetcher_instance", prefetcher)
+    monkeypatch.setenv("RESEARCH_PREFETCH_ENABLED", "true")
+    
+    queries = prefetcher.build_queries("QuickBooks migration", ["python"])
+    assert queries[0] == "QuickBooks migration"
+    assert len(queries) == prefetcher.max_queries_per_objective
+    
+    for future in prefetcher.prefetch(queries[:1]):
+        future.result(timeout=5)
+    
+    assert calls == [("QuickBooks migration", False)]
+    cached = WebSearcher()._get_prefetched_results("quickbooks  MIGRATION", 5)
+    assert cached[0]["url"] == "https://developer.intuit.com"
+
+
+def test_breakdown_prefetch_matches_research_task_queries(monkeypatch):
+    """Test the prefetch started at task breakdown is hit by the research task's own queries."""
+    import logging
+    from agents.orchestrator import OrchestratorAgent
+    from utils.research_prefetcher import ResearchPrefetcher
+    import utils.research_prefetcher as prefetch_module
+    
+    def fake_search(self, query, num_results=10, use_prefetch=True):
+        return [{"title": query, "url": "https://developer.intuit.com", "snippet": "", "source": "google"}]
+    
+    prefetcher = ResearchPrefetcher(max_workers=2, pages_per_query=0)
+    monkeypatch.setattr(WebSearcher, "search", fake_search)
+    monkeypatch.setattr(prefetch_module, "_prefetcher_instance", prefetcher)
+    monkeypatch.setenv("RESEARCH_PREFETCH_ENABLED", "true")
+    
+    objective = "Follow every requirement below strictly. Research: QuickBooks Online migration to Odoo"
+    orchestrator = OrchestratorAgent.__new__(OrchestratorAgent)
+    orchestrator.logger = logging.getLogger("test")
+    orchestrator._start_research_prefetch([objective])
+    for future in list(prefetcher._inflight.values()):
+        future.result(timeout=5)
+    
+    # The research task as OrchestratorAgent._analyze_objective builds it
+    task = Task(
+        id="task_0001_research",
+        title="Research",
+        description=f"Conduct web research for: {objective}",
+        agent_type=AgentType.RESEARCHER,
+        tech_stack=orchestrator._detect_tech_stack(objective.lower()),
+        metadata={"research_query": objective, "research_depth": "adaptive"}
+    )
+    agent = ResearcherAgent.__new__(ResearcherAgent)
+    query = agent._extract_research_query(task)
+    searcher = WebSearcher()
+    
+    first = searcher._get_prefetched_results(query, 5)
+    assert first is not None and first[0]["title"] == query
+    for deep_query in agent._generate_deep_queries(query, task):
+        assert searcher._get_prefetched_results(deep_query, 3) is not None
+
+
+def test_map_reduce_synthesis_reuses_section_summaries(tmp_path):
+    """Test only new page sections are summarized and repeated inputs skip the LLM."""
+    import asyncio
+    import logging
+    from types import SimpleNamespace
+    from agents.researcher_agent import SectionSummaryCache
+    
+    class FakeLLM:
+        def __init__(self):
+            self.calls = 0
+        
+        async def complete(self, system_prompt, user_prompt, temperature=0.7, max_tokens=4096):
+            self.calls += 1
+            if "insights" in system_prompt:
+                return SimpleNamespace(success=True, content='{"insights": ["Use OAuth 2.0 refresh tokens"]}', error=None)
+            return SimpleNamespace(success=True, content="- section summary", error=None)
+    
+    agent = ResearcherAgent.__new__(ResearcherAgent)
+    agent.logger = logging.getLogger("test")
+    agent.llm_service = FakeLLM()
+    agent.section_cache = SectionSummaryCache(str(tmp_path), ttl_days=1)
+    agent.max_sections_per_page = 6
+    agent.max_new_sections = 20
+    
+    page_text = "\n".join(["Authentication"] + ["Tokens expire after one hour and must be refreshed. " * 5] * 3)
+    results = {"search_results": [], "scraped_content": {"https://docs.example.com": {"url": "https://docs.example.com", "text": page_text}}}
+    
+    insights = asyncio.run(agent._synthesize_findings_map_reduce(results, "QuickBooks OAuth"))
+    assert insights == ["Use OAuth 2.0 refresh tokens"]
+    first_calls = agent.llm_service.calls
+    assert first_calls >= 2  # at least one section summary + reduce
+    
+    # Same pages again (new cache instance reads from disk): no LLM calls
+    agent.section_cache = SectionSummaryCache(str(tmp_path), ttl_days=1)
+    insights = asyncio.run(agent._synthesize_findings_map_reduce(results, "QuickBooks OAuth"))
+    assert insights == ["Use OAuth 2.0 refresh tokens"]
+    assert agent.llm_service.calls == first_calls
+
+
+def test_section_summary_cache_merges_writers_and_evicts(tmp_path):
+    """Test two cache instances keep each other's summaries and the oldest entries are pruned."""
+    from agents.researcher_agent import SectionSummaryCache
+
+    first = SectionSummaryCache(str(tmp_path), ttl_days=1, max_entries=3)
+    second = SectionSummaryCache(str(tmp_path), ttl_days=1, max_entries=3)
+    first.set("a", "summary a")
+    second.set("b", "summary b")
+    first.save()
+    second.save()
+
+    assert first.get("b") == "summary b" and second.get("a") == "summary a"
+
+    for key in ("c", "d"):
+        first.set(key, f"summary {key}")
+        first.save()
+    assert first.get("a") is None
+    assert [first.get(key) for key in ("b", "c", "d")] == ["summary b", "summary c", "summary d"]
+
+
+def test_research_coalescer_groups_equivalent_queries():
+    """Test equivalent in-flight research requests share one run."""
+    import threading
+    from utils.research_coalescer import ResearchCoalescer
+    
+    coalescer = ResearchCoalescer()
+    assert coalescer.signature("QuickBooks OAuth token refresh") == coalescer.signature("quickbooks oauth refresh tokens")
+    
+    leader, is_leader = coalescer.begin("QuickBooks OAuth token refresh", "coder_1")
+    assert is_leader
+    
+    joined = coalescer.attach("quickbooks OAuth refresh tokens", "integration_1")
+    assert joined is leader
+    assert coalescer.attach("Stripe webhooks", "coder_2") is None
+    
+    follower, follower_is_leader = coalescer.begin("QuickBooks OAuth token refresh")
+    assert follower is leader and not follower_is_leader
+    
+    shared = {}
+    waiter = threading.Thread(target=lambda: shared.update(coalescer.wait(follower, timeout=5)))
+    waiter.start()
+    
+    waiters = coalescer.finish(leader, {"key_findings": ["Refresh tokens expire after 100 days"]})
+    waiter.join(timeout=5)
+    
+    assert waiters == ["coder_1", "integration_1"]
+    assert shared["key_findings"] == ["Refresh tokens expire after 100 days"]
+    assert coalescer.attach("QuickBooks OAuth token refresh", "coder_3") is None
+    
+    # Fuzzy matching never merges queries for different languages or platforms
+    fuzzy = ResearchCoalescer(similarity_threshold=0.8)
+    fuzzy.begin("QuickBooks Online OAuth 2.0 token refresh flow example python client library")
+    assert fuzzy.attach("QuickBooks Online OAuth 2.0 token refresh flow example node client library", "c") is None
+    assert ResearchCoalescer().attach("QuickBooks OAuth refresh tokens", "c") is None
+
+
+def test_coalesced_research_reaches_broker_waiters_without_workspace_paths(tmp_path, monkeypatch):
+    """Test broker waiters get a path-free copy on success and a failed reply when the leader raises."""
+    import logging
+    import utils.research_database as research_database
+    from utils.research_coalescer import ResearchCoalescer
+    monkeypatch.setattr(research_database, "get_research_database", lambda: None)
+    
+    agent = ResearcherAgent.__new__(ResearcherAgent)
+    agent.logger = logging.getLogger("test")
+    agent.cache = ResearchCache(cache_dir=str(tmp_path / "cache"))
+    agent.coalescer = ResearchCoalescer()
+    sent = []
+    agent.share_result = lambda result_type, data, target_agent_id=None: sent.append((target_agent_id, data))
+    task = Task(id="t1", title="Research", description="", agent_type=AgentType.RESEARCHER, metadata={})
+    
+    def research(query, task):
+        assert agent.coalescer.attach("QuickBooks OAuth", "coder_1")
+        return {"key_findings": ["a"], "artifact_index": str(tmp_path / "artifacts" / "index.json")}
+    
+    agent._conduct_research = research
+    results = agent._conduct_research_coalesced("QuickBooks OAuth", task)
+    assert "artifact_index" in results
+    assert sent == [("coder_1", {"key_findings": ["a"]})]
+    
+    def failing_research(query, task):
+        assert agent.coalescer.attach("Stripe webhooks", "coder_2")
+        raise RuntimeError("search quota exhausted")
+    
+    agent._conduct_research = failing_research
+    with pytest.raises(RuntimeError):
+        agent._conduct_research_coalesced("Stripe webhooks", task)
+    assert sent[-1] == ("coder_2", {"query": "Stripe webhooks", "status": "failed", "error": "search quota exhausted"})
+
+
+def test_research_artifact_streams_pages(tmp_path):
+    """Test pages streamed to a research artifact are read back lazily."""
+    from utils.research_artifact import ResearchArtifactWriter, open_research_artifact
+    from utils.recursive_researcher import RecursiveResearcher
+    
+    writer = ResearchArtifactWriter(tmp_path / "artifact")
+    researcher = RecursiveResearcher(max_depth=1, page_sink=writer.add_page)
+    page = {"url": "https://docs.example.com/auth", "title": "Auth", "text": "Use OAuth refresh tokens. " * 50,
+            "html": "<html>...</html>", "links": []}
+    
+    stub = researcher._retain_page(page["url"], page)
+    assert stub["artifact"] is True and "text" not in stub
+    assert researcher.scraped_content == {}
+    
+    writer.add_many("search_result", [{"title": "Auth", "url": page["url"], "snippet": "OAuth"}])
+    index_path = writer.finalize({"query": "QuickBooks OAuth"})
+    
+    artifact = open_research_artifact(index_path, summary={"key_findings": ["Use refresh tokens"]})
+    assert artifact["key_findings"] == ["Use refresh tokens"]
+    assert artifact.get("search_results")[0]["url"] == page["url"]
+    assert "html" not in artifact.get_page(page["url"])
+    assert list(artifact.get("scraped_content")) == [page["url"]]
+    assert artifact.find_snippets(["refresh"], limit=1)[0]["url"] == page["url"]
+
+
+def test_research_cache_drops_workspace_artifact_paths(tmp_path, monkeypatch):
+    """Test the shared research cache never stores or returns another workspace's artifact path."""
+    import utils.research_database as research_database
+    monkeypatch.setattr(research_database, "get_research_database", lambda: None)
+
+    cache = ResearchCache(cache_dir=str(tmp_path / "cache"))
+    cache.set("QuickBooks OAuth", {"query": "QuickBooks OAuth", "key_findings": ["a"],
+                                   "artifact_index": "/tenant_a/research/artifacts/x/index.json"})
+
+    cached = cache.get("QuickBooks OAuth")
+    assert cached["key_findings"] == ["a"]
+    assert "artifact_index" not in cached
+
+
+def test_web_searcher_fanout_deadline_bounds_blocking_provider(monkeypatch):
+    """Test fan-out returns at its deadline even while a blocking DuckDuckGo call is still running."""
+    import time
+    import types
+    
+    monkeypatch.setitem(sys.modules, "duckduckgo_search", types.ModuleType("duckduckgo_search"))
+    searcher = WebSearcher()
+    searcher.google_api_key = None
+    searcher.bing_api_key = None
+    searcher.search_counts = {"google": 0, "bing": 0, "duckduckgo": 0}
+    searcher._save_search_counts = lambda: None
+    
+    def blocking_attempt(query, num_results):
+        time.sleep(3)
+        return [{"title": "D", "url": "https://d.example.com", "snippet": "", "source": "duckduckgo"}]
+    
+    searcher._duckduckgo_attempt = blocking_attempt
+    
+    started = time.monotonic()
+    results = searcher.search_fanout("test query", num_results=5, deadline=0.3)
+    elapsed = time.monotonic() - started
+    
+    assert results == []
+    assert elapsed < 1.0
+
+
 def test_research_query_extraction():
     """Test research query extraction from task."""
     agent = ResearcherAgent(workspace_path="./test_workspace")
@@ -0,0 +1,156 @@
+"""
+Tests for the response cache (addon_portal/api/core/cache.py)
+"""
+
+import asyncio
+
+import pytest
+
+try:
+    from fastapi import FastAPI, HTTPException, Request
+    from fastapi.testclient import TestClient
+    from api.core import cache as cache_module
+    from api.core.cache import ResponseCache, cached_response, tenant_tag, PLANS_TAG
+except ImportError as e:
+    pytest.skip(f"Licensing API dependencies not available: {e}", allow_module_level=True)
+
+
+def test_tags_invalidate_and_concurrent_misses_share_one_load():
+    """Test concurrent misses run the loader once and tag invalidation forces a reload."""
+    cache = ResponseCache(default_ttl=60)
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"plan": "pro", "version": len(calls)}
+
+    async def scenario():
+        values = await asyncio.gather(*[
+            cache.get_or_load("policy:1:7", loader, tags=[tenant_tag(1), PLANS_TAG]) for _ in range(5)
+        ])
+        assert len(calls) == 1
+        assert len({value.etag for value in values}) == 1
+
+        await cache.invalidate_tags(tenant_tag(2))
+        assert (await cache.get_or_load("policy:1:7", loader)).body["version"] == 1
+
+        await cache.invalidate_tags(tenant_tag(1))
+        reloaded = await cache.get_or_load("policy:1:7", loader, tags=[tenant_tag(1)])
+        assert reloaded.body["version"] == 2
+        assert reloaded.etag != values[0].etag
+
+    asyncio.run(scenario())
+
+
+def test_loader_errors_are_not_cached_and_lru_is_bounded():
+    """Test failed loads propagate without caching and old entries are evicted."""
+    cache = ResponseCache(default_ttl=60, max_entries=2)
+    attempts = []
+
+    async def failing():
+        attempts.append(1)
+        raise HTTPException(404, "tenant not found")
+
+    async def scenario():
+        for _ in range(2):
+            with pytest.raises(HTTPException):
+                await cache.get_or_load("branding:missing", failing)
+        assert len(attempts) == 2
+
+        for key in ("a", "b", "c"):
+            await cache.get_or_load(key, lambda key=key: asyncio.sleep(0, result={"key": key}))
+        assert cache.stats()["entries"] == 2
+
+    asyncio.run(scenario())
+
+
+class FakeRedisStore:
+    """In-memory stand-in for _RedisStore shared by several caches ("workers")."""
+
+    def __init__(self):
+        self.entries = {}
+        self.tags = {}
+        self._generation = 0
+
+    async def generation(self):
+        return self._generation
+
+    async def get(self, key):
+        return self.entries.get(key)
+
+    async def set(self, key, value, ttl, tags, generation):
+        if generation != self._generation:
+            return False
+        self.entries[key] = value
+        for tag in tags:
+            self.tags.setdefault(tag, set()).add(key)
+        return True
+
+    async def invalidate(self, tag):
+        self._generation += 1
+        keys = self.tags.pop(tag, set())
+        for key in keys:
+            self.entries.pop(key, None)
+        return len(keys)
+
+
+def test_load_overlapping_another_workers_invalidation_is_not_stored():
+    """Test a slow load in one worker cannot write a stale body back after another worker invalidated."""
+    shared = FakeRedisStore()
+    worker_a = ResponseCache(default_ttl=300, redis_url="redis://unused")
+    worker_b = ResponseCache(default_ttl=300, redis_url="redis://unused")
+    worker_a._redis = worker_b._redis = shared
+    state = {"license": "active"}
+
+    async def scenario():
+        loading = asyncio.Event()
+        release = asyncio.Event()
+
+        async def slow_loader():
+            body = dict(state)
+            loading.set()
+            await release.wait()
+            return body
+
+        pending = asyncio.create_task(worker_a.get_or_load("policy:1:7", slow_loader, tags=[tenant_tag(1)]))
+        await loading.wait()
+        state["license"] = "revoked"
+        await worker_b.invalidate_tags(tenant_tag(1))
+        release.set()
+        assert (await pending).body["license"] == "active"
+
+        assert shared.entries == {}
+        fresh = await worker_a.get_or_load("policy:1:7", lambda: asyncio.sleep(0, result=dict(state)))
+        assert fresh.body["license"] == "revoked"
+
+    asyncio.run(scenario())
+
+
+def test_cached_response_returns_304_for_matching_etag(monkeypatch):
+    """Test ETag round trip: second request with If-None-Match gets an empty 304."""
+    monkeypatch.setattr(cache_module, "_cache_instance", ResponseCache(default_ttl=60))
+    loads = []
+    app = FastAPI()
+
+    @app.get("/branding")
+    async def branding(request: Request):
+        async def load():
+            loads.append(1)
+            return {"primary_color": "#123456" if len(loads) == 1 else "#654321"}
+        return await cached_response(request, "branding:acme", load, tags=[tenant_tag(1)])
+
+    client = TestClient(app)
+    first = client.get("/branding")
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+
+    second = client.get("/branding", headers={"If-None-Match": etag})
+    assert second.status_code == 304
+    assert second.content == b""
+    assert len(loads) == 1
+
+    asyncio.run(cache_module.invalidate_tags(tenant_tag(1)))
+    third = client.get("/branding", headers={"If-None-Match": etag})
+    assert third.status_code == 200
+    assert len(loads) == 2
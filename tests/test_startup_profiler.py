@@ -0,0 +1,41 @@
+"""
+Tests for the startup profiler behind `main.py --profile-startup` (utils/startup_profiler.py)
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.startup_profiler import StartupProfiler
+
+
+def test_profiler_records_nested_imports_and_timings(tmp_path, monkeypatch):
+    """Test new imports form a tree (already loaded modules are skipped) and measure() records labels."""
+    package = tmp_path / "profiled_pkg"
+    package.mkdir()
+    (package / "__init__.py").write_text("from profiled_pkg import heavy\nimport json\n")
+    (package / "heavy.py").write_text("import time\ntime.sleep(0.02)\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    profiler = StartupProfiler()
+    profiler.install_import_hook()
+    try:
+        import profiled_pkg  # noqa: F401
+        with profiler.measure("Constructor()"):
+            pass
+    finally:
+        profiler.remove_import_hook()
+        for name in ("profiled_pkg", "profiled_pkg.heavy"):
+            sys.modules.pop(name, None)
+
+    top = [node for node in profiler.root.children if node.name == "profiled_pkg"]
+    assert len(top) == 1
+    children = {child.name: child for child in top[0].children}
+    assert "profiled_pkg.heavy" in children and "json" not in children
+    assert children["profiled_pkg.heavy"].cumulative >= 0.02
+    assert top[0].cumulative >= children["profiled_pkg.heavy"].cumulative
+
+    report = profiler.report(min_ms=1)
+    assert "profiled_pkg.heavy" in report
+    assert "Constructor()" in report
@@ -0,0 +1,198 @@
+"""
+Tests for the agent_task_stats rollup (addon_portal/api/services/task_stats_service.py)
+
+Drives task writes through agent_task_service and checks that the incrementally
+maintained rows always match a full recompute from agent_tasks.
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+try:
+    from sqlalchemy import event, select
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+    from api.core.db import Base
+    from api.models.agent_tasks import AgentTask, AgentTaskStats, GLOBAL_STATS_SCOPE
+    from api.models.llm_config import LLMProjectConfig
+    from api.services import agent_task_service as tasks
+    from api.services import task_stats_service as stats
+except ImportError as e:
+    pytest.skip(f"Licensing API dependencies not available: {e}", allow_module_level=True)
+
+
+PROJECT_ID = "project-rollup"
+
+
+def _run(scenario, tmp_path):
+    async def runner():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'stats.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all, tables=[
+                LLMProjectConfig.__table__, AgentTask.__table__, AgentTaskStats.__table__
+            ])
+        session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        started = datetime.now(timezone.utc) - timedelta(hours=1)
+        async with session_factory() as session:
+            session.add(LLMProjectConfig(
+                project_id=PROJECT_ID, client_name="Client", description="Migration",
+                execution_status="running", execution_started_at=started,
+            ))
+            await session.commit()
+        try:
+            async with session_factory() as session:
+                return await scenario(session, started)
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(runner())
+
+
+async def _actual(session, started):
+    rows = await tasks.get_project_tasks(session, PROJECT_ID, execution_started_at=started)
+    return tasks.summarize_project_tasks(rows)
+
+
+def test_incremental_rollup_matches_full_recompute(tmp_path):
+    """Test main/backup duplicates and status changes keep the row equal to a recompute."""
+    async def scenario(session, started):
+        # First read builds the (empty) project row; later writes update it in place
+        assert (await tasks.calculate_project_progress(session, PROJECT_ID, started))["total_tasks"] == 0
+        await stats.get_global_stats(session)
+
+        main = await tasks.create_task(session, PROJECT_ID, "coder", "Build API")
+        backup = await tasks.create_task(session, PROJECT_ID, "coder", "Build API")
+        other = await tasks.create_task(session, PROJECT_ID, "researcher", "Research")
+        qa = await tasks.create_task(session, PROJECT_ID, "qa", "Test")
+
+        steps = [
+            (main.task_id, "running"),
+            (backup.task_id, "running"),
+            (other.task_id, "running"),
+            (main.task_id, "failed"),
+            (backup.task_id, "completed"),
+            (other.task_id, "completed"),
+            (qa.task_id, "cancelled"),
+        ]
+        for task_id, status in steps:
+            await tasks.update_task_status(session, task_id, status)
+            expected = await _actual(session, started)
+            assert await tasks.calculate_project_progress(session, PROJECT_ID, started) == expected
+
+        progress = await tasks.calculate_project_progress(session, PROJECT_ID, started)
+        assert progress["total_tasks"] == 3
+        assert progress["completed_tasks"] == 2
+        assert progress["cancelled_tasks"] == 1
+
+        global_stats = await stats.get_global_stats(session)
+        assert global_stats["total_tasks"] == 4
+        assert global_stats["completed_tasks"] == 2
+        assert global_stats["failed_tasks"] == 1
+        assert global_stats["in_progress_tasks"] == 0
+
+        summary = await stats.reconcile_task_stats(session)
+        assert summary == {"projects": 1, "drifted": 0, "removed": 0}
+
+    _run(scenario, tmp_path)
+
+
+def test_reconcile_repairs_drift_from_direct_writes(tmp_path):
+    """Test rows written behind the service's back are picked up by reconciliation."""
+    async def scenario(session, started):
+        await tasks.calculate_project_progress(session, PROJECT_ID, started)
+        await stats.get_global_stats(session)
+
+        # Agents running outside the API process insert rows directly
+        session.add(AgentTask(
+            task_id="direct-1", project_id=PROJECT_ID, agent_type="coder",
+            task_name="Direct", status="completed", actual_duration_seconds=30,
+        ))
+        await session.commit()
+        assert (await tasks.calculate_project_progress(session, PROJECT_ID, started))["total_tasks"] == 0
+
+        summary = await stats.reconcile_task_stats(session)
+        assert summary["drifted"] == 2
+        progress = await tasks.calculate_project_progress(session, PROJECT_ID, started)
+        assert progress["completed_tasks"] == 1
+        assert (await stats.get_global_stats(session))["average_duration_seconds"] == 30.0
+
+    _run(scenario, tmp_path)
+
+
+def test_restart_resets_project_row(tmp_path):
+    """Test removing a project's tasks drops its row and subtracts them globally."""
+    async def scenario(session, started):
+        await tasks.calculate_project_progress(session, PROJECT_ID, started)
+        await stats.get_global_stats(session)
+        task = await tasks.create_task(session, PROJECT_ID, "coder", "Build API")
+        await tasks.update_task_status(session, task.task_id, "failed")
+
+        await stats.remove_project_tasks(session, PROJECT_ID)
+        await session.execute(AgentTask.__table__.delete())
+        await session.commit()
+
+        assert (await session.execute(
+            select(AgentTaskStats).where(AgentTaskStats.project_id == PROJECT_ID)
+        )).scalar_one_or_none() is None
+        global_stats = await stats.get_global_stats(session)
+        assert global_stats["total_tasks"] == 0 and global_stats["failed_tasks"] == 0
+        assert (await session.get(AgentTaskStats, GLOBAL_STATS_SCOPE)) is not None
+
+    _run(scenario, tmp_path)
+
+
+def test_read_path_rebuild_does_not_overwrite_maintained_row(tmp_path):
+    """Test a rebuild from a stale read never replaces a current-run row that increments maintain."""
+    async def scenario(session, started):
+        await tasks.calculate_project_progress(session, PROJECT_ID, started)
+        task = await tasks.create_task(session, PROJECT_ID, "coder", "Build API")
+
+        # A rebuild racing with the create computed its values before the task existed
+        await stats._store(session, stats._project_values(PROJECT_ID, started, [], None))
+        assert (await tasks.calculate_project_progress(session, PROJECT_ID, started))["total_tasks"] == 1
+
+        # Reconciliation is the repair path and does replace the row
+        await session.execute(AgentTask.__table__.delete().where(AgentTask.task_id == task.task_id))
+        await session.commit()
+        await stats.reconcile_task_stats(session)
+        assert (await tasks.calculate_project_progress(session, PROJECT_ID, started))["total_tasks"] == 0
+
+    _run(scenario, tmp_path)
+
+
+def test_task_writes_leave_the_global_row_to_one_batched_update(tmp_path):
+    """Test task writes never update the shared global row; committed deltas are applied in one UPDATE."""
+    async def scenario(session, started):
+        await stats.get_global_stats(session)
+        global_updates = []
+
+        def count_global_updates(conn, cursor, statement, parameters, context, executemany):
+            if statement.startswith("UPDATE agent_task_stats") and GLOBAL_STATS_SCOPE in str(parameters):
+                global_updates.append(statement)
+
+        engine = session.bind.sync_engine
+        event.listen(engine, "before_cursor_execute", count_global_updates)
+        try:
+            for name in ("Build API", "Build UI", "Research"):
+                await tasks.create_task(session, PROJECT_ID, "coder", name)
+            assert global_updates == []
+
+            # A rolled-back write never reaches the global counters
+            rolled_back = AgentTask(
+                task_id="rolled-back", project_id=PROJECT_ID, agent_type="qa", task_name="Test", status="pending",
+            )
+            session.add(rolled_back)
+            await session.flush()
+            await stats.apply_task_change(session, rolled_back, None)
+            await session.rollback()
+
+            assert (await stats.get_global_stats(session))["total_tasks"] == 3
+            assert len(global_updates) == 1
+        finally:
+            event.remove(engine, "before_cursor_execute", count_global_updates)
+
+        summary = await stats.reconcile_task_stats(session)
+        assert summary["drifted"] == 0
+
+    _run(scenario, tmp_path)
@@ -0,0 +1,90 @@
+"""
+Tests for pre-dispatch template fast path routing (utils/template_fast_path.py)
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from agents.base_agent import AgentType, Task, TaskStatus
+from utils.template_fast_path import TemplateFastPathRouter
+
+
+def make_task(task_id, agent_type, dependencies=None, objective="customer sync"):
+    return Task(
+        id=task_id, title=task_id, description=f"Implement {objective}", agent_type=agent_type,
+        dependencies=dependencies or [], metadata={"objective": objective}
+    )
+
+
+def test_routed_tasks_drop_research_and_unneeded_research_is_skipped():
+    """Test template-covered coder tasks lose research deps; research still needed elsewhere keeps running."""
+    research_a = make_task("research_a", AgentType.RESEARCHER)
+    coder_a = make_task("coder_a", AgentType.CODER, ["research_a"])
+    research_b = make_task("research_b", AgentType.RESEARCHER)
+    integration_b = make_task("integration_b", AgentType.INTEGRATION, ["research_b"])
+    coder_b = make_task("coder_b", AgentType.CODER, ["research_b", "integration_b"])
+    coder_c = make_task("coder_c", AgentType.CODER, objective="novel feature")
+    tasks = [research_a, coder_a, research_b, integration_b, coder_b, coder_c]
+    project_tasks = {task.id: task for task in tasks}
+
+    def plan(task):
+        if task.metadata["objective"] == "novel feature":
+            return None
+        return {"code_structure": {"files": []}, "files": [{"path": "api/app/endpoints.py", "source": "builtin"}]}
+
+    router = TemplateFastPathRouter(enabled=True)
+    routed = router.route(tasks, project_tasks, plan, lambda task: "integration")
+
+    assert [task.id for task in routed] == ["coder_a", "coder_b"]
+    assert coder_a.dependencies == [] and coder_b.dependencies == ["integration_b"]
+    assert coder_a.metadata["template_fast_path"]["objective_type"] == "integration"
+    assert "template_fast_path" not in coder_c.metadata
+
+    assert research_a.status == TaskStatus.COMPLETED and research_a.result["status"] == "skipped"
+    assert research_b.status == TaskStatus.PENDING  # integration_b still needs it
+
+    router.record_completion(files=1, learned=0, builtin=1, seconds=0.5)
+    summary = router.summary()
+    assert (summary["classified"], summary["routed"], summary["rejected"], summary["research_skipped"]) == (3, 2, 1, 1)
+    assert summary["by_objective_type"] == {"integration": 2}
+    assert summary["avg_seconds"] == 0.5
+
+
+def test_disabled_router_leaves_tasks_untouched():
+    """Test Q2O_TEMPLATE_FAST_PATH_ENABLED=false routes nothing."""
+    research = make_task("research", AgentType.RESEARCHER)
+    coder = make_task("coder", AgentType.CODER, ["research"])
+    router = TemplateFastPathRouter(enabled=False)
+
+    assert router.route([research, coder], {"research": research, "coder": coder}, lambda t: {"files": []}, str) == []
+    assert coder.dependencies == ["research"] and research.status == TaskStatus.PENDING
+
+
+def test_fallback_restores_research_and_counts_degraded_runs():
+    """Test a fallback gets its research deps back and is flagged degraded when that research was skipped."""
+    research_a = make_task("research_a", AgentType.RESEARCHER)
+    coder_a = make_task("coder_a", AgentType.CODER, ["research_a"])
+    research_b = make_task("research_b", AgentType.RESEARCHER)
+    integration_b = make_task("integration_b", AgentType.INTEGRATION, ["research_b"])
+    coder_b = make_task("coder_b", AgentType.CODER, ["research_b"])
+    tasks = [research_a, coder_a, research_b, integration_b, coder_b]
+    project_tasks = {task.id: task for task in tasks}
+
+    router = TemplateFastPathRouter(enabled=True)
+    router.route(tasks, project_tasks, lambda task: {"code_structure": {"files": []}, "files": []}, str)
+    assert coder_a.dependencies == [] and coder_b.dependencies == []
+
+    # research_b still ran for integration_b: its results are usable again
+    assert router.record_fallback(coder_b, "learned template gone", project_tasks.get) is False
+    assert coder_b.dependencies == ["research_b"]
+    assert "template_fast_path_degraded" not in coder_b.metadata
+
+    # research_a was skipped: the hybrid run has no research
+    assert router.record_fallback(coder_a, "learned template gone", project_tasks.get) is True
+    assert coder_a.dependencies == ["research_a"]
+    assert coder_a.metadata["template_fast_path_degraded"] is True
+
+    summary = router.summary()
+    assert (summary["fallbacks"], summary["degraded_fallbacks"]) == (2, 1)
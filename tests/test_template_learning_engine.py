@@ -0,0 +1,85 @@
+"""
+Tests for learned-template retrieval (utils/template_learning_engine.py)
+"""
+
+import asyncio
+import json
+import sqlite3
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.template_learning_engine import TemplateLearningEngine
+
+WEBHOOK_CODE = "\nfrom fastapi import APIRouter\nrouter = APIRouter()\n\n@router.post('/webhook')\nasync def handle(): pass\n"
+
+
+def learn(engine, description, tech_stack, code, quality=95):
+    return asyncio.run(engine.learn_from_generation(description, tech_stack, code, "gemini", quality))
+
+
+def test_similar_task_matches_beyond_exact_tech_stack(tmp_path):
+    """Test a reworded task with a reordered/cased tech stack hits, and a different task type does not."""
+    engine = TemplateLearningEngine(db_path=str(tmp_path / "learned.db"))
+    try:
+        template_id = learn(engine, "api: Stripe webhook handler for payment events", ["FastAPI", "Python"], WEBHOOK_CODE)
+
+        match = engine.find_similar_template("api: webhook handler for Stripe invoice events", ["python", "fastapi"])
+        assert match is not None and match.template_id == template_id
+
+        assert engine.find_similar_template("model: customer email notification service", ["FastAPI", "Python"]) is None
+    finally:
+        engine.close()
+
+
+def test_ranking_prefers_quality_and_usage_is_batched(tmp_path, monkeypatch):
+    """Test equally similar templates rank by quality and usage increments are written in one flush."""
+    monkeypatch.setenv("Q2O_TEMPLATE_USAGE_FLUSH_SIZE", "3")
+    monkeypatch.setenv("Q2O_TEMPLATE_USAGE_FLUSH_SECONDS", "3600")
+    db_path = tmp_path / "learned.db"
+    engine = TemplateLearningEngine(db_path=str(db_path))
+    try:
+        low = learn(engine, "api: webhook receiver", ["FastAPI"], WEBHOOK_CODE, quality=90)
+        high = learn(engine, "api: webhook receiver", ["FastAPI"], WEBHOOK_CODE + "\ndef verify(): pass\n", quality=99)
+
+        ranked = engine.find_similar_templates("api: webhook receiver", ["FastAPI"])
+        assert [template.template_id for template, _ in ranked] == [high, low]
+
+        engine.increment_usage(high)
+        engine.increment_usage(high)
+        assert engine._connection().execute(
+            "SELECT usage_count FROM learned_templates WHERE template_id = ?", (high,)
+        ).fetchone()[0] == 0
+        engine.increment_usage(low)  # third pending use triggers the flush
+        counts = dict(engine._connection().execute("SELECT template_id, usage_count FROM learned_templates"))
+        assert counts == {high: 2, low: 1}
+    finally:
+        engine.close()
+
+
+def test_existing_database_is_indexed_on_open(tmp_path):
+    """Test templates stored before the retrieval index existed are backfilled and retrievable."""
+    db_path = tmp_path / "legacy.db"
+    conn = sqlite3.connect(db_path)
+    conn.execute("""
+        CREATE TABLE learned_templates (
+            template_id TEXT PRIMARY KEY, name TEXT NOT NULL, description TEXT, tech_stack TEXT,
+            pattern_signature TEXT UNIQUE, template_content TEXT, source_llm TEXT, quality_score INTEGER,
+            usage_count INTEGER DEFAULT 0, created_at TIMESTAMP, last_used TIMESTAMP, metadata TEXT
+        )
+    """)
+    conn.execute(
+        "INSERT INTO learned_templates VALUES (?, ?, ?, ?, ?, ?, ?, ?, 0, ?, ?, ?)",
+        ("learned_old", "FastAPI Webhook Handler", "api: Stripe webhook handler", json.dumps(["FastAPI"]),
+         "sig", WEBHOOK_CODE, "gemini", 95, "2025-01-01T00:00:00", "2025-01-01T00:00:00", "{}")
+    )
+    conn.commit()
+    conn.close()
+
+    engine = TemplateLearningEngine(db_path=str(db_path))
+    try:
+        match = engine.find_similar_template("api: Stripe webhook handler", ["FastAPI"])
+        assert match is not None and match.template_id == "learned_old"
+    finally:
+        engine.close()
@@ -0,0 +1,44 @@
+"""
+Tests for TemplateRenderer caching (utils/template_renderer.py)
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.template_renderer import TemplateRenderer
+
+
+def test_render_string_reuses_compiled_templates(tmp_path):
+    """Test identical sources compile once and the LRU evicts the least recently used source."""
+    renderer = TemplateRenderer(str(tmp_path / "templates"), bytecode_cache_dir="", string_cache_size=2)
+    compiled = []
+    original = renderer.env.from_string
+    renderer.env.from_string = lambda source: compiled.append(source) or original(source)
+
+    assert renderer.render_string("Hello {{ name | snake_case }}", {"name": "MyApp"}) == "Hello my_app"
+    assert renderer.render_string("Hello {{ name | snake_case }}", {"name": "OtherApp"}) == "Hello other_app"
+    assert len(compiled) == 1
+
+    renderer.render_string("a", {})
+    renderer.render_string("Hello {{ name | snake_case }}", {"name": "X"})
+    renderer.render_string("b", {})  # evicts "a"
+    renderer.render_string("a", {})
+    assert compiled == ["Hello {{ name | snake_case }}", "a", "b", "a"]
+
+
+def test_warm_up_fills_shared_bytecode_cache(tmp_path):
+    """Test warm_up compiles every template and a second renderer loads bytecode instead of compiling."""
+    templates = tmp_path / "templates"
+    (templates / "api").mkdir(parents=True)
+    (templates / "api" / "endpoint.py.j2").write_text("def {{ name }}(): pass\n")
+    (templates / "model.py.j2").write_text("class {{ name | pascal_case }}: pass\n")
+    cache_dir = tmp_path / "bytecode"
+
+    assert TemplateRenderer(str(templates), bytecode_cache_dir=str(cache_dir)).warm_up() == 2
+    assert len(list(cache_dir.iterdir())) == 2
+
+    second = TemplateRenderer(str(templates), bytecode_cache_dir=str(cache_dir))
+    second.env.compile = None  # any compile attempt would fail
+    assert second.render("model.py.j2", {"name": "sales_order"}) == "class SalesOrder: pass\n"
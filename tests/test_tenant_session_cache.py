@@ -0,0 +1,81 @@
+"""
+Tests for cached tenant session validation and throttled last_activity writes
+(addon_portal/api/services/tenant_auth_service.py)
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+try:
+    from sqlalchemy import event, select
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+    from api.core.db import Base
+    from api.core.exceptions import InvalidOperationError
+    from api.core.settings import settings
+    from api.models.licensing import Tenant, TenantSession
+    from api.services import tenant_auth_service
+    from api.services.tenant_auth_service import SessionCache, logout, validate_session
+except ImportError as e:
+    pytest.skip(f"Licensing API dependencies not available: {e}", allow_module_level=True)
+
+
+def test_session_cache_throttles_activity_writes_and_honors_logout(monkeypatch):
+    """Test cached validations skip queries, writes are throttled, and idle/logout still reject."""
+    monkeypatch.setattr(settings, "SESSION_ACTIVITY_GRANULARITY_SECONDS", 60)
+    monkeypatch.setattr(tenant_auth_service, "session_cache", SessionCache(ttl_seconds=60, max_entries=100))
+
+    async def scenario():
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all, tables=[Tenant.__table__, TenantSession.__table__])
+        statements = []
+        event.listen(engine.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+        session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+        now = datetime.now(timezone.utc)
+        async with session_factory() as db:
+            db.add(Tenant(id=1, name="Tenant", slug="tenant"))
+            db.add_all([
+                TenantSession(id=1, tenant_id=1, session_token="active", last_activity=now - timedelta(minutes=5),
+                              expires_at=now + timedelta(hours=1), created_at=now - timedelta(hours=1)),
+                TenantSession(id=2, tenant_id=1, session_token="idle", last_activity=now - timedelta(minutes=45),
+                              expires_at=now + timedelta(hours=1), created_at=now - timedelta(hours=1)),
+            ])
+            await db.commit()
+
+        async with session_factory() as db:
+            # First request loads the session and writes last_activity (5 minutes old)
+            info = await validate_session("active", db)
+            await db.commit()
+            assert info["tenant_slug"] == "tenant"
+            statements.clear()
+
+            # Follow-up requests are answered from the cache without any SQL
+            for _ in range(5):
+                assert await validate_session("active", db) == info
+            await db.commit()
+            assert statements == []
+
+            # Once activity moved past the granularity, one UPDATE is issued
+            cached = tenant_auth_service.session_cache.get(SessionCache.key("active"))
+            cached.persisted_activity -= timedelta(minutes=2)
+            await validate_session("active", db)
+            await db.commit()
+            assert len(statements) == 1 and statements[0].lstrip().upper().startswith("UPDATE")
+
+            with pytest.raises(InvalidOperationError):
+                await validate_session("idle", db)
+
+            await logout("active", db)
+            await db.commit()
+            with pytest.raises(InvalidOperationError):
+                await validate_session("active", db)
+            assert len(tenant_auth_service.session_cache) == 0
+
+            stored = (await db.execute(select(TenantSession.id))).scalars().all()
+            assert stored == [2]
+        await engine.dispose()
+
+    asyncio.run(scenario())
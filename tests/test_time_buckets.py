@@ -0,0 +1,75 @@
+"""
+Tests for SQL-side day bucketing (addon_portal/api/utils/time_buckets.py)
+
+Checks the SQLite path against the per-row Python conversion the analytics
+endpoints used before, and that the PostgreSQL expression compiles.
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+try:
+    from sqlalchemy.dialects import postgresql
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+    from api.core.db import Base
+    from api.core.settings import settings
+    from api.models.licensing import ActivationCode, Tenant
+    from api.utils.time_buckets import count_by_local_day, daily_series, local_day
+    from api.utils.timezone_utils import utc_to_server_tz
+except ImportError as e:
+    pytest.skip(f"Licensing API dependencies not available: {e}", allow_module_level=True)
+
+
+@pytest.fixture
+def server_tz(monkeypatch):
+    monkeypatch.setattr(settings, "TIME_ZONE", "UTC-5")
+
+
+def test_count_by_local_day_matches_python_conversion(server_tz):
+    """Test rows near UTC midnight land on the server-timezone day."""
+    base = datetime(2026, 3, 10, 0, 0)  # naive UTC, as stored
+    created = [base + timedelta(hours=h) for h in (-30, -6, -4, 1, 3, 6, 20, 29, 50)]
+
+    async def scenario():
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all, tables=[Tenant.__table__, ActivationCode.__table__])
+        session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        async with session_factory() as session:
+            session.add(Tenant(id=1, name="Tenant", slug="tenant"))
+            for i, created_at in enumerate(created):
+                session.add(ActivationCode(
+                    tenant_id=1, code_plain=f"CODE-{i}", code_hash=f"hash-{i}", created_at=created_at,
+                ))
+            await session.commit()
+            counts = await count_by_local_day(
+                session, ActivationCode.created_at,
+                datetime(2026, 3, 9).date(), datetime(2026, 3, 11).date(),
+            )
+        await engine.dispose()
+        return counts
+
+    counts = asyncio.run(scenario())
+
+    expected = {}
+    for created_at in created:
+        day = utc_to_server_tz(created_at.replace(tzinfo=timezone.utc)).date()
+        if datetime(2026, 3, 9).date() <= day <= datetime(2026, 3, 11).date():
+            expected[day] = expected.get(day, 0) + 1
+    assert counts == expected
+
+    series = daily_series(datetime(2026, 3, 8).date(), datetime(2026, 3, 12).date(), codes=counts)
+    assert [point["date"] for point in series] == ["Mar 08", "Mar 09", "Mar 10", "Mar 11", "Mar 12"]
+    assert sum(point["codes"] for point in series) == sum(expected.values())
+    assert series[0]["codes"] == 0 and series[-1]["codes"] == 0
+
+
+def test_postgresql_expression_uses_interval_offset(server_tz):
+    """Test fixed offsets are bound as INTERVALs (a '-05:00' string would be a POSIX zone)."""
+    sql = str(local_day(ActivationCode.created_at, "postgresql").compile(dialect=postgresql.dialect()))
+    assert "date_trunc" in sql
+    assert "AS INTERVAL" in sql
+    # Naive columns are first interpreted as UTC
+    assert sql.count("timezone(") == 2
@@ -1,18 +1,28 @@
 """
 Utility modules for the multi-agent system.
+
+Exports are resolved on first access so importing a single utils submodule
+does not load Jinja2 and the infrastructure validator.
 """
 
-from utils.template_renderer import TemplateRenderer, get_renderer
-from utils.infrastructure_validator import InfrastructureValidator, get_validator
-from utils.project_layout import ProjectLayout, get_default_layout, set_default_layout
+import importlib
+
+_EXPORTS = {
+    'TemplateRenderer': 'utils.template_renderer',
+    'get_renderer': 'utils.template_renderer',
+    'InfrastructureValidator': 'utils.infrastructure_validator',
+    'get_validator': 'utils.infrastructure_validator',
+    'ProjectLayout': 'utils.project_layout',
+    'get_default_layout': 'utils.project_layout',
+    'set_default_layout': 'utils.project_layout',
+}
+
+__all__ = list(_EXPORTS)
 
-__all__ = [
-    'TemplateRenderer',
-    'get_renderer',
-    'InfrastructureValidator',
-    'get_validator',
-    'ProjectLayout',
-    'get_default_layout',
-    'set_default_layout'
-]
 
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(_EXPORTS[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module 'utils' has no attribute {name!r}")
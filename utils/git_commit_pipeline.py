@@ -0,0 +1,457 @@
+"""
+Git Commit Pipeline - Turns a batch of task outputs into one commit without
+spawning git per file.
+
+Two long-lived git processes serve every batch:
+- `git fast-import` writes the blobs, the tree and the commit, and answers
+  `ls` queries so unchanged files are skipped without reading HEAD's tree.
+- `git cat-file --batch-check` resolves the branch tip before and after each
+  commit.
+
+Per batch, only `git check-ignore` (drop ignored outputs, as `git add` would)
+and `git update-index --index-info` (keep the index in step with the new
+commit) are spawned, however many files the batch contains. Repository facts
+that do not change between batches (top level, object format, identity) are
+probed once.
+
+Each batch ends with a fast-import `checkpoint` so the branch moves right away,
+and every checkpoint leaves a small pack file behind. Every gc_interval commits
+(and on close) fast-import is stopped and `git gc --auto` consolidates them once
+they pass gc.autoPackLimit.
+"""
+
+import hashlib
+import logging
+import os
+import subprocess
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_GIT_TIMEOUT = 30
+# Commits (one pack file each) between `git gc --auto` runs
+DEFAULT_GC_INTERVAL = 50
+
+
+class GitPipelineError(Exception):
+    """The pipeline cannot commit in this repository state; use plain git commands instead."""
+
+
+def _quote_path(path: str) -> bytes:
+    """C-style quote a repository path for the fast-import stream."""
+    escaped = path.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+    return f'"{escaped}"'.encode('utf-8')
+
+
+def _local_timezone_offset() -> str:
+    """Current UTC offset in git's +HHMM form."""
+    offset = -(time.altzone if time.localtime().tm_isdst > 0 else time.timezone)
+    sign = '+' if offset >= 0 else '-'
+    offset = abs(offset)
+    return f"{sign}{offset // 3600:02d}{(offset % 3600) // 60:02d}"
+
+
+class GitCommitPipeline:
+    """Commits batches of workspace files through persistent git processes."""
+
+    def __init__(self, workspace_path: Path, gc_interval: int = DEFAULT_GC_INTERVAL):
+        self.workspace_path = Path(workspace_path)
+        self.gc_interval = gc_interval
+        self._lock = threading.Lock()
+        self._state: Optional[Dict[str, Any]] = None
+        self._fast_import: Optional[subprocess.Popen] = None
+        self._fast_import_stderr = None
+        self._cat_file: Optional[subprocess.Popen] = None
+        self._next_mark = 1
+        self._commits_since_gc = 0
+        self.stats = {'commits': 0, 'files': 0, 'skipped_unchanged': 0, 'processes_spawned': 0, 'gc_runs': 0}
+
+    # ------------------------------------------------------------------
+    # Repository state
+    # ------------------------------------------------------------------
+
+    def _run_git(self, args: List[str], input_bytes: Optional[bytes] = None,
+                 cwd: Optional[Path] = None) -> subprocess.CompletedProcess:
+        self.stats['processes_spawned'] += 1
+        return subprocess.run(
+            ["git"] + args,
+            input=input_bytes,
+            capture_output=True,
+            timeout=_GIT_TIMEOUT,
+            cwd=cwd or self.workspace_path
+        )
+
+    def _repo_state(self) -> Dict[str, Any]:
+        """Top level, git dir, object format, identities and file mode trust; probed once per pipeline."""
+        if self._state is not None:
+            return self._state
+
+        result = self._run_git(["rev-parse", "--show-toplevel", "--absolute-git-dir"])
+        if result.returncode != 0:
+            raise GitPipelineError(f"not a work tree: {result.stderr.decode(errors='replace').strip()}")
+        toplevel, git_dir = result.stdout.decode('utf-8').splitlines()[:2]
+
+        object_format = 'sha1'
+        result = self._run_git(["rev-parse", "--show-object-format"])
+        if result.returncode == 0 and result.stdout.strip():
+            object_format = result.stdout.decode().strip()
+
+        identities = {}
+        for variable in ("GIT_AUTHOR_IDENT", "GIT_COMMITTER_IDENT"):
+            result = self._run_git(["var", variable])
+            if result.returncode != 0:
+                raise GitPipelineError(f"no git identity configured ({variable})")
+            # "Name <email> <epoch> <tz>" - keep the name and email, time is set per commit
+            identities[variable] = result.stdout.decode('utf-8').strip().rsplit(' ', 2)[0]
+
+        # Without a usable executable bit (Windows, core.fileMode=false) modes come from the index
+        trust_mode = os.name != 'nt'
+        if trust_mode:
+            result = self._run_git(["config", "--bool", "core.fileMode"])
+            trust_mode = result.stdout.decode().strip() != "false"
+
+        self._state = {
+            'toplevel': toplevel,
+            'git_dir': git_dir,
+            'object_format': object_format,
+            'author': identities["GIT_AUTHOR_IDENT"],
+            'committer': identities["GIT_COMMITTER_IDENT"],
+            'trust_mode': trust_mode,
+        }
+        return self._state
+
+    def _current_branch(self) -> str:
+        """Branch HEAD points at, read from the HEAD file (no process)."""
+        head_file = Path(self._repo_state()['git_dir']) / "HEAD"
+        try:
+            head = head_file.read_text(encoding='utf-8').strip()
+        except OSError as e:
+            raise GitPipelineError(f"cannot read HEAD: {e}")
+        if not head.startswith("ref: refs/heads/") or head.endswith("/.invalid"):
+            # Detached HEAD or a ref backend without a plain HEAD file
+            raise GitPipelineError(f"HEAD is not a branch ({head})")
+        return head[len("ref: "):]
+
+    def _object_id(self, data: bytes) -> str:
+        """Blob id git will assign to data, computed in-process."""
+        digest = hashlib.new(self._repo_state()['object_format'])
+        digest.update(b"blob %d\0" % len(data))
+        digest.update(data)
+        return digest.hexdigest()
+
+    # ------------------------------------------------------------------
+    # Long-lived processes
+    # ------------------------------------------------------------------
+
+    def _resolve(self, rev: str) -> Optional[str]:
+        """Object id for rev via the persistent cat-file session (None if missing)."""
+        if self._cat_file is None or self._cat_file.poll() is not None:
+            self.stats['processes_spawned'] += 1
+            self._cat_file = subprocess.Popen(
+                ["git", "cat-file", "--batch-check"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                cwd=self._repo_state()['toplevel']
+            )
+        try:
+            self._cat_file.stdin.write(rev.encode('utf-8') + b"\n")
+            self._cat_file.stdin.flush()
+            line = self._cat_file.stdout.readline().decode('utf-8').strip()
+        except OSError as e:
+            raise GitPipelineError(f"cat-file session failed: {e}")
+        if not line:
+            raise GitPipelineError("cat-file session exited")
+        if line.endswith(" missing"):
+            return None
+        return line.split(' ', 1)[0]
+
+    def _fast_import_process(self) -> subprocess.Popen:
+        if self._fast_import is None or self._fast_import.poll() is not None:
+            self.stats['processes_spawned'] += 1
+            self._fast_import_stderr = tempfile.TemporaryFile()
+            self._fast_import = subprocess.Popen(
+                ["git", "fast-import", "--quiet", "--date-format=raw"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=self._fast_import_stderr,
+                cwd=self._repo_state()['toplevel']
+            )
+            self._next_mark = 1
+        return self._fast_import
+
+    def _fast_import_failure(self, reason: str) -> GitPipelineError:
+        """Collect fast-import's stderr, stop it and describe the failure."""
+        detail = ""
+        if self._fast_import_stderr is not None:
+            try:
+                self._fast_import_stderr.seek(0)
+                detail = self._fast_import_stderr.read().decode(errors='replace').strip()
+            except (OSError, ValueError):
+                pass
+        self._close_fast_import()
+        return GitPipelineError(f"{reason}: {detail}" if detail else reason)
+
+    def _send(self, *chunks: bytes) -> None:
+        process = self._fast_import_process()
+        try:
+            for chunk in chunks:
+                process.stdin.write(chunk)
+            process.stdin.flush()
+        except OSError as e:
+            raise self._fast_import_failure(f"fast-import stream failed: {e}")
+
+    def _read_response(self) -> str:
+        line = self._fast_import.stdout.readline()
+        if not line:
+            raise self._fast_import_failure("fast-import exited")
+        return line.decode('utf-8').rstrip("\n")
+
+    def _blob_in_tree(self, commit_id: str, path: str) -> Tuple[Optional[str], Optional[str]]:
+        """(mode, blob id) of path in commit_id, answered by fast-import's `ls`."""
+        self._send(b"ls " + commit_id.encode() + b" " + _quote_path(path) + b"\n")
+        response = self._read_response()
+        if response.startswith("missing "):
+            return None, None
+        mode, _type, object_id = response.split('\t', 1)[0].split(' ')
+        return mode, object_id
+
+    # ------------------------------------------------------------------
+    # Commit
+    # ------------------------------------------------------------------
+
+    def _ignored(self, paths: List[str]) -> set:
+        """Paths matched by .gitignore/exclude rules (one process for the whole batch)."""
+        if not paths:
+            return set()
+        result = self._run_git(
+            ["check-ignore", "--stdin", "-z"],
+            input_bytes=b"\0".join(p.encode('utf-8') for p in paths) + b"\0",
+            cwd=Path(self._repo_state()['toplevel'])
+        )
+        # Exit status 1 means nothing is ignored
+        if result.returncode not in (0, 1):
+            raise GitPipelineError(f"check-ignore failed: {result.stderr.decode(errors='replace').strip()}")
+        return {p.decode('utf-8') for p in result.stdout.split(b"\0") if p}
+
+    def _index_modes(self, paths: List[str]) -> Dict[str, str]:
+        """Regular-file modes of paths in the index (one process for the whole batch)."""
+        if not paths:
+            return {}
+        result = self._run_git(
+            ["ls-files", "--stage", "-z", "--"] + paths,
+            cwd=Path(self._repo_state()['toplevel'])
+        )
+        if result.returncode != 0:
+            raise GitPipelineError(f"ls-files failed: {result.stderr.decode(errors='replace').strip()}")
+        modes = {}
+        for record in result.stdout.decode('utf-8').split("\0"):
+            if record:
+                # "<mode> <object> <stage>\t<path>"
+                info, path = record.split("\t", 1)
+                modes[path] = info.split(' ', 1)[0]
+        return modes
+
+    def _repo_relative(self, file: str) -> Optional[str]:
+        """Workspace-relative (or absolute) file as a POSIX path from the repository root."""
+        toplevel = Path(self._repo_state()['toplevel']).resolve()
+        absolute = (self.workspace_path / file).resolve()
+        try:
+            return absolute.relative_to(toplevel).as_posix()
+        except ValueError:
+            logger.debug(f"Skipping {file}: outside repository {toplevel}")
+            return None
+
+    def commit_files(self, files: List[str], message: str) -> bool:
+        """
+        Commit the current contents of files on top of the checked-out branch.
+
+        Files that no longer exist are recorded as deletions; files whose
+        content already matches the branch tip are left out.
+
+        Args:
+            files: Paths relative to the workspace
+            message: Commit message
+
+        Returns:
+            True if a commit was created, False if nothing changed
+
+        Raises:
+            GitPipelineError: If the repository state, a git process failure or
+                timeout, or an unreadable file prevents the fast path (the
+                caller falls back to git add/commit)
+        """
+        with self._lock:
+            try:
+                return self._commit_files(files, message)
+            except (OSError, subprocess.SubprocessError) as e:
+                # Don't reuse long-running processes that may be mid-stream
+                self._state = None
+                self._close_processes()
+                raise GitPipelineError(f"commit failed: {e}") from e
+
+    def _commit_files(self, files: List[str], message: str) -> bool:
+        """Build and write the commit for commit_files (caller holds the lock)."""
+        state = self._repo_state()
+        branch = self._current_branch()
+        parent = self._resolve(f"{branch}^{{commit}}")
+        if parent is None and self._resolve(branch) is not None:
+            raise GitPipelineError(f"{branch} does not point at a commit")
+
+        paths = []
+        for file in files:
+            path = self._repo_relative(file)
+            if path and path not in paths:
+                paths.append(path)
+        ignored = self._ignored(paths)
+        index_modes = {} if state['trust_mode'] else self._index_modes(
+            [path for path in paths if path not in ignored]
+        )
+
+        toplevel = Path(state['toplevel'])
+        changes: List[Tuple[str, Optional[str], Optional[bytes]]] = []  # (path, mode, data)
+        for path in paths:
+            if path in ignored:
+                continue
+            full_path = toplevel / path
+            head_mode, head_id = self._blob_in_tree(parent, path) if parent else (None, None)
+            if not full_path.is_file():
+                if head_id is not None:
+                    changes.append((path, None, None))
+                continue
+            data = full_path.read_bytes()
+            if state['trust_mode']:
+                mode = "100755" if os.access(full_path, os.X_OK) else "100644"
+            else:
+                # Keep the recorded executable bit instead of clearing it
+                mode = index_modes.get(path) or head_mode
+                if mode not in ("100644", "100755"):
+                    mode = "100644"
+            if head_id == self._object_id(data) and head_mode == mode:
+                self.stats['skipped_unchanged'] += 1
+                continue
+            changes.append((path, mode, data))
+
+        if not changes:
+            return False
+
+        commit_id = self._write_commit(branch, parent, changes, message)
+        self._sync_index(changes)
+        self.stats['commits'] += 1
+        self.stats['files'] += len(changes)
+        logger.debug(f"Committed {len(changes)} files to {branch} as {commit_id[:12]}")
+        self._commits_since_gc += 1
+        if self.gc_interval and self._commits_since_gc >= self.gc_interval:
+            self._gc()
+        return True
+
+    def _write_commit(self, branch: str, parent: Optional[str],
+                      changes: List[Tuple[str, Optional[str], Optional[bytes]]], message: str) -> str:
+        state = self._repo_state()
+        when = f"{int(time.time())} {_local_timezone_offset()}"
+        mark = self._next_mark
+        self._next_mark += 1
+        message_bytes = message.encode('utf-8')
+
+        chunks = [
+            f"commit {branch}\n".encode('utf-8'),
+            f"mark :{mark}\n".encode(),
+            f"author {state['author']} {when}\n".encode('utf-8'),
+            f"committer {state['committer']} {when}\n".encode('utf-8'),
+            b"data %d\n" % len(message_bytes), message_bytes, b"\n",
+        ]
+        if parent:
+            # Explicit parent so commits made outside the pipeline are built upon
+            chunks.append(f"from {parent}\n".encode())
+        for path, mode, data in changes:
+            if data is None:
+                chunks.append(b"D " + _quote_path(path) + b"\n")
+            else:
+                chunks.extend([
+                    f"M {mode} inline ".encode() + _quote_path(path) + b"\n",
+                    b"data %d\n" % len(data), data, b"\n",
+                ])
+        # checkpoint writes the pack and updates the branch ref; get-mark then reports the commit id
+        chunks.extend([b"\n", b"checkpoint\n\n", f"get-mark :{mark}\n".encode()])
+        self._send(*chunks)
+        commit_id = self._read_response()
+
+        if self._resolve(branch) != commit_id:
+            raise self._fast_import_failure(f"{branch} was not updated to {commit_id}")
+        return commit_id
+
+    def _gc(self) -> None:
+        """Stop fast-import (its packs are complete) and let git consolidate the pack files."""
+        self._commits_since_gc = 0
+        self._close_fast_import()
+        self.stats['gc_runs'] += 1
+        try:
+            result = self._run_git(["gc", "--auto", "--quiet"], cwd=Path(self._repo_state()['toplevel']))
+        except subprocess.TimeoutExpired:
+            logger.warning("git gc --auto timed out after pipeline commits")
+            return
+        if result.returncode != 0:
+            logger.warning(f"git gc --auto failed after pipeline commits: "
+                           f"{result.stderr.decode(errors='replace').strip()}")
+
+    def _sync_index(self, changes: List[Tuple[str, Optional[str], Optional[bytes]]]) -> None:
+        """Point the index entries of committed paths at the new blobs (one process)."""
+        zero_id = "0" * len(self._object_id(b""))
+        lines = []
+        for path, mode, data in changes:
+            if data is None:
+                lines.append(f"0 {zero_id}\t{path}")
+            else:
+                lines.append(f"{mode} {self._object_id(data)}\t{path}")
+        result = self._run_git(
+            ["update-index", "-z", "--index-info"],
+            input_bytes="\0".join(lines).encode('utf-8') + b"\0",
+            cwd=Path(self._repo_state()['toplevel'])
+        )
+        if result.returncode != 0:
+            # The commit exists; only `git status` is affected until the next index refresh
+            logger.warning(f"Failed to sync index after pipeline commit: "
+                           f"{result.stderr.decode(errors='replace').strip()}")
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def invalidate(self) -> None:
+        """Forget probed repository state (after git init or a branch switch)."""
+        with self._lock:
+            self._state = None
+            self._close_processes()
+
+    def _close_fast_import(self) -> None:
+        process, self._fast_import = self._fast_import, None
+        if process is not None:
+            try:
+                process.stdin.close()
+                process.wait(timeout=_GIT_TIMEOUT)
+            except (OSError, subprocess.TimeoutExpired):
+                process.kill()
+        if self._fast_import_stderr is not None:
+            self._fast_import_stderr.close()
+            self._fast_import_stderr = None
+
+    def _close_processes(self) -> None:
+        self._close_fast_import()
+        process, self._cat_file = self._cat_file, None
+        if process is not None:
+            try:
+                process.stdin.close()
+                process.wait(timeout=_GIT_TIMEOUT)
+            except (OSError, subprocess.TimeoutExpired):
+                process.kill()
+
+    def close(self) -> None:
+        """Stop the long-lived git processes and consolidate the packs written since the last gc."""
+        with self._lock:
+            if self._commits_since_gc and self._state is not None:
+                self._gc()
+            self._close_processes()
@@ -11,6 +11,8 @@ from pathlib import Path
 from datetime import datetime
 from collections import defaultdict
 
+from utils.git_commit_pipeline import GitCommitPipeline, GitPipelineError
+
 logger = logging.getLogger(__name__)
 
 
@@ -38,10 +40,18 @@ class GitManager:
         
         # QA_Engineer: Solution 2 - Batch Commits - Queue for batch commit operations
         self._batch_commit_queue: Dict[str, List[Dict[str, Any]]] = defaultdict(list)  # workspace_path -> [commit_info]
-        self._batch_commit_lock = threading.Lock()
+        self._batch_commit_lock = threading.RLock()  # Re-entered when a full queue flushes itself
         self._batch_commit_max_size = 10  # Maximum files per batch commit
         self._batch_commit_timeout = 30.0  # Seconds before auto-flush
         
+        # Batch commits go through persistent git processes instead of git add/commit per batch
+        self._is_git_repo: Optional[bool] = None
+        self._commit_pipeline = GitCommitPipeline(
+            self.workspace_path,
+            gc_interval=int(os.getenv("GIT_COMMIT_PIPELINE_GC_INTERVAL", "50"))
+        )
+        self._use_commit_pipeline = os.getenv("GIT_COMMIT_PIPELINE_ENABLED", "true").lower() == "true"
+        
         if not self.git_available:
             logger.warning("Git is not available. VCS features will be disabled.")
     
@@ -60,9 +70,11 @@ class GitManager:
             return False
     
     def is_git_repo(self) -> bool:
-        """Check if workspace is a Git repository."""
+        """Check if workspace is a Git repository (a positive answer is cached)."""
         if not self.git_available:
             return False
+        if self._is_git_repo:
+            return True
         
         try:
             result = subprocess.run(
@@ -72,10 +84,16 @@ class GitManager:
                 timeout=5,
                 cwd=self.workspace_path
             )
-            return result.returncode == 0
+            self._is_git_repo = result.returncode == 0
+            return self._is_git_repo
         except subprocess.TimeoutExpired:
             return False
     
+    def _invalidate_repo_state(self) -> None:
+        """Drop cached repository state after this manager changed it."""
+        self._is_git_repo = None
+        self._commit_pipeline.invalidate()
+    
     def initialize_repo(self, initial_commit: bool = False) -> bool:
         """Initialize a Git repository if it doesn't exist."""
         if not self.git_available:
@@ -94,6 +112,7 @@ class GitManager:
                 cwd=self.workspace_path
             )
             logger.info("Initialized Git repository")
+            self._invalidate_repo_state()
             
             if initial_commit:
                 # Create initial commit with .gitignore if exists
@@ -145,6 +164,7 @@ class GitManager:
             if not self.initialize_repo():
                 return False
         
+        self._invalidate_repo_state()
         try:
             # Checkout base branch first
             subprocess.run(
@@ -226,26 +246,24 @@ class GitManager:
         try:
             if files:
                 # Stage specific files
+                to_stage = []
                 for file in files:
                     file_path = self.workspace_path / file
                     if file_path.exists():
                         # Check against ignore patterns
-                        if ignore_patterns:
-                            should_ignore = False
-                            for pattern in ignore_patterns:
-                                if pattern in str(file_path):
-                                    should_ignore = True
-                                    break
-                            if should_ignore:
-                                continue
-                        
-                        subprocess.run(
-                            ["git", "add", file],
-                            check=True,
-                            capture_output=True,
-                            timeout=10,
-                            cwd=self.workspace_path
-                        )
+                        if ignore_patterns and any(pattern in str(file_path) for pattern in ignore_patterns):
+                            continue
+                        to_stage.append(file)
+                
+                # One git add per chunk of paths rather than per file (chunked for command-line limits)
+                for start in range(0, len(to_stage), 100):
+                    subprocess.run(
+                        ["git", "add", "--"] + to_stage[start:start + 100],
+                        check=True,
+                        capture_output=True,
+                        timeout=30,
+                        cwd=self.workspace_path
+                    )
             else:
                 # Stage all modified files
                 subprocess.run(
@@ -392,17 +410,32 @@ class GitManager:
                     self._batch_commit_queue[ws_key] = []
                     continue
                 
-                # Stage all files
-                if not self.stage_files(unique_files):
-                    logger.warning(f"Failed to stage files for batch commit, skipping")
-                    self._batch_commit_queue[ws_key] = []
-                    continue
-                
                 # Generate batch commit message
                 commit_message = self._generate_batch_commit_message(task_summaries, unique_files)
                 
-                # Create batch commit
-                success = self.commit(commit_message)
+                success = None
+                if self._use_commit_pipeline:
+                    try:
+                        success = self._commit_pipeline.commit_files(unique_files, commit_message)
+                        if not success:
+                            logger.debug("No changes to commit")
+                            self._batch_commit_queue[ws_key] = []
+                            continue
+                    except GitPipelineError as e:
+                        logger.warning(f"Commit pipeline unavailable, falling back to git add/commit: {e}")
+                        self._use_commit_pipeline = False
+                        self._commit_pipeline.close()
+                        success = None
+                
+                if success is None:
+                    # Stage all files
+                    if not self.stage_files(unique_files):
+                        logger.warning(f"Failed to stage files for batch commit, skipping")
+                        self._batch_commit_queue[ws_key] = []
+                        continue
+                    
+                    # Create batch commit
+                    success = self.commit(commit_message)
                 
                 if success:
                     logger.info(f"Batch commit successful: {len(unique_files)} files from {len(task_summaries)} tasks")
@@ -441,6 +474,12 @@ class GitManager:
         """
         return self._flush_batch_commits()
     
+    def close(self) -> None:
+        """Flush pending batch commits and stop the commit pipeline's git processes."""
+        if self.auto_commit:
+            self._flush_batch_commits()
+        self._commit_pipeline.close()
+    
     def _generate_commit_message(self, task_id: str, task_title: str, files_created: List[str]) -> str:
         """Generate a commit message from task information."""
         files_summary = ", ".join(files_created[:3])
@@ -23,27 +23,36 @@ import hashlib
 from datetime import datetime, timedelta
 from pathlib import Path
 import sqlite3
+import importlib
+import importlib.util
+from functools import lru_cache
 
-# Optional imports with fallback
-try:
-    import google.generativeai as genai
-    GEMINI_AVAILABLE = True
-except ImportError:
-    GEMINI_AVAILABLE = False
+
+def _sdk_installed(module_name: str) -> bool:
+    """Check whether a provider SDK is installed without importing it."""
+    try:
+        return importlib.util.find_spec(module_name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+@lru_cache(maxsize=None)
+def _load_sdk(module_name: str):
+    """Import a provider SDK on first use (each SDK takes 0.3-0.4s to import)."""
+    return importlib.import_module(module_name)
+
+
+# Optional provider SDKs: only checked here, imported when a provider client is first needed
+GEMINI_AVAILABLE = _sdk_installed("google.generativeai")
+if not GEMINI_AVAILABLE:
     logging.warning("google-generativeai not installed - Gemini unavailable")
 
-try:
-    import openai
-    OPENAI_AVAILABLE = True
-except ImportError:
-    OPENAI_AVAILABLE = False
+OPENAI_AVAILABLE = _sdk_installed("openai")
+if not OPENAI_AVAILABLE:
     logging.warning("openai not installed - OpenAI unavailable")
 
-try:
-    from anthropic import Anthropic
-    ANTHROPIC_AVAILABLE = True
-except ImportError:
-    ANTHROPIC_AVAILABLE = False
+ANTHROPIC_AVAILABLE = _sdk_installed("anthropic")
+if not ANTHROPIC_AVAILABLE:
     logging.warning("anthropic not installed - Claude unavailable")
 
 
@@ -510,65 +519,85 @@ class LLMService:
         logging.info(f"[OK] LLMService initialized (primary: {self.primary}, budget: ${budget}/month)")
     
     def _init_gemini(self):
-        """Initialize Gemini client."""
+        """Read Gemini configuration (the client is created on first use)."""
+        self._gemini_model = None
         if not GEMINI_AVAILABLE:
-            self.gemini_model = None
             return
         
         api_key = os.getenv("GOOGLE_API_KEY")
         if api_key:
-            genai.configure(api_key=api_key)
             model_name = os.getenv("GEMINI_MODEL", "gemini-2.5-flash")
-            self.gemini_model = genai.GenerativeModel(model_name)
+            self._gemini_api_key = api_key
             self.gemini_model_name = model_name  # Store actual model name
-            logging.info(f"[OK] Gemini initialized ({model_name})")
+            logging.info(f"[OK] Gemini configured ({model_name})")
         else:
-            self.gemini_model = None
             self.gemini_model_name = None
             logging.warning("[WARNING] GOOGLE_API_KEY not set - Gemini unavailable")
     
     def _init_openai(self):
-        """Initialize OpenAI client."""
+        """Read OpenAI configuration (the client is created on first use)."""
+        self._openai_client = None
         if not OPENAI_AVAILABLE:
-            self.openai_client = None
             return
         
         api_key = os.getenv("OPENAI_API_KEY")
         if api_key:
-            self.openai_client = openai.OpenAI(api_key=api_key)
+            self._openai_api_key = api_key
             # Updated to gpt-5-mini (user requested) - falls back to gpt-5.1 or gpt-4o-mini if unavailable
             self.openai_model_name = os.getenv("OPENAI_MODEL", "gpt-5-mini")  # Store actual model name
-            logging.info(f"[OK] OpenAI initialized ({self.openai_model_name})")
+            logging.info(f"[OK] OpenAI configured ({self.openai_model_name})")
         else:
-            self.openai_client = None
             self.openai_model_name = None
             logging.warning("[WARNING] OPENAI_API_KEY not set - OpenAI unavailable")
     
     def _init_anthropic(self):
-        """Initialize Anthropic client."""
+        """Read Anthropic configuration (the client is created on first use)."""
+        self._anthropic_client = None
         if not ANTHROPIC_AVAILABLE:
-            self.anthropic_client = None
             return
         
         api_key = os.getenv("ANTHROPIC_API_KEY")
         if api_key:
-            self.anthropic_client = Anthropic(api_key=api_key)
+            self._anthropic_api_key = api_key
             # Updated to latest Claude 3.5 Sonnet version
             self.anthropic_model_name = os.getenv("ANTHROPIC_MODEL", "claude-3-5-sonnet-20250219")  # Store actual model name
-            logging.info(f"[OK] Anthropic initialized ({self.anthropic_model_name})")
+            logging.info(f"[OK] Anthropic configured ({self.anthropic_model_name})")
         else:
-            self.anthropic_client = None
             self.anthropic_model_name = None
             logging.debug("[INFO] ANTHROPIC_API_KEY not set - Claude unavailable (optional)")
     
+    @property
+    def gemini_model(self):
+        """Default Gemini model (SDK imported and configured on first access)."""
+        if self._gemini_model is None and GEMINI_AVAILABLE and self.gemini_model_name:
+            genai = _load_sdk("google.generativeai")
+            genai.configure(api_key=self._gemini_api_key)
+            self._gemini_model = genai.GenerativeModel(self.gemini_model_name)
+        return self._gemini_model
+    
+    @property
+    def openai_client(self):
+        """OpenAI client (SDK imported on first access)."""
+        if self._openai_client is None and OPENAI_AVAILABLE and self.openai_model_name:
+            self._openai_client = _load_sdk("openai").OpenAI(api_key=self._openai_api_key)
+        return self._openai_client
+    
+    @property
+    def anthropic_client(self):
+        """Anthropic client (SDK imported on first access)."""
+        if self._anthropic_client is None and ANTHROPIC_AVAILABLE and self.anthropic_model_name:
+            self._anthropic_client = _load_sdk("anthropic").Anthropic(api_key=self._anthropic_api_key)
+        return self._anthropic_client
+    
     def _is_provider_available(self, provider: LLMProvider) -> bool:
         """Check if a provider is configured and available."""
+        # Configured = SDK installed and API key set; clients are created on first call
         if provider == LLMProvider.GEMINI:
-            return self.gemini_model is not None
+            return GEMINI_AVAILABLE and self.gemini_model_name is not None
         elif provider == LLMProvider.OPENAI:
-            return self.openai_client is not None
+            return OPENAI_AVAILABLE and self.openai_model_name is not None
         elif provider == LLMProvider.ANTHROPIC:
-            return self.anthropic_client is not None
+            return ANTHROPIC_AVAILABLE and self.anthropic_model_name is not None
         return False
     
     def _get_model_name(self, provider: LLMProvider) -> str:
@@ -912,6 +941,7 @@ class LLMService:
         """Generate completion using Gemini with specified model."""
         if not GEMINI_AVAILABLE:
             raise ValueError("Gemini not available")
+        genai = _load_sdk("google.generativeai")
         
         # CRITICAL: Load API key from environment (ensures it's loaded from root .env)
         api_key = os.getenv("GOOGLE_API_KEY")
@@ -1103,7 +1133,9 @@ class LLMService:
         # Use specified model or fallback to stored/default
         model = model_name or self.openai_model_name or os.getenv("OPENAI_MODEL", "gpt-5-mini")
         
-        response = self.openai_client.chat.completions.create(
+        # The SDK call blocks; run it in a thread so concurrent generations overlap
+        response = await asyncio.to_thread(
+            self.openai_client.chat.completions.create,
             model=model,
             messages=[
                 {"role": "system", "content": system_prompt},
@@ -1163,7 +1195,9 @@ class LLMService:
         # Use specified model or fallback to stored/default
         model = model_name or self.anthropic_model_name or os.getenv("ANTHROPIC_MODEL", "claude-3-5-sonnet-20250219")
         
-        response = self.anthropic_client.messages.create(
+        # The SDK call blocks; run it in a thread so concurrent generations overlap
+        response = await asyncio.to_thread(
+            self.anthropic_client.messages.create,
             model=model,
             max_tokens=max_tokens,
             temperature=temperature,
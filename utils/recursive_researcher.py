@@ -8,7 +8,7 @@ import re
 import time
 import logging
 import asyncio
-from typing import Dict, List, Set, Optional
+from typing import Callable, Dict, List, Set, Optional
 from urllib.parse import urljoin, urlparse
 from bs4 import BeautifulSoup
 
@@ -34,7 +34,8 @@ class RecursiveResearcher:
     """
     
     def __init__(self, max_depth: int = 2, max_links_per_page: int = 10,
-                 request_timeout: int = 10):
+                 request_timeout: int = 10,
+                 page_sink: Optional[Callable[[Dict], None]] = None):
         """
         Initialize recursive researcher.
         
@@ -42,13 +43,38 @@ class RecursiveResearcher:
             max_depth: Maximum recursion depth (1-3)
             max_links_per_page: Maximum links to follow from each page
             request_timeout: HTTP request timeout in seconds
+            page_sink: Optional callback that receives each fully processed page
+                (e.g. ResearchArtifactWriter.add_page). When set, pages are streamed
+                out instead of being kept in memory; results only hold small stubs.
         """
         self.max_depth = max_depth
         self.max_links_per_page = max_links_per_page
         self.request_timeout = request_timeout
+        self.page_sink = page_sink
         self.visited_urls: Set[str] = set()
         self.scraped_content: Dict[str, Dict] = {}
     
+    def _retain_page(self, url: str, content: Dict) -> Dict:
+        """
+        Keep a processed page: in memory, or streamed to page_sink as a stub.
+        
+        Returns:
+            The value to store in research_data for this URL
+        """
+        if not self.page_sink:
+            self.scraped_content[url] = content
+            return content
+        
+        self.page_sink(content)
+        text = content.get('text', '')
+        return {
+            'url': url,
+            'title': content.get('title', ''),
+            'excerpt': text[:500],
+            'word_count': len(text.split()),
+            'artifact': True
+        }
+    
     def recursive_research(self, initial_results: List[Dict], 
                           focus_keywords: List[str] = None) -> Dict:
         """
@@ -86,8 +112,6 @@ class RecursiveResearcher:
             content = self._scrape_page(url)
             
             if content:
-                self.scraped_content[url] = content
-                research_data['level_1_content'][url] = content
                 research_data['total_pages_scraped'] += 1
                 
                 # Extract important links from this page
@@ -96,6 +120,7 @@ class RecursiveResearcher:
                     url, 
                     focus_keywords
                 )
+                research_data['level_1_content'][url] = self._retain_page(url, content)
                 research_data['discovered_links'].extend(important_links)
                 
                 # Categorize links
@@ -122,8 +147,6 @@ class RecursiveResearcher:
                 content = self._scrape_page(url)
                 
                 if content:
-                    self.scraped_content[url] = content
-                    research_data['level_2_content'][url] = content
                     research_data['total_pages_scraped'] += 1
                     
                     # Extract code examples
@@ -133,6 +156,8 @@ class RecursiveResearcher:
                     # Extract API endpoints
                     endpoints = self._extract_api_endpoints(content)
                     research_data['api_endpoints'].extend(endpoints)
+                    
+                    research_data['level_2_content'][url] = self._retain_page(url, content)
                 
                 # Rate limiting (sync context, so use time.sleep)
                 # Note: If this method becomes async, change to await asyncio.sleep(0.5)
@@ -203,6 +228,10 @@ class RecursiveResearcher:
         
         self.visited_urls.add(url)
         
+        prefetched = self._get_prefetched_page(url)
+        if prefetched:
+            return prefetched
+        
         try:
             if HTTPX_AVAILABLE:
                 async with httpx.AsyncClient(timeout=self.request_timeout) as client:
@@ -239,6 +268,16 @@ class RecursiveResearcher:
             logger.warning(f"Error scraping {url}: {e}")
             return None
     
+    def _get_prefetched_page(self, url: str) -> Optional[Dict]:
+        """Return a page already warmed by the research prefetcher, if any."""
+        try:
+            from utils.research_prefetcher import is_prefetch_enabled, get_research_prefetcher
+        except ImportError:
+            return None
+        if not is_prefetch_enabled():
+            return None
+        return get_research_prefetcher().get_page(url)
+    
     def _scrape_page(self, url: str) -> Optional[Dict]:
         """
         Scrape a single page (sync wrapper).
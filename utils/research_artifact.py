@@ -0,0 +1,285 @@
+"""
+Streaming Research Artifacts - Bounded-memory storage for large research runs.
+
+Recursive research can scrape dozens of full documentation pages. Instead of
+keeping every page in memory (and copying it into task metadata, JSON backups
+and the cache), pages and other bulky items are streamed to disk as JSONL
+chunks with a small byte-offset index:
+
+    research/artifacts/<artifact_id>/
+        chunks.jsonl   - one {"kind": ..., "data": ...} object per line
+        index.json     - summary fields + byte offsets of every chunk
+
+Consumers open a ResearchArtifact, a lazy read-only view that behaves like the
+old research results dict (`.get("search_results")`, `["key_findings"]`) but
+only reads the chunks that are actually asked for.
+"""
+
+import os
+import json
+import logging
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_VERSION = 1
+CHUNKS_FILENAME = "chunks.jsonl"
+INDEX_FILENAME = "index.json"
+
+# Result keys that are stored as chunk streams rather than in the index summary
+STREAMED_KEYS = {
+    'search_results': 'search_result',
+    'code_examples': 'code_example',
+    'api_endpoints': 'api_endpoint',
+}
+
+
+class ResearchArtifactWriter:
+    """Appends research chunks to disk and records their offsets."""
+
+    def __init__(self, directory: Union[str, Path]):
+        """
+        Initialize writer.
+
+        Args:
+            directory: Artifact directory (already validated to be inside the workspace)
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.chunks_path = self.directory / CHUNKS_FILENAME
+        self.index_path = self.directory / INDEX_FILENAME
+        self._file = open(self.chunks_path, 'ab')
+        self._offsets: Dict[str, List[List[int]]] = {}
+        self._pages: Dict[str, List[int]] = {}
+
+    def add(self, kind: str, data: Any) -> List[int]:
+        """
+        Append one chunk.
+
+        Args:
+            kind: Chunk kind ('page', 'search_result', 'code_example', 'api_endpoint', ...)
+            data: JSON-serializable payload
+
+        Returns:
+            [offset, length] of the written line
+        """
+        line = (json.dumps({'kind': kind, 'data': data}, default=str) + '\n').encode('utf-8')
+        offset = self._file.tell()
+        self._file.write(line)
+        location = [offset, len(line)]
+        self._offsets.setdefault(kind, []).append(location)
+        return location
+
+    def add_page(self, page: Dict[str, Any]):
+        """Append a scraped page (raw HTML and link lists are dropped)."""
+        url = page.get('url', '')
+        if url in self._pages:
+            return
+        data = {key: value for key, value in page.items() if key not in ('html', 'links')}
+        self._pages[url] = self.add('page', data)
+
+    def add_many(self, kind: str, items: List[Any]):
+        """Append several chunks of the same kind."""
+        for item in items:
+            self.add(kind, item)
+
+    def finalize(self, summary: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Flush chunks and write the index.
+
+        Args:
+            summary: Small summary fields (query, depth, key_findings, ...) to store in the index
+
+        Returns:
+            Path to index.json
+        """
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+
+        index = {
+            'version': ARTIFACT_VERSION,
+            'summary': summary or {},
+            'chunks': self._offsets,
+            'pages': self._pages,
+        }
+        tmp_path = self.index_path.with_suffix('.json.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(index, f, default=str)
+        os.replace(tmp_path, self.index_path)
+        return str(self.index_path)
+
+    def close(self):
+        """Close the chunk file without writing an index (aborted runs)."""
+        if not self._file.closed:
+            self._file.close()
+
+
+class LazyPageMap(Mapping):
+    """Read-only url -> page mapping that loads each page on access."""
+
+    def __init__(self, artifact: 'ResearchArtifact'):
+        self._artifact = artifact
+
+    def __getitem__(self, url: str) -> Dict[str, Any]:
+        page = self._artifact.get_page(url)
+        if page is None:
+            raise KeyError(url)
+        return page
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._artifact.page_urls())
+
+    def __len__(self) -> int:
+        return len(self._artifact.page_urls())
+
+
+class ResearchArtifact:
+    """
+    Lazy view over a research artifact.
+
+    Behaves like a research results dict for existing consumers: summary fields
+    come from the index (or the caller-supplied summary), streamed keys such as
+    'search_results' are read from disk on access, and 'scraped_content' is a
+    LazyPageMap. Use iter_chunks()/find_snippets() to avoid materializing lists.
+    """
+
+    def __init__(self, index_path: Union[str, Path], summary: Optional[Dict[str, Any]] = None):
+        """
+        Open an artifact.
+
+        Args:
+            index_path: Path to index.json
+            summary: Optional summary dict that overrides the stored one
+                (e.g. the compact results kept in task metadata)
+        """
+        self.index_path = Path(index_path)
+        self.chunks_path = self.index_path.parent / CHUNKS_FILENAME
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                self._index = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not open research artifact {self.index_path}: {e}")
+            self._index = {'summary': {}, 'chunks': {}, 'pages': {}}
+        self._summary = dict(self._index.get('summary', {}))
+        if summary:
+            self._summary.update({k: v for k, v in summary.items() if k not in STREAMED_KEYS and k != 'scraped_content'})
+
+    def _read(self, location: List[int]) -> Optional[Dict[str, Any]]:
+        """Read a single chunk at [offset, length]."""
+        try:
+            with open(self.chunks_path, 'rb') as f:
+                f.seek(location[0])
+                return json.loads(f.read(location[1]).decode('utf-8'))['data']
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Could not read research chunk from {self.chunks_path}: {e}")
+            return None
+
+    def iter_chunks(self, kind: str, limit: Optional[int] = None) -> Iterator[Any]:
+        """Stream chunks of a kind in write order (one chunk in memory at a time)."""
+        locations = self._index.get('chunks', {}).get(kind, [])
+        if limit is not None:
+            locations = locations[:limit]
+        if not locations or not self.chunks_path.exists():
+            return
+        with open(self.chunks_path, 'rb') as f:
+            for offset, length in locations:
+                f.seek(offset)
+                try:
+                    yield json.loads(f.read(length).decode('utf-8'))['data']
+                except (ValueError, KeyError):
+                    continue
+
+    def count(self, kind: str) -> int:
+        """Number of chunks of a kind (no disk read)."""
+        return len(self._index.get('chunks', {}).get(kind, []))
+
+    def page_urls(self) -> List[str]:
+        """URLs of all stored pages."""
+        return list(self._index.get('pages', {}).keys())
+
+    def get_page(self, url: str) -> Optional[Dict[str, Any]]:
+        """Load a single page by URL."""
+        location = self._index.get('pages', {}).get(url)
+        return self._read(location) if location else None
+
+    def iter_pages(self) -> Iterator[Dict[str, Any]]:
+        """Stream all stored pages."""
+        return self.iter_chunks('page')
+
+    def find_snippets(self, keywords: List[str], limit: int = 5, context_chars: int = 300) -> List[Dict[str, str]]:
+        """
+        Find short excerpts around keyword matches, streaming one page at a time.
+
+        Args:
+            keywords: Case-insensitive keywords to look for
+            limit: Maximum snippets to return
+            context_chars: Characters of context around each match
+
+        Returns:
+            List of {'url', 'title', 'snippet'}
+        """
+        keywords = [k.lower() for k in keywords if k]
+        snippets: List[Dict[str, str]] = []
+        if not keywords:
+            return snippets
+        for page in self.iter_pages():
+            text = page.get('text') or page.get('content') or ''
+            lowered = text.lower()
+            for keyword in keywords:
+                position = lowered.find(keyword)
+                if position < 0:
+                    continue
+                start = max(0, position - context_chars // 2)
+                snippets.append({
+                    'url': page.get('url', ''),
+                    'title': page.get('title') or '',
+                    'snippet': text[start:start + context_chars].strip(),
+                })
+                break
+            if len(snippets) >= limit:
+                break
+        return snippets
+
+    # Dict-like access for consumers written against plain research results
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self._summary:
+            return self._summary[key]
+        if key in STREAMED_KEYS:
+            return list(self.iter_chunks(STREAMED_KEYS[key]))
+        if key == 'scraped_content':
+            return LazyPageMap(self)
+        if key == 'artifact_index':
+            return str(self.index_path)
+        return default
+
+    def __getitem__(self, key: str) -> Any:
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._summary or key in STREAMED_KEYS or key in ('scraped_content', 'artifact_index')
+
+    def to_dict(self, include_pages: bool = False) -> Dict[str, Any]:
+        """Materialize the artifact (pages only when explicitly requested)."""
+        result = dict(self._summary)
+        for key, kind in STREAMED_KEYS.items():
+            result[key] = list(self.iter_chunks(kind))
+        if include_pages:
+            result['scraped_content'] = {page.get('url', ''): page for page in self.iter_pages()}
+        result['artifact_index'] = str(self.index_path)
+        return result
+
+
+def open_research_artifact(index_path: Union[str, Path],
+                           summary: Optional[Dict[str, Any]] = None) -> Optional[ResearchArtifact]:
+    """Open a research artifact view, or None if the index does not exist."""
+    if not index_path or not os.path.exists(index_path):
+        return None
+    return ResearchArtifact(index_path, summary=summary)
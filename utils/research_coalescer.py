@@ -0,0 +1,179 @@
+"""
+Research Request Coalescer - Deduplicates equivalent in-flight research.
+
+Several agents (and both ResearcherAgent instances) often ask for the same topic
+at the same time, e.g. "QuickBooks OAuth token refresh" and "quickbooks oauth
+refresh tokens". The coalescer groups such requests by a normalized token
+signature so only one crawl + LLM run happens; everyone else waits for (or is
+sent) that single result.
+"""
+
+import re
+import threading
+import logging
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_STOPWORDS = {
+    'a', 'an', 'the', 'for', 'to', 'of', 'in', 'on', 'and', 'or', 'with',
+    'how', 'using', 'via', 'about', 'what', 'is', 'are', 'do', 'does',
+}
+
+# Tokens that change what a query is about; fuzzy matching never merges queries
+# that differ in one of these (e.g. "... python" vs "... node")
+_DISTINCT_TOKENS = {
+    'python', 'node', 'node.j', 'nodej', 'javascript', 'typescript', 'java', 'go',
+    'golang', 'ruby', 'php', 'c#', 'net', 'dotnet', 'rust', 'kotlin', 'swift',
+    'react', 'react-native', 'next.j', 'nextj', 'flutter', 'django', 'fastapi',
+    'flask', 'terraform', 'kubernete', 'k8s', 'helm', 'temporal', 'android', 'ios',
+    'quickbook', 'qbo', 'odoo', 'stripe', 'sage', 'xero', 'netsuite', 'wave',
+    'aws', 'azure', 'gcp', 'v1', 'v2', 'v3', 'rest', 'graphql', 'soap',
+}
+
+
+class InflightResearch:
+    """A research run in progress and the agents waiting for its result."""
+
+    def __init__(self, query: str, signature: FrozenSet[str]):
+        self.query = query
+        self.signature = signature
+        self.waiters: List[str] = []
+        self.results: Optional[Dict[str, Any]] = None
+        self.done = threading.Event()
+
+
+class ResearchCoalescer:
+    """Groups semantically equivalent research queries onto one in-flight run."""
+
+    def __init__(self, similarity_threshold: float = 1.0):
+        """
+        Initialize coalescer.
+
+        Args:
+            similarity_threshold: Minimum Jaccard similarity of query signatures
+                for two requests to share a run (1.0 = identical signatures only).
+                Below 1.0, signatures must still agree on every language,
+                framework and platform token.
+        """
+        self.similarity_threshold = similarity_threshold
+        self._lock = threading.Lock()
+        self._inflight: Dict[FrozenSet[str], InflightResearch] = {}
+        self.stats = {'runs': 0, 'coalesced': 0}
+
+    @staticmethod
+    def signature(query: str) -> FrozenSet[str]:
+        """
+        Normalize a query to an order-independent token set.
+
+        Lowercases, drops punctuation and stopwords, and strips plural "s" so
+        word order, casing and plurals do not split equivalent requests.
+        """
+        tokens = set()
+        for token in re.findall(r'[a-z0-9][a-z0-9.+#-]*', (query or '').lower()):
+            token = token.strip('.-')
+            if not token or token in _STOPWORDS:
+                continue
+            if len(token) > 3 and token.endswith('s') and not token.endswith('ss'):
+                token = token[:-1]
+            tokens.add(token)
+        return frozenset(tokens)
+
+    def _find(self, signature: FrozenSet[str]) -> Optional[InflightResearch]:
+        """Find an in-flight run matching signature (caller holds the lock)."""
+        entry = self._inflight.get(signature)
+        if entry or not signature or self.similarity_threshold >= 1.0:
+            return entry
+        for other_signature, other in self._inflight.items():
+            if (signature ^ other_signature) & _DISTINCT_TOKENS:
+                continue
+            union = signature | other_signature
+            if union and len(signature & other_signature) / len(union) >= self.similarity_threshold:
+                return other
+        return None
+
+    def _join(self, entry: InflightResearch, query: str, requester: Optional[str]):
+        """Add requester to an in-flight run (caller holds the lock)."""
+        if requester and requester not in entry.waiters:
+            entry.waiters.append(requester)
+        self.stats['coalesced'] += 1
+        logger.info(f"[COALESCE] '{query}' joined in-flight research for '{entry.query}'")
+
+    def attach(self, query: str, requester: Optional[str]) -> Optional[InflightResearch]:
+        """
+        Join an equivalent in-flight run without starting a new one.
+
+        Args:
+            query: Cleaned research query
+            requester: Agent ID to receive the result (None = caller will wait())
+
+        Returns:
+            The in-flight run that was joined, or None if there is none
+        """
+        with self._lock:
+            entry = self._find(self.signature(query))
+            if entry:
+                self._join(entry, query, requester)
+            return entry
+
+    def begin(self, query: str, requester: Optional[str] = None) -> Tuple[InflightResearch, bool]:
+        """
+        Join an equivalent in-flight run or register a new one.
+
+        Args:
+            query: Cleaned research query
+            requester: Agent ID that asked for the research (if any)
+
+        Returns:
+            (run, is_leader) - the leader must call finish() when done
+        """
+        signature = self.signature(query)
+        with self._lock:
+            entry = self._find(signature)
+            if entry:
+                self._join(entry, query, requester)
+                return entry, False
+            entry = InflightResearch(query, signature)
+            if requester:
+                entry.waiters.append(requester)
+            self._inflight[signature] = entry
+            self.stats['runs'] += 1
+            return entry, True
+
+    def finish(self, entry: InflightResearch, results: Optional[Dict[str, Any]]) -> List[str]:
+        """
+        Complete a run and release everyone waiting on it.
+
+        Args:
+            entry: Run returned by begin() as leader
+            results: Research results, or None if the run failed
+
+        Returns:
+            Agent IDs that asked for this research and should be sent the result
+        """
+        with self._lock:
+            self._inflight.pop(entry.signature, None)
+            entry.results = results
+            waiters = list(entry.waiters)
+        entry.done.set()
+        return waiters
+
+    def wait(self, entry: InflightResearch, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Block until a run finishes; returns its results (None on failure/timeout)."""
+        if not entry.done.wait(timeout):
+            return None
+        return entry.results
+
+
+_coalescer_instance: Optional[ResearchCoalescer] = None
+_coalescer_lock = threading.Lock()
+
+
+def get_research_coalescer() -> ResearchCoalescer:
+    """Get or create the process-wide ResearchCoalescer (shared by all ResearcherAgents)."""
+    global _coalescer_instance
+    if _coalescer_instance is None:
+        with _coalescer_lock:
+            if _coalescer_instance is None:
+                _coalescer_instance = ResearchCoalescer()
+    return _coalescer_instance
@@ -0,0 +1,254 @@
+"""
+Research Prefetcher - Speculative web search and page warm-up.
+
+Started by the OrchestratorAgent as soon as project objectives are known, so
+search results and top pages for the detected platforms/tech stack are already
+in memory when ResearcherAgent tasks are scheduled. This overlaps network I/O
+with the (slow) LLM task breakdown.
+
+Consumers:
+- WebSearcher.search() checks prefetched search results first
+- RecursiveResearcher / ResearcherAgent scraping checks prefetched pages first
+
+Enabled with RESEARCH_PREFETCH_ENABLED=true (off by default because prefetch
+spends search quota speculatively).
+"""
+
+import os
+import re
+import time
+import logging
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class ResearchPrefetcher:
+    """
+    Process-wide, in-memory prefetch store for search results and scraped pages.
+
+    Jobs run on a small background thread pool. Entries expire after a TTL so a
+    long-running worker does not serve stale results to later projects.
+    """
+
+    def __init__(self, max_workers: int = 4, ttl_seconds: int = 3600,
+                 pages_per_query: int = 3, max_queries_per_objective: int = 6):
+        """
+        Initialize prefetcher.
+
+        Args:
+            max_workers: Background threads used for prefetch jobs
+            ttl_seconds: How long prefetched entries stay valid
+            pages_per_query: Top results per query to fetch as pages
+            max_queries_per_objective: Cap on speculative queries per objective
+        """
+        self.ttl_seconds = ttl_seconds
+        self.pages_per_query = pages_per_query
+        self.max_queries_per_objective = max_queries_per_objective
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="research-prefetch")
+        self._lock = threading.Lock()
+        self._search_results: Dict[str, Tuple[float, int, List[Dict]]] = {}
+        self._pages: Dict[str, Tuple[float, Dict]] = {}
+        self._inflight: Dict[str, Future] = {}
+        self.stats = {'queries_prefetched': 0, 'pages_prefetched': 0, 'search_hits': 0, 'page_hits': 0}
+
+    @staticmethod
+    def _normalize_query(query: str) -> str:
+        """Normalize query text so trivially different spellings share an entry."""
+        return re.sub(r'\s+', ' ', (query or '').lower()).strip()
+
+    def _is_fresh(self, stored_at: float) -> bool:
+        return time.time() - stored_at < self.ttl_seconds
+
+    def build_queries(self, objective: str, tech_stack: List[str]) -> List[str]:
+        """
+        Build the speculative queries for one objective.
+
+        Uses the same helpers as ResearcherAgent, so the queries match what its
+        research task searches: the cleaned objective, then the deep queries
+        in the order they are issued.
+
+        Args:
+            objective: Objective text (the research task's research_query)
+            tech_stack: Detected tech stack (OrchestratorAgent._detect_tech_stack)
+
+        Returns:
+            De-duplicated list of queries, capped at max_queries_per_objective
+        """
+        from agents.researcher_agent import clean_research_query, deep_research_queries
+
+        query = clean_research_query(objective)
+        queries = [query] + deep_research_queries(query, tech_stack)
+
+        unique = []
+        seen = set()
+        for query in queries:
+            key = self._normalize_query(query)
+            if key and key not in seen:
+                seen.add(key)
+                unique.append(query)
+        return unique[:self.max_queries_per_objective]
+
+    def prefetch(self, queries: List[str], num_results: int = 10) -> List[Future]:
+        """
+        Schedule background search + page fetch for queries.
+
+        Queries that are already fresh or in flight are skipped.
+
+        Args:
+            queries: Queries to prefetch
+            num_results: Results to request per query
+
+        Returns:
+            Futures for the newly scheduled jobs
+        """
+        futures = []
+        for query in queries:
+            key = self._normalize_query(query)
+            with self._lock:
+                cached = self._search_results.get(key)
+                if (cached and self._is_fresh(cached[0])) or key in self._inflight:
+                    continue
+                future = self._executor.submit(self._prefetch_query, query, num_results)
+                self._inflight[key] = future
+            future.add_done_callback(lambda _f, k=key: self._clear_inflight(k))
+            futures.append(future)
+
+        if futures:
+            logger.info(f"[PREFETCH] Scheduled {len(futures)} speculative research queries")
+        return futures
+
+    def _clear_inflight(self, key: str):
+        with self._lock:
+            self._inflight.pop(key, None)
+
+    def _prefetch_query(self, query: str, num_results: int):
+        """Background job: search, store results, then warm the top pages."""
+        from agents.researcher_agent import WebSearcher
+
+        try:
+            results = WebSearcher().search(query, num_results=num_results, use_prefetch=False)
+        except Exception as e:
+            logger.warning(f"[PREFETCH] Search failed for '{query}': {e}")
+            return
+
+        key = self._normalize_query(query)
+        with self._lock:
+            self._search_results[key] = (time.time(), num_results, results)
+            self.stats['queries_prefetched'] += 1
+
+        urls = [r.get('url') for r in results[:self.pages_per_query] if r.get('url')]
+        if urls:
+            self._prefetch_pages(urls)
+
+    def _prefetch_pages(self, urls: List[str]):
+        """Fetch pages concurrently using RecursiveResearcher's scraper."""
+        try:
+            from utils.recursive_researcher import RecursiveResearcher
+        except ImportError as e:
+            logger.debug(f"[PREFETCH] Page warm-up unavailable: {e}")
+            return
+
+        urls = [url for url in urls if self.get_page(url, count_hit=False) is None]
+        if not urls:
+            return
+
+        scraper = RecursiveResearcher(max_depth=1)
+
+        async def fetch_all():
+            return await asyncio.gather(
+                *(scraper._scrape_page_async(url) for url in urls),
+                return_exceptions=True
+            )
+
+        try:
+            pages = asyncio.run(fetch_all())
+        except Exception as e:
+            logger.warning(f"[PREFETCH] Page warm-up failed: {e}")
+            return
+
+        now = time.time()
+        with self._lock:
+            for url, page in zip(urls, pages):
+                if isinstance(page, dict):
+                    self._pages[url] = (now, page)
+                    self.stats['pages_prefetched'] += 1
+
+    def get_search_results(self, query: str, num_results: int, wait: float = 0.0) -> Optional[List[Dict]]:
+        """
+        Return prefetched search results for a query, if available.
+
+        Args:
+            query: Search query
+            num_results: Number of results the caller needs
+            wait: Seconds to wait for an in-flight prefetch of the same query
+
+        Returns:
+            Results (truncated to num_results) or None on miss
+        """
+        key = self._normalize_query(query)
+        with self._lock:
+            future = self._inflight.get(key)
+        if future is not None and wait > 0:
+            try:
+                future.result(timeout=wait)
+            except Exception:
+                pass
+
+        with self._lock:
+            cached = self._search_results.get(key)
+            if not cached or not self._is_fresh(cached[0]):
+                return None
+            stored_at, requested, results = cached
+            # A smaller prefetch cannot satisfy a larger request unless it was exhausted
+            if requested < num_results and len(results) >= requested:
+                return None
+            self.stats['search_hits'] += 1
+        return list(results[:num_results])
+
+    def get_page(self, url: str, count_hit: bool = True) -> Optional[Dict]:
+        """
+        Return a prefetched page (RecursiveResearcher page format) or None.
+
+        Args:
+            url: Page URL
+            count_hit: Whether to record the lookup in stats
+        """
+        with self._lock:
+            cached = self._pages.get(url)
+            if not cached or not self._is_fresh(cached[0]):
+                return None
+            if count_hit:
+                self.stats['page_hits'] += 1
+            return cached[1]
+
+    def clear(self):
+        """Drop all prefetched entries (for testing)."""
+        with self._lock:
+            self._search_results.clear()
+            self._pages.clear()
+
+
+_prefetcher_instance: Optional[ResearchPrefetcher] = None
+_prefetcher_lock = threading.Lock()
+
+
+def is_prefetch_enabled() -> bool:
+    """Check whether speculative research prefetch is enabled."""
+    return os.getenv("RESEARCH_PREFETCH_ENABLED", "false").lower() == "true"
+
+
+def get_research_prefetcher() -> ResearchPrefetcher:
+    """Get or create the process-wide ResearchPrefetcher instance."""
+    global _prefetcher_instance
+    if _prefetcher_instance is None:
+        with _prefetcher_lock:
+            if _prefetcher_instance is None:
+                _prefetcher_instance = ResearchPrefetcher(
+                    max_workers=int(os.getenv("RESEARCH_PREFETCH_WORKERS", "4")),
+                    ttl_seconds=int(os.getenv("RESEARCH_PREFETCH_TTL_SECONDS", "3600")),
+                )
+    return _prefetcher_instance
@@ -0,0 +1,153 @@
+"""
+Startup Profiler - import-time tree and constructor timings for `main.py --profile-startup`.
+
+Import times are measured by wrapping builtins.__import__ (installed before the
+agent modules are imported), so the report shows which `import` statements pull
+in which modules and how long each took, like `python -X importtime` but
+filtered and nested. Constructor and phase timings are recorded with
+StartupProfiler.measure().
+"""
+
+import builtins
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Iterator, List, Optional, Tuple
+
+
+@dataclass
+class ImportNode:
+    """One newly imported module and the modules its import pulled in."""
+    name: str
+    cumulative: float = 0.0
+    children: List["ImportNode"] = field(default_factory=list)
+
+    @property
+    def self_time(self) -> float:
+        return max(self.cumulative - sum(child.cumulative for child in self.children), 0.0)
+
+
+class StartupProfiler:
+    """Collects import and constructor timings during startup."""
+
+    def __init__(self):
+        self.root = ImportNode("<startup>")
+        self.timings: List[Tuple[str, float]] = []
+        self._stack: List[ImportNode] = [self.root]
+        self._original_import = None
+        self._started = time.perf_counter()
+
+    def install_import_hook(self) -> None:
+        """Start timing imports of modules that are not loaded yet."""
+        if self._original_import is not None:
+            return
+        self._original_import = builtins.__import__
+        original_import = self._original_import
+        stack = self._stack
+
+        def timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+            if level:
+                package = (globals or {}).get("__package__") or ""
+                module_name = f"{package}.{name}" if name else package
+            else:
+                module_name = name
+            if module_name in sys.modules:
+                # `from package import submodule` still loads the submodule if it is new
+                package = sys.modules[module_name]
+                new_submodules = [
+                    f"{module_name}.{item}" for item in (fromlist or ())
+                    if item != "*" and hasattr(package, "__path__") and not hasattr(package, item)
+                ]
+                module_name = ", ".join(new_submodules)
+            if not module_name:
+                return original_import(name, globals, locals, fromlist, level)
+            node = ImportNode(module_name)
+            stack[-1].children.append(node)
+            stack.append(node)
+            started = time.perf_counter()
+            try:
+                return original_import(name, globals, locals, fromlist, level)
+            finally:
+                node.cumulative = time.perf_counter() - started
+                stack.pop()
+
+        builtins.__import__ = timed_import
+
+    def remove_import_hook(self) -> None:
+        """Restore the original import function."""
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+        self.root.cumulative = sum(child.cumulative for child in self.root.children)
+
+    @contextmanager
+    def measure(self, label: str) -> Iterator[None]:
+        """Record how long the enclosed block took."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings.append((label, time.perf_counter() - started))
+
+    def report(self, min_ms: float = 5.0, max_depth: int = 6) -> str:
+        """
+        Format the collected timings.
+
+        Args:
+            min_ms: Imports faster than this (cumulative) are left out of the tree
+            max_depth: Deepest import level shown
+
+        Returns:
+            Multi-line report text
+        """
+        lines = ["=" * 80, "STARTUP PROFILE", "=" * 80]
+        lines.append(f"Total startup time: {(time.perf_counter() - self._started) * 1000:.0f} ms")
+        lines.append("")
+        lines.append("Import tree (cumulative ms / self ms):")
+
+        def walk(node: ImportNode, depth: int) -> None:
+            for child in sorted(node.children, key=lambda item: item.cumulative, reverse=True):
+                if child.cumulative * 1000 < min_ms:
+                    continue
+                lines.append(
+                    f"  {'  ' * depth}{child.name:<{max(50 - 2 * depth, 10)}} "
+                    f"{child.cumulative * 1000:8.1f} {child.self_time * 1000:8.1f}"
+                )
+                if depth + 1 < max_depth:
+                    walk(child, depth + 1)
+
+        walk(self.root, 0)
+        lines.append("")
+        lines.append("Constructor / phase timings (ms):")
+        for label, seconds in self.timings:
+            lines.append(f"  {label:<60} {seconds * 1000:8.1f}")
+        lines.append("=" * 80)
+        return "\n".join(lines)
+
+
+_profiler: Optional[StartupProfiler] = None
+
+
+def get_startup_profiler() -> Optional[StartupProfiler]:
+    """The active profiler, or None when startup profiling is off."""
+    return _profiler
+
+
+def enable_startup_profiler() -> StartupProfiler:
+    """Create the process-wide profiler and start timing imports."""
+    global _profiler
+    if _profiler is None:
+        _profiler = StartupProfiler()
+        _profiler.install_import_hook()
+    return _profiler
+
+
+@contextmanager
+def profile_block(label: str) -> Iterator[None]:
+    """measure() on the active profiler; no-op when profiling is off."""
+    if _profiler is None:
+        yield
+    else:
+        with _profiler.measure(label):
+            yield
@@ -0,0 +1,218 @@
+"""
+Template Fast Path - Routes template-satisfiable coder tasks around research and LLM.
+
+Many migration projects repeat near-identical objectives. When every file a
+coder task would create is already covered by a learned template
+(TemplateLearningEngine) or a non-generic built-in template, the task needs
+neither research nor an LLM call. The orchestrator classifies coder tasks right
+after project breakdown:
+
+- the coder agent plans the task's files and resolves a template per file
+  (planning is keyword-based, no LLM)
+- fast-path tasks drop their research dependencies and carry the plan in
+  task.metadata["template_fast_path"]; research tasks no other task still waits
+  on are marked completed as skipped
+- CoderAgent writes the planned files straight from the templates (built-in
+  output rendered during classification is reused), falling back to the regular
+  hybrid path if a learned template has gone away since classification
+- a fallback gets its research dependencies back; research that was already
+  skipped cannot be recovered, so such runs are logged and counted as degraded
+
+Counters are kept in TemplateFastPathRouter.stats.
+"""
+
+import logging
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+from agents.base_agent import AgentType, Task, TaskStatus
+
+logger = logging.getLogger(__name__)
+
+FAST_PATH_METADATA_KEY = "template_fast_path"
+
+
+class TemplateFastPathRouter:
+    """Pre-dispatch classifier and metrics for the template fast path."""
+
+    def __init__(self, enabled: Optional[bool] = None):
+        """
+        Initialize router.
+
+        Args:
+            enabled: Override for Q2O_TEMPLATE_FAST_PATH_ENABLED (default: true)
+        """
+        if enabled is None:
+            enabled = os.getenv("Q2O_TEMPLATE_FAST_PATH_ENABLED", "true").lower() == "true"
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self.stats: Dict[str, Any] = {
+            'classified': 0,         # coder tasks examined
+            'routed': 0,             # tasks sent down the fast path
+            'rejected': 0,           # tasks needing research and/or LLM
+            'research_skipped': 0,   # research tasks no longer needed by anyone
+            'completed': 0,          # fast-path tasks finished from templates
+            'fallbacks': 0,          # fast-path tasks that had to use the hybrid path
+            'degraded_fallbacks': 0, # ... of which without (skipped) research
+            'files': 0,
+            'learned_templates': 0,
+            'builtin_templates': 0,
+            'seconds': 0.0,
+            'by_objective_type': {},
+        }
+
+    def route(
+        self,
+        tasks: List[Task],
+        project_tasks: Dict[str, Task],
+        plan_task: Callable[[Task], Optional[Dict[str, Any]]],
+        objective_type_of: Callable[[Task], str]
+    ) -> List[Task]:
+        """
+        Classify new coder tasks and put template-satisfiable ones on the fast path.
+
+        Args:
+            tasks: Tasks from the breakdown (coder and research tasks are considered)
+            project_tasks: All project tasks by id (to find research dependencies and dependents)
+            plan_task: Returns a fast-path plan for a coder task, or None if any of
+                its files needs research/LLM generation
+            objective_type_of: Objective type of a task (recorded per routed task)
+
+        Returns:
+            Tasks routed onto the fast path
+        """
+        if not self.enabled:
+            return []
+
+        routed: List[Task] = []
+        released_research = set()
+        for task in tasks:
+            if task.agent_type != AgentType.CODER or task.metadata.get("dynamic_task"):
+                continue
+            self._count('classified')
+            try:
+                plan = plan_task(task)
+            except Exception as e:
+                logger.debug(f"[FAST PATH] Could not classify {task.id}: {e}")
+                plan = None
+            if not plan:
+                self._count('rejected')
+                continue
+
+            research_dependencies = [
+                dep_id for dep_id in task.dependencies
+                if dep_id in project_tasks and project_tasks[dep_id].agent_type == AgentType.RESEARCHER
+            ]
+            objective_type = objective_type_of(task)
+            plan["objective_type"] = objective_type
+            plan["research_dependencies"] = research_dependencies
+            task.metadata[FAST_PATH_METADATA_KEY] = plan
+
+            task.dependencies = [dep_id for dep_id in task.dependencies if dep_id not in research_dependencies]
+            released_research.update(research_dependencies)
+
+            routed.append(task)
+            with self._lock:
+                self.stats['routed'] += 1
+                by_type = self.stats['by_objective_type']
+                by_type[objective_type] = by_type.get(objective_type, 0) + 1
+            logger.info(
+                f"[FAST PATH] {task.id} is served by templates ({len(plan['files'])} files, "
+                f"objective type {objective_type}); skipping research and LLM"
+            )
+
+        # Research that only fed fast-path tasks is not needed
+        for research_id in released_research:
+            research_task = project_tasks[research_id]
+            still_needed = any(research_id in other.dependencies for other in project_tasks.values())
+            if still_needed or research_task.status != TaskStatus.PENDING:
+                continue
+            research_task.complete({
+                "status": "skipped",
+                "reason": "All dependent tasks are served by templates (template fast path)"
+            })
+            research_task.metadata["skipped_by_template_fast_path"] = True
+            self._register(research_task)
+            self._count('research_skipped')
+            logger.info(f"[FAST PATH] Skipped research task {research_id}")
+
+        return routed
+
+    def record_completion(self, files: int, learned: int, builtin: int, seconds: float):
+        """Record a fast-path task finished from templates."""
+        with self._lock:
+            self.stats['completed'] += 1
+            self.stats['files'] += files
+            self.stats['learned_templates'] += learned
+            self.stats['builtin_templates'] += builtin
+            self.stats['seconds'] += seconds
+
+    def record_fallback(self, task: Task, reason: str, get_task: Callable[[str], Optional[Task]]) -> bool:
+        """
+        Record a fast-path task that has to use the regular hybrid path.
+
+        The research dependencies dropped at routing time are restored so results
+        of research that ran anyway are used again.
+
+        Args:
+            task: Fast-path task falling back
+            reason: Why its templates cannot be used
+            get_task: Looks up a task by id
+
+        Returns:
+            True if the hybrid path runs degraded (some of its research was skipped)
+        """
+        plan = task.metadata.get(FAST_PATH_METADATA_KEY, {})
+        restored = [dep_id for dep_id in plan.get("research_dependencies", []) if dep_id not in task.dependencies]
+        task.dependencies.extend(restored)
+        skipped = []
+        for dep_id in restored:
+            research_task = get_task(dep_id)
+            if research_task is None or research_task.metadata.get("skipped_by_template_fast_path"):
+                skipped.append(dep_id)
+
+        self._count('fallbacks')
+        if skipped:
+            self._count('degraded_fallbacks')
+            task.metadata["template_fast_path_degraded"] = True
+            logger.warning(
+                f"[FAST PATH] {task.id} falls back to hybrid generation WITHOUT research "
+                f"(skipped: {', '.join(skipped)}): {reason}"
+            )
+        else:
+            logger.warning(f"[FAST PATH] {task.id} falls back to hybrid generation: {reason}")
+        return bool(skipped)
+
+    def summary(self) -> Dict[str, Any]:
+        """Copy of the counters plus average fast-path task duration."""
+        with self._lock:
+            summary = dict(self.stats)
+            summary['by_objective_type'] = dict(self.stats['by_objective_type'])
+        summary['avg_seconds'] = round(summary['seconds'] / summary['completed'], 3) if summary['completed'] else 0.0
+        summary['seconds'] = round(summary['seconds'], 3)
+        return summary
+
+    def _count(self, key: str):
+        with self._lock:
+            self.stats[key] += 1
+
+    @staticmethod
+    def _register(task: Task):
+        try:
+            from utils.task_registry import register_task
+            register_task(task)
+        except ImportError:
+            pass
+
+
+# Per-project singleton (reset between jobs by the agent worker)
+_template_fast_path: Optional[TemplateFastPathRouter] = None
+
+
+def get_template_fast_path() -> TemplateFastPathRouter:
+    """Get the singleton TemplateFastPathRouter instance."""
+    global _template_fast_path
+    if _template_fast_path is None:
+        _template_fast_path = TemplateFastPathRouter()
+    return _template_fast_path
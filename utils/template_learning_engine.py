@@ -5,9 +5,13 @@ Automatically creates reusable templates to reduce future LLM costs.
 This is Q2O's self-improving capability - the platform gets smarter with each project!
 """
 
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Set, Tuple
+import atexit
 import json
+import math
 import sqlite3
+import threading
+import time
 from datetime import datetime
 from pathlib import Path
 import hashlib
@@ -16,6 +20,15 @@ import re
 import os
 from dataclasses import dataclass, asdict
 
+_KEYWORD_STOPWORDS = {
+    'the', 'and', 'for', 'with', 'from', 'into', 'that', 'this', 'using', 'use',
+    'implementation', 'implement', 'create', 'build', 'generate', 'add', 'file',
+}
+
+# Retrieval weights: similarity components, then the final ranking mix
+_TECH_WEIGHT, _TYPE_WEIGHT, _TEXT_WEIGHT = 0.4, 0.3, 0.3
+_SIMILARITY_RANK_WEIGHT, _QUALITY_RANK_WEIGHT, _RECENCY_RANK_WEIGHT = 0.7, 0.2, 0.1
+
 
 @dataclass
 class LearnedTemplate:
@@ -84,48 +97,147 @@ class TemplateLearningEngine:
         self.enabled = os.getenv("Q2O_TEMPLATE_LEARNING_ENABLED", "true").lower() == "true"
         self.min_quality = int(os.getenv("Q2O_TEMPLATE_MIN_QUALITY_TO_LEARN", "90"))
         self.match_threshold = float(os.getenv("Q2O_TEMPLATE_MATCH_THRESHOLD", "0.80"))
+        self.recency_half_life_days = float(os.getenv("Q2O_TEMPLATE_RECENCY_HALF_LIFE_DAYS", "30"))
+        
+        # One connection for the engine's lifetime, shared by agent threads under a lock
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+        
+        # Usage increments are buffered and written in one transaction
+        self._pending_usage: Dict[str, Tuple[int, str]] = {}  # template_id -> (count, last_used)
+        self._usage_flush_size = int(os.getenv("Q2O_TEMPLATE_USAGE_FLUSH_SIZE", "20"))
+        self._usage_flush_interval = float(os.getenv("Q2O_TEMPLATE_USAGE_FLUSH_SECONDS", "30"))
+        self._last_usage_flush = time.monotonic()
         
         if self.enabled:
             self._init_database()
+            atexit.register(self.close)
             logging.info(f"[OK] Template Learning Engine initialized (min quality: {self.min_quality}%)")
         else:
             logging.info("[INFO] Template Learning disabled by configuration")
     
+    def _connection(self) -> sqlite3.Connection:
+        """The engine's long-lived connection (opened on first use)."""
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
+            try:
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            except sqlite3.DatabaseError:
+                pass  # e.g. network filesystems; default journal still works
+        return self._conn
+    
     def _init_database(self):
-        """Initialize learned templates database."""
-        conn = sqlite3.connect(self.db_path)
-        
-        conn.execute("""
-            CREATE TABLE IF NOT EXISTS learned_templates (
-                template_id TEXT PRIMARY KEY,
-                name TEXT NOT NULL,
-                description TEXT,
-                tech_stack TEXT,  -- JSON array
-                pattern_signature TEXT UNIQUE,
-                template_content TEXT,
-                source_llm TEXT,
-                quality_score INTEGER,
-                usage_count INTEGER DEFAULT 0,
-                created_at TIMESTAMP,
-                last_used TIMESTAMP,
-                metadata TEXT  -- JSON
-            )
-        """)
-        
-        conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_pattern ON learned_templates(pattern_signature)
-        """)
-        
-        conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_tech_stack ON learned_templates(tech_stack)
-        """)
-        
-        conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_quality ON learned_templates(quality_score DESC)
-        """)
-        
-        conn.commit()
-        conn.close()
+        """Initialize learned templates database and its retrieval index."""
+        with self._lock:
+            conn = self._connection()
+            
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS learned_templates (
+                    template_id TEXT PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    description TEXT,
+                    tech_stack TEXT,  -- JSON array
+                    pattern_signature TEXT UNIQUE,
+                    template_content TEXT,
+                    source_llm TEXT,
+                    quality_score INTEGER,
+                    usage_count INTEGER DEFAULT 0,
+                    created_at TIMESTAMP,
+                    last_used TIMESTAMP,
+                    metadata TEXT,  -- JSON
+                    task_type TEXT
+                )
+            """)
+            
+            # Databases created before the retrieval index lack task_type
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(learned_templates)")}
+            if "task_type" not in columns:
+                conn.execute("ALTER TABLE learned_templates ADD COLUMN task_type TEXT")
+            
+            # Normalized tech stack (lowercased, one row per technology)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS template_tech_stack (
+                    template_id TEXT NOT NULL,
+                    tech TEXT NOT NULL,
+                    PRIMARY KEY (template_id, tech)
+                )
+            """)
+            
+            # Feature vector per template: kw:<token>, code:<flag>
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS template_features (
+                    template_id TEXT NOT NULL,
+                    feature TEXT NOT NULL,
+                    PRIMARY KEY (template_id, feature)
+                )
+            """)
+            
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_pattern ON learned_templates(pattern_signature)
+            """)
+            
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_tech_stack ON learned_templates(tech_stack)
+            """)
+            
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_quality ON learned_templates(quality_score DESC)
+            """)
+            
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_task_type ON learned_templates(task_type)
+            """)
+            
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_template_tech ON template_tech_stack(tech)
+            """)
+            
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_template_feature ON template_features(feature)
+            """)
+            
+            # Index templates learned before the retrieval index existed
+            unindexed = conn.execute("""
+                SELECT template_id, description, tech_stack, template_content
+                FROM learned_templates WHERE task_type IS NULL
+            """).fetchall()
+            for template_id, description, tech_stack_json, content in unindexed:
+                self._index_template(
+                    conn, template_id, description or "", json.loads(tech_stack_json or "[]"), content or ""
+                )
+            if unindexed:
+                logging.info(f"[INDEX] Indexed {len(unindexed)} existing learned templates")
+            
+            conn.commit()
+    
+    @staticmethod
+    def _normalize_tech_stack(tech_stack: List[str]) -> Set[str]:
+        """Lowercased, trimmed technology names."""
+        return {tech.strip().lower() for tech in (tech_stack or []) if tech and tech.strip()}
+    
+    @staticmethod
+    def _keywords(text: str) -> Set[str]:
+        """Significant lowercase tokens of a task description."""
+        return {
+            token for token in re.findall(r'[a-z][a-z0-9_+#.-]*', (text or '').lower())
+            if len(token) > 2 and token not in _KEYWORD_STOPWORDS
+        }
+    
+    def _index_template(self, conn: sqlite3.Connection, template_id: str, description: str,
+                        tech_stack: List[str], code: str):
+        """(Re)write a template's task type, tech stack rows and feature vector."""
+        signature = self._signature_data(description, tech_stack, code)
+        features = {f"kw:{token}" for token in self._keywords(description)}
+        features.update(f"code:{flag}" for flag, present in signature["structure"].items() if present)
+        
+        conn.execute("UPDATE learned_templates SET task_type = ? WHERE template_id = ?",
+                     (signature["task_type"], template_id))
+        conn.execute("DELETE FROM template_tech_stack WHERE template_id = ?", (template_id,))
+        conn.execute("DELETE FROM template_features WHERE template_id = ?", (template_id,))
+        conn.executemany("INSERT INTO template_tech_stack (template_id, tech) VALUES (?, ?)",
+                         [(template_id, tech) for tech in self._normalize_tech_stack(tech_stack)])
+        conn.executemany("INSERT INTO template_features (template_id, feature) VALUES (?, ?)",
+                         [(template_id, feature) for feature in features])
     
     def extract_pattern_signature(
         self,
@@ -151,6 +263,11 @@ class TemplateLearningEngine:
         Returns:
             Pattern signature hash
         """
+        signature_str = json.dumps(self._signature_data(task_description, tech_stack, code), sort_keys=True)
+        return hashlib.md5(signature_str.encode()).hexdigest()
+    
+    def _signature_data(self, task_description: str, tech_stack: List[str], code: str) -> Dict:
+        """Task type, tech stack and code structure features behind a pattern signature."""
         task_lower = task_description.lower()
         
         # Extract task type
@@ -173,20 +290,13 @@ class TemplateLearningEngine:
         function_count = len(re.findall(r'\ndef ', code))
         class_count = len(re.findall(r'\nclass ', code))
         
-        # Create signature
-        signature_data = {
+        return {
             "task_type": task_type,
             "tech_stack": sorted(tech_stack),
             "structure": structure,
             "function_count": min(function_count, 10),  # Cap for grouping
             "class_count": min(class_count, 5)
         }
-        
-        # Hash for matching
-        signature_str = json.dumps(signature_data, sort_keys=True)
-        signature_hash = hashlib.md5(signature_str.encode()).hexdigest()
-        
-        return signature_hash
     
     def _detect_task_type(self, task_lower: str) -> str:
         """Detect task type from description."""
@@ -217,7 +327,7 @@ class TemplateLearningEngine:
         """
         Find a learned template that matches this task.
         
-        Uses pattern signature matching to find similar previously-learned templates.
+        Returns the best-ranked result of find_similar_templates.
         
         Args:
             task_description: What to build
@@ -226,38 +336,114 @@ class TemplateLearningEngine:
         Returns:
             LearnedTemplate if match found, None otherwise
         """
-        if not self.enabled:
+        matches = self.find_similar_templates(task_description, tech_stack, limit=1)
+        if not matches:
+            logging.debug(f"No learned template matches '{task_description[:60]}' for tech stack: {tech_stack}")
             return None
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Get all templates with exact tech stack match
-        tech_stack_json = json.dumps(sorted(tech_stack))
-        
-        cursor.execute("""
-            SELECT * FROM learned_templates
-            WHERE tech_stack = ?
-            ORDER BY usage_count DESC, quality_score DESC
-            LIMIT 10
-        """, (tech_stack_json,))
-        
-        rows = cursor.fetchall()
-        conn.close()
+        template, score = matches[0]
+        logging.info(
+            f"[TEMPLATE] Found learned template: {template.name} "
+            f"(score {score:.2f}, used {template.usage_count} times)"
+        )
+        return template
+    
+    def find_similar_templates(
+        self,
+        task_description: str,
+        tech_stack: List[str],
+        limit: int = 5
+    ) -> List[Tuple[LearnedTemplate, float]]:
+        """
+        Top-k learned templates for a task, best first.
         
-        if not rows:
-            logging.debug(f"No learned templates found for tech stack: {tech_stack}")
-            return None
+        Candidates share the task type or a technology (via the indexed
+        task_type column and template_tech_stack table). Each is scored on
+        similarity - tech stack overlap, task type match and description
+        keyword overlap - and only those at or above match_threshold are
+        kept. They are ranked by similarity combined with quality_score and
+        how recently the template was used.
         
-        # TODO: Implement semantic similarity matching
-        # For now, return the most-used, highest-quality template
-        row = rows[0]
+        Args:
+            task_description: What to build
+            tech_stack: Technologies needed
+            limit: Maximum number of templates to return
         
-        template = self._row_to_template(row)
+        Returns:
+            List of (template, rank score) tuples
+        """
+        if not self.enabled:
+            return []
         
-        logging.info(f"[TEMPLATE] Found learned template: {template.name} (used {template.usage_count} times)")
+        query_type = self._detect_task_type(task_description.lower())
+        query_techs = self._normalize_tech_stack(tech_stack)
+        query_keywords = self._keywords(task_description)
+        
+        with self._lock:
+            conn = self._connection()
+            tech_placeholders = ",".join("?" for _ in query_techs) or "NULL"
+            rows = conn.execute(f"""
+                SELECT * FROM learned_templates
+                WHERE task_type = ?
+                   OR template_id IN (
+                       SELECT template_id FROM template_tech_stack WHERE tech IN ({tech_placeholders})
+                   )
+            """, (query_type, *query_techs)).fetchall()
+            if not rows:
+                return []
+            
+            ids = [row[0] for row in rows]
+            id_placeholders = ",".join("?" for _ in ids)
+            techs: Dict[str, Set[str]] = {template_id: set() for template_id in ids}
+            for template_id, tech in conn.execute(
+                f"SELECT template_id, tech FROM template_tech_stack WHERE template_id IN ({id_placeholders})", ids
+            ):
+                techs[template_id].add(tech)
+            keywords: Dict[str, Set[str]] = {template_id: set() for template_id in ids}
+            for template_id, feature in conn.execute(
+                f"SELECT template_id, feature FROM template_features "
+                f"WHERE template_id IN ({id_placeholders}) AND feature LIKE 'kw:%'", ids
+            ):
+                keywords[template_id].add(feature[3:])
+        
+        now = datetime.now()
+        ranked = []
+        for row in rows:
+            template_id, task_type = row[0], row[12]
+            similarity = self._similarity(
+                query_techs, query_keywords, query_type, techs[template_id], keywords[template_id], task_type
+            )
+            if similarity < self.match_threshold:
+                continue
+            template = self._row_to_template(row)
+            age_days = max((now - template.last_used).total_seconds() / 86400, 0.0)
+            recency = 0.5 ** (age_days / self.recency_half_life_days) if self.recency_half_life_days > 0 else 0.0
+            score = (
+                _SIMILARITY_RANK_WEIGHT * similarity
+                + _QUALITY_RANK_WEIGHT * (template.quality_score or 0) / 100
+                + _RECENCY_RANK_WEIGHT * recency
+            )
+            ranked.append((template, score))
         
-        return template
+        ranked.sort(key=lambda item: item[1], reverse=True)
+        return ranked[:limit]
+    
+    @staticmethod
+    def _similarity(query_techs: Set[str], query_keywords: Set[str], query_type: str,
+                    template_techs: Set[str], template_keywords: Set[str], template_type: str) -> float:
+        """Weighted tech stack Jaccard, task type match and keyword cosine (0.0-1.0)."""
+        if query_techs or template_techs:
+            tech_similarity = len(query_techs & template_techs) / len(query_techs | template_techs)
+        else:
+            tech_similarity = 1.0
+        type_similarity = 1.0 if query_type == template_type else 0.0
+        if query_keywords and template_keywords:
+            text_similarity = len(query_keywords & template_keywords) / math.sqrt(
+                len(query_keywords) * len(template_keywords)
+            )
+        else:
+            text_similarity = 0.0
+        return _TECH_WEIGHT * tech_similarity + _TYPE_WEIGHT * type_similarity + _TEXT_WEIGHT * text_similarity
     
     def _row_to_template(self, row: tuple) -> LearnedTemplate:
         """Convert database row to LearnedTemplate object."""
@@ -315,74 +501,76 @@ class TemplateLearningEngine:
             task_description, tech_stack, generated_code
         )
         
-        # Check if we already have this pattern
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT template_id, quality_score FROM learned_templates
-            WHERE pattern_signature = ?
-        """, (pattern_sig,))
-        
-        existing = cursor.fetchone()
+        description = task_description[:200]  # Truncate long descriptions
         
-        if existing:
-            existing_id, existing_quality = existing
+        with self._lock:
+            conn = self._connection()
+            cursor = conn.cursor()
             
-            # If new code is better quality, update the template
-            if quality_score > existing_quality:
-                logging.info(f"[UPDATE] Updating template {existing_id} with higher quality code ({existing_quality} -> {quality_score})")
-                
-                cursor.execute("""
-                    UPDATE learned_templates
-                    SET template_content = ?,
-                        quality_score = ?,
-                        source_llm = ?,
-                        metadata = ?
-                    WHERE template_id = ?
-                """, (
-                    generated_code,
-                    quality_score,
-                    source_llm,
-                    json.dumps(metadata or {}),
-                    existing_id
-                ))
+            # Check if we already have this pattern
+            cursor.execute("""
+                SELECT template_id, quality_score FROM learned_templates
+                WHERE pattern_signature = ?
+            """, (pattern_sig,))
+            
+            existing = cursor.fetchone()
+            
+            if existing:
+                existing_id, existing_quality = existing
                 
-                conn.commit()
-                conn.close()
-                return existing_id
-            else:
-                logging.debug(f"Pattern already learned with similar/better quality: {existing_id}")
-                conn.close()
-                return existing_id
-        
-        # Create new learned template
-        template_id = f"learned_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{pattern_sig[:8]}"
-        name = self._generate_template_name(task_description, tech_stack)
-        
-        # Save to database (code as-is for now, parameterization comes later)
-        cursor.execute("""
-            INSERT INTO learned_templates (
-                template_id, name, description, tech_stack,
-                pattern_signature, template_content, source_llm,
-                quality_score, usage_count, created_at, last_used, metadata
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, 0, ?, ?, ?)
-        """, (
-            template_id,
-            name,
-            task_description[:200],  # Truncate long descriptions
-            json.dumps(sorted(tech_stack)),
-            pattern_sig,
-            generated_code,
-            source_llm,
-            quality_score,
-            datetime.now().isoformat(),
-            datetime.now().isoformat(),
-            json.dumps(metadata or {})
-        ))
-        
-        conn.commit()
-        conn.close()
+                # If new code is better quality, update the template
+                if quality_score > existing_quality:
+                    logging.info(f"[UPDATE] Updating template {existing_id} with higher quality code ({existing_quality} -> {quality_score})")
+                    
+                    cursor.execute("""
+                        UPDATE learned_templates
+                        SET template_content = ?,
+                            quality_score = ?,
+                            source_llm = ?,
+                            metadata = ?
+                        WHERE template_id = ?
+                    """, (
+                        generated_code,
+                        quality_score,
+                        source_llm,
+                        json.dumps(metadata or {}),
+                        existing_id
+                    ))
+                    self._index_template(conn, existing_id, description, tech_stack, generated_code)
+                    
+                    conn.commit()
+                    return existing_id
+                else:
+                    logging.debug(f"Pattern already learned with similar/better quality: {existing_id}")
+                    return existing_id
+            
+            # Create new learned template
+            template_id = f"learned_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{pattern_sig[:8]}"
+            name = self._generate_template_name(task_description, tech_stack)
+            
+            # Save to database (code as-is for now, parameterization comes later)
+            cursor.execute("""
+                INSERT INTO learned_templates (
+                    template_id, name, description, tech_stack,
+                    pattern_signature, template_content, source_llm,
+                    quality_score, usage_count, created_at, last_used, metadata
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, 0, ?, ?, ?)
+            """, (
+                template_id,
+                name,
+                description,
+                json.dumps(sorted(tech_stack)),
+                pattern_sig,
+                generated_code,
+                source_llm,
+                quality_score,
+                datetime.now().isoformat(),
+                datetime.now().isoformat(),
+                json.dumps(metadata or {})
+            ))
+            self._index_template(conn, template_id, description, tech_stack, generated_code)
+            
+            conn.commit()
         
         logging.info(f"[LEARNED] Learned new template: {template_id} '{name}' (from {source_llm}, quality: {quality_score}/100)")
         
@@ -557,23 +745,63 @@ Analyze and return JSON array of parameterization suggestions."""
         """
         Track template usage for analytics.
         
+        Increments are buffered and written by flush_usage once
+        Q2O_TEMPLATE_USAGE_FLUSH_SIZE uses are pending or
+        Q2O_TEMPLATE_USAGE_FLUSH_SECONDS have passed.
+        
         Args:
             template_id: Template to track
         """
         if not self.enabled:
             return
         
-        conn = sqlite3.connect(self.db_path)
-        conn.execute("""
-            UPDATE learned_templates
-            SET usage_count = usage_count + 1,
-                last_used = ?
-            WHERE template_id = ?
-        """, (datetime.now().isoformat(), template_id))
-        conn.commit()
-        conn.close()
+        with self._lock:
+            count, _ = self._pending_usage.get(template_id, (0, None))
+            self._pending_usage[template_id] = (count + 1, datetime.now().isoformat())
+            pending = sum(count for count, _ in self._pending_usage.values())
+            due = time.monotonic() - self._last_usage_flush >= self._usage_flush_interval
         
         logging.debug(f"[STATS] Template usage incremented: {template_id}")
+        
+        if pending >= self._usage_flush_size or due:
+            self.flush_usage()
+    
+    def flush_usage(self):
+        """Write buffered usage increments in one transaction."""
+        if not self.enabled:
+            return
+        
+        with self._lock:
+            self._last_usage_flush = time.monotonic()
+            if not self._pending_usage:
+                return
+            updates = [
+                (count, last_used, template_id)
+                for template_id, (count, last_used) in self._pending_usage.items()
+            ]
+            conn = self._connection()
+            conn.executemany("""
+                UPDATE learned_templates
+                SET usage_count = usage_count + ?,
+                    last_used = ?
+                WHERE template_id = ?
+            """, updates)
+            conn.commit()
+            self._pending_usage.clear()
+        
+        logging.debug(f"[STATS] Flushed usage for {len(updates)} templates")
+    
+    def close(self):
+        """Flush buffered usage and close the database connection."""
+        with self._lock:
+            if self._conn is None:
+                return
+            try:
+                self.flush_usage()
+            except sqlite3.Error as e:
+                logging.warning(f"Could not flush template usage: {e}")
+            self._conn.close()
+            self._conn = None
     
     def get_learning_stats(self) -> Dict:
         """
@@ -589,22 +817,22 @@ Analyze and return JSON array of parameterization suggestions."""
                 "cost_saved": 0.0
             }
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT
-                COUNT(*) as total_templates,
-                SUM(usage_count) as total_uses,
-                AVG(quality_score) as avg_quality,
-                SUM(CASE WHEN source_llm = 'gemini' THEN 1 ELSE 0 END) as from_gemini,
-                SUM(CASE WHEN source_llm = 'openai' THEN 1 ELSE 0 END) as from_gpt4,
-                SUM(CASE WHEN source_llm = 'claude' THEN 1 ELSE 0 END) as from_claude
-            FROM learned_templates
-        """)
-        
-        row = cursor.fetchone()
-        conn.close()
+        self.flush_usage()
+        with self._lock:
+            cursor = self._connection().cursor()
+            
+            cursor.execute("""
+                SELECT
+                    COUNT(*) as total_templates,
+                    SUM(usage_count) as total_uses,
+                    AVG(quality_score) as avg_quality,
+                    SUM(CASE WHEN source_llm = 'gemini' THEN 1 ELSE 0 END) as from_gemini,
+                    SUM(CASE WHEN source_llm = 'openai' THEN 1 ELSE 0 END) as from_gpt4,
+                    SUM(CASE WHEN source_llm = 'claude' THEN 1 ELSE 0 END) as from_claude
+                FROM learned_templates
+            """)
+            
+            row = cursor.fetchone()
         
         # Handle empty table (SQL aggregates return None)
         total_templates = row[0] or 0
@@ -638,16 +866,12 @@ Analyze and return JSON array of parameterization suggestions."""
         if not self.enabled:
             return None
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT * FROM learned_templates
-            WHERE template_id = ?
-        """, (template_id,))
-        
-        row = cursor.fetchone()
-        conn.close()
+        self.flush_usage()
+        with self._lock:
+            row = self._connection().execute("""
+                SELECT * FROM learned_templates
+                WHERE template_id = ?
+            """, (template_id,)).fetchone()
         
         if not row:
             return None
@@ -676,17 +900,13 @@ Analyze and return JSON array of parameterization suggestions."""
         if sort_by not in valid_sorts:
             sort_by = "usage_count"
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute(f"""
-            SELECT * FROM learned_templates
-            ORDER BY {sort_by} DESC
-            LIMIT ?
-        """, (limit,))
-        
-        rows = cursor.fetchall()
-        conn.close()
+        self.flush_usage()
+        with self._lock:
+            rows = self._connection().execute(f"""
+                SELECT * FROM learned_templates
+                ORDER BY {sort_by} DESC
+                LIMIT ?
+            """, (limit,)).fetchall()
         
         return [self._row_to_template(row) for row in rows]
     
@@ -703,17 +923,20 @@ Analyze and return JSON array of parameterization suggestions."""
         if not self.enabled:
             return False
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            DELETE FROM learned_templates
-            WHERE template_id = ?
-        """, (template_id,))
-        
-        deleted = cursor.rowcount > 0
-        conn.commit()
-        conn.close()
+        with self._lock:
+            conn = self._connection()
+            cursor = conn.cursor()
+            
+            cursor.execute("""
+                DELETE FROM learned_templates
+                WHERE template_id = ?
+            """, (template_id,))
+            
+            deleted = cursor.rowcount > 0
+            cursor.execute("DELETE FROM template_tech_stack WHERE template_id = ?", (template_id,))
+            cursor.execute("DELETE FROM template_features WHERE template_id = ?", (template_id,))
+            self._pending_usage.pop(template_id, None)
+            conn.commit()
         
         if deleted:
             logging.info(f"[DELETE] Deleted learned template: {template_id}")
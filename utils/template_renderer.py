@@ -1,26 +1,42 @@
 """
 Template Renderer using Jinja2.
 Provides centralized template rendering for all agents.
+
+Compiled templates are cached at three levels: Jinja's own per-environment
+cache for files in templates/, a bytecode cache on disk shared by every
+process (so a new worker loads instead of re-compiling), and an LRU of
+compiled ad-hoc strings for render_string keyed by source hash.
 """
 
+import hashlib
 import os
+import threading
+from collections import OrderedDict
 from pathlib import Path
 from typing import Dict, Any, Optional
-from jinja2 import Environment, FileSystemLoader, TemplateNotFound
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template, TemplateNotFound
 import logging
 
 logger = logging.getLogger(__name__)
 
+_DEFAULT_BYTECODE_CACHE_DIR = Path(__file__).parent.parent / ".template_cache"
+
 
 class TemplateRenderer:
     """Jinja2-based template renderer for code generation."""
     
-    def __init__(self, template_dir: Optional[str] = None):
+    def __init__(self, template_dir: Optional[str] = None, bytecode_cache_dir: Optional[str] = None,
+                 string_cache_size: Optional[int] = None):
         """
         Initialize template renderer.
         
         Args:
             template_dir: Directory containing templates. If None, uses default.
+            bytecode_cache_dir: Directory for compiled template bytecode shared across
+                processes. If None, uses TEMPLATE_BYTECODE_CACHE_DIR or .template_cache/;
+                an empty TEMPLATE_BYTECODE_CACHE_DIR disables it.
+            string_cache_size: Compiled render_string templates to keep
+                (default: TEMPLATE_STRING_CACHE_SIZE or 256)
         """
         # Determine template directory
         if template_dir is None:
@@ -38,7 +54,15 @@ class TemplateRenderer:
             loader=FileSystemLoader(str(self.template_dir)),
             trim_blocks=True,
             lstrip_blocks=True,
-            keep_trailing_newline=True
+            keep_trailing_newline=True,
+            bytecode_cache=self._create_bytecode_cache(bytecode_cache_dir)
+        )
+        
+        # Compiled ad-hoc templates for render_string: source hash -> Template
+        self._string_cache: "OrderedDict[str, Template]" = OrderedDict()
+        self._string_cache_lock = threading.Lock()
+        self._string_cache_size = string_cache_size if string_cache_size is not None else int(
+            os.getenv("TEMPLATE_STRING_CACHE_SIZE", "256")
         )
         
         # Add custom filters
@@ -46,6 +70,20 @@ class TemplateRenderer:
         
         logger.info(f"Template renderer initialized with template dir: {self.template_dir}")
     
+    @staticmethod
+    def _create_bytecode_cache(bytecode_cache_dir: Optional[str]) -> Optional[FileSystemBytecodeCache]:
+        """Bytecode cache on disk, or None if disabled or the directory is not writable."""
+        if bytecode_cache_dir is None:
+            bytecode_cache_dir = os.getenv("TEMPLATE_BYTECODE_CACHE_DIR", str(_DEFAULT_BYTECODE_CACHE_DIR))
+        if not bytecode_cache_dir:
+            return None
+        try:
+            Path(bytecode_cache_dir).mkdir(parents=True, exist_ok=True)
+            return FileSystemBytecodeCache(str(bytecode_cache_dir))
+        except OSError as e:
+            logger.warning(f"Template bytecode cache disabled ({bytecode_cache_dir}): {e}")
+            return None
+    
     def _add_custom_filters(self):
         """Add custom Jinja2 filters."""
         
@@ -109,12 +147,51 @@ class TemplateRenderer:
             Rendered template as string
         """
         try:
-            template = self.env.from_string(template_string)
+            template = self._compile_string(template_string)
             return template.render(**context)
         except Exception as e:
             logger.error(f"Error rendering template string: {str(e)}", exc_info=True)
             raise
     
+    def _compile_string(self, template_string: str) -> Template:
+        """Compiled template for a source string, reused across calls (LRU)."""
+        if self._string_cache_size <= 0:
+            return self.env.from_string(template_string)
+        
+        key = hashlib.sha256(template_string.encode('utf-8')).hexdigest()
+        with self._string_cache_lock:
+            template = self._string_cache.get(key)
+            if template is not None:
+                self._string_cache.move_to_end(key)
+                return template
+        
+        template = self.env.from_string(template_string)
+        with self._string_cache_lock:
+            self._string_cache[key] = template
+            while len(self._string_cache) > self._string_cache_size:
+                self._string_cache.popitem(last=False)
+        return template
+    
+    def warm_up(self) -> int:
+        """
+        Compile every template in template_dir ahead of the first render.
+        
+        Fills the in-process template cache and, on first run, the shared
+        bytecode cache. Call once at worker start.
+        
+        Returns:
+            Number of templates compiled
+        """
+        compiled = 0
+        for template_name in self.env.list_templates():
+            try:
+                self.env.get_template(template_name)
+                compiled += 1
+            except Exception as e:
+                logger.warning(f"Could not precompile template {template_name}: {e}")
+        logger.debug(f"Precompiled {compiled} templates from {self.template_dir}")
+        return compiled
+    
     def get_template_path(self, template_name: str) -> Path:
         """
         Get full path to a template file.
@@ -1,5 +1,5 @@
 import { useState, useEffect, useCallback, useRef } from 'react';
-import type { DashboardState, WebSocketMessage } from '../types/dashboard';
+import type { DashboardState, WebSocketBatch, WebSocketMessage } from '../types/dashboard';
 
 const WS_URL = process.env.NEXT_PUBLIC_WS_URL || 'ws://localhost:8000/ws/dashboard';
 const RECONNECT_INTERVAL = 3000; // 3 seconds
@@ -11,11 +11,17 @@ export function useWebSocket() {
   
   const wsRef = useRef<WebSocket | null>(null);
   const reconnectTimeoutRef = useRef<NodeJS.Timeout>();
+  // Last frame applied and its server epoch; sent on reconnect so the server only resends what changed
+  const seqRef = useRef<number | null>(null);
+  const epochRef = useRef<string | null>(null);
 
   const connect = useCallback(() => {
     try {
-      console.log('Connecting to WebSocket:', WS_URL);
-      const ws = new WebSocket(WS_URL);
+      const url = seqRef.current === null || epochRef.current === null
+        ? WS_URL
+        : `${WS_URL}?epoch=${encodeURIComponent(epochRef.current)}&since=${seqRef.current}`;
+      console.log('Connecting to WebSocket:', url);
+      const ws = new WebSocket(url);
       
       ws.onopen = () => {
         console.log('WebSocket connected');
@@ -23,40 +29,53 @@ export function useWebSocket() {
         setError(null);
       };
 
+      const applyMessage = (message: WebSocketMessage) => {
+        if (message.type === 'initial_state' && message.data.delta) {
+          // Resumed connection: replay only the tasks/agents changed while disconnected
+          Object.values(message.data.tasks || {}).forEach(data => applyMessage({ type: 'task_update', data }));
+          Object.values(message.data.agents || {}).forEach(data => applyMessage({ type: 'agent_activity', data }));
+          applyMessage({ type: 'metric_update', data: message.data.metrics });
+        } else if (message.type === 'initial_state') {
+          setState(message.data);
+        } else if (message.type === 'task_update') {
+          setState(prev => {
+            if (!prev) return prev;
+            const tasks = prev.tasks.map(task =>
+              task.id === message.data.id ? { ...task, ...message.data } : task
+            );
+            return { ...prev, tasks };
+          });
+        } else if (message.type === 'agent_activity') {
+          setState(prev => {
+            if (!prev) return prev;
+            const agents = prev.agents.map(agent =>
+              agent.name === message.data.name ? { ...agent, ...message.data } : agent
+            );
+            return { ...prev, agents };
+          });
+        } else if (message.type === 'metric_update') {
+          setState(prev => {
+            if (!prev) return prev;
+            return { ...prev, metrics: { ...prev.metrics, ...message.data } };
+          });
+        } else if (message.type === 'project_update') {
+          setState(prev => {
+            if (!prev) return prev;
+            return { ...prev, project: { ...prev.project, ...message.data } };
+          });
+        }
+      };
+
       ws.onmessage = (event) => {
         try {
-          const message: WebSocketMessage = JSON.parse(event.data);
-          console.log('WebSocket message:', message.type);
-
-          if (message.type === 'initial_state') {
-            setState(message.data);
-          } else if (message.type === 'task_update') {
-            setState(prev => {
-              if (!prev) return prev;
-              const tasks = prev.tasks.map(task =>
-                task.id === message.data.id ? { ...task, ...message.data } : task
-              );
-              return { ...prev, tasks };
-            });
-          } else if (message.type === 'agent_activity') {
-            setState(prev => {
-              if (!prev) return prev;
-              const agents = prev.agents.map(agent =>
-                agent.name === message.data.name ? { ...agent, ...message.data } : agent
-              );
-              return { ...prev, agents };
-            });
-          } else if (message.type === 'metric_update') {
-            setState(prev => {
-              if (!prev) return prev;
-              return { ...prev, metrics: { ...prev.metrics, ...message.data } };
-            });
-          } else if (message.type === 'project_update') {
-            setState(prev => {
-              if (!prev) return prev;
-              return { ...prev, project: { ...prev.project, ...message.data } };
-            });
+          const frame: WebSocketMessage | WebSocketBatch = JSON.parse(event.data);
+          const messages = frame.type === 'batch' ? frame.events : [frame];
+          if (typeof frame.seq === 'number' && typeof frame.epoch === 'string') {
+            seqRef.current = frame.seq;
+            epochRef.current = frame.epoch;
           }
+          console.log('WebSocket frame:', frame.type, messages.length);
+          messages.forEach(applyMessage);
         } catch (err) {
           console.error('Failed to parse WebSocket message:', err);
         }
@@ -49,6 +49,16 @@ export interface DashboardState {
 export interface WebSocketMessage {
   type: 'initial_state' | 'task_update' | 'agent_activity' | 'metric_update' | 'project_update';
   data: any;
+  seq?: number;  // initial_state only: frame the snapshot corresponds to
+  epoch?: string;  // initial_state only: server instance the seq belongs to
+}
+
+// Server sends events in batches: one frame per flush interval
+export interface WebSocketBatch {
+  type: 'batch';
+  epoch: string;  // changes when the server restarts (seq starts over)
+  seq: number;
+  events: WebSocketMessage[];
 }
 
 export interface StatCard {
@@ -64,43 +64,48 @@ const DashboardPage: NextPage = () => {
       setError(null);
     };
 
+    const applyMessage = (message: any) => {
+      if (message.type === 'initial_state') {
+        setDashboardState(message.data);
+      } else if (message.type === 'task_update') {
+        setDashboardState(prev => {
+          if (!prev) return prev;
+          return {
+            ...prev,
+            tasks: {
+              ...prev.tasks,
+              [message.data.task_id]: message.data
+            }
+          };
+        });
+      } else if (message.type === 'agent_activity') {
+        setDashboardState(prev => {
+          if (!prev) return prev;
+          return {
+            ...prev,
+            agents: {
+              ...prev.agents,
+              [message.data.agent_id]: message.data
+            }
+          };
+        });
+      } else if (message.type === 'metric_update') {
+        setDashboardState(prev => {
+          if (!prev) return prev;
+          return {
+            ...prev,
+            metrics: message.data
+          };
+        });
+      }
+    };
+
     ws.onmessage = (event) => {
       try {
-        const message = JSON.parse(event.data);
-        
-        if (message.type === 'initial_state') {
-          setDashboardState(message.data);
-        } else if (message.type === 'task_update') {
-          setDashboardState(prev => {
-            if (!prev) return prev;
-            return {
-              ...prev,
-              tasks: {
-                ...prev.tasks,
-                [message.data.task_id]: message.data
-              }
-            };
-          });
-        } else if (message.type === 'agent_activity') {
-          setDashboardState(prev => {
-            if (!prev) return prev;
-            return {
-              ...prev,
-              agents: {
-                ...prev.agents,
-                [message.data.agent_id]: message.data
-              }
-            };
-          });
-        } else if (message.type === 'metric_update') {
-          setDashboardState(prev => {
-            if (!prev) return prev;
-            return {
-              ...prev,
-              metrics: message.data
-            };
-          });
-        }
+        const frame = JSON.parse(event.data);
+        // Server sends events in batches: one frame per flush interval
+        const messages = frame.type === 'batch' ? frame.events : [frame];
+        messages.forEach(applyMessage);
       } catch (err) {
         console.error('Error parsing WebSocket message:', err);
       }